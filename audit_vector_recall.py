@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Vector recall audit
+Measures how many of the true nearest neighbours the HNSW index returns, on
+the chunks actually stored in the Vector Brain. Stored embeddings are pulled
+from the configured backend, a sample of them is used as queries, and the
+exact top-k (core/exact_vectors.py) is the ground truth.
+
+Reports recall@k and query latency of:
+- the live collection, with its current HNSW settings (chromadb/embedded)
+- a grid of HNSW settings (M x construction_ef x search_ef), each built into a
+  temporary in-process Chroma collection from the same embeddings
+
+and names the cheapest grid setting reaching --target-recall, to carry over
+to brains.vector.connection (hnsw_m, hnsw_construction_ef, hnsw_search_ef).
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+sys.path.append(str(Path(__file__).parent / "nancy-services"))
+
+import numpy as np
+import chromadb
+
+from core.exact_vectors import ExactIndex, ExactVectorBackend
+from core.vector_backend import (
+    COLLECTION_NAME, DEFAULT_PERSIST_DIRECTORY, get_chroma_client, get_vector_backend_config
+)
+
+PAGE_SIZE = 5000
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def parse_ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def load_embeddings(backend: str, persist_directory: str):
+    """(ids, embeddings, distance space, live collection or None) of the stored chunks."""
+    if backend == "exact":
+        store = ExactVectorBackend(None, persist_directory)
+        try:
+            ids, embeddings = store.export_embeddings()
+            return ids, embeddings, store.space, None
+        finally:
+            store.close()
+
+    client = chromadb.PersistentClient(path=persist_directory) if backend == "embedded" else get_chroma_client()
+    collection = client.get_collection(COLLECTION_NAME)
+    ids, embeddings = [], []
+    for offset in range(0, collection.count(), PAGE_SIZE):
+        page = collection.get(include=["embeddings"], limit=PAGE_SIZE, offset=offset)
+        ids.extend(page["ids"])
+        embeddings.extend(page["embeddings"])
+    space = (collection.metadata or {}).get("hnsw:space", "l2")
+    return ids, np.asarray(embeddings, dtype=np.float32), space, collection
+
+
+def recall_of(collection, embeddings, ids, queries: List[int], truth: List[List[str]], k: int) -> Dict[str, Any]:
+    recalls, latencies = [], []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        result = collection.query(query_embeddings=[embeddings[query].tolist()], n_results=k + 1, include=[])
+        latencies.append((time.perf_counter() - start) * 1000)
+        found = [chunk_id for chunk_id in result["ids"][0] if chunk_id != ids[query]][:k]
+        recalls.append(len(set(found) & set(expected)) / len(expected) if expected else 1.0)
+    return {
+        "recall": statistics.mean(recalls),
+        "min_recall": min(recalls),
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", help="chromadb, embedded or exact (default: brains.vector.backend)")
+    parser.add_argument("--persist-directory", help="store of the embedded/exact backend")
+    parser.add_argument("--samples", type=int, default=200, help="stored chunks used as queries")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--m", default="8,16,32", help="HNSW M values of the grid")
+    parser.add_argument("--construction-ef", default="100,200", help="HNSW construction_ef values of the grid")
+    parser.add_argument("--search-ef", default="10,50,100", help="HNSW search_ef values of the grid")
+    parser.add_argument("--no-grid", action="store_true", help="only audit the live collection")
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    settings = get_vector_backend_config()
+    backend = (args.backend or settings["backend"]).lower()
+    persist_directory = (args.persist_directory or settings["connection"].get("persist_directory")
+                         or DEFAULT_PERSIST_DIRECTORY)
+
+    ids, embeddings, space, live = load_embeddings(backend, persist_directory)
+    if len(ids) <= args.k:
+        raise SystemExit(f"Only {len(ids)} chunks stored; need more than k={args.k}")
+    print(f"Loaded {len(ids)} embeddings ({embeddings.shape[1]} dimensions, {space}) from the {backend} backend")
+
+    queries = random.Random(args.seed).sample(range(len(ids)), min(args.samples, len(ids)))
+    index = ExactIndex(space=space)
+    index.set_rows(np.arange(len(ids)), embeddings)
+    start = time.perf_counter()
+    rows, _ = index.search(embeddings[queries], args.k + 1)
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    truth = [[ids[row] for row in query_rows if row != query][:args.k] for query, query_rows in zip(queries, rows)]
+    print(f"Exact top-{args.k}: {exact_ms:.2f} ms per query (batched)")
+
+    results = {"backend": backend, "chunks": len(ids), "k": args.k, "samples": len(queries),
+               "exact_ms_per_query": exact_ms}
+    if live is not None:
+        results["live"] = {"hnsw": {k: v for k, v in (live.metadata or {}).items() if k.startswith("hnsw:")},
+                           **recall_of(live, embeddings, ids, queries, truth, args.k)}
+        print(f"Live collection {results['live']['hnsw'] or '(Chroma defaults)'}: "
+              f"recall@{args.k}={results['live']['recall']:.3f} p50={results['live']['p50_ms']:.2f} ms")
+
+    grid = []
+    if not args.no_grid:
+        print(f"\n{'M':>4} {'constr_ef':>9} {'search_ef':>9} {'recall':>7} {'min':>6} {'p50 ms':>8} {'build s':>8}")
+        with tempfile.TemporaryDirectory() as directory:
+            client = chromadb.PersistentClient(path=directory)
+            for m in parse_ints(args.m):
+                for construction_ef in parse_ints(args.construction_ef):
+                    for search_ef in parse_ints(args.search_ef):
+                        name = f"recall_audit_{m}_{construction_ef}_{search_ef}"
+                        collection = client.create_collection(name, metadata={
+                            "hnsw:space": space, "hnsw:M": m,
+                            "hnsw:construction_ef": construction_ef, "hnsw:search_ef": search_ef
+                        })
+                        start = time.perf_counter()
+                        for offset in range(0, len(ids), PAGE_SIZE):
+                            collection.add(ids=ids[offset:offset + PAGE_SIZE],
+                                           embeddings=embeddings[offset:offset + PAGE_SIZE].tolist())
+                        build_seconds = time.perf_counter() - start
+                        summary = {"m": m, "construction_ef": construction_ef, "search_ef": search_ef,
+                                   "build_seconds": build_seconds,
+                                   **recall_of(collection, embeddings, ids, queries, truth, args.k)}
+                        client.delete_collection(name)
+                        grid.append(summary)
+                        print(f"{m:>4} {construction_ef:>9} {search_ef:>9} {summary['recall']:>7.3f} "
+                              f"{summary['min_recall']:>6.2f} {summary['p50_ms']:>8.2f} {build_seconds:>8.1f}")
+        results["grid"] = grid
+
+        passing = [g for g in grid if g["recall"] >= args.target_recall]
+        if passing:
+            best = min(passing, key=lambda g: (g["p50_ms"], g["m"], g["construction_ef"]))
+            results["recommended"] = best
+            print(f"\nFastest setting with recall@{args.k} >= {args.target_recall}: hnsw_m={best['m']} "
+                  f"hnsw_construction_ef={best['construction_ef']} hnsw_search_ef={best['search_ef']}")
+        else:
+            print(f"\nNo grid setting reached recall@{args.k} >= {args.target_recall}; "
+                  f"raise search_ef/M or use the exact backend")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
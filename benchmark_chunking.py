@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Chunking strategy benchmark
+Compares the old character-packed sentence chunks, paragraph chunks and the
+token-aware sliding windows of core/chunking.py on benchmark_data: index size
+(chunks, indexed tokens, chunks over the embedding model's window) and
+retrieval quality (hit@k and MRR of the chunk holding each query's answer).
+Retrieval uses the bge-small embeddings when fastembed is installed and BM25
+otherwise.
+"""
+
+import argparse
+import json
+import math
+import re
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+sys.path.append(str(Path(__file__).parent / "nancy-services"))
+
+from core.chunking import TextChunker, MODEL_MAX_TOKENS, SPECIAL_TOKENS
+
+try:
+    from fastembed import TextEmbedding
+    import numpy as np
+    FASTEMBED_AVAILABLE = True
+except ImportError:
+    FASTEMBED_AVAILABLE = False
+
+# (query, file name, text the retrieved chunk must contain)
+QUERIES = [
+    ("Why was the aluminum heat sink adopted?", "thermal_analysis_report.txt", "85°C"),
+    ("How much larger is the redesigned enclosure?", "mechanical_integration_plan.txt", "15% larger volume"),
+    ("Who decided on the split power rail design?", "electrical_design_review.txt", "split power rail"),
+    ("What receiver sensitivity does the antenna matching network achieve?", "electrical_review_meeting.txt", "-92dBm"),
+    ("Where is the antenna placed in the enclosure?", "electrical_review_meeting.txt", "side wall of the enclosure"),
+    ("Radiated emissions margin at 290MHz", "emc_test_results.txt", "290MHz"),
+    ("WiFi fundamental emission result at 2.4GHz", "emc_test_results.txt", "WiFi Fundamental"),
+    ("How is the 128KB SRAM allocated?", "firmware_requirements.txt", "SRAM Allocation"),
+    ("What does a single button press do?", "firmware_requirements.txt", "Wake from sleep mode"),
+    ("Target weight of the device including battery", "ergonomic_analysis.txt", "140g"),
+    ("How many users had trouble reaching the button?", "ergonomic_analysis.txt", "difficulty with button reach"),
+    ("Peak power draw during transmission", "march_design_review_transcript.txt", "2.7W during peak transmission"),
+    ("How long should the accelerated aging test run?", "march_design_review_transcript.txt", "1000-hour accelerated aging"),
+    ("Processor power consumption in sleep mode", "power_analysis_report.txt", "Processor (sleep mode)"),
+    ("Options to reach the 5-year battery life target", "power_analysis_report.txt", "Larger battery"),
+    ("What drop test is required?", "system_requirements_v2.txt", "Drop test compliance"),
+    ("What is the total system heat generation?", "thermal_constraints_doc.txt", "Total system heat generation"),
+    ("How do customers want WiFi setup to work?", "voice_of_customer.txt", "scanning a QR code"),
+]
+
+_SENTENCE = re.compile(r"[^.!?\n]+[.!?]*\s*|\n+")
+_WORD = re.compile(r"\w+")
+
+
+def chunk_legacy(text: str, chunk_size: int = 384) -> List[str]:
+    """The previous strategy: sentences packed greedily up to 384 characters."""
+    chunks, current = [], ""
+    for sentence in (s.strip() for s in _SENTENCE.findall(text)):
+        if not sentence:
+            continue
+        if len(current) + len(sentence) <= chunk_size:
+            current += " " + sentence
+        else:
+            if current.strip():
+                chunks.append(current.strip())
+            current = sentence
+    if current.strip():
+        chunks.append(current.strip())
+    return chunks
+
+
+def chunk_paragraphs(text: str) -> List[str]:
+    """The document MCP server's previous strategy: one chunk per paragraph."""
+    return [p.strip() for p in text.split("\n\n") if p.strip()] or [text]
+
+
+def load_corpus(data_dir: Path, repeat: int) -> Dict[str, str]:
+    corpus = {}
+    for path in sorted(data_dir.rglob("*.txt")):
+        corpus[path.name] = path.read_text(encoding="utf-8") * repeat
+    return corpus
+
+
+class BM25:
+    def __init__(self, texts: List[str], k1: float = 1.5, b: float = 0.75):
+        self.k1, self.b = k1, b
+        self.docs = [Counter(_WORD.findall(t.lower())) for t in texts]
+        self.lengths = [sum(d.values()) for d in self.docs]
+        self.average_length = statistics.mean(self.lengths) if self.lengths else 0
+        frequency = Counter(term for d in self.docs for term in d)
+        n = len(self.docs)
+        self.idf = {t: math.log(1 + (n - f + 0.5) / (f + 0.5)) for t, f in frequency.items()}
+
+    def rank(self, query: str) -> List[int]:
+        terms = _WORD.findall(query.lower())
+        scores = []
+        for doc, length in zip(self.docs, self.lengths):
+            score = 0.0
+            for term in terms:
+                tf = doc.get(term, 0)
+                if tf:
+                    score += self.idf[term] * tf * (self.k1 + 1) / (
+                        tf + self.k1 * (1 - self.b + self.b * length / self.average_length))
+            scores.append(score)
+        return sorted(range(len(scores)), key=lambda i: -scores[i])
+
+
+class EmbeddingRanker:
+    def __init__(self, model, texts: List[str]):
+        self.model = model
+        self.matrix = np.array(list(model.embed(texts)))
+
+    def rank(self, query: str) -> List[int]:
+        vector = np.array(list(self.model.embed([query]))[0])
+        return list(np.argsort(-(self.matrix @ vector)))
+
+
+def evaluate(name: str, chunks: List[Tuple[str, str]], counter: TextChunker, model, k: int) -> Dict[str, Any]:
+    texts = [text for _, text in chunks]
+    token_counts = [counter.count_tokens(text) for text in texts]
+    window = MODEL_MAX_TOKENS - SPECIAL_TOKENS
+
+    start = time.perf_counter()
+    ranker = EmbeddingRanker(model, texts) if model is not None else BM25(texts)
+    index_seconds = time.perf_counter() - start
+
+    hits, reciprocal_ranks = 0, []
+    for query, file_name, answer in QUERIES:
+        ranked = ranker.rank(query)
+        rank = next((position + 1 for position, i in enumerate(ranked)
+                     if chunks[i][0] == file_name and answer in texts[i]), None)
+        hits += rank is not None and rank <= k
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+
+    result = {
+        "chunks": len(texts),
+        "indexed_tokens": sum(token_counts),
+        "mean_tokens": statistics.mean(token_counts),
+        "max_tokens": max(token_counts),
+        "chunks_over_window": sum(count > window for count in token_counts),
+        "tokens_truncated": sum(max(0, count - window) for count in token_counts),
+        f"hit_at_{k}": hits / len(QUERIES),
+        "mrr": statistics.mean(reciprocal_ranks),
+        "index_seconds": index_seconds
+    }
+    print(f"  {name:<18} chunks={result['chunks']:<6} tokens={result['indexed_tokens']:<8} "
+          f"mean={result['mean_tokens']:6.1f} max={result['max_tokens']:<5} over={result['chunks_over_window']:<4} "
+          f"hit@{k}={result[f'hit_at_{k}']:.2f} mrr={result['mrr']:.3f}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default=str(Path(__file__).parent / "benchmark_data"),
+                        help="directory of .txt documents (searched recursively)")
+    parser.add_argument("--sizes", default="128,256,512", help="sliding window sizes in tokens")
+    parser.add_argument("--overlap", type=int, default=50, help="sliding window overlap in tokens")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="repeat each document this many times, to measure larger documents")
+    parser.add_argument("-k", type=int, default=3, help="cutoff for hit@k")
+    parser.add_argument("--bm25", action="store_true", help="use BM25 even if fastembed is installed")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    corpus = load_corpus(Path(args.data_dir), args.repeat)
+    print(f"Corpus: {len(corpus)} documents, {sum(len(t) for t in corpus.values())} characters")
+
+    model = None
+    if FASTEMBED_AVAILABLE and not args.bm25:
+        model = TextEmbedding(model_name="BAAI/bge-small-en-v1.5")
+    print(f"Retrieval: {'bge-small embeddings' if model is not None else 'BM25'}, {len(QUERIES)} queries\n")
+
+    tokenizer = getattr(getattr(model, "model", None), "tokenizer", None)
+    counter = TextChunker(tokenizer=tokenizer)
+    print(f"Token counts: {'model tokenizer' if counter.tokenizer is not None else 'word-piece approximation'}")
+
+    strategies = {
+        "legacy_384_chars": lambda text: chunk_legacy(text),
+        "paragraph": chunk_paragraphs,
+    }
+    for size in (int(s) for s in args.sizes.split(",")):
+        chunker = TextChunker(chunk_size=size, chunk_overlap=min(args.overlap, size // 4), tokenizer=tokenizer)
+        strategies[f"window_{size}"] = chunker.split
+
+    results = {}
+    for name, strategy in strategies.items():
+        start = time.perf_counter()
+        chunks = [(file_name, chunk) for file_name, text in corpus.items() for chunk in strategy(text)]
+        chunk_seconds = time.perf_counter() - start
+        results[name] = evaluate(name, chunks, counter, model, args.k)
+        results[name]["chunk_seconds"] = chunk_seconds
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "retrieval": "bge-small" if model is not None else "bm25",
+                "documents": len(corpus),
+                "queries": len(QUERIES),
+                "strategies": results
+            }, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
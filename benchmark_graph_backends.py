@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Graph backend benchmark
+Loads the same synthetic project graph (documents, authors, eras, decisions,
+features, meetings, timeline events, concepts and components) into the Neo4j
+and embedded (in-process, DuckDB-persisted) Graph Brain backends, then times
+every GraphBrain query method on both: load time, p50/p95 latency per query
+and result row counts, which should match between backends.
+
+The Neo4j run needs a reachable server (NEO4J_URI/NEO4J_USER/NEO4J_PASSWORD)
+with an empty database, or --clear-neo4j to delete everything in it first.
+The process-wide graph query cache is disabled unless --with-cache is given.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+sys.path.append(str(Path(__file__).parent / "nancy-services"))
+
+from core.graph_cache import graph_cache
+
+TOPICS = ["thermal", "power", "antenna", "enclosure", "firmware", "battery", "emc", "sensor"]
+RELATIONSHIP_TYPES = ["REFERENCES", "INFLUENCED_BY", "AFFECTS", "DISCUSSES"]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def build_project(documents: int, people: int, seed: int) -> Dict[str, Any]:
+    """A deterministic synthetic project, as lists of writer calls."""
+    rng = random.Random(seed)
+    names = [f"Engineer {i:03d}" for i in range(people)]
+    eras = [f"Phase {i}" for i in range(1, 5)]
+    filenames = [f"{TOPICS[i % len(TOPICS)]}_report_{i:05d}.txt" for i in range(documents)]
+    decisions = [f"Decision {i:04d} on {TOPICS[i % len(TOPICS)]}" for i in range(max(1, documents // 10))]
+    features = [f"Feature {i:04d} {TOPICS[i % len(TOPICS)]}" for i in range(max(1, documents // 25))]
+    components = [f"{topic.title()} Subsystem" for topic in TOPICS]
+
+    relationships = []
+    for i, filename in enumerate(filenames):
+        for _ in range(3):
+            target = filenames[rng.randrange(documents)]
+            if target != filename:
+                relationships.append({
+                    "source_node_label": "Document", "source_node_name": filename,
+                    "relationship_type": rng.choice(RELATIONSHIP_TYPES),
+                    "target_node_label": "Document", "target_node_name": target,
+                    "context": f"{TOPICS[i % len(TOPICS)]} dependency"
+                })
+        relationships.append({
+            "source_node_label": "Document", "source_node_name": filename,
+            "relationship_type": "REFERENCES", "target_node_label": "Concept",
+            "target_node_name": TOPICS[i % len(TOPICS)], "context": None
+        })
+
+    foundational = []
+    for i, name in enumerate(names):
+        foundational.append({"source": {"type": "Person", "name": name}, "relationship": "HAS_EXPERTISE",
+                             "target": {"type": "Expertise", "name": TOPICS[i % len(TOPICS)]}})
+        foundational.append({"source": {"type": "Person", "name": name}, "relationship": "HAS_ROLE",
+                             "target": {"type": "Role", "name": rng.choice(["Lead", "Engineer", "Reviewer"])}})
+    for i, component in enumerate(components):
+        foundational.append({"source": {"type": "Component", "name": component}, "relationship": "PART_OF",
+                             "target": {"type": "Subsystem", "name": "Device"}})
+        foundational.append({"source": {"type": "Component", "name": component}, "relationship": "INTERFACES_WITH",
+                             "target": {"type": "Component", "name": components[(i + 1) % len(components)]}})
+
+    return {
+        "names": names, "eras": eras, "filenames": filenames, "decisions": decisions,
+        "features": features, "components": components, "relationships": relationships,
+        "foundational": foundational,
+        "authors": {filename: names[rng.randrange(people)] for filename in filenames},
+        "document_eras": {filename: eras[i * len(eras) // documents] for i, filename in enumerate(filenames)},
+        "makers": {decision: names[rng.randrange(people)] for decision in decisions},
+        "owners": {feature: names[rng.randrange(people)] for feature in features},
+        "events": [(f"Milestone {i:03d}", rng.choice(["meeting", "test", "release"]),
+                    f"2025-{1 + i * 12 // 60:02d}-{1 + i % 28:02d}T10:00:00", rng.sample(names, 2))
+                   for i in range(60)]
+    }
+
+
+def load_project(brain, project: Dict[str, Any]) -> float:
+    start = time.perf_counter()
+    for era in project["eras"]:
+        brain.add_era_node(era, description=f"{era} of the project", start_date="2025-01-01")
+    for filename in project["filenames"]:
+        brain.add_document_node(filename, "txt")
+        brain.add_author_relationship(filename, project["authors"][filename])
+        brain.link_document_to_era(filename, project["document_eras"][filename])
+    brain.add_concept_nodes([(topic, "Concept") for topic in TOPICS])
+    brain.add_relationships(project["relationships"])
+    brain.add_foundational_relationships(project["foundational"])
+    for i, decision in enumerate(project["decisions"]):
+        brain.add_decision_node(decision, project["makers"][decision], context=f"{TOPICS[i % len(TOPICS)]} trade-off",
+                                era=project["eras"][i % len(project["eras"])])
+        brain.add_relationship("Document", project["filenames"][i * 10], "INFLUENCED_BY", "Decision", decision)
+    for i, feature in enumerate(project["features"]):
+        brain.add_feature_node(feature, owner=project["owners"][feature],
+                               influenced_by_decisions=project["decisions"][i::len(project["features"])][:3])
+    for i in range(0, len(project["decisions"]), 5):
+        brain.add_meeting_node(f"Review {i:04d}", project["names"][:4], project["decisions"][i:i + 5],
+                               era=project["eras"][i % len(project["eras"])])
+    for name, event_type, timestamp, participants in project["events"]:
+        brain.add_temporal_event(name, event_type, timestamp, participants, project["eras"][0])
+    return time.perf_counter() - start
+
+
+def query_suite(project: Dict[str, Any]) -> Dict[str, Any]:
+    filename = project["filenames"][0]
+    author = project["authors"][filename]
+    other = project["authors"][project["filenames"][1]]
+    return {
+        "get_author_of_document": lambda b: [b.get_author_of_document(filename)],
+        "get_documents_by_author": lambda b: b.get_documents_by_author(author),
+        "get_authored_documents": lambda b: b.get_authored_documents(author),
+        "find_related_documents": lambda b: b.find_related_documents(filename),
+        "find_cross_team_influences": lambda b: b.find_cross_team_influences(author, other),
+        "find_documents_that_reference_topic": lambda b: b.find_documents_that_reference_topic("thermal"),
+        "get_author_collaboration_network": lambda b: b.get_author_collaboration_network(),
+        "get_author_collaboration_network(author)": lambda b: b.get_author_collaboration_network(author),
+        "find_decision_impact_chain": lambda b: b.find_decision_impact_chain(author, "thermal"),
+        "get_knowledge_graph_statistics": lambda b: [b.get_knowledge_graph_statistics()],
+        "find_decision_provenance": lambda b: b.find_decision_provenance(project["features"][0]),
+        "find_knowledge_expert": lambda b: b.find_knowledge_expert("thermal"),
+        "find_impact_analysis": lambda b: b.find_impact_analysis(project["filenames"][0]),
+        "find_project_timeline": lambda b: b.find_project_timeline(),
+        "find_knowledge_silos": lambda b: b.find_knowledge_silos(),
+        "explore_relationships": lambda b: b.explore_relationships("thermal"),
+        "get_cross_references": lambda b: b.get_cross_references(),
+        "find_technical_relationships": lambda b: b.find_technical_relationships("Thermal Subsystem"),
+        "find_expertise_and_roles(person)": lambda b: b.find_expertise_and_roles(person_name=author),
+        "find_expertise_and_roles(topic)": lambda b: b.find_expertise_and_roles(topic="thermal"),
+        "find_expertise_and_roles": lambda b: b.find_expertise_and_roles(),
+        "get_temporal_sequence": lambda b: b.get_temporal_sequence(limit=20),
+        "find_causal_chain": lambda b: b.find_causal_chain(project["events"][-1][0]),
+        "resolve_entities": lambda b: b.resolve_entities("thermal report"),
+    }
+
+
+def run_queries(brain, project: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    results = {}
+    for name, query in query_suite(project).items():
+        rows = len(query(brain))  # warm-up
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query(brain)
+            latencies.append((time.perf_counter() - start) * 1000)
+        results[name] = {
+            "rows": rows,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "mean_ms": statistics.mean(latencies)
+        }
+    return results
+
+
+def open_backend(backend: str, args):
+    if backend == "embedded":
+        from core.embedded_graph import EmbeddedGraphBrain
+        return EmbeddedGraphBrain(args.database_path)
+    from core.knowledge_graph import GraphBrain
+    brain = GraphBrain()
+    existing = brain.query("MATCH (n) RETURN count(n) AS count")[0]["count"]
+    if existing:
+        if not args.clear_neo4j:
+            brain.close()
+            raise RuntimeError(f"Neo4j database holds {existing} nodes; pass --clear-neo4j to delete them")
+        brain.query("MATCH (n) DETACH DELETE n")
+    return brain
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="embedded,neo4j", help="comma-separated backends to compare")
+    parser.add_argument("--documents", type=int, default=500, help="documents in the synthetic project")
+    parser.add_argument("--people", type=int, default=25, help="people in the synthetic project")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per query")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--database-path", help="DuckDB file of the embedded backend (default: a temporary file)")
+    parser.add_argument("--clear-neo4j", action="store_true", help="delete every node in Neo4j before loading")
+    parser.add_argument("--with-cache", action="store_true", help="keep the graph query cache enabled")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    graph_cache.enabled = args.with_cache
+    temporary = None
+    if not args.database_path:
+        temporary = tempfile.TemporaryDirectory()
+        args.database_path = os.path.join(temporary.name, "graph.duckdb")
+
+    project = build_project(args.documents, args.people, args.seed)
+    print(f"Project: {len(project['filenames'])} documents, {len(project['names'])} people, "
+          f"{len(project['relationships'])} document relationships, {len(project['decisions'])} decisions")
+
+    results = {}
+    for backend in args.backends.split(","):
+        print(f"\n{backend}:")
+        try:
+            brain = open_backend(backend, args)
+        except Exception as e:
+            print(f"  skipped: {e}")
+            results[backend] = {"skipped": str(e)}
+            continue
+        # Writers print a line per call; keep the benchmark output readable
+        stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+        try:
+            load_seconds = load_project(brain, project)
+            queries = run_queries(brain, project, args.repeat)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+            brain.close()
+        print(f"  load: {load_seconds:.2f} s")
+        for name, summary in queries.items():
+            print(f"  {name:<42} rows={summary['rows']:<6} p50={summary['p50_ms']:8.2f} ms  "
+                  f"p95={summary['p95_ms']:8.2f} ms")
+        results[backend] = {"load_seconds": load_seconds, "queries": queries}
+
+    compared = [b for b in results if "queries" in results[b]]
+    if len(compared) == 2:
+        first, second = compared
+        print(f"\n{'query':<42} {first + ' p50':>14} {second + ' p50':>14} {'speedup':>9}  rows")
+        for name in results[first]["queries"]:
+            a, b = results[first]["queries"][name], results[second]["queries"][name]
+            rows = "match" if a["rows"] == b["rows"] else f"{a['rows']} vs {b['rows']}"
+            print(f"{name:<42} {a['p50_ms']:11.2f} ms {b['p50_ms']:11.2f} ms "
+                  f"{b['p50_ms'] / max(a['p50_ms'], 1e-6):8.1f}x  {rows}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "documents": args.documents,
+                "people": args.people,
+                "repeat": args.repeat,
+                "cache_enabled": args.with_cache,
+                "backends": results
+            }, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if temporary is not None:
+        temporary.cleanup()
+
+
+if __name__ == "__main__":
+    main()
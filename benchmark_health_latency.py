@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Health endpoint latency under ingestion load
+Measures /health latency on an idle Nancy API, then again while worker threads
+continuously post files to /api/ingest, post gzip NDJSON batches of Knowledge
+Packets to /api/ingest/knowledge-packets (MCP mode) and optionally run
+directory scans. With blocking brain work off the event loop, p99 should stay
+flat under load.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import statistics
+import threading
+import time
+from typing import Dict, Any, List
+
+import requests
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(label: str, latencies_ms: List[float]) -> Dict[str, Any]:
+    summary = {
+        "requests": len(latencies_ms),
+        "p50_ms": percentile(latencies_ms, 50),
+        "p95_ms": percentile(latencies_ms, 95),
+        "p99_ms": percentile(latencies_ms, 99),
+        "max_ms": max(latencies_ms),
+        "mean_ms": statistics.mean(latencies_ms)
+    }
+    print(f"  {label:<10} n={summary['requests']:<6} p50={summary['p50_ms']:8.1f} ms  "
+          f"p95={summary['p95_ms']:8.1f} ms  p99={summary['p99_ms']:8.1f} ms  max={summary['max_ms']:8.1f} ms")
+    return summary
+
+
+def poll_health(base_url: str, seconds: float, interval: float) -> List[float]:
+    """Hit /health repeatedly for `seconds` and return latencies in ms."""
+    latencies = []
+    session = requests.Session()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            session.get(f"{base_url}/health", timeout=60)
+        except requests.RequestException:
+            pass
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(interval)
+    return latencies
+
+
+def ingest_worker(base_url: str, worker_id: int, file_kb: int, stop: threading.Event, counts: Dict[str, int]):
+    """Post generated text files to /api/ingest until stopped."""
+    session = requests.Session()
+    paragraph = f"Worker {worker_id} thermal and power budget notes for the enclosure design review. "
+    body = (paragraph * (file_kb * 1024 // len(paragraph) + 1)).encode()
+    sequence = 0
+    while not stop.is_set():
+        sequence += 1
+        files = {"file": (f"load_{worker_id}_{sequence}.txt", body + str(sequence).encode(), "text/plain")}
+        try:
+            response = session.post(f"{base_url}/api/ingest", files=files, data={"author": "Load Test"}, timeout=300)
+            counts["ok" if response.ok else "failed"] += 1
+        except requests.RequestException:
+            counts["failed"] += 1
+
+
+def knowledge_packet(worker_id: int, sequence: int, index: int, chunks: int) -> Dict[str, Any]:
+    """A valid Knowledge Packet with vector chunks and graph entities, unique per (worker, sequence, index)."""
+    key = f"load-{worker_id}-{sequence}-{index}"
+    return {
+        "packet_version": "1.0",
+        "packet_id": hashlib.sha256(key.encode()).hexdigest(),
+        "timestamp": "2025-08-15T10:30:00Z",
+        "source": {
+            "mcp_server": "nancy-load-test",
+            "server_version": "1.0.0",
+            "original_location": f"/load/{key}.txt",
+            "content_type": "document"
+        },
+        "metadata": {"title": f"{key}.txt", "author": "Load Test"},
+        "content": {
+            "vector_data": {
+                "chunks": [
+                    {"chunk_id": f"chunk_{i}",
+                     "text": f"{key} section {i}: thermal and power budget notes for the enclosure design review."}
+                    for i in range(chunks)
+                ],
+                "embedding_model": "BAAI/bge-small-en-v1.5"
+            },
+            "graph_data": {
+                "entities": [
+                    {"type": "Document", "name": f"{key}.txt"},
+                    {"type": "Person", "name": f"Load Tester {worker_id}"}
+                ]
+            }
+        }
+    }
+
+
+def packet_worker(base_url: str, worker_id: int, packets_per_request: int, chunks: int,
+                  stop: threading.Event, counts: Dict[str, int]):
+    """Post gzip NDJSON batches to /api/ingest/knowledge-packets until stopped."""
+    session = requests.Session()
+    headers = {"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"}
+    sequence = 0
+    while not stop.is_set():
+        sequence += 1
+        lines = (json.dumps(knowledge_packet(worker_id, sequence, i, chunks)) for i in range(packets_per_request))
+        body = gzip.compress("\n".join(lines).encode())
+        try:
+            response = session.post(f"{base_url}/api/ingest/knowledge-packets", data=body, headers=headers, timeout=300)
+            counts["ok" if response.ok else "failed"] += 1
+        except requests.RequestException:
+            counts["failed"] += 1
+
+
+def scan_worker(base_url: str, directory: str, stop: threading.Event, counts: Dict[str, int]):
+    """Run directory scan-and-process requests until stopped."""
+    session = requests.Session()
+    while not stop.is_set():
+        try:
+            response = session.post(
+                f"{base_url}/api/directory/scan-and-process",
+                data={"directory_path": directory, "process_limit": 50},
+                timeout=600
+            )
+            counts["ok" if response.ok else "failed"] += 1
+        except requests.RequestException:
+            counts["failed"] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure /health latency during heavy ingestion")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="Nancy API base URL")
+    parser.add_argument("--seconds", type=float, default=30.0, help="duration of each phase")
+    parser.add_argument("--interval", type=float, default=0.05, help="pause between health probes")
+    parser.add_argument("--ingest-workers", type=int, default=8, help="concurrent /api/ingest clients")
+    parser.add_argument("--file-kb", type=int, default=256, help="size of each ingested file")
+    parser.add_argument("--packet-workers", type=int, default=2,
+                        help="concurrent /api/ingest/knowledge-packets clients (needs MCP mode; 0 to skip)")
+    parser.add_argument("--packets-per-request", type=int, default=200, help="Knowledge Packets per bulk request")
+    parser.add_argument("--packet-chunks", type=int, default=4, help="vector chunks per Knowledge Packet")
+    parser.add_argument("--scan-directory", help="also run directory scan-and-process on this path")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    print(f"Nancy API: {args.base_url}")
+    requests.get(f"{args.base_url}/health", timeout=30).raise_for_status()
+
+    print(f"\nIdle phase ({args.seconds:.0f}s)")
+    idle = summarize("idle", poll_health(args.base_url, args.seconds, args.interval))
+
+    print(f"\nLoad phase ({args.seconds:.0f}s, {args.ingest_workers} ingest workers, "
+          f"{args.packet_workers} knowledge packet workers{', directory scans' if args.scan_directory else ''})")
+    stop = threading.Event()
+    counts = {"ok": 0, "failed": 0}
+    packet_counts = {"ok": 0, "failed": 0}
+    workers = [
+        threading.Thread(target=ingest_worker, args=(args.base_url, i, args.file_kb, stop, counts), daemon=True)
+        for i in range(args.ingest_workers)
+    ]
+    workers += [
+        threading.Thread(target=packet_worker, daemon=True, args=(
+            args.base_url, i, args.packets_per_request, args.packet_chunks, stop, packet_counts
+        ))
+        for i in range(args.packet_workers)
+    ]
+    if args.scan_directory:
+        workers.append(threading.Thread(target=scan_worker, args=(args.base_url, args.scan_directory, stop, counts), daemon=True))
+    for worker in workers:
+        worker.start()
+
+    # Let the workers saturate the server before measuring
+    time.sleep(2)
+    loaded = summarize("loaded", poll_health(args.base_url, args.seconds, args.interval))
+    stop.set()
+
+    print(f"\nIngestion requests: {counts['ok']} ok, {counts['failed']} failed")
+    if args.packet_workers:
+        print(f"Knowledge packet requests: {packet_counts['ok']} ok, {packet_counts['failed']} failed "
+              f"({args.packets_per_request} packets each)")
+    print(f"p99 ratio loaded/idle: {loaded['p99_ms'] / idle['p99_ms']:.1f}x")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"idle": idle, "loaded": loaded, "ingestion_requests": counts,
+                       "knowledge_packet_requests": packet_counts}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
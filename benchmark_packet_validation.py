@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Knowledge Packet validation throughput benchmark
+Compares per-call jsonschema.validate (the old path, run once per pipeline stage)
+against the precompiled validators with the packet "validated" marker.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, Callable
+
+import jsonschema
+
+sys.path.append(str(Path(__file__).parent / "nancy-services"))
+
+from schemas.knowledge_packet import (
+    KNOWLEDGE_PACKET_SCHEMA, NancyKnowledgePacket, KnowledgePacketValidator,
+    validate_packet_data, FASTJSONSCHEMA_AVAILABLE
+)
+
+# Endpoint, packet constructor and MCP host each validated the packet
+PIPELINE_STAGES = 3
+
+
+def make_vector_packet(chunk_count: int) -> Dict[str, Any]:
+    """Document-style packet with many text chunks."""
+    text = "Thermal analysis of the enclosure shows the heat sink margin is adequate. " * 14
+    return NancyKnowledgePacket.create(
+        mcp_server="benchmark",
+        server_version="1.0.0",
+        original_location="/benchmark/vector.md",
+        content_type="document",
+        title="Vector benchmark packet",
+        content={
+            "vector_data": {
+                "chunks": [
+                    {"chunk_id": f"chunk_{i}", "text": text, "chunk_metadata": {"position": i}}
+                    for i in range(chunk_count)
+                ]
+            }
+        }
+    ).to_dict()
+
+
+def make_table_packet(row_count: int, column_count: int) -> Dict[str, Any]:
+    """Spreadsheet-style packet with JSON row lists."""
+    columns = [f"measurement_{c}" for c in range(column_count)]
+    return NancyKnowledgePacket.create(
+        mcp_server="benchmark",
+        server_version="1.0.0",
+        original_location="/benchmark/table.csv",
+        content_type="spreadsheet",
+        title="Table benchmark packet",
+        content={
+            "analytical_data": {
+                "table_data": [{
+                    "table_name": "results",
+                    "columns": columns,
+                    "rows": [[r * c * 0.5 for c in range(column_count)] for r in range(row_count)],
+                    "column_types": ["float"] * column_count
+                }]
+            }
+        }
+    ).to_dict()
+
+
+def measure(label: str, packet: Dict[str, Any], validate: Callable[[Dict[str, Any]], None], seconds: float) -> float:
+    """Run validate repeatedly for about `seconds` and return packets/sec."""
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        validate(packet)
+        count += 1
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed
+    print(f"  {label:<38} {rate:>10.1f} packets/sec")
+    return rate
+
+
+def legacy_pipeline(packet_data: Dict[str, Any]):
+    """Old behaviour: a fresh jsonschema.validate in every stage."""
+    for _ in range(PIPELINE_STAGES):
+        jsonschema.validate(packet_data, KNOWLEDGE_PACKET_SCHEMA)
+
+
+def precompiled_pipeline(packet_data: Dict[str, Any]):
+    """New behaviour: validate once, later stages see the marker."""
+    validator = KnowledgePacketValidator()
+    validator.validate(packet_data)
+    packet = NancyKnowledgePacket(packet_data, validated=True)
+    validator.validate_packet(packet)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Knowledge Packet validation throughput")
+    parser.add_argument("--chunks", type=int, default=500, help="chunks in the vector packet")
+    parser.add_argument("--rows", type=int, default=5000, help="rows in the table packet")
+    parser.add_argument("--columns", type=int, default=12, help="columns in the table packet")
+    parser.add_argument("--seconds", type=float, default=3.0, help="time per measurement")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    packets = {
+        "vector": make_vector_packet(args.chunks),
+        "table": make_table_packet(args.rows, args.columns)
+    }
+
+    print(f"fastjsonschema available: {FASTJSONSCHEMA_AVAILABLE}")
+    results = {"fastjsonschema": FASTJSONSCHEMA_AVAILABLE, "packets": {}}
+
+    for name, packet in packets.items():
+        size_kb = len(json.dumps(packet)) / 1024
+        print(f"\n{name} packet ({size_kb:.0f} KB)")
+        single = measure("jsonschema.validate (single call)", packet,
+                         lambda p: jsonschema.validate(p, KNOWLEDGE_PACKET_SCHEMA), args.seconds)
+        compiled = measure("precompiled validate_packet_data", packet, validate_packet_data, args.seconds)
+        legacy = measure(f"pipeline, {PIPELINE_STAGES}x jsonschema.validate", packet, legacy_pipeline, args.seconds)
+        pipeline = measure("pipeline, validate once + marker", packet, precompiled_pipeline, args.seconds)
+        print(f"  speedup: {compiled / single:.1f}x per call, {pipeline / legacy:.1f}x per pipeline")
+
+        results["packets"][name] = {
+            "size_kb": round(size_kb, 1),
+            "jsonschema_validate_per_sec": single,
+            "precompiled_per_sec": compiled,
+            "legacy_pipeline_per_sec": legacy,
+            "marker_pipeline_per_sec": pipeline
+        }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+API cold start: time and resident memory
+Starts fresh Python processes that import the Nancy API (api.main) and,
+optionally, run its startup (lifespan) as uvicorn would, recording wall time,
+RSS and which heavy libraries (spaCy, tree-sitter, langchain, transformers,
+fastembed, ...) were loaded. With --baseline-ref the same probe runs against
+an earlier commit, checked out in a temporary git worktree, for a
+before/after comparison.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+REPO_ROOT = Path(__file__).parent
+
+# Runs in the measured process, with nancy-services as working directory
+PROBE = r'''
+import json, os, resource, sys, time
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+HEAVY_MODULES = ["spacy", "tree_sitter", "langchain", "transformers", "torch",
+                 "fastembed", "onnxruntime", "chromadb", "neo4j", "duckdb", "pandas"]
+
+result = {"interpreter_rss_mb": rss_mb()}
+start = time.perf_counter()
+import api.main
+result["import_s"] = time.perf_counter() - start
+result["import_rss_mb"] = rss_mb()
+
+if os.environ.get("NANCY_PROBE_LIFESPAN") == "1":
+    import asyncio
+
+    async def startup():
+        started = time.perf_counter()
+        async with api.main.app.router.lifespan_context(api.main.app):
+            result["startup_s"] = time.perf_counter() - started
+            result["startup_rss_mb"] = rss_mb()
+
+    asyncio.run(startup())
+
+result["heavy_modules"] = sorted(name for name in HEAVY_MODULES if name in sys.modules)
+print("NANCY_PROBE " + json.dumps(result))
+'''
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def run_probe(services_dir: Path, python: str, lifespan: bool) -> Dict[str, Any]:
+    """One cold start in a fresh process; returns the probe's measurements."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(services_dir), env.get("PYTHONPATH")]))
+    env["NANCY_PROBE_LIFESPAN"] = "1" if lifespan else "0"
+    start = time.perf_counter()
+    completed = subprocess.run([python, "-c", PROBE], cwd=services_dir, env=env,
+                               capture_output=True, text=True, timeout=900)
+    process_s = time.perf_counter() - start
+    for line in completed.stdout.splitlines():
+        if line.startswith("NANCY_PROBE "):
+            result = json.loads(line[len("NANCY_PROBE "):])
+            result["process_s"] = process_s
+            return result
+    raise RuntimeError(f"Probe failed in {services_dir} (exit {completed.returncode}):\n"
+                       f"{completed.stderr[-2000:]}")
+
+
+def summarize(label: str, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    summary = {"runs": len(runs), "heavy_modules": runs[-1]["heavy_modules"]}
+    for key in ("import_s", "startup_s", "process_s", "import_rss_mb", "startup_rss_mb"):
+        values = [run[key] for run in runs if key in run]
+        if values:
+            summary[f"{key}_p50"] = percentile(values, 50)
+            summary[f"{key}_max"] = max(values)
+            summary[f"{key}_mean"] = statistics.mean(values)
+    line = f"  {label:<10} import p50={summary['import_s_p50']:6.2f} s  rss={summary['import_rss_mb_p50']:7.1f} MB"
+    if "startup_s_p50" in summary:
+        line += f"  startup p50={summary['startup_s_p50']:6.2f} s  rss={summary['startup_rss_mb_p50']:7.1f} MB"
+    line += f"  process p50={summary['process_s_p50']:6.2f} s"
+    print(line)
+    print(f"  {'':<10} heavy modules loaded: {', '.join(summary['heavy_modules']) or 'none'}")
+    return summary
+
+
+def measure(label: str, services_dir: Path, args) -> Dict[str, Any]:
+    runs = []
+    for _ in range(args.runs):
+        runs.append(run_probe(services_dir, args.python, args.lifespan))
+    return summarize(label, runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Nancy API cold-start time and resident memory")
+    parser.add_argument("--runs", type=int, default=5, help="cold starts per tree")
+    parser.add_argument("--lifespan", action="store_true",
+                        help="also run the API startup (Nancy adapter, MCP host, job workers)")
+    parser.add_argument("--baseline-ref", help="git ref to compare against, e.g. HEAD~1")
+    parser.add_argument("--python", default=sys.executable, help="interpreter of the Nancy environment")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"Cold start over {args.runs} runs{' including lifespan startup' if args.lifespan else ''}")
+    if args.baseline_ref:
+        worktree = Path(tempfile.mkdtemp(prefix="nancy-baseline-"))
+        try:
+            subprocess.run(["git", "worktree", "add", "--detach", str(worktree), args.baseline_ref],
+                           cwd=REPO_ROOT, check=True, capture_output=True)
+            results["baseline"] = measure("baseline", worktree / "nancy-services", args)
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", str(worktree)],
+                           cwd=REPO_ROOT, capture_output=True)
+            shutil.rmtree(worktree, ignore_errors=True)
+    results["current"] = measure("current", REPO_ROOT / "nancy-services", args)
+
+    if "baseline" in results:
+        baseline, current = results["baseline"], results["current"]
+        print(f"\nimport time: {baseline['import_s_p50'] / current['import_s_p50']:.1f}x faster, "
+              f"RSS {baseline['import_rss_mb_p50'] - current['import_rss_mb_p50']:.1f} MB lower")
+        if "startup_s_p50" in baseline and "startup_s_p50" in current:
+            print(f"startup time: {baseline['startup_s_p50'] / current['startup_s_p50']:.1f}x faster, "
+                  f"RSS {baseline['startup_rss_mb_p50'] - current['startup_rss_mb_p50']:.1f} MB lower")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Vector backend benchmark
+Loads the same chunk corpus into the Chroma server backend (HTTP), the
+embedded in-process Chroma store and the exact brute-force store, then
+reports add throughput and p50/p99 latency of unfiltered and
+metadata-filtered queries on each.
+
+Chunks are cut from benchmark_data with the configured chunker and repeated
+with a variant suffix until --chunks is reached. Embeddings are computed once
+up front with the bge-small model and replayed by the embedding function, so
+the timings measure the stores, not the model.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+sys.path.append(str(Path(__file__).parent / "nancy-services"))
+
+import chromadb
+from chromadb import Documents, EmbeddingFunction, Embeddings
+
+from core.chunking import TextChunker
+from core.nlp import FastEmbedEmbeddingFunction
+from core.exact_vectors import ExactVectorBackend
+from core.vector_backend import ChromaVectorBackend, VectorBackend
+
+COLLECTION_NAME = "nancy_benchmark_vectors"
+
+
+class PrecomputedEmbeddingFunction(EmbeddingFunction):
+    """Serves embeddings computed once in advance; unseen texts go to the model."""
+
+    def __init__(self, model: FastEmbedEmbeddingFunction, texts: List[str]):
+        self._model = model
+        unique = list(dict.fromkeys(texts))
+        self._vectors = dict(zip(unique, model(unique)))
+
+    def __call__(self, input: Documents) -> Embeddings:
+        missing = [text for text in input if text not in self._vectors]
+        if missing:
+            self._vectors.update(zip(missing, self._model(missing)))
+        return [self._vectors[text] for text in input]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": statistics.mean(latencies)
+    }
+
+
+def build_corpus(data_dir: Path, chunks: int) -> List[Dict[str, Any]]:
+    chunker = TextChunker.from_config()
+    base = []
+    for path in sorted(data_dir.glob("*.txt")):
+        for text in chunker.split(path.read_text(encoding="utf-8", errors="ignore")):
+            base.append((path.name, text))
+    if not base:
+        raise SystemExit(f"No .txt files in {data_dir}")
+    corpus = []
+    for i in range(chunks):
+        filename, text = base[i % len(base)]
+        variant = i // len(base)
+        source = f"{filename}#{variant}"
+        corpus.append({
+            "id": f"chunk_{i:07d}",
+            "text": text if variant == 0 else f"{text} (revision {variant})",
+            "metadata": {"source": source, "chunk_key": filename, "chunk_index": i % len(base)}
+        })
+    return corpus
+
+
+def open_backend(backend: str, embedding_function, persist_directory: str) -> VectorBackend:
+    if backend == "exact":
+        return ExactVectorBackend(embedding_function, os.path.join(persist_directory, "exact"))
+    if backend == "embedded":
+        client = chromadb.PersistentClient(path=persist_directory)
+    else:
+        client = chromadb.HttpClient(host=os.getenv("CHROMA_HOST", "localhost"),
+                                     port=int(os.getenv("CHROMA_PORT", "8000")))
+        client.heartbeat()
+    try:
+        client.delete_collection(COLLECTION_NAME)
+    except Exception:
+        pass
+    return ChromaVectorBackend(client, embedding_function, backend_name=backend, collection_name=COLLECTION_NAME)
+
+
+def run_backend(store: VectorBackend, corpus: List[Dict[str, Any]], queries: List[str],
+                sources: List[str], batch_size: int, n_results: int) -> Dict[str, Any]:
+    start = time.perf_counter()
+    for offset in range(0, len(corpus), batch_size):
+        batch = corpus[offset:offset + batch_size]
+        store.add(ids=[c["id"] for c in batch], documents=[c["text"] for c in batch],
+                  metadatas=[c["metadata"] for c in batch])
+    add_seconds = time.perf_counter() - start
+
+    store.query([queries[0]], n_results=n_results)  # warm-up
+    unfiltered, filtered = [], []
+    for query, source in zip(queries, sources):
+        start = time.perf_counter()
+        store.query([query], n_results=n_results)
+        unfiltered.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        store.query([query], n_results=n_results, where={"source": source})
+        filtered.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "chunks": store.count(),
+        "add_seconds": add_seconds,
+        "add_chunks_per_second": len(corpus) / add_seconds if add_seconds else 0.0,
+        "query": summarize(unfiltered),
+        "filtered_query": summarize(filtered)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="chromadb,embedded,exact", help="comma-separated backends to compare")
+    parser.add_argument("--data-dir", default=str(Path(__file__).parent / "benchmark_data"))
+    parser.add_argument("--chunks", type=int, default=10000, help="chunks loaded into each backend")
+    parser.add_argument("--queries", type=int, default=200, help="timed queries per mode")
+    parser.add_argument("--batch-size", type=int, default=500, help="chunks per add call")
+    parser.add_argument("--n-results", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = build_corpus(Path(args.data_dir), args.chunks)
+    sampled = [rng.choice(corpus) for _ in range(args.queries)]
+    # Queries are the opening words of stored chunks, filtered to their own source
+    queries = [" ".join(c["text"].split()[:12]) for c in sampled]
+    sources = [c["metadata"]["source"] for c in sampled]
+
+    print(f"Embedding {len(corpus)} chunks and {len(queries)} queries once...")
+    embedding_function = PrecomputedEmbeddingFunction(FastEmbedEmbeddingFunction(),
+                                                      [c["text"] for c in corpus] + queries)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as persist_directory:
+        for backend in args.backends.split(","):
+            print(f"\n{backend}:")
+            try:
+                store = open_backend(backend, embedding_function, persist_directory)
+            except Exception as e:
+                print(f"  skipped: {e}")
+                results[backend] = {"skipped": str(e)}
+                continue
+            try:
+                summary = run_backend(store, corpus, queries, sources, args.batch_size, args.n_results)
+            finally:
+                if isinstance(store, ChromaVectorBackend):
+                    try:
+                        store.client.delete_collection(COLLECTION_NAME)
+                    except Exception:
+                        pass
+                store.close()
+            print(f"  add:      {summary['add_chunks_per_second']:10.0f} chunks/s "
+                  f"({summary['chunks']} chunks in {summary['add_seconds']:.2f} s)")
+            for label in ("query", "filtered_query"):
+                print(f"  {label:<15} p50={summary[label]['p50_ms']:8.2f} ms  "
+                      f"p99={summary[label]['p99_ms']:8.2f} ms")
+            results[backend] = summary
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "chunks": args.chunks,
+                "queries": args.queries,
+                "batch_size": args.batch_size,
+                "n_results": args.n_results,
+                "backends": results
+            }, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,8 +11,10 @@ import sys
 import hashlib
 import logging
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, Callable
 from datetime import datetime
 
 # Add current directory to path for local imports
@@ -93,6 +95,24 @@ class NancyKnowledgePacket:
         }
 
 
+# Directories never worth descending into during repository walks
+SKIPPED_DIRECTORIES = {'.git', '__pycache__', 'node_modules', '.venv', 'venv'}
+
+# Per-process analyzer used by the streaming repository analysis pool
+_worker_analyzer = None
+
+
+def _init_analysis_worker():
+    """Build one CodebaseAnalyzer per pool process so parsers load once per worker."""
+    global _worker_analyzer
+    _worker_analyzer = CodebaseAnalyzer()
+
+
+def _analyze_file_in_worker(file_path: str) -> Dict[str, Any]:
+    """Analyze a single file inside a pool worker."""
+    return _worker_analyzer.analyze_single_file(file_path)
+
+
 class CodebaseAnalyzer:
     """
     Main codebase analyzer that orchestrates AST parsing, Git analysis,
@@ -208,7 +228,7 @@ class CodebaseAnalyzer:
             # Walk through repository
             for root, dirs, files in os.walk(repo_path):
                 # Skip common non-source directories
-                dirs[:] = [d for d in dirs if d not in {'.git', '__pycache__', 'node_modules', '.venv', 'venv'}]
+                dirs[:] = [d for d in dirs if d not in SKIPPED_DIRECTORIES]
                 
                 for file in files:
                     file_path = os.path.join(root, file)
@@ -262,6 +282,142 @@ class CodebaseAnalyzer:
             logger.error(f"Repository analysis failed for {repo_path}: {e}")
             return {"error": f"Repository analysis failed: {e}"}
     
+    def analyze_repository_stream(self, repo_path: str, file_extensions: List[str] = None,
+                                  max_workers: Optional[int] = None,
+                                  progress_interval: int = 50) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze a repository in a process pool and yield results incrementally.
+
+        Yields ``file`` events carrying one file's knowledge packets, periodic
+        ``progress`` events with files/sec throughput, and a final ``complete``
+        event with repository stats. Only a bounded window of files is in
+        flight at any time, so memory does not grow with repository size.
+        """
+        if not os.path.exists(repo_path):
+            yield {"event": "error", "error": f"Repository path does not exist: {repo_path}"}
+            return
+
+        if file_extensions is None:
+            file_extensions = self.supported_extensions
+        extensions = {ext.lower() for ext in file_extensions}
+
+        git_initialized = self.git_analyzer.initialize_repository(repo_path)
+
+        max_workers = max_workers or os.cpu_count() or 1
+        max_in_flight = max_workers * 2
+
+        repository_stats = {
+            "total_files": 0,
+            "analyzed_files": 0,
+            "failed_files": 0,
+            "total_packets": 0,
+            "languages": set(),
+            "authors": set(),
+            "total_functions": 0,
+            "total_classes": 0
+        }
+        start_time = time.monotonic()
+
+        def progress_event() -> Dict[str, Any]:
+            elapsed = time.monotonic() - start_time
+            files_done = repository_stats["analyzed_files"] + repository_stats["failed_files"]
+            return {
+                "event": "progress",
+                "files_done": files_done,
+                "files_seen": repository_stats["total_files"],
+                "packets_emitted": repository_stats["total_packets"],
+                "elapsed_seconds": round(elapsed, 3),
+                "files_per_second": round(files_done / elapsed, 2) if elapsed > 0 else 0.0
+            }
+
+        def collect(future) -> Dict[str, Any]:
+            file_path = in_flight.pop(future)
+            try:
+                file_analysis = future.result()
+            except Exception as e:
+                file_analysis = {"error": f"Analysis failed: {e}"}
+
+            if "error" in file_analysis:
+                repository_stats["failed_files"] += 1
+                logger.warning(f"Failed to analyze {file_path}: {file_analysis['error']}")
+                return {"event": "file_error", "file_path": file_path, "error": file_analysis["error"]}
+
+            repository_stats["analyzed_files"] += 1
+            repository_stats["total_packets"] += file_analysis.get("total_packets", 0)
+            repository_stats["languages"].add(file_analysis.get("language", "unknown"))
+
+            ast_analysis = file_analysis.get("ast_analysis", {})
+            repository_stats["total_functions"] += len(ast_analysis.get("functions", []))
+            repository_stats["total_classes"] += len(ast_analysis.get("classes", []))
+
+            git_analysis = file_analysis.get("git_analysis")
+            if git_analysis and "contributors" in git_analysis:
+                repository_stats["authors"].update(git_analysis["contributors"])
+
+            return {
+                "event": "file",
+                "file_path": file_path,
+                "doc_id": file_analysis["doc_id"],
+                "language": file_analysis.get("language", "unknown"),
+                "knowledge_packets": file_analysis["knowledge_packets"]
+            }
+
+        in_flight = {}
+        files_since_progress = 0
+
+        def drain(limit: int) -> Iterator[Dict[str, Any]]:
+            """Collect finished files until fewer than ``limit`` are in flight."""
+            nonlocal files_since_progress
+            while len(in_flight) >= limit:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield collect(future)
+                    files_since_progress += 1
+
+                if files_since_progress >= progress_interval:
+                    files_since_progress = 0
+                    yield progress_event()
+
+        pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_analysis_worker)
+        try:
+            for root, dirs, files in os.walk(repo_path):
+                dirs[:] = [d for d in dirs if d not in SKIPPED_DIRECTORIES]
+
+                for file in files:
+                    repository_stats["total_files"] += 1
+                    if Path(file).suffix.lower() not in extensions:
+                        continue
+
+                    file_path = os.path.join(root, file)
+                    in_flight[pool.submit(_analyze_file_in_worker, file_path)] = file_path
+
+                    # Backpressure: drain completed work before submitting more
+                    yield from drain(max_in_flight)
+
+            yield from drain(1)
+        finally:
+            # A consumer that stops early (closed stream, failed notification) must
+            # not leave queued files running in the worker processes
+            pool.shutdown(wait=not in_flight, cancel_futures=True)
+
+        yield progress_event()
+
+        repo_analysis = {}
+        if git_initialized:
+            repo_analysis = self._generate_repository_analysis(repo_path)
+
+        repository_stats["languages"] = list(repository_stats["languages"])
+        repository_stats["authors"] = list(repository_stats["authors"])
+
+        yield {
+            "event": "complete",
+            "repository_path": repo_path,
+            "total_knowledge_packets": repository_stats["total_packets"],
+            "repository_stats": repository_stats,
+            "repository_analysis": repo_analysis,
+            "git_enabled": git_initialized
+        }
+
     def _generate_vector_packets(self, content: str, file_path: str, doc_id: str, ast_result: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate vector brain packets for semantic search."""
         packets = []
@@ -478,9 +634,16 @@ class CodebaseMCPServer:
     Nancy Codebase MCP Server providing comprehensive code analysis capabilities.
     """
     
-    def __init__(self):
+    def __init__(self, notify: Optional[Callable[[Dict[str, Any]], None]] = None):
         self.analyzer = CodebaseAnalyzer()
+        self.notify = notify or self._write_notification
         logger.info("Nancy Codebase MCP Server initialized")
+
+    @staticmethod
+    def _write_notification(message: Dict[str, Any]):
+        """Write a JSON-RPC notification to stdout as one NDJSON line."""
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
     
     async def handle_request(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle incoming MCP requests."""
@@ -491,6 +654,8 @@ class CodebaseMCPServer:
                 result = await self._handle_analyze_file(request.params)
             elif request.method == "analyze_repository":
                 result = await self._handle_analyze_repository(request.params)
+            elif request.method == "analyze_repository_stream":
+                result = await self._handle_analyze_repository({**request.params, "stream": True})
             elif request.method == "get_file_authorship":
                 result = await self._handle_get_authorship(request.params)
             elif request.method == "get_developer_expertise":
@@ -527,8 +692,51 @@ class CodebaseMCPServer:
         if not repo_path:
             raise ValueError("repo_path parameter is required")
         
+        if params.get("stream"):
+            return await self._stream_repository_analysis(params, repo_path, file_extensions)
+        
         return self.analyzer.analyze_repository(repo_path, file_extensions)
     
+    async def _stream_repository_analysis(self, params: Dict[str, Any], repo_path: str,
+                                          file_extensions: Optional[List[str]]) -> Dict[str, Any]:
+        """
+        Stream repository analysis as JSON-RPC notifications.
+
+        Each analyzed file is sent as a ``nancy/knowledge_packets`` notification and
+        progress as ``nancy/progress``; the final response carries only the summary.
+        """
+        stream = self.analyzer.analyze_repository_stream(
+            repo_path,
+            file_extensions,
+            max_workers=params.get("max_workers"),
+            progress_interval=params.get("progress_interval", 50)
+        )
+        loop = asyncio.get_event_loop()
+        sentinel = object()
+
+        try:
+            while True:
+                # Pull the next event off-loop so the pool's waits never block the server
+                event = await loop.run_in_executor(None, next, stream, sentinel)
+                if event is sentinel:
+                    return {"error": "Repository analysis ended without a summary"}
+
+                kind = event.pop("event")
+                if kind == "complete":
+                    return event
+                if kind == "error":
+                    return event
+
+                method = "nancy/progress" if kind == "progress" else "nancy/knowledge_packets"
+                self.notify({
+                    "jsonrpc": "2.0",
+                    "method": method,
+                    "params": {"repo_path": repo_path, "kind": kind, **event}
+                })
+        finally:
+            # Shuts the analysis pool down when a notification write fails
+            stream.close()
+    
     async def _handle_get_authorship(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle file authorship request."""
         file_path = params.get("file_path")
@@ -570,6 +778,7 @@ class CodebaseMCPServer:
             "capabilities": [
                 "analyze_file",
                 "analyze_repository", 
+                "analyze_repository_stream",
                 "get_file_authorship",
                 "get_developer_expertise",
                 "get_supported_languages"
@@ -595,8 +804,10 @@ async def main():
     print("\nReady for requests...")
     
     # Example usage for testing
-    if len(sys.argv) > 1:
-        test_path = sys.argv[1]
+    args = [arg for arg in sys.argv[1:] if arg != "--stream"]
+    stream = "--stream" in sys.argv[1:]
+    if args:
+        test_path = args[0]
         if os.path.isfile(test_path):
             print(f"\nTesting file analysis: {test_path}")
             request = {
@@ -611,7 +822,7 @@ async def main():
                 "jsonrpc": "2.0", 
                 "id": 1,
                 "method": "analyze_repository",
-                "params": {"repo_path": test_path}
+                "params": {"repo_path": test_path, "stream": stream}
             }
         
         response = await server.handle_request(request)
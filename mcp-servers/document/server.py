@@ -14,6 +14,11 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+# The chunker is shared with Nancy Core: nancy-services/ in a checkout, /app in the API image
+NANCY_SERVICES = Path(__file__).resolve().parents[2] / "nancy-services"
+sys.path.append(str(NANCY_SERVICES if NANCY_SERVICES.is_dir() else Path(__file__).resolve().parents[2]))
+from core.chunking import TextChunker
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -44,6 +49,9 @@ class DocumentMCPServer:
             '.css': 'text/css',
             '.json': 'application/json'
         }
+        
+        # Token windows sized for the embedding model, as in Nancy Core
+        self.chunker = TextChunker.from_env()
     
     async def start(self):
         """Start the MCP server."""
@@ -177,9 +185,9 @@ class DocumentMCPServer:
                 "vector_data": {
                     "chunks": chunks,
                     "embedding_model": "BAAI/bge-small-en-v1.5",
-                    "chunk_strategy": "semantic_paragraphs",
-                    "chunk_size": 512,
-                    "chunk_overlap": 50
+                    "chunk_strategy": "sentence_boundary",
+                    "chunk_size": self.chunker.chunk_size,
+                    "chunk_overlap": self.chunker.chunk_overlap
                 },
                 "analytical_data": analytical_data,
                 "graph_data": graph_data
@@ -204,26 +212,24 @@ class DocumentMCPServer:
         return packet
     
     def _chunk_content(self, content: str, file_path: str) -> List[Dict[str, Any]]:
-        """Chunk content for vector storage."""
+        """Chunk content into overlapping token windows for vector storage."""
         chunks = []
         
-        # Simple paragraph-based chunking
-        paragraphs = content.split('\n\n')
-        
-        for i, paragraph in enumerate(paragraphs):
-            if paragraph.strip():
-                chunk = {
-                    "chunk_id": f"paragraph_{i}",
-                    "text": paragraph.strip(),
-                    "chunk_metadata": {
-                        "paragraph": i + 1,
-                        "file": Path(file_path).name,
-                        "chunk_type": "paragraph"
-                    }
+        for i, chunk in enumerate(self.chunker.chunk(content)):
+            chunks.append({
+                "chunk_id": f"chunk_{i}",
+                "text": chunk["text"],
+                "chunk_metadata": {
+                    "chunk_index": i,
+                    "file": Path(file_path).name,
+                    "chunk_type": "token_window",
+                    "start_char": chunk["start_char"],
+                    "end_char": chunk["end_char"],
+                    "token_count": chunk["token_count"]
                 }
-                chunks.append(chunk)
+            })
         
-        # If no paragraphs, create single chunk
+        # Empty documents still get a single chunk
         if not chunks:
             chunks.append({
                 "chunk_id": "full_content",
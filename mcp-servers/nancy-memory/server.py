@@ -22,6 +22,10 @@ from mcp.server.fastmcp import FastMCP
 import requests
 from pydantic import BaseModel
 
+# The chunker is shared with Nancy Core; in the API image nancy-services/ is /app, added above
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'nancy-services'))
+from core.chunking import TextChunker
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("nancy-memory-mcp")
@@ -34,6 +38,7 @@ class NancyMemoryMCP:
     
     def __init__(self, nancy_api_base: str = NANCY_API_BASE):
         self.nancy_api_base = nancy_api_base
+        self.chunker = TextChunker.from_env()
         self.mcp = FastMCP("Nancy Memory Server")
         self._setup_tools()
         self._setup_resources()
@@ -112,9 +117,18 @@ class NancyMemoryMCP:
                     content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
                     
                     # Build content for different brains
+                    chunks = [{
+                        "chunk_id": f"{filename_final}_chunk_{i}",
+                        "text": chunk["text"],
+                        "chunk_metadata": {
+                            "chunk_index": i,
+                            "source_file": filename_final,
+                            "token_count": chunk["token_count"]
+                        }
+                    } for i, chunk in enumerate(self.chunker.chunk(content))]
                     packet_content = {
                         "vector_data": {
-                            "chunks": [{
+                            "chunks": chunks or [{
                                 "chunk_id": f"{filename_final}_chunk_0",
                                 "text": content,
                                 "chunk_metadata": {
@@ -123,9 +137,9 @@ class NancyMemoryMCP:
                                 }
                             }],
                             "embedding_model": "BAAI/bge-small-en-v1.5",
-                            "chunk_strategy": "document_structure",
-                            "chunk_size": len(content),
-                            "chunk_overlap": 0
+                            "chunk_strategy": "sentence_boundary",
+                            "chunk_size": self.chunker.chunk_size,
+                            "chunk_overlap": self.chunker.chunk_overlap
                         }
                     }
                     
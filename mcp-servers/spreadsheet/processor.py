@@ -4,11 +4,23 @@ Extracted from nancy-services/core/ingestion.py to provide standalone spreadshee
 """
 
 import pandas as pd
+import pyarrow as pa
 import io
+import os
+import sys
+import base64
 import hashlib
-from typing import Dict, Any, List, Optional, Tuple
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Iterator
 from datetime import datetime
 
+# The streaming reader is shared with Nancy Core: nancy-services/ in a checkout, /app in the API image
+NANCY_SERVICES = Path(__file__).resolve().parents[2] / "nancy-services"
+sys.path.append(str(NANCY_SERVICES if NANCY_SERVICES.is_dir() else Path(__file__).resolve().parents[2]))
+from core.spreadsheet_streaming import (
+    SheetStatistics, iter_spreadsheet_chunks, dataframe_to_arrow, STREAMABLE_EXTENSIONS, STREAMING_THRESHOLD_BYTES
+)
+
 
 class SpreadsheetProcessor:
     """
@@ -83,55 +95,13 @@ class SpreadsheetProcessor:
                 
                 processed_sheets.append(sheet_name)
             
-            # Calculate quality metrics
             total_rows = sum(len(df) for df in sheets_data.values())
             total_cols = max(len(df.columns) for df in sheets_data.values() if not df.empty)
             
-            quality_metrics = {
-                "extraction_confidence": 0.95,  # High confidence for structured data
-                "content_completeness": 1.0 if processed_sheets else 0.0,
-                "relationship_accuracy": 0.9,
-                "text_quality_score": 0.85,
-                "metadata_richness": 0.8
-            }
-            
-            # Prepare result for Knowledge Packet generation
-            result = {
-                "filename": filename,
-                "file_type": file_type,
-                "author": author,
-                "sheets_processed": processed_sheets,
-                "total_rows": total_rows,
-                "total_columns": total_cols,
-                "content": {
-                    "vector_data": {
-                        "chunks": vector_chunks,
-                        "embedding_model": "BAAI/bge-small-en-v1.5",
-                        "chunk_strategy": "spreadsheet_summary"
-                    },
-                    "analytical_data": {
-                        "table_data": analytical_tables,
-                        "structured_fields": {
-                            "sheet_count": len(processed_sheets),
-                            "total_rows": total_rows,
-                            "total_columns": total_cols,
-                            "sheet_names": processed_sheets
-                        }
-                    },
-                    "graph_data": {
-                        "entities": graph_entities,
-                        "relationships": graph_relationships
-                    }
-                },
-                "processing_hints": {
-                    "priority_brain": "analytical",
-                    "semantic_weight": 0.7,
-                    "relationship_importance": 0.8,
-                    "content_classification": "technical",
-                    "indexing_priority": "high"
-                },
-                "quality_metrics": quality_metrics
-            }
+            result = self._build_result(
+                filename, file_type, author, processed_sheets, total_rows, total_cols,
+                vector_chunks, analytical_tables, graph_entities, graph_relationships
+            )
             
             print(f"Successfully processed spreadsheet {filename}: {len(processed_sheets)} sheets")
             return result
@@ -158,6 +128,206 @@ class SpreadsheetProcessor:
                 }
             }
     
+    def process_spreadsheet_file(self, file_path: str, author: str = "Unknown") -> Dict[str, Any]:
+        """
+        Process a spreadsheet from disk. CSV and XLSX files above
+        STREAMING_THRESHOLD_BYTES are parsed chunk by chunk with one-pass column
+        statistics; summaries and graph data come from a bounded row sample.
+        Smaller files go through process_spreadsheet.
+        """
+        filename = Path(file_path).name
+        file_type = self._get_file_type(filename)
+        if file_type not in STREAMABLE_EXTENSIONS or os.path.getsize(file_path) <= STREAMING_THRESHOLD_BYTES:
+            with open(file_path, 'rb') as f:
+                return self.process_spreadsheet(filename, f.read(), author)
+        
+        try:
+            processed_sheets = []
+            vector_chunks = []
+            analytical_tables = []
+            graph_entities = []
+            graph_relationships = []
+            total_rows = 0
+            total_cols = 0
+            
+            for sheet_name, chunks in iter_spreadsheet_chunks(file_path, file_type):
+                stats, table_data = self._stream_sheet_table(sheet_name, chunks)
+                if table_data is None:
+                    # A column changed type mid-sheet; re-read it cast to the unified schema
+                    print(f"Column types drifted in sheet '{sheet_name}', re-reading with {stats.unified_schema()}")
+                    stats, table_data = self._stream_sheet_table(
+                        sheet_name, self._iter_sheet_chunks(file_path, file_type, sheet_name), stats.unified_schema()
+                    )
+                
+                if stats.row_count == 0:
+                    continue
+                
+                print(f"Streamed sheet '{sheet_name}' with {stats.row_count} rows and {len(stats.columns)} columns")
+                total_rows += stats.row_count
+                total_cols = max(total_cols, len(stats.columns))
+                sample_df = stats.sample_frame()
+                
+                summary_text = self._generate_spreadsheet_summary(filename, sheet_name, sample_df, total_rows=stats.row_count)
+                if summary_text:
+                    vector_chunks.append({
+                        "chunk_id": f"{sheet_name}_summary",
+                        "text": summary_text,
+                        "chunk_metadata": {
+                            "sheet_name": sheet_name,
+                            "source_file": filename,
+                            "chunk_type": "spreadsheet_summary",
+                            "row_count": stats.row_count,
+                            "column_count": len(stats.columns)
+                        }
+                    })
+                
+                table_data["column_statistics"] = stats.to_dict()["columns"]
+                analytical_tables.append(table_data)
+                
+                sheet_entities, sheet_relationships = self._extract_graph_data(filename, sheet_name, sample_df)
+                graph_entities.extend(sheet_entities)
+                graph_relationships.extend(sheet_relationships)
+                
+                processed_sheets.append(sheet_name)
+            
+            if not processed_sheets:
+                raise ValueError(f"No valid sheets found in {filename}")
+            
+            result = self._build_result(
+                filename, file_type, author, processed_sheets, total_rows, total_cols,
+                vector_chunks, analytical_tables, graph_entities, graph_relationships
+            )
+            result["processing_hints"]["ingestion_mode"] = "streaming"
+            
+            print(f"Successfully streamed spreadsheet {filename}: {len(processed_sheets)} sheets")
+            return result
+        
+        except Exception as e:
+            print(f"Error streaming spreadsheet {filename}: {e}")
+            import traceback
+            traceback.print_exc()
+            
+            return {
+                "filename": filename,
+                "error": str(e),
+                "status": "failed",
+                "quality_metrics": {
+                    "extraction_confidence": 0.0,
+                    "content_completeness": 0.0,
+                    "processing_errors": [{
+                        "error_type": "processing_failure",
+                        "error_message": str(e),
+                        "severity": "high",
+                        "component": "spreadsheet_processor"
+                    }]
+                }
+            }
+    
+    def _iter_sheet_chunks(self, file_path: str, file_type: str, sheet_name: str) -> Iterator[pa.Table]:
+        """Chunks of a single sheet, for re-reading it."""
+        for name, chunks in iter_spreadsheet_chunks(file_path, file_type):
+            if name == sheet_name:
+                yield from chunks
+                return
+    
+    def _stream_sheet_table(self, sheet_name: str, chunks: Iterator[pa.Table],
+                            schema: Optional[pa.Schema] = None) -> Tuple[SheetStatistics, Optional[Dict[str, Any]]]:
+        """
+        Fold a sheet's chunks into online statistics and an Arrow IPC attachment
+        written chunk by chunk. Returns table_data None when a chunk cannot be cast
+        to the stream schema; the statistics then carry the unified schema.
+        """
+        stats = SheetStatistics()
+        sink = pa.BufferOutputStream()
+        writer = None
+        stream_schema = schema
+        
+        try:
+            for chunk in chunks:
+                if chunk.num_rows == 0:
+                    continue
+                if writer is None:
+                    stream_schema = stream_schema or chunk.schema
+                    writer = pa.ipc.new_stream(sink, stream_schema)
+                
+                stats.update(chunk)
+                if chunk.schema != stream_schema:
+                    try:
+                        chunk = chunk.cast(stream_schema)
+                    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError):
+                        # Drain the rest so the statistics see every column type
+                        for remaining in chunks:
+                            stats.update(remaining)
+                        return stats, None
+                writer.write_table(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        if writer is None:
+            return stats, {}
+        
+        return stats, {
+            "table_name": f"sheet_{sheet_name}",
+            "columns": [field.name for field in stream_schema],
+            "rows": [],
+            "column_types": [self._arrow_type_to_packet_type(field.type) for field in stream_schema],
+            "row_count": stats.row_count,
+            "arrow_ipc": base64.b64encode(sink.getvalue().to_pybytes()).decode("ascii")
+        }
+    
+    def _build_result(self, filename: str, file_type: str, author: str, processed_sheets: List[str],
+                      total_rows: int, total_cols: int, vector_chunks: List[Dict], analytical_tables: List[Dict],
+                      graph_entities: List[Dict], graph_relationships: List[Dict]) -> Dict[str, Any]:
+        """Assemble processed sheet data into the Knowledge Packet content structure."""
+        # Calculate quality metrics
+        quality_metrics = {
+            "extraction_confidence": 0.95,  # High confidence for structured data
+            "content_completeness": 1.0 if processed_sheets else 0.0,
+            "relationship_accuracy": 0.9,
+            "text_quality_score": 0.85,
+            "metadata_richness": 0.8
+        }
+        
+        # Prepare result for Knowledge Packet generation
+        result = {
+            "filename": filename,
+            "file_type": file_type,
+            "author": author,
+            "sheets_processed": processed_sheets,
+            "total_rows": total_rows,
+            "total_columns": total_cols,
+            "content": {
+                "vector_data": {
+                    "chunks": vector_chunks,
+                    "embedding_model": "BAAI/bge-small-en-v1.5",
+                    "chunk_strategy": "spreadsheet_summary"
+                },
+                "analytical_data": {
+                    "table_data": analytical_tables,
+                    "structured_fields": {
+                        "sheet_count": len(processed_sheets),
+                        "total_rows": total_rows,
+                        "total_columns": total_cols,
+                        "sheet_names": processed_sheets
+                    }
+                },
+                "graph_data": {
+                    "entities": graph_entities,
+                    "relationships": graph_relationships
+                }
+            },
+            "processing_hints": {
+                "priority_brain": "analytical",
+                "semantic_weight": 0.7,
+                "relationship_importance": 0.8,
+                "content_classification": "technical",
+                "indexing_priority": "high"
+            },
+            "quality_metrics": quality_metrics
+        }
+        return result
+    
     def _get_file_type(self, filename: str) -> str:
         """Extract file extension from filename."""
         return '.' + filename.split('.')[-1].lower() if '.' in filename else ''
@@ -219,17 +389,18 @@ class SpreadsheetProcessor:
         
         return sheets_data
     
-    def _generate_spreadsheet_summary(self, filename: str, sheet_name: str, df: pd.DataFrame) -> Optional[str]:
+    def _generate_spreadsheet_summary(self, filename: str, sheet_name: str, df: pd.DataFrame, total_rows: Optional[int] = None) -> Optional[str]:
         """
         Generate a comprehensive, searchable text summary of the spreadsheet for vector search.
         Enhanced with domain-specific terminology and engineering context.
+        When df is a row sample of a streamed sheet, total_rows gives the real size.
         """
         try:
             if df.empty:
                 return None
             
             # Basic statistics
-            num_rows = len(df)
+            num_rows = total_rows if total_rows is not None else len(df)
             num_cols = len(df.columns)
             
             # Enhanced column analysis
@@ -442,43 +613,53 @@ class SpreadsheetProcessor:
             return {'name': col_name, 'data_type': 'unknown', 'error': str(e)}
     
     def _extract_table_data(self, sheet_name: str, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
-        """Extract structured table data for the Analytical Brain."""
+        """
+        Extract structured table data for the Analytical Brain.
+        
+        Rows travel as a base64 Arrow IPC stream attachment rather than JSON row
+        lists, so the host can load them into DuckDB column-wise with types intact.
+        """
         try:
             if df.empty:
                 return None
             
-            # Convert DataFrame to structured format for Knowledge Packet
-            columns = df.columns.tolist()
-            rows = df.values.tolist()
+            arrow_table = dataframe_to_arrow(df)
             
-            # Determine column types
-            column_types = []
-            for col in df.columns:
-                col_data = df[col].dropna()
-                if col_data.empty:
-                    column_types.append("string")
-                elif col_data.dtype in ['int64', 'int32']:
-                    column_types.append("integer")
-                elif col_data.dtype in ['float64', 'float32']:
-                    column_types.append("float")
-                elif pd.api.types.is_datetime64_any_dtype(col_data):
-                    column_types.append("datetime")
-                elif col_data.dtype == 'bool':
-                    column_types.append("boolean")
-                else:
-                    column_types.append("string")
+            # Determine column types from the Arrow schema
+            column_types = [self._arrow_type_to_packet_type(field.type) for field in arrow_table.schema]
+            
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, arrow_table.schema) as writer:
+                writer.write_table(arrow_table)
             
             return {
                 "table_name": f"sheet_{sheet_name}",
-                "columns": columns,
-                "rows": rows,
-                "column_types": column_types
+                "columns": [str(col) for col in arrow_table.column_names],
+                "rows": [],
+                "column_types": column_types,
+                "row_count": arrow_table.num_rows,
+                "arrow_ipc": base64.b64encode(sink.getvalue().to_pybytes()).decode("ascii")
             }
         
         except Exception as e:
             print(f"Error extracting table data for {sheet_name}: {e}")
             return None
     
+    @staticmethod
+    def _arrow_type_to_packet_type(arrow_type: pa.DataType) -> str:
+        """Map an Arrow type to a Knowledge Packet column type."""
+        if pa.types.is_integer(arrow_type):
+            return "integer"
+        if pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type):
+            return "float"
+        if pa.types.is_boolean(arrow_type):
+            return "boolean"
+        if pa.types.is_timestamp(arrow_type):
+            return "datetime"
+        if pa.types.is_date(arrow_type):
+            return "date"
+        return "string"
+    
     def _extract_graph_data(self, filename: str, sheet_name: str, df: pd.DataFrame) -> Tuple[List[Dict], List[Dict]]:
         """
         Extract entities and relationships for the Graph Brain.
@@ -9,6 +9,7 @@ import asyncio
 import json
 import sys
 import hashlib
+import os
 import logging
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -346,11 +347,9 @@ class SpreadsheetMCPServer:
                 }
                 return MCPResponse(request.id, error=error).to_dict()
             
-            # Read file content
+            # Check the file without reading it; large spreadsheets are streamed
             try:
-                with open(file_path, 'rb') as f:
-                    content = f.read()
-                file_size = len(content)
+                file_size = os.path.getsize(file_path)
             except FileNotFoundError:
                 error = {
                     "code": -32603,
@@ -371,7 +370,7 @@ class SpreadsheetMCPServer:
             self.logger.info(f"Processing spreadsheet: {filename} ({file_size} bytes)")
             
             # Process spreadsheet
-            processed_data = self.processor.process_spreadsheet(filename, content, author)
+            processed_data = self.processor.process_spreadsheet_file(file_path, author)
             
             if "error" in processed_data:
                 self.logger.error(f"Processing failed: {processed_data['error']}")
@@ -1,17 +1,34 @@
-from fastapi import APIRouter, HTTPException, Form
+from fastapi import APIRouter, Depends, HTTPException, Form, Response
 from typing import Optional, Dict, Any
-from core.ingestion import DirectoryIngestionService
+from core.brain_registry import get_directory_service, get_job_manager, get_directory_watcher
+from core.concurrency import run_blocking
 
 router = APIRouter()
-directory_service = DirectoryIngestionService()
+
+
+async def _queue_job(job_manager, response: Response, job_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Queue a background job and return its id with HTTP 202."""
+    job_id = await run_blocking(job_manager.submit, job_type, params)
+    response.status_code = 202
+    return {
+        "job_id": job_id,
+        "job_type": job_type,
+        "status": "queued",
+        "status_url": f"/api/jobs/{job_id}"
+    }
+
 
 @router.post("/directory/scan")
 async def scan_directory(
+    response: Response,
     directory_path: str = Form(...),
     recursive: bool = Form(True),
     file_patterns: Optional[str] = Form(None),
     ignore_patterns: Optional[str] = Form(None),
-    author: str = Form("Directory Scan")
+    author: str = Form("Directory Scan"),
+    background: bool = Form(False),
+    directory_service=Depends(get_directory_service),
+    job_manager=Depends(get_job_manager)
 ) -> Dict[str, Any]:
     """
     Scan a directory for files and detect changes using hash-based comparison.
@@ -23,12 +40,24 @@ async def scan_directory(
     - file_patterns: Comma-separated patterns to include (e.g., "*.txt,*.md")
     - ignore_patterns: Comma-separated patterns to ignore (e.g., ".git/*,*.pyc")
     - author: Author attribution for discovered files
+    - background: Queue as a background job and return its id immediately
     
     Returns:
-    - Scan results including file counts and change detection
+    - Scan results including file counts and change detection,
+      or the job id when background is set (poll /api/jobs/{job_id})
     """
     try:
-        result = directory_service.scan_directory(
+        if background:
+            return await _queue_job(job_manager, response, "scan", {
+                "directory_path": directory_path,
+                "recursive": recursive,
+                "file_patterns": file_patterns,
+                "ignore_patterns": ignore_patterns,
+                "author": author
+            })
+        
+        result = await run_blocking(
+            directory_service.scan_directory,
             directory_path=directory_path,
             recursive=recursive,
             file_patterns=file_patterns,
@@ -46,8 +75,12 @@ async def scan_directory(
 
 @router.post("/directory/process")
 async def process_pending_files(
+    response: Response,
     limit: int = Form(50),
-    author: str = Form("Directory Processing")
+    author: str = Form("Directory Processing"),
+    background: bool = Form(False),
+    directory_service=Depends(get_directory_service),
+    job_manager=Depends(get_job_manager)
 ) -> Dict[str, Any]:
     """
     Process files that are pending ingestion through Nancy's four-brain architecture.
@@ -55,12 +88,17 @@ async def process_pending_files(
     Parameters:
     - limit: Maximum number of files to process in this batch
     - author: Author attribution for processed files
+    - background: Queue as a background job and return its id immediately
     
     Returns:
-    - Processing results including success/failure counts and detailed results
+    - Processing results including success/failure counts and detailed results,
+      or the job id when background is set (poll /api/jobs/{job_id})
     """
     try:
-        result = directory_service.process_pending_files(limit=limit, author=author)
+        if background:
+            return await _queue_job(job_manager, response, "process", {"limit": limit, "author": author})
+        
+        result = await run_blocking(directory_service.process_pending_files, limit=limit, author=author)
         
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
@@ -72,12 +110,16 @@ async def process_pending_files(
 
 @router.post("/directory/scan-and-process")
 async def scan_and_process_directory(
+    response: Response,
     directory_path: str = Form(...),
     recursive: bool = Form(True),
     file_patterns: Optional[str] = Form(None),
     ignore_patterns: Optional[str] = Form(None),
     author: str = Form("Directory Ingestion"),
-    process_limit: int = Form(50)
+    process_limit: int = Form(50),
+    background: bool = Form(False),
+    directory_service=Depends(get_directory_service),
+    job_manager=Depends(get_job_manager)
 ) -> Dict[str, Any]:
     """
     Complete directory ingestion: scan for changes and process pending files.
@@ -90,12 +132,25 @@ async def scan_and_process_directory(
     - ignore_patterns: Comma-separated patterns to ignore
     - author: Author attribution for processed files
     - process_limit: Maximum number of files to process
+    - background: Queue as a background job and return its id immediately
     
     Returns:
-    - Combined scan and processing results
+    - Combined scan and processing results,
+      or the job id when background is set (poll /api/jobs/{job_id})
     """
     try:
-        result = directory_service.scan_and_process_directory(
+        if background:
+            return await _queue_job(job_manager, response, "scan_and_process", {
+                "directory_path": directory_path,
+                "recursive": recursive,
+                "file_patterns": file_patterns,
+                "ignore_patterns": ignore_patterns,
+                "author": author,
+                "limit": process_limit
+            })
+        
+        result = await run_blocking(
+            directory_service.scan_and_process_directory,
             directory_path=directory_path,
             recursive=recursive,
             file_patterns=file_patterns,
@@ -117,7 +172,8 @@ async def add_directory_config(
     directory_path: str = Form(...),
     recursive: bool = Form(True),
     file_patterns: Optional[str] = Form(None),
-    ignore_patterns: Optional[str] = Form(None)
+    ignore_patterns: Optional[str] = Form(None),
+    directory_service=Depends(get_directory_service)
 ) -> Dict[str, Any]:
     """
     Add a directory to the configuration for regular scanning.
@@ -132,7 +188,8 @@ async def add_directory_config(
     - Configuration details including assigned config ID
     """
     try:
-        result = directory_service.add_directory_config(
+        result = await run_blocking(
+            directory_service.add_directory_config,
             directory_path=directory_path,
             recursive=recursive,
             file_patterns=file_patterns,
@@ -148,7 +205,7 @@ async def add_directory_config(
         raise HTTPException(status_code=500, detail=f"Failed to add directory config: {str(e)}")
 
 @router.get("/directory/status")
-async def get_directory_status() -> Dict[str, Any]:
+async def get_directory_status(directory_service=Depends(get_directory_service)) -> Dict[str, Any]:
     """
     Get comprehensive status of directory-based ingestion system.
     
@@ -156,7 +213,7 @@ async def get_directory_status() -> Dict[str, Any]:
     - Directory configurations, file statistics, and processing status
     """
     try:
-        result = directory_service.get_directory_status()
+        result = await run_blocking(directory_service.get_directory_status)
         
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
@@ -167,7 +224,7 @@ async def get_directory_status() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Failed to get directory status: {str(e)}")
 
 @router.get("/directory/health")
-async def directory_health_check() -> Dict[str, Any]:
+async def directory_health_check(directory_service=Depends(get_directory_service)) -> Dict[str, Any]:
     """
     Health check for directory ingestion service.
     
@@ -176,7 +233,7 @@ async def directory_health_check() -> Dict[str, Any]:
     """
     try:
         # Perform basic health checks
-        status = directory_service.get_directory_status()
+        status = await run_blocking(directory_service.get_directory_status)
         
         health_info = {
             "service": "directory_ingestion",
@@ -194,4 +251,48 @@ async def directory_health_check() -> Dict[str, Any]:
             "status": "unhealthy",
             "error": str(e),
             "timestamp": None
-        }
\ No newline at end of file
+        }
+
+
+@router.post("/directory/watch/start")
+async def start_directory_watch(directory_watcher=Depends(get_directory_watcher)) -> Dict[str, Any]:
+    """
+    Start watch mode for all enabled directory configurations.
+    File system events are debounced, filtered through each directory's patterns
+    and queued as pending files; a background job then ingests them. A full
+    rescan still runs periodically as a consistency check.
+    
+    Returns:
+    - Watcher status including the watched directories
+    """
+    try:
+        result = await run_blocking(directory_watcher.start)
+        
+        if "error" in result:
+            raise HTTPException(status_code=400, detail=result["error"])
+        
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to start directory watch: {str(e)}")
+
+@router.post("/directory/watch/stop")
+async def stop_directory_watch(directory_watcher=Depends(get_directory_watcher)) -> Dict[str, Any]:
+    """
+    Stop watch mode. Events already received are applied before the watcher exits.
+    """
+    try:
+        await run_blocking(directory_watcher.stop)
+        return directory_watcher.get_status()
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to stop directory watch: {str(e)}")
+
+@router.get("/directory/watch/status")
+async def get_directory_watch_status(directory_watcher=Depends(get_directory_watcher)) -> Dict[str, Any]:
+    """
+    Get watch mode status: watched directories, event counts and files queued.
+    """
+    return directory_watcher.get_status()
@@ -1,12 +1,41 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from typing import Optional
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request, Query
+from typing import Optional, AsyncIterator
+from pathlib import Path
+import json
 import logging
+import os
+import tempfile
+import zlib
 
 from core.legacy_adapter import get_nancy_adapter
+from core.spreadsheet_streaming import STREAMABLE_EXTENSIONS
+from core.concurrency import run_blocking
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+UPLOAD_SPOOL_DIR = Path("./data/temp")
+UPLOAD_COPY_BLOCK_SIZE = 1024 * 1024
+MAX_PACKET_BATCH_SIZE = 1000
+
+# Cap on the decompressed size of a gzip request body
+MAX_DECOMPRESSED_BODY_BYTES = int(os.getenv("NANCY_MAX_DECOMPRESSED_BODY_BYTES", str(4 * 1024 ** 3)))
+
+
+async def _spool_upload(file: UploadFile) -> str:
+    """Copy an upload to a temporary file in fixed-size blocks and return its path."""
+    UPLOAD_SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix, dir=UPLOAD_SPOOL_DIR)
+    try:
+        while True:
+            block = await file.read(UPLOAD_COPY_BLOCK_SIZE)
+            if not block:
+                break
+            await run_blocking(temp_file.write, block)
+        return temp_file.name
+    finally:
+        temp_file.close()
+
 
 @router.post("/ingest")
 async def ingest_data(
@@ -23,11 +52,19 @@ async def ingest_data(
         if not nancy_adapter:
             raise HTTPException(status_code=503, detail="Nancy Core not available")
         
-        # Read file content
-        content = await file.read()
-        
-        # Use legacy adapter for backwards compatibility
-        result = nancy_adapter.ingest_file(file.filename, content, author)
+        # Spreadsheets are spooled to disk so large uploads can be streamed
+        if Path(file.filename).suffix.lower() in STREAMABLE_EXTENSIONS:
+            temp_path = await _spool_upload(file)
+            try:
+                result = await nancy_adapter.ingest_file_path_async(file.filename, temp_path, author)
+            finally:
+                os.unlink(temp_path)
+        else:
+            # Read file content
+            content = await file.read()
+            
+            # Use legacy adapter for backwards compatibility; blocking work runs off the event loop
+            result = await nancy_adapter.ingest_file_async(file.filename, content, author)
         
         logger.info(f"Successfully ingested file: {file.filename}")
         return result
@@ -68,12 +105,12 @@ async def ingest_knowledge_packet(packet_data: dict):
         # Import Knowledge Packet validation
         from schemas.knowledge_packet import NancyKnowledgePacket, KnowledgePacketValidator
         
-        # Validate packet
+        # Validate packet off the event loop; large packets take a while
         validator = KnowledgePacketValidator()
-        validator.validate(packet_data)
+        await run_blocking(validator.validate, packet_data)
         
-        # Create Knowledge Packet object
-        packet = NancyKnowledgePacket(packet_data)
+        # Create Knowledge Packet object (already validated above)
+        packet = NancyKnowledgePacket(packet_data, validated=True)
         
         # Queue for processing
         await nancy_adapter.mcp_host.packet_queue.put(packet)
@@ -92,6 +129,157 @@ async def ingest_knowledge_packet(packet_data: dict):
         raise HTTPException(status_code=500, detail=f"Processing failed: {e}")
 
 
+class _GzipBody:
+    """
+    Incremental gunzip of a request body. A body may hold several gzip members
+    (concatenated files, pigz output); each member's end starts a new
+    decompressor on the bytes that follow. Output is produced in bounded steps
+    and capped at max_bytes, so a small compressed body cannot expand without limit.
+    """
+    
+    def __init__(self, max_bytes: int = MAX_DECOMPRESSED_BODY_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._in_member = False
+    
+    def decompress(self, data: bytes) -> bytes:
+        output = []
+        while data:
+            self._in_member = True
+            block = self._decompressor.decompress(data, self.max_bytes - self.total_bytes + 1)
+            self.total_bytes += len(block)
+            if self.total_bytes > self.max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Decompressed body exceeds {self.max_bytes} bytes"
+                )
+            output.append(block)
+            if self._decompressor.eof:
+                data = self._decompressor.unused_data
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                self._in_member = False
+            else:
+                data = self._decompressor.unconsumed_tail
+        return b"".join(output)
+    
+    def flush(self) -> bytes:
+        if self._in_member:
+            raise zlib.error("truncated gzip member")
+        return b""
+
+
+async def _iter_ndjson_lines(request: Request,
+                             max_decompressed_bytes: int = MAX_DECOMPRESSED_BODY_BYTES) -> AsyncIterator[bytes]:
+    """Yield the lines of a streamed NDJSON body, decompressing gzip on the fly."""
+    content_encoding = request.headers.get("content-encoding", "").lower()
+    content_type = request.headers.get("content-type", "").lower()
+    decompressor = None
+    if "gzip" in content_encoding or "gzip" in content_type:
+        decompressor = _GzipBody(max_decompressed_bytes)
+    
+    # Pieces of the current (unterminated) line, joined once its newline arrives
+    pending = []
+    async for block in request.stream():
+        if decompressor:
+            block = decompressor.decompress(block)
+        if b"\n" not in block:
+            pending.append(block)
+            continue
+        *lines, tail = block.split(b"\n")
+        lines[0] = b"".join(pending) + lines[0]
+        pending = [tail]
+        for line in lines:
+            yield line
+    
+    if decompressor:
+        pending.append(decompressor.flush())
+    for line in b"".join(pending).split(b"\n"):
+        yield line
+
+
+@router.post("/ingest/knowledge-packets")
+async def ingest_knowledge_packets(
+    request: Request,
+    batch_size: int = Query(100, ge=1, le=MAX_PACKET_BATCH_SIZE)
+):
+    """
+    Bulk Knowledge Packet ingestion for MCP servers.
+    
+    The body is newline-delimited JSON, one packet per line, optionally gzip
+    compressed (Content-Encoding: gzip or a gzip content type; multi-member
+    gzip is accepted, up to MAX_DECOMPRESSED_BODY_BYTES decompressed). Packets are
+    validated as the body streams in and queued in batches, so the host writes
+    each batch to the brains with one bulk operation per brain. Invalid lines
+    are reported individually and do not reject the rest of the request.
+    """
+    nancy_adapter = get_nancy_adapter()
+    if not nancy_adapter:
+        raise HTTPException(status_code=503, detail="Nancy Core not available")
+    
+    # Validate we're in MCP mode
+    if not hasattr(nancy_adapter, 'mcp_host') or not nancy_adapter.mcp_host:
+        current_mode = nancy_adapter.migration_mode
+        raise HTTPException(
+            status_code=501,
+            detail=f"Knowledge Packet ingestion requires MCP mode. Current mode: {current_mode}. Set NANCY_MIGRATION_MODE=mcp or use /api/ingest endpoint for legacy compatibility."
+        )
+    
+    from schemas.knowledge_packet import NancyKnowledgePacket, KnowledgePacketValidator
+    
+    validator = KnowledgePacketValidator()
+    
+    def parse_packet(line: bytes) -> NancyKnowledgePacket:
+        packet_data = json.loads(line)
+        validator.validate(packet_data)
+        return NancyKnowledgePacket(packet_data, validated=True)
+    
+    packet_queue = nancy_adapter.mcp_host.packet_queue
+    results = []
+    batch = []
+    batches_enqueued = 0
+    line_number = 0
+    
+    try:
+        async for line in _iter_ndjson_lines(request):
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                # Parsing and validation run in the worker threadpool
+                packet = await run_blocking(parse_packet, line)
+            except (ValueError, TypeError) as e:
+                results.append({"line": line_number, "packet_id": None, "status": "rejected", "error": str(e)})
+                continue
+            
+            batch.append(packet)
+            results.append({"line": line_number, "packet_id": packet.packet_id, "status": "queued", "error": None})
+            if len(batch) >= batch_size:
+                await packet_queue.put(batch)
+                batches_enqueued += 1
+                batch = []
+        
+        if batch:
+            await packet_queue.put(batch)
+            batches_enqueued += 1
+            
+    except zlib.error as e:
+        logger.error(f"Invalid gzip body after {line_number} lines: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid gzip body: {e}")
+    
+    accepted = sum(1 for result in results if result["status"] == "queued")
+    rejected = len(results) - accepted
+    logger.info(f"Bulk ingestion queued {accepted} Knowledge Packets in {batches_enqueued} batches, rejected {rejected}")
+    
+    return {
+        "status": "success" if rejected == 0 else "partial",
+        "accepted": accepted,
+        "rejected": rejected,
+        "batches_enqueued": batches_enqueued,
+        "results": results
+    }
+
+
 @router.get("/ingest/status")
 async def ingestion_status():
     """
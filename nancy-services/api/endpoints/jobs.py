@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Dict, Any
+from core.brain_registry import get_job_manager
+from core.concurrency import run_blocking
+
+router = APIRouter()
+
+@router.get("/jobs")
+async def list_jobs(limit: int = Query(50, ge=1, le=500), job_manager=Depends(get_job_manager)) -> Dict[str, Any]:
+    """
+    List recent background ingestion jobs, newest first.
+    """
+    try:
+        jobs = await run_blocking(job_manager.list_jobs, limit)
+        return {"jobs": jobs, "count": len(jobs)}
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list jobs: {str(e)}")
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, job_manager=Depends(get_job_manager)) -> Dict[str, Any]:
+    """
+    Report progress of a background ingestion job.
+    
+    Returns:
+    - Job status and phase, files done/failed/total, throughput (files/sec),
+      ETA in seconds, scan results and the most recent file errors
+    """
+    try:
+        job = await run_blocking(job_manager.get_job, job_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get job: {str(e)}")
+    
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
@@ -1,42 +1,24 @@
-from functools import lru_cache
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import Optional
-from core.query_orchestrator import QueryOrchestrator
-from core.enhanced_query_orchestrator import EnhancedQueryOrchestrator
-from core.intelligent_query_orchestrator import IntelligentQueryOrchestrator
-from core.langchain_orchestrator import LangChainOrchestrator
+from core.brain_registry import (
+    get_langchain_orchestrator,          # LangChain-integrated orchestrator (RECOMMENDED)
+    get_intelligent_query_orchestrator,  # true LLM-based processing
+    get_enhanced_query_orchestrator,     # intelligent routing (rule-based)
+    get_query_orchestrator               # legacy orchestrator for compatibility
+)
+from core.graph_cache import graph_cache
 
 router = APIRouter()
 
-# NEW: LangChain-integrated orchestrator (RECOMMENDED)
-@lru_cache()
-def get_langchain_orchestrator():
-    print("Creating LangChain-integrated Nancy Orchestrator...")
-    return LangChainOrchestrator()
-
-# Intelligent orchestrator with true LLM-based processing
-@lru_cache()
-def get_intelligent_query_orchestrator():
-    print("Creating Intelligent QueryOrchestrator instance (LLM-based)...")
-    return IntelligentQueryOrchestrator()
-
-# Enhanced orchestrator with intelligent routing (rule-based)
-@lru_cache()
-def get_enhanced_query_orchestrator():
-    print("Creating Enhanced QueryOrchestrator instance...")
-    return EnhancedQueryOrchestrator()
-
-# Legacy orchestrator for compatibility
-@lru_cache()
-def get_query_orchestrator():
-    print("Creating Legacy QueryOrchestrator instance...")
-    return QueryOrchestrator()
+# Orchestrators are created on first use and share the process-wide brains
+# (core/brain_registry.py), so only the ones actually requested are loaded
 
 class QueryRequest(BaseModel):
     query: str
     n_results: int = 5
     orchestrator: str = "langchain"  # Default to LangChain-integrated (RECOMMENDED)
+    retrieval_mode: Optional[str] = None  # vector, lexical, hybrid or auto; default brains.vector.retrieval_mode
 
 @router.post("/query")
 def query_data(request: QueryRequest):
@@ -48,23 +30,26 @@ def query_data(request: QueryRequest):
     - "intelligent": Uses LLM for query analysis and response synthesis
     - "enhanced": Uses rule-based pattern matching (no LLM)
     - "legacy": Basic orchestration for compatibility
+    
+    retrieval_mode selects how the orchestrator's Vector Brain searches:
+    "vector" (dense similarity), "lexical" (BM25), "hybrid" (both, fused by
+    reciprocal rank) or "auto" (hybrid for queries holding identifiers).
     """
     try:
         # Conditional orchestrator loading - only create what we need!
         if request.orchestrator == "langchain":
             orchestrator = get_langchain_orchestrator()
-            result = orchestrator.query(request.query, request.n_results)
         elif request.orchestrator == "intelligent":
             orchestrator = get_intelligent_query_orchestrator()
-            result = orchestrator.query(request.query, request.n_results)
         elif request.orchestrator == "enhanced":
             orchestrator = get_enhanced_query_orchestrator()
-            result = orchestrator.query(request.query, request.n_results)
         elif request.orchestrator == "legacy":
             orchestrator = get_query_orchestrator()
-            result = orchestrator.query(request.query, request.n_results)
         else:
             raise ValueError(f"Unknown orchestrator type: {request.orchestrator}")
+        
+        with orchestrator.vector_brain.retrieval_mode(request.retrieval_mode):
+            result = orchestrator.query(request.query, request.n_results)
             
         return result
     except Exception as e:
@@ -84,8 +69,8 @@ class GraphQueryRequest(BaseModel):
 @router.post("/query/graph")
 def query_graph_data(
     request: GraphQueryRequest,
-    enhanced_orchestrator: EnhancedQueryOrchestrator = Depends(get_enhanced_query_orchestrator),
-    legacy_orchestrator: QueryOrchestrator = Depends(get_query_orchestrator)
+    enhanced_orchestrator=Depends(get_enhanced_query_orchestrator),
+    legacy_orchestrator=Depends(get_query_orchestrator)
 ):
     """
     Receives a graph query for author documents, passes it to the appropriate QueryOrchestrator,
@@ -110,7 +95,7 @@ def query_graph_data(
 @router.post("/query/test-strategy")
 def test_query_strategy(
     request: QueryRequest,
-    enhanced_orchestrator: EnhancedQueryOrchestrator = Depends(get_enhanced_query_orchestrator)
+    enhanced_orchestrator=Depends(get_enhanced_query_orchestrator)
 ):
     """
     Test endpoint that shows what strategy would be used for a query without executing it.
@@ -127,7 +112,7 @@ def test_query_strategy(
 
 @router.get("/health")
 def health_check(
-    intelligent_orchestrator: IntelligentQueryOrchestrator = Depends(get_intelligent_query_orchestrator)
+    intelligent_orchestrator=Depends(get_intelligent_query_orchestrator)
 ):
     """
     Check the health of all four brains in Nancy's architecture.
@@ -163,3 +148,21 @@ def health_check(
             "error": str(e),
             "message": "Health check failed - system may be misconfigured"
         })
+
+@router.get("/query/graph/cache")
+def graph_cache_stats():
+    """
+    Hit rate, size and evictions of the process-wide Graph Brain query cache.
+    """
+    return graph_cache.get_stats()
+
+@router.post("/query/lexical/rebuild")
+def rebuild_lexical_index(orchestrator=Depends(get_query_orchestrator)):
+    """
+    Re-index every stored chunk into the BM25 lexical index. New chunks are
+    indexed at ingest; this backfills chunks stored before the index existed.
+    """
+    try:
+        return {"status": "success", "chunks_indexed": orchestrator.vector_brain.rebuild_lexical_index()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -3,8 +3,9 @@ from contextlib import asynccontextmanager
 import logging
 import os
 
-from api.endpoints import ingest, query, directory
+from api.endpoints import ingest, query, directory, jobs
 from core.legacy_adapter import initialize_nancy, shutdown_nancy, get_nancy_adapter
+from core.brain_registry import get_job_manager, get_directory_watcher, get_loaded
 
 # Configure logging
 logging.basicConfig(
@@ -29,6 +30,11 @@ async def lifespan(app: FastAPI):
         if await initialize_nancy():
             nancy_adapter = get_nancy_adapter()
             logger.info("Nancy Core initialized successfully")
+            # Resume queued and interrupted background ingestion jobs; brains
+            # and models are loaded by the first job or request that needs them
+            get_job_manager().start()
+            if os.getenv("NANCY_DIRECTORY_WATCH", "false").lower() == "true":
+                get_directory_watcher().start()
         else:
             logger.error("Failed to initialize Nancy Core")
             raise HTTPException(status_code=500, detail="Nancy initialization failed")
@@ -37,6 +43,9 @@ async def lifespan(app: FastAPI):
         
     finally:
         logger.info("Shutting down Nancy Core...")
+        for name in ("directory_watcher", "job_manager"):
+            if get_loaded(name) is not None:
+                get_loaded(name).stop()
         await shutdown_nancy()
         logger.info("Nancy Core shutdown complete")
 
@@ -52,6 +61,7 @@ app = FastAPI(
 app.include_router(ingest.router, prefix="/api", tags=["Ingestion"])
 app.include_router(query.router, prefix="/api", tags=["Querying"])
 app.include_router(directory.router, prefix="/api", tags=["Directory Ingestion"])
+app.include_router(jobs.router, prefix="/api", tags=["Jobs"])
 
 
 @app.get("/")
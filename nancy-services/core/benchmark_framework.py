@@ -38,8 +38,8 @@ class BenchmarkResult:
 class StandardRAGBaseline:
     """Simple vector-only RAG for comparison"""
     def __init__(self):
-        from .nlp import VectorBrain
-        self.vector_brain = VectorBrain()
+        from .brain_registry import get_vector_brain
+        self.vector_brain = get_vector_brain()
     
     def query(self, query_text: str, n_results: int = 10):
         """Vector-only query without metadata or knowledge graph enrichment"""
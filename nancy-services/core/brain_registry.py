@@ -0,0 +1,168 @@
+"""
+Process-wide registry of Nancy's brains, models and services.
+
+Every resource is created on first use and then shared by every holder in
+the process: one VectorBrain (one fastembed model, one Chroma client), one
+AnalyticalBrain, one Graph Brain, one spaCy pipeline, one set of tree-sitter
+parsers, one Knowledge Packet dedup index and one instance of each
+orchestrator. Importing the API therefore loads no model; a brain is built
+by the first request (or background job) that needs it.
+
+Each resource is built once, under its own lock, so concurrent first
+requests wait for the same instance instead of building their own, and
+building one resource does not block lookups of resources already loaded.
+The modules defining a resource are imported by its factory, so spaCy,
+tree-sitter, langchain, fastembed and Chroma are only imported when used.
+
+The getters double as FastAPI dependencies (Depends(get_directory_service)).
+"""
+
+import threading
+
+_resources = {}
+_resource_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _get_or_create(name: str, factory):
+    resource = _resources.get(name)
+    if resource is not None:
+        return resource
+    with _registry_lock:
+        lock = _resource_locks.setdefault(name, threading.Lock())
+    with lock:
+        resource = _resources.get(name)
+        if resource is None:
+            print(f"Initializing {name}...")
+            resource = factory()
+            _resources[name] = resource
+        return resource
+
+
+def get_loaded(name: str):
+    """The named resource if it has been created, else None (without creating it)."""
+    return _resources.get(name)
+
+
+def loaded_resources() -> list:
+    """Names of the resources created so far."""
+    return sorted(_resources)
+
+
+# Brains and models
+
+def get_analytical_brain():
+    def create():
+        from .search import AnalyticalBrain
+        return AnalyticalBrain()
+    return _get_or_create("analytical_brain", create)
+
+
+def get_graph_brain():
+    def create():
+        from .graph_backend import create_graph_brain
+        return create_graph_brain()
+    return _get_or_create("graph_brain", create)
+
+
+def get_vector_brain():
+    def create():
+        from .nlp import VectorBrain
+        return VectorBrain()
+    return _get_or_create("vector_brain", create)
+
+
+def get_spacy_model():
+    def create():
+        import spacy
+        return spacy.load("en_core_web_sm")
+    return _get_or_create("spacy_model", create)
+
+
+def get_llm_client(preferred_llm: str = "gemini"):
+    def create():
+        from .llm_client import LLMClient
+        return LLMClient(preferred_llm=preferred_llm)
+    return _get_or_create(f"llm_client:{preferred_llm}", create)
+
+
+def get_packet_dedup_index():
+    def create():
+        from .packet_dedup import PacketDedupIndex
+        return PacketDedupIndex(get_analytical_brain())
+    return _get_or_create("packet_dedup_index", create)
+
+
+# Ingestion services
+
+def get_ingestion_service():
+    def create():
+        from .ingestion import IngestionService
+        return IngestionService()
+    return _get_or_create("ingestion_service", create)
+
+
+def get_codebase_service():
+    def create():
+        from .ingestion import CodebaseIngestionService
+        return CodebaseIngestionService()
+    return _get_or_create("codebase_service", create)
+
+
+def get_directory_service():
+    def create():
+        from .ingestion import DirectoryIngestionService
+        return DirectoryIngestionService()
+    return _get_or_create("directory_service", create)
+
+
+def get_job_manager():
+    def create():
+        from .ingestion_jobs import IngestionJobManager
+        return IngestionJobManager(get_directory_service())
+    return _get_or_create("job_manager", create)
+
+
+def _process_watched_changes(directory_root: str, queued: int):
+    """Start a background process job for files the watcher queued, unless one is already waiting."""
+    job_manager = get_job_manager()
+    if job_manager.has_queued_process_job(directory_root):
+        return
+    job_manager.submit("process", {"directory_path": directory_root, "author": "Directory Watcher"})
+
+
+def get_directory_watcher():
+    def create():
+        from .directory_watcher import DirectoryWatcher
+        return DirectoryWatcher(get_directory_service(), on_changes=_process_watched_changes)
+    return _get_or_create("directory_watcher", create)
+
+
+# Query orchestrators
+
+def get_query_orchestrator():
+    def create():
+        from .query_orchestrator import QueryOrchestrator
+        return QueryOrchestrator()
+    return _get_or_create("query_orchestrator", create)
+
+
+def get_enhanced_query_orchestrator():
+    def create():
+        from .enhanced_query_orchestrator import EnhancedQueryOrchestrator
+        return EnhancedQueryOrchestrator()
+    return _get_or_create("enhanced_query_orchestrator", create)
+
+
+def get_intelligent_query_orchestrator():
+    def create():
+        from .intelligent_query_orchestrator import IntelligentQueryOrchestrator
+        return IntelligentQueryOrchestrator()
+    return _get_or_create("intelligent_query_orchestrator", create)
+
+
+def get_langchain_orchestrator():
+    def create():
+        from .langchain_orchestrator import LangChainOrchestrator
+        return LangChainOrchestrator()
+    return _get_or_create("langchain_orchestrator", create)
@@ -0,0 +1,190 @@
+"""
+Token-aware sliding-window chunking for the Vector Brain and the MCP servers.
+
+The embedding model (bge-small) reads at most 512 tokens per chunk and silently
+drops the rest, so chunks are sized in model tokens rather than characters.
+TextChunker tokenizes a document once and walks it with a window of chunk_size
+tokens that advances by chunk_size - chunk_overlap, so every step is linear in
+the document length.
+
+Window ends are placed, in order of preference, on:
+- an anchor sentence start (one sentence in ANCHOR_INTERVAL, chosen by hashing
+  its content), so boundaries follow the text rather than its offset and an
+  edit only changes the chunks around it
+- any sentence or line start
+- the window limit (a single sentence longer than the window)
+within the second half of the window. The last window is balanced with the one
+before it, so a document never ends in a tiny tail chunk.
+
+With the tokenizers package and the embedding model's tokenizer, token counts
+are exact; otherwise a word-piece approximation is used that over-counts
+rather than under-counts.
+"""
+
+import hashlib
+import os
+import re
+from typing import Any, Dict, List, Tuple
+
+# Token window of BAAI/bge-small-en-v1.5, including [CLS] and [SEP]
+MODEL_MAX_TOKENS = 512
+SPECIAL_TOKENS = 2
+
+DEFAULT_CHUNK_SIZE = 512
+DEFAULT_CHUNK_OVERLAP = 50
+
+# Roughly one sentence in this many is a content-defined chunk boundary
+ANCHOR_INTERVAL = 4
+
+# Fallback tokenizer: words split into pieces of at most 6 characters, and
+# every punctuation mark on its own, approximating WordPiece
+_APPROXIMATE_TOKEN = re.compile(r"\w{1,6}|[^\w\s]")
+_SENTENCE_END = frozenset(".!?")
+
+
+def _is_anchor(sentence: str) -> bool:
+    digest = hashlib.blake2b(sentence.strip().encode('utf-8'), digest_size=4).digest()
+    return int.from_bytes(digest, 'big') % ANCHOR_INTERVAL == 0
+
+
+class TextChunker:
+    """
+    Splits text into overlapping windows of at most chunk_size model tokens.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+                 tokenizer=None):
+        """
+        Args:
+            chunk_size: Window size in tokens, capped at the model's window
+            chunk_overlap: Tokens shared by consecutive windows, capped at a
+                quarter of the window so the walk always advances
+            tokenizer: Optional tokenizers.Tokenizer of the embedding model
+        """
+        self.chunk_size = max(16, min(int(chunk_size), MODEL_MAX_TOKENS - SPECIAL_TOKENS))
+        self.chunk_overlap = max(0, min(int(chunk_overlap), self.chunk_size // 4))
+        self.tokenizer = self._prepare_tokenizer(tokenizer)
+
+    @classmethod
+    def from_env(cls, tokenizer=None) -> "TextChunker":
+        """Chunker sized by NANCY_CHUNK_SIZE/NANCY_CHUNK_OVERLAP, for MCP servers without the Nancy configuration."""
+        return cls(
+            chunk_size=int(os.getenv("NANCY_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)),
+            chunk_overlap=int(os.getenv("NANCY_CHUNK_OVERLAP", DEFAULT_CHUNK_OVERLAP)),
+            tokenizer=tokenizer
+        )
+
+    @classmethod
+    def from_config(cls, tokenizer=None) -> "TextChunker":
+        """Chunker using brains.vector.chunk_size/chunk_overlap from the Nancy configuration."""
+        chunk_size = int(os.getenv("NANCY_CHUNK_SIZE", DEFAULT_CHUNK_SIZE))
+        chunk_overlap = int(os.getenv("NANCY_CHUNK_OVERLAP", DEFAULT_CHUNK_OVERLAP))
+        try:
+            from .config_manager import get_config_manager
+            manager = get_config_manager()
+            config = manager.config or manager.load_config()
+            chunk_size = config.brains.vector.chunk_size
+            chunk_overlap = config.brains.vector.chunk_overlap
+        except Exception as e:
+            print(f"Chunking configuration not loaded, using {chunk_size}/{chunk_overlap} tokens: {e}")
+        return cls(chunk_size=chunk_size, chunk_overlap=chunk_overlap, tokenizer=tokenizer)
+
+    @staticmethod
+    def _prepare_tokenizer(tokenizer):
+        """A copy of the model tokenizer without truncation or padding, or None."""
+        if tokenizer is None:
+            return None
+        try:
+            from tokenizers import Tokenizer
+            tokenizer = Tokenizer.from_str(tokenizer.to_str())
+            tokenizer.no_truncation()
+            tokenizer.no_padding()
+            return tokenizer
+        except Exception as e:
+            print(f"Model tokenizer unavailable for chunking, approximating token counts: {e}")
+            return None
+
+    def tokenize(self, text: str) -> List[Tuple[int, int]]:
+        """Character spans of the tokens of text."""
+        if self.tokenizer is not None:
+            encoding = self.tokenizer.encode(text, add_special_tokens=False)
+            return [(start, end) for start, end in encoding.offsets if end > start]
+        return [match.span() for match in _APPROXIMATE_TOKEN.finditer(text)]
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.tokenize(text))
+
+    def chunk(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Chunks of text as dicts with the chunk text, its character span and
+        token count. Chunk text is sliced from the original, whitespace intact.
+        """
+        spans = self.tokenize(text)
+        n = len(spans)
+        if n == 0:
+            return []
+
+        # Sentence starts: after sentence-ending punctuation followed by
+        # whitespace, and at every line start
+        sentence_starts = [0]
+        for i in range(1, n):
+            gap = text[spans[i - 1][1]:spans[i][0]]
+            if "\n" in gap or (gap and text[spans[i - 1][1] - 1] in _SENTENCE_END):
+                sentence_starts.append(i)
+
+        # Latest sentence start, latest anchor start and next sentence start
+        # at or before/after each token
+        previous_start = [0] * (n + 1)
+        previous_anchor = [-1] * (n + 1)
+        next_start = [n] * (n + 1)
+        starts = sentence_starts + [n]
+        anchor = -1
+        for k, start in enumerate(sentence_starts):
+            end = starts[k + 1]
+            if k > 0 and _is_anchor(text[spans[start][0]:spans[end - 1][1]]):
+                anchor = start
+            for i in range(start, end):
+                previous_start[i] = start
+                previous_anchor[i] = anchor
+                next_start[i] = start if i == start else end
+        previous_start[n] = n
+        previous_anchor[n] = anchor
+
+        window = self.chunk_size
+        minimum = window // 4
+        chunks = []
+        start = 0
+        while True:
+            remaining = n - start
+            if remaining <= window:
+                end = n
+            else:
+                limit = start + window
+                if n - limit < minimum:
+                    # A full window would leave a tiny tail: split the rest in two
+                    limit = start + (remaining + self.chunk_overlap) // 2
+                floor = start + (limit - start) // 2
+                if previous_anchor[limit] > floor:
+                    end = previous_anchor[limit]
+                elif previous_start[limit] > floor:
+                    end = previous_start[limit]
+                else:
+                    end = limit
+
+            chunks.append({
+                "text": text[spans[start][0]:spans[end - 1][1]],
+                "start_char": spans[start][0],
+                "end_char": spans[end - 1][1],
+                "token_count": end - start
+            })
+            if end >= n:
+                return chunks
+
+            # The overlap starts at the first sentence start inside it, if any
+            overlap_start = max(end - self.chunk_overlap, start + 1)
+            sentence_start = next_start[overlap_start]
+            start = sentence_start if sentence_start < end else overlap_start
+
+    def split(self, text: str) -> List[str]:
+        """Chunk texts only."""
+        return [chunk["text"] for chunk in self.chunk(text)]
@@ -0,0 +1,34 @@
+"""
+Nancy Concurrency Helpers
+Runs blocking brain work (DuckDB, Chroma, Neo4j, file parsing) off the event
+loop so that async request handlers never stall other requests.
+"""
+
+import os
+from functools import partial
+from typing import Any, Callable, Optional
+
+import anyio
+import anyio.to_thread
+
+# Threads available to blocking ingestion/brain work. Kept separate from the
+# default threadpool so long ingestions cannot starve sync request handlers.
+BLOCKING_THREADS = int(os.getenv("NANCY_BLOCKING_THREADS", "8"))
+
+_blocking_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+def get_blocking_limiter() -> anyio.CapacityLimiter:
+    """Return the shared limiter, created lazily inside the running event loop."""
+    global _blocking_limiter
+    if _blocking_limiter is None:
+        _blocking_limiter = anyio.CapacityLimiter(BLOCKING_THREADS)
+    return _blocking_limiter
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking callable in the bounded worker threadpool and await its result.
+    Equivalent to starlette's run_in_threadpool, but capped at BLOCKING_THREADS.
+    """
+    return await anyio.to_thread.run_sync(partial(func, *args, **kwargs), limiter=get_blocking_limiter())
@@ -22,6 +22,7 @@ class BrainBackend(str, Enum):
     PINECONE = "pinecone"
     QDRANT = "qdrant"
     FAISS = "faiss"
+    EXACT = "exact"  # in-process brute-force search (core/exact_vectors.py)
     
     # Analytical backends
     DUCKDB = "duckdb"
@@ -35,6 +36,10 @@ class BrainBackend(str, Enum):
     TIGERGRAPH = "tigergraph"
     NEPTUNE = "neptune"
 
+    # In-process backends: graph persisted to DuckDB (core/embedded_graph.py),
+    # vectors in a local Chroma store (core/vector_backend.py)
+    EMBEDDED = "embedded"
+
 
 class OrchestrationMode(str, Enum):
     FOUR_BRAIN = "four_brain"
@@ -82,6 +87,7 @@ class DuckDBConnection(ConnectionConfig):
     database_path: str
     read_only: bool = False
     memory_limit: str = "1GB"
+    threads: Optional[int] = None
 
 
 class Neo4jConnection(ConnectionConfig):
@@ -106,11 +112,12 @@ class VectorBrainConfig(BaseModel):
     embedding_model: str = "BAAI/bge-small-en-v1.5"
     chunk_size: int = Field(default=512, ge=100, le=2000)
     chunk_overlap: int = Field(default=50, ge=0, le=200)
+    retrieval_mode: str = Field(default="vector", pattern="^(vector|lexical|hybrid|auto)$")
     connection: Dict[str, Any]
     
     @validator('backend')
     def validate_vector_backend(cls, v):
-        valid_backends = [BrainBackend.CHROMADB, BrainBackend.WEAVIATE, BrainBackend.PINECONE, BrainBackend.QDRANT, BrainBackend.FAISS]
+        valid_backends = [BrainBackend.CHROMADB, BrainBackend.WEAVIATE, BrainBackend.PINECONE, BrainBackend.QDRANT, BrainBackend.FAISS, BrainBackend.EXACT, BrainBackend.EMBEDDED]
         if v not in valid_backends:
             raise ValueError(f"Invalid vector backend: {v}")
         return v
@@ -139,7 +146,7 @@ class GraphBrainConfig(BaseModel):
     
     @validator('backend')
     def validate_graph_backend(cls, v):
-        valid_backends = [BrainBackend.NEO4J, BrainBackend.ARANGODB, BrainBackend.TIGERGRAPH, BrainBackend.NEPTUNE]
+        valid_backends = [BrainBackend.NEO4J, BrainBackend.ARANGODB, BrainBackend.TIGERGRAPH, BrainBackend.NEPTUNE, BrainBackend.EMBEDDED]
         if v not in valid_backends:
             raise ValueError(f"Invalid graph backend: {v}")
         return v
@@ -0,0 +1,256 @@
+"""
+Filesystem watch mode for directory ingestion.
+
+Each enabled directory_config row gets a watchdog observer (inotify on Linux).
+Events are debounced and coalesced per path, filtered through the directory's
+include/ignore patterns and pushed straight into the file_state pending queue,
+so a project folder stays fresh without re-walking the tree. A full rescan per
+directory still runs periodically as a consistency check for missed events
+(inotify queue overflows, changes made while Nancy was down).
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, Callable
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+# Quiet period before a path's events are applied
+DEFAULT_DEBOUNCE_SECONDS = float(os.getenv("NANCY_WATCH_DEBOUNCE_SECONDS", "2.0"))
+
+# Interval of the full consistency rescan per watched directory
+DEFAULT_RESCAN_INTERVAL_SECONDS = float(os.getenv("NANCY_WATCH_RESCAN_SECONDS", "3600"))
+
+FLUSH_INTERVAL_SECONDS = 0.5
+
+
+class _DirectoryEventHandler(FileSystemEventHandler):
+    """Forwards watchdog events for one watched directory to the watcher."""
+
+    def __init__(self, watcher: "DirectoryWatcher", config_id: str):
+        super().__init__()
+        self.watcher = watcher
+        self.config_id = config_id
+
+    def on_any_event(self, event):
+        if event.event_type in ("opened", "closed_no_write"):
+            return
+        self.watcher._record_event(self.config_id, event.src_path, event.is_directory)
+        dest_path = getattr(event, "dest_path", None)
+        if dest_path:
+            self.watcher._record_event(self.config_id, dest_path, event.is_directory)
+
+
+class DirectoryWatcher:
+    """
+    Watches the enabled directory configurations and keeps file_state current.
+    """
+
+    def __init__(self, directory_service, debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+                 rescan_interval_seconds: float = DEFAULT_RESCAN_INTERVAL_SECONDS,
+                 on_changes: Optional[Callable[[str, int], None]] = None):
+        """
+        Args:
+            directory_service: DirectoryIngestionService used for filtering and file state
+            debounce_seconds: Quiet period per path before its events are applied
+            rescan_interval_seconds: Interval of the full consistency rescan
+            on_changes: Called with (directory_root, queued_count) after a flush
+                queued new or changed files, e.g. to start a process job
+        """
+        self.directory_service = directory_service
+        self.analytical_brain = directory_service.analytical_brain
+        self.debounce_seconds = debounce_seconds
+        self.rescan_interval_seconds = rescan_interval_seconds
+        self.on_changes = on_changes
+
+        self.configs: Dict[str, Dict[str, Any]] = {}
+        self.observer = None
+        self._pending: Dict[tuple, float] = {}
+        self._pending_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._next_rescan: Dict[str, float] = {}
+
+        # Metrics
+        self.events_received = 0
+        self.paths_flushed = 0
+        self.files_queued = 0
+        self.rescans = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> Dict[str, Any]:
+        """Start watching every enabled directory configuration."""
+        if not WATCHDOG_AVAILABLE:
+            return {"error": "Watch mode requires the watchdog package (pip install watchdog)"}
+        if self.is_running:
+            return self.get_status()
+
+        self.configs = {}
+        self._next_rescan = {}
+        self.observer = Observer()
+        for config in self.analytical_brain.get_directory_configs(enabled_only=True):
+            directory_path = config["directory_path"]
+            if not os.path.isdir(directory_path):
+                print(f"Skipping watch for missing directory: {directory_path}")
+                continue
+            self.configs[config["id"]] = config
+            # Changes made while Nancy was down are only found by a rescan
+            self._next_rescan[config["id"]] = time.monotonic()
+            self.observer.schedule(
+                _DirectoryEventHandler(self, config["id"]),
+                directory_path,
+                recursive=bool(config.get("recursive", True))
+            )
+
+        self._stop.clear()
+        self.observer.start()
+        self._thread = threading.Thread(target=self._run, name="nancy-directory-watcher", daemon=True)
+        self._thread.start()
+        print(f"Directory watcher started for {len(self.configs)} directories "
+              f"({type(self.observer).__name__}, debounce {self.debounce_seconds}s)")
+        return self.get_status()
+
+    def stop(self):
+        """Stop watching; pending events are flushed first."""
+        self._stop.set()
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join(timeout=5)
+            self.observer = None
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        print("Directory watcher stopped")
+
+    def _record_event(self, config_id: str, path: str, is_directory: bool):
+        """Called from the observer thread; only stamps the path's last event time."""
+        with self._pending_lock:
+            self._pending[(config_id, path, is_directory)] = time.monotonic()
+            self.events_received += 1
+
+    def _run(self):
+        while not self._stop.wait(FLUSH_INTERVAL_SECONDS):
+            try:
+                self._flush(force=False)
+                self._rescan_due()
+            except Exception as e:
+                print(f"Directory watcher error: {e}")
+        self._flush(force=True)
+
+    def _flush(self, force: bool):
+        """Apply every path whose events have been quiet for debounce_seconds."""
+        now = time.monotonic()
+        with self._pending_lock:
+            ready = [key for key, last_event in self._pending.items()
+                     if force or now - last_event >= self.debounce_seconds]
+            for key in ready:
+                del self._pending[key]
+
+        queued_by_root: Dict[str, int] = {}
+        for config_id, path, is_directory in ready:
+            config = self.configs.get(config_id)
+            if config is None:
+                continue
+            queued = self._apply_path(config, path, is_directory)
+            if queued:
+                root = config["directory_path"]
+                queued_by_root[root] = queued_by_root.get(root, 0) + queued
+        self.paths_flushed += len(ready)
+
+        for root, queued in queued_by_root.items():
+            self.files_queued += queued
+            print(f"Directory watcher queued {queued} changed files under {root}")
+            if self.on_changes:
+                try:
+                    self.on_changes(root, queued)
+                except Exception as e:
+                    print(f"Directory watcher change callback failed: {e}")
+
+    def _apply_path(self, config: Dict[str, Any], path: str, is_directory: bool) -> int:
+        """Bring file_state in line with the path's current state; returns files queued."""
+        root = config["directory_path"]
+        file_patterns = config.get("file_patterns")
+        ignore_patterns = config.get("ignore_patterns")
+
+        if not os.path.exists(path):
+            # Removed or moved away: the file, or everything under the directory
+            self.directory_service.remove_path(path)
+            return 0
+
+        if os.path.isdir(path):
+            # Directory events matter only when a directory appears with content
+            # (moved in, restored); file events inside it are not reported
+            if not is_directory:
+                return 0
+            return self._apply_directory(config, path)
+
+        status = self.directory_service.track_file_change(path, root, file_patterns, ignore_patterns)
+        return 1 if status == "queued" else 0
+
+    def _apply_directory(self, config: Dict[str, Any], directory: str) -> int:
+        root = config["directory_path"]
+        queued = 0
+        for current, dirs, files in os.walk(directory):
+            dirs[:] = [d for d in dirs if not self.directory_service._should_ignore_directory(
+                os.path.relpath(os.path.join(current, d), root), config.get("ignore_patterns"))]
+            for name in files:
+                status = self.directory_service.track_file_change(
+                    os.path.join(current, name), root, config.get("file_patterns"), config.get("ignore_patterns")
+                )
+                queued += status == "queued"
+        return queued
+
+    def _rescan_due(self):
+        """Run the consistency rescan for directories whose interval has elapsed."""
+        for config_id, config in self.configs.items():
+            if time.monotonic() < self._next_rescan.get(config_id, 0):
+                continue
+            if self._stop.is_set():
+                return
+
+            print(f"Directory watcher consistency rescan of {config['directory_path']}")
+            result = self.directory_service.scan_directory(
+                directory_path=config["directory_path"],
+                recursive=bool(config.get("recursive", True)),
+                file_patterns=config.get("file_patterns"),
+                ignore_patterns=config.get("ignore_patterns"),
+                author="Directory Watcher"
+            )
+            self.analytical_brain.update_directory_last_scan(config_id)
+            self._next_rescan[config_id] = time.monotonic() + self.rescan_interval_seconds
+            self.rescans += 1
+
+            queued = result.get("files_to_process", 0) if "error" not in result else 0
+            if queued and self.on_changes:
+                try:
+                    self.on_changes(config["directory_path"], queued)
+                except Exception as e:
+                    print(f"Directory watcher change callback failed: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._pending_lock:
+            pending_paths = len(self._pending)
+        return {
+            "watching": self.is_running,
+            "watchdog_available": WATCHDOG_AVAILABLE,
+            "observer": type(self.observer).__name__ if self.observer is not None else None,
+            "directories": [config["directory_path"] for config in self.configs.values()],
+            "debounce_seconds": self.debounce_seconds,
+            "rescan_interval_seconds": self.rescan_interval_seconds,
+            "pending_paths": pending_paths,
+            "events_received": self.events_received,
+            "paths_flushed": self.paths_flushed,
+            "files_queued": self.files_queued,
+            "rescans": self.rescans
+        }
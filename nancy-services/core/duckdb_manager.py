@@ -0,0 +1,116 @@
+"""
+Process-wide DuckDB access for the Analytical Brain.
+
+A DuckDB file takes one read-write handle per process, and a connection must
+not be used by two threads at once. Every AnalyticalBrain therefore shares
+one DuckDBManager per database file:
+- one writer connection; writes are serialized by a single lock, one
+  transaction at a time (transaction() wraps an explicit batch, nested
+  transactions join the outer one)
+- one reader cursor per thread (writer.cursor(), sharing the database
+  instance), so reads run concurrently and see committed data; a thread
+  inside a write transaction reads through the writer and sees its own
+  uncommitted writes
+
+memory_limit and threads are read from brains.analytical.connection;
+NANCY_DUCKDB_MEMORY_LIMIT and NANCY_DUCKDB_THREADS override them.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+import duckdb
+
+DEFAULT_DATABASE_PATH = os.path.join("data", "project_nancy.duckdb")
+
+
+def get_analytical_connection_config() -> dict:
+    """
+    DuckDB settings (memory_limit, threads) of the Analytical Brain, from
+    brains.analytical.connection in the Nancy configuration.
+    """
+    connection = {}
+    try:
+        from .config_manager import get_config_manager
+        manager = get_config_manager()
+        config = manager.config or manager.load_config()
+        connection = dict(config.brains.analytical.connection)
+    except Exception as e:
+        print(f"Analytical configuration not loaded, using DuckDB defaults: {e}")
+    if os.getenv("NANCY_DUCKDB_MEMORY_LIMIT"):
+        connection["memory_limit"] = os.getenv("NANCY_DUCKDB_MEMORY_LIMIT")
+    if os.getenv("NANCY_DUCKDB_THREADS"):
+        connection["threads"] = int(os.getenv("NANCY_DUCKDB_THREADS"))
+    return {key: connection[key] for key in ("memory_limit", "threads") if connection.get(key)}
+
+
+class DuckDBManager:
+    """
+    The writer connection and per-thread reader cursors of one DuckDB file.
+    """
+
+    def __init__(self, database_path: str, settings: dict = None):
+        self.database_path = database_path
+        self.settings = dict(settings or {})
+        if database_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(database_path)), exist_ok=True)
+        self._writer = duckdb.connect(database=database_path, read_only=False, config=self.settings)
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+
+    def connection(self):
+        """
+        Connection for the calling thread: the writer while it holds a write
+        transaction, else its own reader cursor.
+        """
+        if getattr(self._local, "depth", 0):
+            return self._writer
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self._writer.cursor()
+            self._local.cursor = cursor
+        return cursor
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run a batch of writes on the writer connection as one transaction,
+        committed on exit and rolled back on error.
+        """
+        with self._write_lock:
+            depth = getattr(self._local, "depth", 0)
+            self._local.depth = depth + 1
+            try:
+                if depth:
+                    yield self._writer
+                    return
+                self._writer.execute("BEGIN TRANSACTION")
+                try:
+                    yield self._writer
+                    self._writer.execute("COMMIT")
+                except Exception:
+                    self._writer.execute("ROLLBACK")
+                    raise
+            finally:
+                self._local.depth = depth
+
+    def close(self):
+        with self._write_lock:
+            self._writer.close()
+
+
+# One manager per database file, shared by every AnalyticalBrain in the process
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_duckdb_manager(database_path: str = None) -> DuckDBManager:
+    database_path = database_path or DEFAULT_DATABASE_PATH
+    key = database_path if database_path == ":memory:" else os.path.abspath(database_path)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = DuckDBManager(database_path, get_analytical_connection_config())
+            _managers[key] = manager
+        return manager
@@ -0,0 +1,1441 @@
+"""
+Embedded in-process Graph Brain backend.
+
+For single-node deployments and CI the graph is small enough to live in the
+Nancy process: nodes and relationships are held in memory, with adjacency,
+name and entity-text indexes, and persisted write-through to two DuckDB
+property-graph tables (graph_nodes, graph_relationships). Queries are plain
+Python over the indexes, so there is no server, network round-trip or
+transaction overhead per call.
+
+The store behind a database file is shared by every EmbeddedGraphBrain in
+the process and guarded by one lock; the file must not be opened by another
+process at the same time. database_path ":memory:" keeps the graph in memory
+only.
+"""
+
+import bisect
+import heapq
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+import duckdb
+import pandas as pd
+
+from .graph_backend import (
+    GraphBackend, ENTITY_LABELS, DEFAULT_ENTITY_LIMIT, DEFAULT_TRAVERSAL_MAX_NODES,
+    entity_words, entity_numbered_terms
+)
+
+DEFAULT_GRAPH_DATABASE_PATH = "./data/nancy_graph.duckdb"
+
+# Properties a node is merged on (Document nodes on filename, CodeFile nodes on file_path)
+KEY_PROPERTIES = ("name", "filename", "file_path")
+
+# Properties searched by resolve_entities, as in the Neo4j entity full-text indexes
+TEXT_PROPERTIES = ("name", "filename", "context")
+
+_ENTITY_LABEL_SET = frozenset(ENTITY_LABELS)
+
+
+def _entity_terms(text: str) -> list:
+    """Words and numbered terms of text, as indexed by entity_words and entity_terms in Neo4j."""
+    return entity_words(text) + entity_numbered_terms(text)
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    """ISO string or datetime as an aware datetime; naive values are taken as UTC, like Neo4j."""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _sort_key(value):
+    """Ascending order with None last, as Cypher ORDER BY."""
+    return (value is None, value if value is not None else "")
+
+
+class _GraphStore:
+    """
+    Nodes and relationships of one embedded graph, in memory and in DuckDB.
+    All access goes through `lock`; writers run inside write(), which
+    persists the nodes and relationships they touched in one transaction.
+    """
+
+    def __init__(self, database_path: str):
+        self.database_path = database_path
+        self.lock = threading.RLock()
+        self.references = 0
+
+        self.nodes = {}            # id -> {"labels": [...], "properties": {...}}
+        self.relationships = {}    # id -> {"type", "source", "target", "properties"}
+        self.outgoing = defaultdict(dict)   # node id -> {relationship id: None}, insertion ordered
+        self.incoming = defaultdict(dict)
+        self.by_label = defaultdict(dict)   # label -> {node id: None}
+        self.by_key = defaultdict(dict)     # (label, property, value) -> {node id: None}
+        self.by_type = defaultdict(dict)    # relationship type -> {relationship id: None}
+        self.relationship_keys = {}         # (source, type, target) -> relationship id
+        self.by_source_doc = defaultdict(dict)  # doc_id in source_doc_ids -> {relationship id: None}
+        self.text_index = defaultdict(set)  # lowercase word -> node ids
+        self.node_words = {}
+        self._vocabulary = None             # sorted words, rebuilt after text changes
+        self.next_node_id = 1
+        self.next_relationship_id = 1
+
+        self._dirty_nodes, self._dirty_relationships = set(), set()
+        self._deleted_nodes, self._deleted_relationships = set(), set()
+
+        if database_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(database_path)), exist_ok=True)
+        self.connection = duckdb.connect(database_path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS graph_nodes (
+                id BIGINT PRIMARY KEY,
+                labels VARCHAR,
+                properties VARCHAR
+            )
+        """)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS graph_relationships (
+                id BIGINT PRIMARY KEY,
+                type VARCHAR,
+                source BIGINT,
+                target BIGINT,
+                properties VARCHAR
+            )
+        """)
+        self._load()
+
+    def _load(self):
+        for node_id, labels, properties in self.connection.execute(
+                "SELECT id, labels, properties FROM graph_nodes ORDER BY id").fetchall():
+            self._add_node(node_id, json.loads(labels), json.loads(properties))
+        for rel_id, rel_type, source, target, properties in self.connection.execute(
+                "SELECT id, type, source, target, properties FROM graph_relationships ORDER BY id").fetchall():
+            self._add_relationship(rel_id, rel_type, source, target, json.loads(properties))
+        self.next_node_id = max(self.nodes, default=0) + 1
+        self.next_relationship_id = max(self.relationships, default=0) + 1
+
+    @contextmanager
+    def write(self):
+        with self.lock:
+            try:
+                yield self
+            finally:
+                self._persist()
+
+    def _persist(self):
+        if not (self._dirty_nodes or self._dirty_relationships
+                or self._deleted_nodes or self._deleted_relationships):
+            return
+        connection = self.connection
+        connection.execute("BEGIN TRANSACTION")
+        try:
+            if self._deleted_relationships:
+                connection.execute("DELETE FROM graph_relationships WHERE id IN (SELECT unnest(?))",
+                                   [sorted(self._deleted_relationships)])
+            if self._deleted_nodes:
+                connection.execute("DELETE FROM graph_nodes WHERE id IN (SELECT unnest(?))",
+                                   [sorted(self._deleted_nodes)])
+            nodes = [n for n in self._dirty_nodes if n in self.nodes]
+            if nodes:
+                frame = pd.DataFrame({
+                    "id": nodes,
+                    "labels": [json.dumps(self.nodes[n]["labels"]) for n in nodes],
+                    "properties": [json.dumps(self.nodes[n]["properties"], default=str) for n in nodes]
+                })
+                connection.register("graph_node_rows", frame)
+                connection.execute("INSERT OR REPLACE INTO graph_nodes SELECT id, labels, properties FROM graph_node_rows")
+                connection.unregister("graph_node_rows")
+            relationships = [r for r in self._dirty_relationships if r in self.relationships]
+            if relationships:
+                frame = pd.DataFrame({
+                    "id": relationships,
+                    "type": [self.relationships[r]["type"] for r in relationships],
+                    "source": [self.relationships[r]["source"] for r in relationships],
+                    "target": [self.relationships[r]["target"] for r in relationships],
+                    "properties": [json.dumps(self.relationships[r]["properties"], default=str)
+                                   for r in relationships]
+                })
+                connection.register("graph_relationship_rows", frame)
+                connection.execute("""
+                    INSERT OR REPLACE INTO graph_relationships
+                    SELECT id, type, source, target, properties FROM graph_relationship_rows
+                """)
+                connection.unregister("graph_relationship_rows")
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        finally:
+            self._dirty_nodes, self._dirty_relationships = set(), set()
+            self._deleted_nodes, self._deleted_relationships = set(), set()
+
+    def close(self):
+        self.connection.close()
+
+    # -- Nodes ------------------------------------------------------------
+
+    def _add_node(self, node_id, labels, properties):
+        self.nodes[node_id] = {"labels": labels, "properties": properties}
+        for label in labels:
+            self.by_label[label][node_id] = None
+            for key in KEY_PROPERTIES:
+                if properties.get(key) is not None:
+                    self.by_key[(label, key, properties[key])][node_id] = None
+        self._index_text(node_id)
+
+    def _index_text(self, node_id):
+        node = self.nodes[node_id]
+        words = set()
+        if _ENTITY_LABEL_SET.intersection(node["labels"]):
+            for key in TEXT_PROPERTIES:
+                value = node["properties"].get(key)
+                if isinstance(value, str):
+                    words.update(_entity_terms(value))
+        previous = self.node_words.get(node_id, set())
+        if words == previous:
+            return
+        for word in previous - words:
+            self.text_index[word].discard(node_id)
+        for word in words - previous:
+            if not self.text_index[word]:
+                self._vocabulary = None
+            self.text_index[word].add(node_id)
+        self.node_words[node_id] = words
+
+    def vocabulary(self) -> list:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(word for word, ids in self.text_index.items() if ids)
+        return self._vocabulary
+
+    def find(self, label: str, key: str, value, **properties) -> list:
+        """Ids of label nodes whose key property is value and that have every other given property."""
+        return [node_id for node_id in self.by_key.get((label, key, value), ())
+                if all(self.nodes[node_id]["properties"].get(k) == v for k, v in properties.items())]
+
+    def merge_node(self, label: str, key: str, value, **properties) -> int:
+        """MERGE (n:label {key: value, **properties}): the first match, or a new node."""
+        matches = self.find(label, key, value, **properties)
+        if matches:
+            return matches[0]
+        node_id = self.next_node_id
+        self.next_node_id += 1
+        self._add_node(node_id, [label], {key: value, **properties})
+        self._dirty_nodes.add(node_id)
+        return node_id
+
+    def set_properties(self, node_id: int, **properties):
+        """SET properties of a node; None values leave the property unchanged."""
+        node = self.nodes[node_id]
+        for key, value in properties.items():
+            if value is None or node["properties"].get(key) == value:
+                continue
+            if key in KEY_PROPERTIES:
+                for label in node["labels"]:
+                    old = node["properties"].get(key)
+                    if old is not None:
+                        self.by_key[(label, key, old)].pop(node_id, None)
+                    self.by_key[(label, key, value)][node_id] = None
+            node["properties"][key] = value
+            self._dirty_nodes.add(node_id)
+        self._index_text(node_id)
+
+    def delete_node(self, node_id: int):
+        """DETACH DELETE."""
+        for rel_id in list(self.outgoing.get(node_id, ())) + list(self.incoming.get(node_id, ())):
+            if rel_id in self.relationships:
+                self.delete_relationship(rel_id)
+        node = self.nodes.pop(node_id)
+        for label in node["labels"]:
+            self.by_label[label].pop(node_id, None)
+            for key in KEY_PROPERTIES:
+                if node["properties"].get(key) is not None:
+                    self.by_key[(label, key, node["properties"][key])].pop(node_id, None)
+        for word in self.node_words.pop(node_id, ()):
+            self.text_index[word].discard(node_id)
+        self.outgoing.pop(node_id, None)
+        self.incoming.pop(node_id, None)
+        self._dirty_nodes.discard(node_id)
+        self._deleted_nodes.add(node_id)
+
+    def props(self, node_id: int) -> dict:
+        return self.nodes[node_id]["properties"]
+
+    def labels(self, node_id: int) -> list:
+        return self.nodes[node_id]["labels"]
+
+    def has_label(self, node_id: int, label: str) -> bool:
+        return label in self.nodes[node_id]["labels"]
+
+    def with_label(self, label: str) -> list:
+        return list(self.by_label.get(label, ()))
+
+    def degree(self, node_id: int) -> int:
+        return len(self.outgoing.get(node_id, ())) + len(self.incoming.get(node_id, ()))
+
+    # -- Relationships ----------------------------------------------------
+
+    def _add_relationship(self, rel_id, rel_type, source, target, properties):
+        self.relationships[rel_id] = {"type": rel_type, "source": source, "target": target,
+                                      "properties": properties}
+        self.outgoing[source][rel_id] = None
+        self.incoming[target][rel_id] = None
+        self.by_type[rel_type][rel_id] = None
+        self.relationship_keys[(source, rel_type, target)] = rel_id
+        for doc_id in properties.get("source_doc_ids", ()):
+            self.by_source_doc[doc_id][rel_id] = None
+
+    def merge_relationship(self, source: int, rel_type: str, target: int, **properties) -> int:
+        """MERGE (source)-[r:rel_type]->(target) SET r += properties (None values are skipped)."""
+        rel_id = self.relationship_keys.get((source, rel_type, target))
+        if rel_id is None:
+            rel_id = self.next_relationship_id
+            self.next_relationship_id += 1
+            self._add_relationship(rel_id, rel_type, source, target, {})
+            self._dirty_relationships.add(rel_id)
+        relationship = self.relationships[rel_id]
+        for key, value in properties.items():
+            if value is not None and relationship["properties"].get(key) != value:
+                relationship["properties"][key] = value
+                self._dirty_relationships.add(rel_id)
+        return rel_id
+
+    def set_relationship_properties(self, rel_id: int, **properties):
+        relationship_properties = self.relationships[rel_id]["properties"]
+        if "source_doc_ids" in properties:
+            self._unindex_sources(rel_id, relationship_properties)
+            for doc_id in properties["source_doc_ids"] or ():
+                self.by_source_doc[doc_id][rel_id] = None
+        relationship_properties.update(properties)
+        self._dirty_relationships.add(rel_id)
+
+    def _unindex_sources(self, rel_id: int, properties: dict):
+        for doc_id in properties.get("source_doc_ids") or ():
+            rel_ids = self.by_source_doc.get(doc_id)
+            if rel_ids is not None:
+                rel_ids.pop(rel_id, None)
+                if not rel_ids:
+                    del self.by_source_doc[doc_id]
+
+    def with_source_doc(self, doc_id: str) -> list:
+        """Ids of the relationships whose source_doc_ids contain doc_id."""
+        return list(self.by_source_doc.get(doc_id, ()))
+
+    def delete_relationship(self, rel_id: int):
+        relationship = self.relationships.pop(rel_id)
+        self._unindex_sources(rel_id, relationship["properties"])
+        self.outgoing[relationship["source"]].pop(rel_id, None)
+        self.incoming[relationship["target"]].pop(rel_id, None)
+        self.by_type[relationship["type"]].pop(rel_id, None)
+        self.relationship_keys.pop((relationship["source"], relationship["type"], relationship["target"]), None)
+        self._dirty_relationships.discard(rel_id)
+        self._deleted_relationships.add(rel_id)
+
+    def out(self, node_id: int, *types):
+        """(relationship, neighbour id) for each outgoing relationship, optionally of the given types."""
+        for rel_id in self.outgoing.get(node_id, ()):
+            relationship = self.relationships[rel_id]
+            if not types or relationship["type"] in types:
+                yield relationship, relationship["target"]
+
+    def into(self, node_id: int, *types):
+        """(relationship, neighbour id) for each incoming relationship, optionally of the given types."""
+        for rel_id in self.incoming.get(node_id, ()):
+            relationship = self.relationships[rel_id]
+            if not types or relationship["type"] in types:
+                yield relationship, relationship["source"]
+
+    def both(self, node_id: int, *types):
+        yield from self.out(node_id, *types)
+        yield from self.into(node_id, *types)
+
+
+# One store per database file, shared by every EmbeddedGraphBrain in the process
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def _acquire_store(database_path: str) -> _GraphStore:
+    with _stores_lock:
+        key = database_path if database_path == ":memory:" else os.path.abspath(database_path)
+        store = _stores.get(key)
+        if store is None:
+            store = _GraphStore(database_path)
+            _stores[key] = store
+        store.references += 1
+        return store
+
+
+def _release_store(store: _GraphStore):
+    with _stores_lock:
+        store.references -= 1
+        if store.references == 0:
+            key = store.database_path if store.database_path == ":memory:" else os.path.abspath(store.database_path)
+            _stores.pop(key, None)
+            store.close()
+
+
+class EmbeddedGraphBrain(GraphBackend):
+    """
+    Graph Brain held in process and persisted to DuckDB - the project knowledge
+    graph without a Neo4j server. Answers the same queries as GraphBrain.
+    """
+    backend_name = "embedded"
+
+    def __init__(self, database_path: str = None):
+        super().__init__()
+        self.database_path = database_path or DEFAULT_GRAPH_DATABASE_PATH
+        self._store = _acquire_store(self.database_path)
+
+    def close(self):
+        if self._store is not None:
+            _release_store(self._store)
+            self._store = None
+
+    def health_check(self) -> dict:
+        try:
+            with self._store.lock:
+                nodes = len(self._store.nodes)
+            return {"status": "healthy", "details": f"Embedded graph operational ({nodes} nodes)"}
+        except Exception as e:
+            return {"status": "unhealthy", "error": str(e)}
+
+    # ============================================================================
+    # WRITERS
+    # ============================================================================
+
+    def add_document_node(self, filename: str, file_type: str):
+        """
+        Adds a new Document node to the graph.
+        """
+        with self._store.write() as store:
+            if not store.find("Document", "filename", filename):
+                store.merge_node("Document", "filename", filename, file_type=file_type)
+        print(f"Added Document node for {filename} to the embedded graph.")
+
+    def add_author_relationship(self, filename: str, author_name: str):
+        """
+        Creates a Person node for the author (if it doesn't exist)
+        and links it to the Document node.
+        """
+        with self._store.write() as store:
+            person = store.merge_node("Person", "name", author_name)
+            document = store.merge_node("Document", "filename", filename)
+            store.merge_relationship(person, "AUTHORED", document)
+        print(f"Linked author {author_name} to document {filename} in the embedded graph.")
+
+    def add_relationship(self, source_node_label: str, source_node_name: str, relationship_type: str,
+                         target_node_label: str, target_node_name: str, context: str = None):
+        """
+        Creates a generic relationship between two nodes with optional context.
+        """
+        source_doc_id = getattr(self._provenance, "doc_id", None)
+        with self._store.write() as store:
+            rel_id = self._merge_named_relationship(store, source_node_label, source_node_name, relationship_type,
+                                                    target_node_label, target_node_name, context)
+            if source_doc_id:
+                # Several documents can assert the same edge; keep every source
+                source_doc_ids = store.relationships[rel_id]["properties"].get("source_doc_ids", [])
+                if source_doc_id not in source_doc_ids:
+                    store.set_relationship_properties(rel_id, source_doc_ids=source_doc_ids + [source_doc_id])
+        print(f"Linked {source_node_name} -[:{relationship_type}]-> {target_node_name} in the embedded graph.")
+
+    @staticmethod
+    def _merge_named_relationship(store, source_label, source_name, relationship_type,
+                                  target_label, target_name, context=None) -> int:
+        GraphBackend._validate_relationship_types([source_label, relationship_type, target_label])
+        source = store.merge_node(source_label, "name", source_name)
+        target = store.merge_node(target_label, "name", target_name)
+        return store.merge_relationship(source, relationship_type, target, context=context or None)
+
+    def add_relationships(self, relationships: list[dict]):
+        """
+        Create many relationships at once. Each dict has the add_relationship arguments:
+        source_node_label, source_node_name, relationship_type, target_node_label,
+        target_node_name and optional context.
+        """
+        with self._store.write() as store:
+            for rel in relationships:
+                self._merge_named_relationship(
+                    store, rel["source_node_label"], rel["source_node_name"], rel["relationship_type"],
+                    rel["target_node_label"], rel["target_node_name"], rel.get("context")
+                )
+        print(f"Linked {len(relationships)} relationships in the embedded graph.")
+
+    def add_concept_node(self, concept_name: str, concept_type: str = "Concept"):
+        """
+        Add a concept node to the graph (for topics, technologies, constraints, etc.)
+        """
+        with self._store.write() as store:
+            store.merge_node(concept_type, "name", concept_name)
+        print(f"Added {concept_type} node for {concept_name} to the embedded graph.")
+
+    def add_concept_nodes(self, nodes: list[tuple]):
+        """
+        Add many (concept_name, concept_type) nodes in one write.
+        """
+        with self._store.write() as store:
+            for concept_name, concept_type in nodes:
+                store.merge_node(concept_type or "Concept", "name", concept_name)
+        print(f"Added {len(nodes)} concept nodes to the embedded graph.")
+
+    def remove_document_provenance(self, doc_ids: list[str], code_files: list[str] = None) -> dict:
+        """
+        Retire the graph facts contributed by replaced or deleted documents.
+
+        doc_ids are removed from each relationship's source_doc_ids; relationships
+        no other document supports are deleted. Function and Class nodes of
+        code_files are removed outright, as they are rebuilt from the new version.
+        """
+        doc_ids = set(doc_ids)
+        code_files = set(code_files or [])
+        updated = deleted = code_nodes_deleted = 0
+        with self._store.write() as store:
+            rel_ids = dict.fromkeys(rel_id for doc_id in doc_ids for rel_id in store.with_source_doc(doc_id))
+            for rel_id in rel_ids:
+                sources = store.relationships[rel_id]["properties"]["source_doc_ids"]
+                updated += 1
+                remaining = [doc_id for doc_id in sources if doc_id not in doc_ids]
+                if remaining:
+                    store.set_relationship_properties(rel_id, source_doc_ids=remaining)
+                else:
+                    store.delete_relationship(rel_id)
+                    deleted += 1
+
+            for file_path in code_files:
+                for code_file in store.find("CodeFile", "file_path", file_path):
+                    code_nodes = {node_id for _, node_id in store.out(code_file, "CONTAINS_FUNCTION", "CONTAINS_CLASS")
+                                  if store.props(node_id).get("file_path") == file_path}
+                    for node_id in code_nodes:
+                        store.delete_node(node_id)
+                        code_nodes_deleted += 1
+                    for rel_id in list(store.outgoing.get(code_file, ())):
+                        if store.relationships[rel_id]["type"] == "IMPORTS":
+                            store.delete_relationship(rel_id)
+
+        print(f"Retired {deleted} relationships and {code_nodes_deleted} code nodes "
+              f"for {len(doc_ids)} documents in the embedded graph.")
+        return {
+            "relationships_updated": updated,
+            "relationships_deleted": deleted,
+            "code_nodes_deleted": code_nodes_deleted
+        }
+
+    def add_decision_node(self, decision_name: str, decision_maker: str, context: str = None, era: str = None):
+        """
+        Add a decision node with the person who made it and optional context.
+        """
+        with self._store.write() as store:
+            decision = store.merge_node("Decision", "name", decision_name)
+            store.set_properties(decision, context=context, era=era)
+            person = store.merge_node("Person", "name", decision_maker)
+            store.merge_relationship(person, "MADE", decision)
+        print(f"Added Decision '{decision_name}' by {decision_maker} to GraphBrain.")
+
+    def add_meeting_node(self, meeting_name: str, attendees: list, decisions_made: list = None, era: str = None):
+        """
+        Add a meeting node with attendees and any decisions that resulted.
+        """
+        with self._store.write() as store:
+            meeting = store.merge_node("Meeting", "name", meeting_name)
+            store.set_properties(meeting, era=era)
+            for attendee in attendees:
+                store.merge_relationship(store.merge_node("Person", "name", attendee), "ATTENDED", meeting)
+            for decision in decisions_made or []:
+                store.merge_relationship(meeting, "RESULTED_IN", store.merge_node("Decision", "name", decision))
+        print(f"Added Meeting '{meeting_name}' with {len(attendees)} attendees to GraphBrain.")
+
+    def add_feature_node(self, feature_name: str, owner: str = None, influenced_by_decisions: list = None,
+                         era: str = None):
+        """
+        Add a feature node and link it to decisions that influenced it.
+        """
+        with self._store.write() as store:
+            feature = store.merge_node("Feature", "name", feature_name)
+            store.set_properties(feature, era=era)
+            if owner:
+                store.merge_relationship(store.merge_node("Person", "name", owner), "OWNS", feature)
+            for decision in influenced_by_decisions or []:
+                store.merge_relationship(store.merge_node("Decision", "name", decision), "LED_TO", feature)
+        print(f"Added Feature '{feature_name}' to GraphBrain.")
+
+    def add_era_node(self, era_name: str, description: str = None, start_date: str = None, end_date: str = None):
+        """
+        Add a project era/phase node (e.g., "Initial Research", "Q3 2025", "MVP Development").
+        """
+        with self._store.write() as store:
+            era = store.merge_node("Era", "name", era_name)
+            store.set_properties(era, description=description, start_date=start_date, end_date=end_date)
+        print(f"Added Era '{era_name}' to GraphBrain.")
+
+    def link_document_to_era(self, filename: str, era_name: str):
+        """
+        Link a document to the era when it was created.
+        """
+        with self._store.write() as store:
+            document = store.merge_node("Document", "filename", filename)
+            store.merge_relationship(document, "CREATED_IN", store.merge_node("Era", "name", era_name))
+        print(f"Linked document {filename} to era {era_name}.")
+
+    def add_foundational_relationships(self, relationships: list[dict]):
+        """
+        Add relationships using the foundational schema:
+        - People & Organization: MEMBER_OF, HAS_ROLE, HAS_EXPERTISE, MADE, ATTENDED
+        - Technical Subsystems: PART_OF, INTERFACES_WITH, CONSTRAINED_BY, AFFECTS
+        - Project Management: VALIDATED_BY, PRODUCED, MITIGATED_BY, INFLUENCED_BY
+        """
+        with self._store.write() as store:
+            for rel in relationships:
+                self._merge_named_relationship(
+                    store, rel['source']['type'], rel['source']['name'], rel['relationship'],
+                    rel['target']['type'], rel['target']['name'], rel.get('context')
+                )
+
+    def add_code_file_node(self, file_path: str, language: str, author: str = None,
+                           lines_of_code: int = None, git_info: dict = None):
+        """
+        Add a code file node with programming language and metadata.
+        """
+        with self._store.write() as store:
+            code_file = store.merge_node("CodeFile", "file_path", file_path)
+            store.set_properties(code_file, language=language, lines_of_code=lines_of_code or None)
+            if author:
+                store.merge_relationship(store.merge_node("Person", "name", author), "AUTHORED", code_file)
+            if git_info and not git_info.get("error"):
+                for contributor in git_info.get("contributors", []):
+                    store.merge_relationship(store.merge_node("Person", "name", contributor),
+                                             "CONTRIBUTED_TO", code_file)
+        print(f"Added CodeFile node for {file_path} ({language}) to the embedded graph.")
+
+    def add_function_node(self, function_name: str, file_path: str, language: str,
+                          line_start: int = None, line_end: int = None,
+                          docstring: str = None, args: list = None):
+        """
+        Add a function/method node and link it to its containing file.
+        """
+        with self._store.write() as store:
+            function = store.merge_node("Function", "name", function_name, file_path=file_path)
+            store.set_properties(function, language=language, line_start=line_start or None,
+                                 line_end=line_end or None, docstring=docstring or None, arguments=args or None)
+            code_file = store.merge_node("CodeFile", "file_path", file_path)
+            store.merge_relationship(code_file, "CONTAINS_FUNCTION", function)
+        print(f"Added Function node for {function_name} in {file_path} to the embedded graph.")
+
+    def add_class_node(self, class_name: str, file_path: str, language: str,
+                       line_start: int = None, line_end: int = None,
+                       docstring: str = None, base_classes: list = None):
+        """
+        Add a class node and link it to its containing file.
+        """
+        with self._store.write() as store:
+            cls = store.merge_node("Class", "name", class_name, file_path=file_path)
+            store.set_properties(cls, language=language, line_start=line_start or None,
+                                 line_end=line_end or None, docstring=docstring or None)
+            code_file = store.merge_node("CodeFile", "file_path", file_path)
+            store.merge_relationship(code_file, "CONTAINS_CLASS", cls)
+            for base_class in base_classes or []:
+                store.merge_relationship(cls, "INHERITS_FROM", store.merge_node("Class", "name", base_class))
+        print(f"Added Class node for {class_name} in {file_path} to the embedded graph.")
+
+    def add_import_relationship(self, importing_file: str, imported_module: str,
+                                import_type: str = "import", alias: str = None):
+        """
+        Add import/dependency relationships between code files and modules.
+        """
+        with self._store.write() as store:
+            module = store.merge_node("Module", "name", imported_module)
+            code_file = store.merge_node("CodeFile", "file_path", importing_file)
+            store.merge_relationship(code_file, "IMPORTS", module, import_type=import_type, alias=alias)
+        print(f"Added import relationship: {importing_file} imports {imported_module}")
+
+    def add_temporal_event(self, event_name: str, event_type: str, timestamp: str = None,
+                           participants: list = None, era: str = None, context: str = None):
+        """
+        Add a temporal event node (meetings, decisions, testing phases, releases, etc.)
+        with precise timestamp tracking and sequential relationships.
+        """
+        moment = _to_datetime(timestamp) if timestamp else datetime.now(timezone.utc)
+        with self._store.write() as store:
+            event = store.merge_node("TemporalEvent", "name", event_name, type=event_type)
+            store.set_properties(event, timestamp=moment.isoformat(), event_date=moment.date().isoformat(),
+                                 context=context, era=era)
+            if era:
+                store.merge_relationship(event, "OCCURRED_IN", store.merge_node("Era", "name", era))
+            for participant in participants or []:
+                store.merge_relationship(store.merge_node("Person", "name", participant), "PARTICIPATED_IN", event)
+
+            # Link the latest earlier event to this one
+            if timestamp:
+                previous, previous_moment = None, None
+                for other in store.with_label("TemporalEvent"):
+                    other_moment = _to_datetime(store.props(other).get("timestamp"))
+                    if (store.props(other).get("name") != event_name and other_moment is not None
+                            and other_moment < moment and (previous_moment is None or other_moment > previous_moment)):
+                        previous, previous_moment = other, other_moment
+                if previous is not None:
+                    store.merge_relationship(previous, "HAPPENED_BEFORE", event)
+        print(f"Added Temporal Event '{event_name}' ({event_type}) to GraphBrain.")
+
+    # ============================================================================
+    # QUERIES
+    # ============================================================================
+
+    def get_author_of_document(self, filename: str) -> Optional[str]:
+        """
+        Finds the author of a given document.
+        """
+        store = self._store
+        with store.lock:
+            for document in store.find("Document", "filename", filename):
+                for _, person in store.into(document, "AUTHORED"):
+                    if store.has_label(person, "Person"):
+                        return store.props(person).get("name")
+        return None
+
+    def get_documents_by_author(self, author_name: str) -> list[str]:
+        """
+        Finds all documents authored by a given person.
+        """
+        store = self._store
+        with store.lock:
+            return [store.props(d).get("filename") for d in self._authored(store, author_name, "Document")]
+
+    def get_authored_documents(self, author_name: str) -> list[dict]:
+        """
+        Get documents authored by a specific person (for IntelligentQueryOrchestrator).
+        """
+        store = self._store
+        with store.lock:
+            rows = [{"document": store.props(d).get("filename"), "file_type": store.props(d).get("file_type")}
+                    for d in self._authored(store, author_name, "Document")]
+        rows.sort(key=lambda row: _sort_key(row["document"]))
+        return rows
+
+    def list_people(self) -> list[str]:
+        """
+        Names of every Person in the graph.
+        """
+        store = self._store
+        with store.lock:
+            return sorted(store.props(p).get("name") for p in store.with_label("Person"))
+
+    def resolve_entities(self, text: str, labels: list = None, limit: int = DEFAULT_ENTITY_LIMIT,
+                         match_all: bool = True) -> list[dict]:
+        """
+        Resolve a free-text topic to graph nodes through the entity word index,
+        best match first: [{"id", "name", "labels", "score"}]. Each word
+        matches whole (scoring 2) or as a prefix (scoring 1); all words must
+        match unless match_all is False. When no word matches, nodes of any
+        label named exactly text are returned (scoring 1).
+        """
+        store = self._store
+        with store.lock:
+            scored = self._score_entities(store, text, match_all)
+            label_filter = set(labels) if labels else None
+            ranked = [
+                (score, node_id) for node_id, score in scored.items()
+                if label_filter is None or label_filter.intersection(store.labels(node_id))
+            ]
+            if not ranked:
+                ranked = [
+                    (1, node_id) for node_id in self._find_named(store, (text or "").strip())
+                    if label_filter is None or label_filter.intersection(store.labels(node_id))
+                ]
+            ranked = heapq.nsmallest(limit, ranked, key=lambda item: (-item[0], item[1]))
+            return [{
+                "id": node_id,
+                "name": store.props(node_id).get("name", store.props(node_id).get("filename")),
+                "labels": list(store.labels(node_id)),
+                "score": float(score)
+            } for score, node_id in ranked]
+
+    @staticmethod
+    def _find_named(store, name: str) -> list:
+        """Ids of nodes of any label whose name or filename is name."""
+        if not name:
+            return []
+        found = {}
+        for label in list(store.by_label):
+            for key in ("name", "filename"):
+                found.update(dict.fromkeys(store.by_key.get((label, key, name), ())))
+        return list(found)
+
+    @staticmethod
+    def _score_entities(store, text, match_all=True) -> dict:
+        terms = _entity_terms(text)
+        if not terms:
+            return {}
+        vocabulary = store.vocabulary()
+        totals = None
+        for term in terms:
+            scores = {node_id: 2 for node_id in store.text_index.get(term, ())}
+            # Single letters only match whole; as prefixes they would match nearly everything
+            if len(term) > 1:
+                position = bisect.bisect_left(vocabulary, term)
+                while position < len(vocabulary) and vocabulary[position].startswith(term):
+                    for node_id in store.text_index[vocabulary[position]]:
+                        scores.setdefault(node_id, 1)
+                    position += 1
+            if totals is None:
+                totals = scores
+            elif match_all:
+                totals = {node_id: totals[node_id] + score for node_id, score in scores.items() if node_id in totals}
+            else:
+                for node_id, score in scores.items():
+                    totals[node_id] = totals.get(node_id, 0) + score
+        return totals or {}
+
+    def _resolve_entity_ids(self, text, labels=None, limit=DEFAULT_ENTITY_LIMIT, match_all=True) -> list:
+        return [entity["id"] for entity in self.resolve_entities(text, labels, limit, match_all)]
+
+    def find_cross_team_influences(self, author1: str, author2: str) -> list[dict]:
+        """
+        Find how one team member's work influenced another's work.
+        """
+        store = self._store
+        with store.lock:
+            documents2 = set(self._authored(store, author2, "Document"))
+            rows = []
+            for d1 in self._authored(store, author1, "Document"):
+                for relationship, d2 in store.both(d1):
+                    if d2 in documents2:
+                        rows.append({
+                            "source_doc": store.props(d1).get("filename"),
+                            "target_doc": store.props(d2).get("filename"),
+                            "relationship_type": relationship["type"],
+                            "context": relationship["properties"].get("context")
+                        })
+        rows.sort(key=lambda row: (_sort_key(row["source_doc"]), _sort_key(row["target_doc"])))
+        return rows
+
+    @staticmethod
+    def _authored(store, author_name, label):
+        return [node for person in store.find("Person", "name", author_name)
+                for _, node in store.out(person, "AUTHORED") if store.has_label(node, label)]
+
+    def find_documents_that_reference_topic(self, topic: str) -> list[dict]:
+        """
+        Find documents that reference or mention a specific topic/concept.
+        """
+        store = self._store
+        rows = {}
+        with store.lock:
+            concept_ids = self._resolve_entity_ids(topic)
+            for concept in concept_ids:
+                if store.props(concept).get("name") != topic:
+                    continue
+                for relationship, document in store.both(concept, "REFERENCES", "MENTIONS", "AFFECTS", "INFLUENCES"):
+                    if store.has_label(document, "Document"):
+                        row = (store.props(document).get("filename"), relationship["type"],
+                               relationship["properties"].get("context"))
+                        rows[row] = None
+        return [{"filename": f, "relationship_type": t, "context": c}
+                for f, t, c in sorted(rows, key=lambda row: _sort_key(row[0]))]
+
+    def get_author_collaboration_network(self, author: str = None) -> list[dict]:
+        """
+        Get the collaboration network - who works with whom through document relationships.
+        """
+        store = self._store
+        counts = defaultdict(int)
+        with store.lock:
+            people = store.find("Person", "name", author) if author else store.with_label("Person")
+            for p1 in people:
+                name1 = store.props(p1).get("name")
+                for _, d1 in store.out(p1, "AUTHORED"):
+                    if not store.has_label(d1, "Document"):
+                        continue
+                    for relationship, d2 in store.both(d1):
+                        if not store.has_label(d2, "Document"):
+                            continue
+                        for _, p2 in store.into(d2, "AUTHORED"):
+                            if not store.has_label(p2, "Person") or p2 == p1:
+                                continue
+                            name2 = store.props(p2).get("name")
+                            if author or (name1 is not None and name2 is not None and name1 < name2):
+                                counts[(name1, name2, relationship["type"])] += 1
+        rows = [{"author1": a1, "author2": a2, "relationship_type": t, "interaction_count": n}
+                for (a1, a2, t), n in counts.items()]
+        rows.sort(key=lambda row: (-row["interaction_count"], _sort_key(row["author2"])))
+        return rows
+
+    def find_decision_impact_chain(self, decision_maker: str, topic: str) -> list[dict]:
+        """
+        Find how a decision maker's choices impacted other work on a topic.
+        """
+        store = self._store
+        rows = {}
+        with store.lock:
+            topic_ids = set(self._resolve_entity_ids(topic, labels=["Document"]))
+            for d1 in self._authored(store, decision_maker, "Document"):
+                # Paths of 1..3 AFFECTS/INFLUENCES/CONSTRAINS hops, each relationship used once
+                stack = [(d1, 0, frozenset())]
+                while stack:
+                    node, length, used = stack.pop()
+                    if length == 3:
+                        continue
+                    for relationship, d2 in store.out(node, "AFFECTS", "INFLUENCES", "CONSTRAINS"):
+                        key = (relationship["source"], relationship["type"], relationship["target"])
+                        if key in used:
+                            continue
+                        stack.append((d2, length + 1, used | {key}))
+                        if not store.has_label(d2, "Document") or not (d1 in topic_ids or d2 in topic_ids):
+                            continue
+                        for _, p2 in store.into(d2, "AUTHORED"):
+                            if store.has_label(p2, "Person"):
+                                rows[(store.props(d1).get("filename"), store.props(d2).get("filename"),
+                                      store.props(p2).get("name"), length + 1)] = None
+        result = [{"decision_document": d1, "affected_document": d2, "affected_author": p2, "impact_distance": n}
+                  for d1, d2, p2, n in rows]
+        result.sort(key=lambda row: (row["impact_distance"], _sort_key(row["affected_author"])))
+        return result
+
+    def get_knowledge_graph_statistics(self, recompute: bool = False) -> dict:
+        """
+        Get statistics about the knowledge graph structure. Counts come from
+        the label and type indexes and degrees from the adjacency lists, so
+        they are always current and recompute has nothing to do.
+        """
+        store = self._store
+        with store.lock:
+            node_counts = {label: len(ids) for label, ids in store.by_label.items() if ids}
+            rel_counts = {rel_type: len(ids) for rel_type, ids in store.by_type.items() if ids}
+            connected_docs = heapq.nlargest(
+                10, store.with_label("Document"), key=store.degree
+            )
+            return {
+                "node_counts": node_counts,
+                "relationship_counts": dict(sorted(rel_counts.items(), key=lambda item: -item[1])),
+                "total_nodes": len(store.nodes),
+                "total_relationships": len(store.relationships),
+                "most_connected_documents": [
+                    {"filename": store.props(d).get("filename"), "connection_count": store.degree(d)}
+                    for d in connected_docs
+                ],
+                "degrees_recomputed_at": None
+            }
+
+    def recompute_degrees(self) -> int:
+        """
+        Degrees are read from the adjacency lists; returns the number of nodes.
+        """
+        with self._store.lock:
+            return len(self._store.nodes)
+
+    def find_decision_provenance(self, feature_or_topic: str) -> list[dict]:
+        """
+        Trace back to find what decisions led to a feature or influenced work on a topic.
+        This answers "Why did we build this feature this way?"
+        """
+        store = self._store
+        rows = {}
+        with store.lock:
+            topic_ids = self._resolve_entity_ids(feature_or_topic, labels=["Feature", "Document"])
+            for item in topic_ids:
+                if store.has_label(item, "Feature"):
+                    decisions = [d for _, d in store.into(item, "LED_TO") if store.has_label(d, "Decision")]
+                    kind, target = "feature", store.props(item).get("name")
+                elif store.has_label(item, "Document"):
+                    decisions = [d for _, d in store.out(item, "INFLUENCED_BY") if store.has_label(d, "Decision")]
+                    kind, target = "document", store.props(item).get("filename")
+                else:
+                    continue
+                for decision in decisions:
+                    props = store.props(decision)
+                    documents = []
+                    if kind == "feature":
+                        documents = list(dict.fromkeys(
+                            store.props(doc).get("filename") for _, doc in store.into(decision, "INFLUENCED_BY")
+                            if store.has_label(doc, "Document")
+                        ))
+                    meetings = [store.props(m).get("name") for _, m in store.into(decision, "RESULTED_IN")
+                                if store.has_label(m, "Meeting")] or [None]
+                    for _, person in store.into(decision, "MADE"):
+                        if not store.has_label(person, "Person"):
+                            continue
+                        for meeting in meetings:
+                            row = (kind, target, props.get("name"), store.props(person).get("name"),
+                                   props.get("context"), props.get("era"), meeting)
+                            rows.setdefault(row, documents)
+        result = [{
+            "type": kind, "target": target, "decision": decision, "decision_maker": maker,
+            "decision_context": context, "era": era, "meeting": meeting, "influencing_documents": documents
+        } for (kind, target, decision, maker, context, era, meeting), documents in rows.items()]
+        result.sort(key=lambda row: (_sort_key(row["era"]), _sort_key(row["decision_maker"])))
+        return result
+
+    def find_knowledge_expert(self, topic: str) -> list[dict]:
+        """
+        Find who are the real experts on a topic by analyzing their connections
+        to decisions, documents, and features related to that topic.
+        """
+        store = self._store
+        holdings = defaultdict(lambda: {"Document": set(), "Decision": set(), "Feature": set()})
+        with store.lock:
+            topic_ids = self._resolve_entity_ids(topic, labels=["Document", "Decision", "Feature"])
+            for item in topic_ids:
+                for label, rel_type in (("Document", "AUTHORED"), ("Decision", "MADE"), ("Feature", "OWNS")):
+                    if store.has_label(item, label):
+                        for _, person in store.into(item, rel_type):
+                            if store.has_label(person, "Person"):
+                                holdings[store.props(person).get("name")][label].add(item)
+        rows = []
+        for expert, items in holdings.items():
+            documents, decisions, features = len(items["Document"]), len(items["Decision"]), len(items["Feature"])
+            rows.append({
+                "expert": expert,
+                "documents_authored": documents,
+                "decisions_made": decisions,
+                "features_owned": features,
+                "expertise_score": documents + decisions * 2 + features * 3
+            })
+        rows.sort(key=lambda row: (-row["expertise_score"], _sort_key(row["expert"])))
+        return rows[:10]
+
+    def find_impact_analysis(self, document_name: str) -> list[dict]:
+        """
+        Find what would be affected if we changed a specific document.
+        Answers "What will this change affect?"
+        """
+        store = self._store
+        rows = {}
+        with store.lock:
+            for document in store.find("Document", "filename", document_name):
+                for _, decision in store.out(document, "INFLUENCED_BY"):
+                    if not store.has_label(decision, "Decision"):
+                        continue
+                    features = [f for _, f in store.out(decision, "LED_TO") if store.has_label(f, "Feature")] or [None]
+                    for feature in features:
+                        owners = [None] if feature is None else (
+                            [p for _, p in store.into(feature, "OWNS") if store.has_label(p, "Person")] or [None])
+                        for owner in owners:
+                            rows[("decision_impact", store.props(decision).get("name"),
+                                  store.props(feature).get("name") if feature is not None else None,
+                                  store.props(owner).get("name") if owner is not None else None,
+                                  "Decision maker")] = None
+                for _, other in store.into(document, "REFERENCES", "DEPENDS_ON"):
+                    if not store.has_label(other, "Document"):
+                        continue
+                    authors = [p for _, p in store.into(other, "AUTHORED") if store.has_label(p, "Person")] or [None]
+                    for author in authors:
+                        rows[("document_impact", store.props(other).get("filename"), None,
+                              store.props(author).get("name") if author is not None else None,
+                              "Document author")] = None
+        result = [{"impact_type": t, "affected_item": item, "downstream_feature": feature,
+                   "stakeholder": stakeholder, "stakeholder_role": role}
+                  for t, item, feature, stakeholder, role in rows]
+        result.sort(key=lambda row: (row["impact_type"], _sort_key(row["affected_item"])))
+        return result
+
+    def find_project_timeline(self, era_name: str = None) -> list[dict]:
+        """
+        Get a timeline view of project evolution showing decisions, meetings, and documents by era.
+        """
+        store = self._store
+        with store.lock:
+            eras = store.find("Era", "name", era_name) if era_name else store.with_label("Era")
+            decisions_by_era, meetings_by_era = defaultdict(list), defaultdict(list)
+            for decision in store.with_label("Decision"):
+                decisions_by_era[store.props(decision).get("era")].append(decision)
+            for meeting in store.with_label("Meeting"):
+                meetings_by_era[store.props(meeting).get("era")].append(meeting)
+
+            rows = []
+            for era in eras:
+                props = store.props(era)
+                documents = []
+                for _, document in store.into(era, "CREATED_IN"):
+                    if store.has_label(document, "Document"):
+                        authors = [store.props(p).get("name") for _, p in store.into(document, "AUTHORED")
+                                   if store.has_label(p, "Person")] or [None]
+                        documents += [{"document": store.props(document).get("filename"), "author": a}
+                                      for a in authors]
+                decisions = []
+                for decision in decisions_by_era.get(props.get("name"), []):
+                    makers = [store.props(p).get("name") for _, p in store.into(decision, "MADE")
+                              if store.has_label(p, "Person")] or [None]
+                    decisions += [{"decision": store.props(decision).get("name"), "maker": maker,
+                                   "context": store.props(decision).get("context")} for maker in makers]
+                rows.append({
+                    "era": props.get("name"),
+                    "era_description": props.get("description"),
+                    "documents": documents,
+                    "decisions": decisions,
+                    "meetings": list(dict.fromkeys(store.props(m).get("name")
+                                                   for m in meetings_by_era.get(props.get("name"), []))),
+                    "_start_date": props.get("start_date")
+                })
+        rows.sort(key=lambda row: (_sort_key(row["_start_date"]), _sort_key(row["era"])))
+        for row in rows:
+            del row["_start_date"]
+        return rows
+
+    def find_knowledge_silos(self) -> list[dict]:
+        """
+        Identify potential knowledge silos - people who are the only ones connected to certain topics.
+        """
+        store = self._store
+        rows = []
+        with store.lock:
+            design_document_ids = self._resolve_entity_ids(
+                "spec design architecture", labels=["Document"], limit=10000, match_all=False
+            )
+            concepts = list(dict.fromkeys(store.with_label("Feature") + store.with_label("Decision")
+                                          + design_document_ids))
+            for concept in concepts:
+                people = {store.props(p).get("name") for _, p in store.into(concept) if store.has_label(p, "Person")}
+                if len(people) == 1:
+                    rows.append({
+                        "concept_type": store.labels(concept)[0],
+                        "concept_name": store.props(concept).get("name"),
+                        "sole_expert": next(iter(people)),
+                        "risk_level": "Potential knowledge silo"
+                    })
+        rows.sort(key=lambda row: (row["concept_type"], _sort_key(row["concept_name"])))
+        return rows
+
+    def explore_relationships(self, entity_name: str) -> list[dict]:
+        """
+        Explore relationships for a specific entity (for IntelligentQueryOrchestrator).
+        """
+        store = self._store
+        rows = []
+        with store.lock:
+            entity_ids = self._resolve_entity_ids(entity_name)
+            for entity in entity_ids:
+                if store.props(entity).get("name") != entity_name:
+                    continue
+                for relationship, related in store.both(entity):
+                    rows.append({
+                        "source": entity_name,
+                        "relationship": relationship["type"],
+                        "target": store.props(related).get("name"),
+                        "target_type": store.labels(related)[0],
+                        "context": relationship["properties"].get("context")
+                    })
+                    if len(rows) == 20:
+                        return rows
+        return rows
+
+    def get_cross_references(self) -> list[dict]:
+        """
+        Get documents that reference each other (for IntelligentQueryOrchestrator).
+        """
+        store = self._store
+        with store.lock:
+            rows = []
+            for rel_id in store.by_type.get("REFERENCES", ()):
+                relationship = store.relationships[rel_id]
+                source, target = relationship["source"], relationship["target"]
+                if store.has_label(source, "Document") and store.has_label(target, "Document"):
+                    rows.append({
+                        "source": store.props(source).get("filename"),
+                        "target": store.props(target).get("filename"),
+                        "context": relationship["properties"].get("context")
+                    })
+        rows.sort(key=lambda row: (_sort_key(row["source"]), _sort_key(row["target"])))
+        return rows
+
+    def find_technical_relationships(self, component_or_subsystem: str) -> list[dict]:
+        """
+        Find technical relationships for components/subsystems using foundational schema
+        """
+        store = self._store
+        groups = {}
+        with store.lock:
+            entity_ids = self._resolve_entity_ids(component_or_subsystem)
+            for entity in entity_ids:
+                key = (store.props(entity).get("name"), store.labels(entity)[0])
+                group = groups.setdefault(key, {
+                    "focus_entity": key[0], "entity_type": key[1], "parents": {}, "components": {},
+                    "interfaces": {}, "constraints": {}, "affected_by_decisions": {}
+                })
+                for field, neighbours in (
+                    ("parents", store.out(entity, "PART_OF")),
+                    ("components", store.into(entity, "PART_OF")),
+                    ("interfaces", store.both(entity, "INTERFACES_WITH")),
+                    ("constraints", store.out(entity, "CONSTRAINED_BY")),
+                    ("affected_by_decisions", store.into(entity, "AFFECTS"))
+                ):
+                    for _, neighbour in neighbours:
+                        name = store.props(neighbour).get("name")
+                        if name is not None:
+                            group[field][name] = None
+        return [{key: list(value) if isinstance(value, dict) else value for key, value in group.items()}
+                for group in groups.values()]
+
+    def find_expertise_and_roles(self, person_name: str = None, topic: str = None) -> list[dict]:
+        """
+        Find people's expertise and roles using foundational schema
+        """
+        store = self._store
+
+        def names(pairs):
+            return list(dict.fromkeys(n for n in (store.props(node).get("name") for _, node in pairs) if n is not None))
+
+        if person_name:
+            with store.lock:
+                return [{
+                    "person": person_name,
+                    "expertise_areas": names(r for p in people for r in store.out(p, "HAS_EXPERTISE")),
+                    "roles": names(r for p in people for r in store.out(p, "HAS_ROLE")),
+                    "teams": names(r for p in people for r in store.out(p, "MEMBER_OF")),
+                    "decisions_made": names(r for p in people for r in store.out(p, "MADE"))
+                } for people in [store.find("Person", "name", person_name)] if people]
+
+        if topic:
+            rows = {}
+            with store.lock:
+                topic_ids = self._resolve_entity_ids(topic)
+                topic_set = set(topic_ids)
+                for expertise in topic_ids:
+                    if store.props(expertise).get("name") != topic:
+                        continue
+                    for _, person in store.into(expertise, "HAS_EXPERTISE"):
+                        if not store.has_label(person, "Person"):
+                            continue
+                        name = store.props(person).get("name")
+                        row = rows.setdefault(name, {"person": name, "roles": {}, "related_decisions": {}})
+                        for role in names(store.out(person, "HAS_ROLE")):
+                            row["roles"][role] = None
+                        for decision in names((r, d) for r, d in store.out(person, "MADE") if d in topic_set):
+                            row["related_decisions"][decision] = None
+            result = [{"person": row["person"], "roles": list(row["roles"]),
+                       "related_decisions": list(row["related_decisions"])} for row in rows.values()]
+            result.sort(key=lambda row: -len(row["related_decisions"]))
+            return result
+
+        rows = {}
+        with store.lock:
+            for person in store.with_label("Person"):
+                roles = names(store.out(person, "HAS_ROLE"))
+                for _, expertise in store.out(person, "HAS_EXPERTISE"):
+                    key = (store.props(person).get("name"), store.props(expertise).get("name"))
+                    row = rows.setdefault(key, {"person": key[0], "expertise_area": key[1], "roles": {}})
+                    for role in roles:
+                        row["roles"][role] = None
+        result = [{**row, "roles": list(row["roles"])} for row in rows.values()]
+        result.sort(key=lambda row: (_sort_key(row["person"]), _sort_key(row["expertise_area"])))
+        return result
+
+    def find_code_experts(self, technology_or_language: str) -> list[dict]:
+        """
+        Find code experts based on their contributions to specific languages or technologies.
+        """
+        technology = technology_or_language
+        store = self._store
+
+        def contains(value):
+            return isinstance(value, str) and technology in value
+
+        rows = []
+        with store.lock:
+            for person in store.with_label("Person"):
+                files = {cf for _, cf in store.out(person, "AUTHORED", "CONTRIBUTED_TO")
+                         if store.has_label(cf, "CodeFile")
+                         and (contains(store.props(cf).get("language")) or contains(store.props(cf).get("file_path")))}
+                if not files:
+                    continue
+                functions = sum(1 for _, f in store.out(person, "AUTHORED")
+                                if store.has_label(f, "Function") and contains(store.props(f).get("language")))
+                classes = sum(1 for _, c in store.out(person, "AUTHORED")
+                              if store.has_label(c, "Class") and contains(store.props(c).get("language")))
+                rows.append({
+                    "expert": store.props(person).get("name"),
+                    "email": store.props(person).get("email"),
+                    "files_contributed": len(files),
+                    "total_lines_authored": sum(store.props(cf).get("lines_of_code") or 0 for cf in files),
+                    "functions_authored": functions,
+                    "classes_authored": classes,
+                    "expertise_score": len(files) * 2 + functions + classes
+                })
+        rows.sort(key=lambda row: (-row["expertise_score"], _sort_key(row["expert"])))
+        return rows[:10]
+
+    def get_codebase_statistics(self, repository_path: str = None) -> dict:
+        """
+        Get comprehensive statistics about the codebase.
+        """
+        store = self._store
+
+        def in_repository(node):
+            path = store.props(node).get("file_path")
+            return repository_path is None or (isinstance(path, str) and path.startswith(repository_path))
+
+        with store.lock:
+            code_files = [cf for cf in store.with_label("CodeFile") if in_repository(cf)]
+
+            languages = defaultdict(lambda: {"file_count": 0, "total_lines": 0})
+            for cf in code_files:
+                entry = languages[store.props(cf).get("language")]
+                entry["file_count"] += 1
+                entry["total_lines"] += store.props(cf).get("lines_of_code") or 0
+            language_distribution = sorted(
+                ({"language": language, **entry} for language, entry in languages.items()),
+                key=lambda row: -row["file_count"]
+            )
+
+            functions, classes = set(), set()
+            for cf in code_files:
+                functions.update(f for _, f in store.out(cf, "CONTAINS_FUNCTION") if store.has_label(f, "Function"))
+                classes.update(c for _, c in store.out(cf, "CONTAINS_CLASS") if store.has_label(c, "Class"))
+
+            called = []
+            for function in store.with_label("Function"):
+                if not in_repository(function):
+                    continue
+                calls = sum(1 for _, caller in store.into(function, "CALLS") if store.has_label(caller, "Function"))
+                if calls:
+                    called.append({"function_name": store.props(function).get("name"),
+                                   "file_path": store.props(function).get("file_path"), "call_count": calls})
+            called.sort(key=lambda row: -row["call_count"])
+
+            contributors = defaultdict(set)
+            for cf in code_files:
+                for _, person in store.into(cf, "AUTHORED", "CONTRIBUTED_TO"):
+                    if store.has_label(person, "Person"):
+                        contributors[store.props(person).get("name")].add(cf)
+            top_contributors = sorted((
+                {"contributor": name, "files_contributed": len(files),
+                 "total_lines_contributed": sum(store.props(cf).get("lines_of_code") or 0 for cf in files)}
+                for name, files in contributors.items()
+            ), key=lambda row: -row["total_lines_contributed"])
+
+            return {
+                "language_distribution": language_distribution,
+                "entity_counts": {"total_files": len(code_files), "total_functions": len(functions),
+                                  "total_classes": len(classes)},
+                "most_called_functions": called[:10],
+                "top_contributors": top_contributors[:10]
+            }
+
+    def get_temporal_sequence(self, start_date: str = None, end_date: str = None,
+                              event_types: list = None, limit: int = 50) -> list[dict]:
+        """
+        Get chronological sequence of events, decisions, and documents.
+        """
+        start, end = _to_datetime(start_date), _to_datetime(end_date)
+        store = self._store
+
+        def in_range(moment):
+            return (moment is not None and (start is None or moment >= start)
+                    and (end is None or moment <= end))
+
+        def participants(node, rel_type):
+            return list(dict.fromkeys(store.props(p).get("name") for _, p in store.into(node, rel_type)
+                                      if store.has_label(p, "Person")))
+
+        items = []
+        with store.lock:
+            if not event_types or 'events' in event_types:
+                for event in store.with_label("TemporalEvent"):
+                    props = store.props(event)
+                    moment = _to_datetime(props.get("timestamp"))
+                    if in_range(moment):
+                        items.append((moment, {"timestamp": props.get("timestamp"), "item_type": "event",
+                                               "name": props.get("name"), "subtype": props.get("type"),
+                                               "description": props.get("context"), "era": props.get("era"),
+                                               "participants": participants(event, "PARTICIPATED_IN")}))
+            if not event_types or 'decisions' in event_types:
+                for decision in store.with_label("Decision"):
+                    props = store.props(decision)
+                    moment = _to_datetime(props.get("timestamp"))
+                    if in_range(moment):
+                        items.append((moment, {"timestamp": props.get("timestamp"), "item_type": "decision",
+                                               "name": props.get("name"), "subtype": "decision",
+                                               "description": props.get("context"), "era": props.get("era"),
+                                               "participants": participants(decision, "MADE")}))
+            if not event_types or 'documents' in event_types:
+                for document in store.with_label("Document"):
+                    props = store.props(document)
+                    moment = _to_datetime(props.get("timestamp"))
+                    if in_range(moment):
+                        items.append((moment, {"timestamp": props.get("timestamp"), "item_type": "document",
+                                               "name": props.get("filename"), "subtype": props.get("document_type"),
+                                               "description": props.get("version"), "era": props.get("era"),
+                                               "participants": participants(document, "AUTHORED")}))
+        return [row for _, row in heapq.nsmallest(limit, items, key=lambda item: item[0])]
+
+    def _breadth_first_traversal(self, anchor_labels: list, anchor_key: str, anchor_value,
+                                 relationship_types: list, direction: str, max_depth: int,
+                                 fanout: int, limit: int, timeout_seconds: float, is_match) -> dict:
+        """
+        Hop-by-hop BFS over the adjacency lists under the store lock; see
+        GraphBackend._breadth_first_traversal.
+        """
+        deadline = time.monotonic() + timeout_seconds
+        types = tuple(relationship_types)
+        expand = {"both": _GraphStore.both, "in": _GraphStore.into, "out": _GraphStore.out}[direction]
+        store = self._store
+        stats = self._new_traversal_stats()
+        nodes, matches = {}, []
+
+        def describe(node_id):
+            props = store.props(node_id)
+            return {
+                "labels": list(store.labels(node_id)),
+                "filename": props.get("filename"),
+                "name": props.get("name"),
+                "timestamp": props.get("timestamp"),
+                "context": props.get("context", props.get("description"))
+            }
+
+        with store.lock:
+            for label in anchor_labels:
+                for anchor in store.find(label, anchor_key, anchor_value):
+                    nodes[anchor] = {"parent": None, "depth": 0, "is_anchor": True, **describe(anchor)}
+            frontier = list(nodes)
+
+            depth = 0
+            while frontier and depth < max_depth and len(matches) < limit:
+                if time.monotonic() >= deadline:
+                    stats["timed_out"] = True
+                    break
+                depth += 1
+                next_frontier = []
+                for parent_id in frontier:
+                    parent = nodes[parent_id]
+                    followed = 0
+                    for relationship, node_id in expand(store, parent_id, *types):
+                        if followed == fanout:
+                            # Relationships beyond the fanout cap are never followed
+                            stats["pruned_by_fanout"] += 1
+                            continue
+                        followed += 1
+                        if node_id in nodes:
+                            continue
+                        if len(nodes) >= DEFAULT_TRAVERSAL_MAX_NODES:
+                            stats["pruned_by_max_nodes"] += 1
+                            continue
+                        first_hop = parent["is_anchor"]
+                        context = relationship["properties"].get("context")
+                        nodes[node_id] = {
+                            "parent": parent_id,
+                            "depth": depth,
+                            "is_anchor": False,
+                            **describe(node_id),
+                            "relationship_type": relationship["type"],
+                            "first_relationship_type": relationship["type"] if first_hop else parent["first_relationship_type"],
+                            "first_relationship_context": context if first_hop else parent["first_relationship_context"]
+                        }
+                        next_frontier.append(node_id)
+                        if is_match(nodes[node_id]):
+                            if len(matches) < limit:
+                                matches.append(node_id)
+                            else:
+                                stats["pruned_by_limit"] += 1
+                frontier = next_frontier
+
+        self._finish_traversal_stats(stats, nodes, depth)
+        return {"nodes": nodes, "matches": matches, **stats}
@@ -6,9 +6,7 @@ Demonstrates intelligent use of all three databases based on query type and cont
 import re
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
-from .search import AnalyticalBrain
-from .knowledge_graph import GraphBrain
-from .nlp import VectorBrain
+from .brain_registry import get_analytical_brain, get_graph_brain, get_vector_brain
 
 class QueryAnalyzer:
     """
@@ -108,11 +106,11 @@ class EnhancedQueryOrchestrator:
     
     def __init__(self):
         """
-        Initialize the three brains and query analyzer.
+        Take the process-wide brains and initialize the query analyzer.
         """
-        self.analytical_brain = AnalyticalBrain()
-        self.graph_brain = GraphBrain()
-        self.vector_brain = VectorBrain()
+        self.analytical_brain = get_analytical_brain()
+        self.graph_brain = get_graph_brain()
+        self.vector_brain = get_vector_brain()
         self.query_analyzer = QueryAnalyzer()
         print("Enhanced Query Orchestrator initialized with intelligent routing.")
 
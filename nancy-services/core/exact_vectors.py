@@ -0,0 +1,496 @@
+"""
+Exact (brute-force) Vector Brain backend.
+
+Below roughly 100k chunks, scoring every stored embedding with one matrix
+product is as fast as an HNSW lookup and has perfect recall. ExactIndex keeps
+the embeddings as a contiguous float32 matrix, memory-mapped from a file so
+the collection is paged in by the OS rather than parsed at startup, and
+answers a batch of queries with a blocked matrix product and an argpartition
+top-k per block.
+
+ExactVectorBackend stores chunk IDs, documents and metadata in a DuckDB
+sidecar next to the matrix (exact_chunks.duckdb, exact_embeddings.f32 under
+brains.vector.connection.persist_directory) and evaluates Chroma `where`
+filters in memory before scoring only the matching rows. Distances follow
+Chroma's definitions for the configured hnsw_space ("l2", "ip", "cosine"),
+so results are interchangeable with the Chroma backends; the recall audit
+(audit_vector_recall.py) uses ExactIndex as its ground truth.
+
+Like the embedded graph, one store per directory is shared by every
+VectorBrain in the process; the files must not be written by another process
+at the same time.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from .vector_backend import VectorBackend, DEFAULT_PERSIST_DIRECTORY, matches_where
+
+# Beyond this, an HNSW index (the chromadb or embedded backend) is usually faster
+EXACT_RECOMMENDED_MAX_CHUNKS = 100_000
+
+# Rows scored per matrix product, bounding the distance matrix to
+# queries x SEARCH_BLOCK_ROWS floats
+SEARCH_BLOCK_ROWS = 65536
+
+SPACES = ("l2", "ip", "cosine")
+
+
+class ExactIndex:
+    """
+    Embedding matrix with exact top-k search. Rows are addressed by integer
+    position; removed rows stay allocated and are skipped until reused.
+    With a path the matrix is a memory-mapped file, grown by doubling.
+    """
+
+    def __init__(self, dimension: int = None, path: str = None, space: str = "l2"):
+        if space not in SPACES:
+            raise ValueError(f"Unsupported distance space: {space}")
+        self.space = space
+        self.path = path
+        self.dimension = dimension
+        self.capacity = 0
+        self.size = 0  # rows in use or freed, i.e. 1 + the highest row ever set
+        self.matrix = None
+        self.norms = np.zeros(0, dtype=np.float32)   # squared row norms
+        self.active = np.zeros(0, dtype=bool)
+        if dimension and path and os.path.exists(path):
+            capacity = os.path.getsize(path) // (4 * dimension)
+            if capacity:
+                self.capacity = capacity
+                self.matrix = np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, dimension))
+                self.norms = np.zeros(capacity, dtype=np.float32)
+                self.active = np.zeros(capacity, dtype=bool)
+
+    def restore(self, rows):
+        """Mark stored rows live after reopening a matrix file."""
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) == 0:
+            return
+        self.active[rows] = True
+        self.size = int(rows.max()) + 1
+        vectors = np.asarray(self.matrix[rows])
+        self.norms[rows] = np.einsum("ij,ij->i", vectors, vectors)
+
+    def _ensure_capacity(self, rows: int):
+        if rows <= self.capacity:
+            return
+        capacity = max(rows, 2 * self.capacity, 1024)
+        if self.path:
+            if self.matrix is not None:
+                self.matrix.flush()
+                self.matrix = None
+            with open(self.path, "ab") as f:
+                f.truncate(capacity * self.dimension * 4)
+            matrix = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension))
+        else:
+            matrix = np.zeros((capacity, self.dimension), dtype=np.float32)
+            if self.matrix is not None:
+                matrix[:self.capacity] = self.matrix
+        norms = np.zeros(capacity, dtype=np.float32)
+        norms[:self.capacity] = self.norms
+        active = np.zeros(capacity, dtype=bool)
+        active[:self.capacity] = self.active
+        self.matrix, self.norms, self.active, self.capacity = matrix, norms, active, capacity
+
+    def set_rows(self, rows, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2:
+            raise ValueError("Embeddings must be a 2-D array")
+        if self.dimension is None:
+            self.dimension = vectors.shape[1]
+        elif vectors.shape[1] != self.dimension:
+            raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match the index ({self.dimension})")
+        rows = np.asarray(rows, dtype=np.int64)
+        self._ensure_capacity(int(rows.max()) + 1)
+        self.matrix[rows] = vectors
+        self.norms[rows] = np.einsum("ij,ij->i", vectors, vectors)
+        self.active[rows] = True
+        self.size = max(self.size, int(rows.max()) + 1)
+
+    def remove_rows(self, rows):
+        self.active[np.asarray(rows, dtype=np.int64)] = False
+
+    def flush(self):
+        if isinstance(self.matrix, np.memmap):
+            self.matrix.flush()
+
+    def _distances(self, queries, query_norms, block, block_norms):
+        dots = queries @ block.T
+        if self.space == "l2":
+            distances = query_norms[:, None] + block_norms[None, :] - 2 * dots
+            np.maximum(distances, 0, out=distances)
+        elif self.space == "ip":
+            distances = 1 - dots
+        else:
+            scale = np.sqrt(query_norms)[:, None] * np.sqrt(block_norms)[None, :]
+            distances = 1 - dots / np.maximum(scale, 1e-12)
+        return distances
+
+    def _blocks(self, candidates):
+        """(rows, matrix block, norms) per SEARCH_BLOCK_ROWS candidates; contiguous views when nothing is filtered out."""
+        if candidates is None and self.active[:self.size].all():
+            for start in range(0, self.size, SEARCH_BLOCK_ROWS):
+                stop = min(start + SEARCH_BLOCK_ROWS, self.size)
+                yield np.arange(start, stop), self.matrix[start:stop], self.norms[start:stop]
+            return
+        if candidates is None:
+            candidates = np.flatnonzero(self.active[:self.size])
+        for start in range(0, len(candidates), SEARCH_BLOCK_ROWS):
+            rows = candidates[start:start + SEARCH_BLOCK_ROWS]
+            yield rows, self.matrix[rows], self.norms[rows]
+
+    def search(self, queries, k: int, candidates=None) -> tuple:
+        """
+        Exact k nearest rows of each query, nearest first, as (rows, distances)
+        arrays of shape (queries, <=k). candidates restricts the search to
+        those rows (e.g. the rows passing a metadata filter).
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if candidates is not None:
+            candidates = np.asarray(candidates, dtype=np.int64)
+            candidates = candidates[self.active[candidates]]
+        available = int(self.active[:self.size].sum()) if candidates is None else len(candidates)
+        k = min(k, available)
+        if k == 0 or self.matrix is None:
+            empty = np.zeros((len(queries), 0))
+            return empty.astype(np.int64), empty.astype(np.float32)
+        query_norms = np.einsum("ij,ij->i", queries, queries)
+
+        best_rows, best_distances = [], []
+        for rows, block, block_norms in self._blocks(candidates):
+            distances = self._distances(queries, query_norms, block, block_norms)
+            if distances.shape[1] > k:
+                top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+                distances = np.take_along_axis(distances, top, axis=1)
+                rows = rows[top]
+            else:
+                rows = np.broadcast_to(rows, distances.shape)
+            best_rows.append(rows)
+            best_distances.append(distances)
+
+        rows = np.concatenate(best_rows, axis=1)
+        distances = np.concatenate(best_distances, axis=1)
+        if rows.shape[1] > k:
+            top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            rows = np.take_along_axis(rows, top, axis=1)
+            distances = np.take_along_axis(distances, top, axis=1)
+        order = np.argsort(distances, axis=1, kind="stable")
+        return np.take_along_axis(rows, order, axis=1), np.take_along_axis(distances, order, axis=1)
+
+
+class _ExactStore:
+    """
+    ExactIndex plus the chunk records of its rows, in memory and in DuckDB.
+    All access goes through `lock`. Searches score the matrix outside it, so
+    they run concurrently; writes wait until no search is scoring and hold
+    new searches back meanwhile.
+    """
+
+    def __init__(self, directory: str, space: str):
+        self.directory = directory
+        self.lock = threading.RLock()
+        self._changed = threading.Condition(self.lock)
+        self._searches = 0
+        self._writers = 0
+        self.references = 0
+        self.row_of = {}       # chunk id -> row
+        self.records = {}      # row -> (chunk id, document, metadata)
+        self.free_rows = []
+        self._warned = False
+
+        if directory == ":memory:":
+            self.connection = duckdb.connect(":memory:")
+            matrix_path = None
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self.connection = duckdb.connect(os.path.join(directory, "exact_chunks.duckdb"))
+            matrix_path = os.path.join(directory, "exact_embeddings.f32")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS exact_chunks (
+                row BIGINT PRIMARY KEY,
+                id VARCHAR,
+                document VARCHAR,
+                metadata VARCHAR
+            )
+        """)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS exact_settings (key VARCHAR PRIMARY KEY, value VARCHAR)")
+        settings = dict(self.connection.execute("SELECT key, value FROM exact_settings").fetchall())
+        if settings.get("space", space) != space:
+            print(f"Exact vector store was built with space {settings['space']}; using it instead of {space}")
+            space = settings["space"]
+        dimension = int(settings["dimension"]) if "dimension" in settings else None
+        self.index = ExactIndex(dimension=dimension, path=matrix_path, space=space)
+
+        for row, chunk_id, document, metadata in self.connection.execute(
+                "SELECT row, id, document, metadata FROM exact_chunks ORDER BY row").fetchall():
+            self.row_of[chunk_id] = row
+            self.records[row] = (chunk_id, document, json.loads(metadata))
+        if self.records:
+            self.index.restore(list(self.records))
+            self.free_rows = sorted(set(range(self.index.size)) - set(self.records), reverse=True)
+
+    def close(self):
+        self.index.flush()
+        self.connection.close()
+
+    def _save_settings(self):
+        self.connection.execute("""
+            INSERT OR REPLACE INTO exact_settings VALUES ('dimension', ?), ('space', ?)
+        """, [str(self.index.dimension), self.index.space])
+
+    @contextmanager
+    def _searching(self):
+        """Shared access for scoring: no write runs until the block ends."""
+        with self.lock:
+            while self._writers:
+                self._changed.wait()
+            self._searches += 1
+        try:
+            yield
+        finally:
+            with self.lock:
+                self._searches -= 1
+                if not self._searches:
+                    self._changed.notify_all()
+
+    @contextmanager
+    def _writing(self):
+        """Exclusive access for changing rows and records: holds the lock once no search is scoring."""
+        with self.lock:
+            self._writers += 1
+            try:
+                while self._searches:
+                    self._changed.wait()
+                yield
+            finally:
+                self._writers -= 1
+                self._changed.notify_all()
+
+    def _save_records(self, records: dict):
+        """Persist {row: (chunk id, document, metadata)}."""
+        rows = list(records)
+        frame = pd.DataFrame({
+            "row": rows,
+            "id": [records[row][0] for row in rows],
+            "document": [records[row][1] for row in rows],
+            "metadata": [json.dumps(records[row][2], default=str) for row in rows]
+        })
+        self.connection.register("exact_chunk_rows", frame)
+        self.connection.execute("INSERT OR REPLACE INTO exact_chunks SELECT row, id, document, metadata FROM exact_chunk_rows")
+        self.connection.unregister("exact_chunk_rows")
+
+    def _transaction(self, persist):
+        self.connection.execute("BEGIN TRANSACTION")
+        try:
+            persist()
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+
+    def write(self, ids, documents, metadatas, vectors, overwrite: bool):
+        # A repeated ID within the batch keeps its last occurrence
+        positions = {chunk_id: position for position, chunk_id in enumerate(ids)}
+        with self._writing():
+            rows, keep = [], []
+            free = len(self.free_rows)
+            next_row = self.index.size
+            for chunk_id, position in positions.items():
+                row = self.row_of.get(chunk_id)
+                if row is not None and not overwrite:
+                    continue  # as Chroma, adding an existing ID leaves it unchanged
+                if row is None:
+                    if free:
+                        free -= 1
+                        row = self.free_rows[free]
+                    else:
+                        row, next_row = next_row, next_row + 1
+                rows.append(row)
+                keep.append(position)
+            if not rows:
+                return 0
+            records = {row: (ids[position], documents[position], metadatas[position] or {})
+                       for row, position in zip(rows, keep)}
+
+            # Matrix rows first: a row becomes live only once its record is committed
+            size = self.index.size
+            overwritten = [row for row in rows if row in self.records]
+            previous = np.array(self.index.matrix[overwritten]) if overwritten else None
+            self.index.set_rows(rows, np.asarray(vectors, dtype=np.float32)[keep])
+            self.index.flush()
+
+            def persist():
+                self._save_settings()
+                self._save_records(records)
+            try:
+                self._transaction(persist)
+            except Exception:
+                # Put the matrix back to what the committed records describe
+                self.index.remove_rows([row for row in rows if row not in self.records])
+                if overwritten:
+                    self.index.set_rows(overwritten, previous)
+                self.index.size = size
+                self.index.flush()
+                raise
+
+            # Memory follows the committed state
+            del self.free_rows[free:]
+            for row, record in records.items():
+                self.row_of[record[0]] = row
+                self.records[row] = record
+
+            if len(self.records) > EXACT_RECOMMENDED_MAX_CHUNKS and not self._warned:
+                self._warned = True
+                print(f"Exact vector store holds {len(self.records)} chunks; above "
+                      f"{EXACT_RECOMMENDED_MAX_CHUNKS} the chromadb or embedded (HNSW) backend is usually faster")
+            return len(rows)
+
+    def update(self, ids, metadatas):
+        with self._writing():
+            records = {}
+            for chunk_id, metadata in zip(ids, metadatas):
+                row = self.row_of.get(chunk_id)
+                if row is not None:
+                    records[row] = (chunk_id, self.records[row][1], metadata or {})
+            if records:
+                self._transaction(lambda: self._save_records(records))
+                self.records.update(records)
+
+    def rows_matching(self, where: dict) -> list:
+        return [row for row, (_, _, metadata) in self.records.items() if matches_where(metadata, where)]
+
+    def delete(self, ids=None, where=None):
+        with self._writing():
+            rows = set()
+            if ids:
+                rows.update(self.row_of[chunk_id] for chunk_id in ids if chunk_id in self.row_of)
+            if where:
+                rows.update(self.rows_matching(where))
+            if not rows:
+                return
+            rows = sorted(rows)
+            self._transaction(lambda: self.connection.execute(
+                "DELETE FROM exact_chunks WHERE row IN (SELECT unnest(?))", [rows]))
+            self.index.remove_rows(rows)
+            for row in rows:
+                chunk_id = self.records.pop(row)[0]
+                del self.row_of[chunk_id]
+            self.free_rows.extend(reversed(rows))
+
+    def search(self, vectors, n_results, where=None) -> dict:
+        # Rows and records cannot change while _searching; only the filter needs the lock
+        with self._searching():
+            with self.lock:
+                candidates = self.rows_matching(where) if where else None
+            rows, distances = self.index.search(vectors, n_results, candidates)
+            results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+            for query_rows, query_distances in zip(rows, distances):
+                records = [self.records[int(row)] for row in query_rows]
+                results["ids"].append([record[0] for record in records])
+                results["documents"].append([record[1] for record in records])
+                results["metadatas"].append([dict(record[2]) for record in records])
+                results["distances"].append([float(distance) for distance in query_distances])
+            return results
+
+
+# One store per directory, shared by every ExactVectorBackend in the process
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def _store_key(directory: str) -> str:
+    return directory if directory == ":memory:" else os.path.abspath(directory)
+
+
+def _acquire_store(directory: str, space: str) -> _ExactStore:
+    with _stores_lock:
+        store = _stores.get(_store_key(directory))
+        if store is None:
+            store = _ExactStore(directory, space)
+            _stores[_store_key(directory)] = store
+        store.references += 1
+        return store
+
+
+def _release_store(store: _ExactStore):
+    with _stores_lock:
+        store.references -= 1
+        if store.references == 0:
+            _stores.pop(_store_key(store.directory), None)
+            store.close()
+
+
+class ExactVectorBackend(VectorBackend):
+    """
+    Brute-force Vector Brain store: perfect recall, for collections small
+    enough to score in full on every query.
+    """
+    backend_name = "exact"
+
+    def __init__(self, embedding_function, persist_directory: str = None, space: str = "l2"):
+        super().__init__(embedding_function)
+        self.persist_directory = persist_directory or DEFAULT_PERSIST_DIRECTORY
+        self._store = _acquire_store(self.persist_directory, space)
+
+    def close(self):
+        if self._store is not None:
+            _release_store(self._store)
+            self._store = None
+
+    @property
+    def space(self) -> str:
+        return self._store.index.space
+
+    def _embed(self, texts: list[str]):
+        return np.asarray(self.embedding_function(texts), dtype=np.float32)
+
+    def add(self, ids, documents, metadatas):
+        if ids:
+            self._store.write(ids, documents, metadatas, self._embed(documents), overwrite=False)
+
+    def upsert(self, ids, documents, metadatas):
+        if ids:
+            self._store.write(ids, documents, metadatas, self._embed(documents), overwrite=True)
+
+    def update(self, ids, metadatas):
+        self._store.update(ids, metadatas)
+
+    def get_ids(self, where):
+        with self._store.lock:
+            return [self._store.records[row][0] for row in self._store.rows_matching(where)]
+
+    def delete(self, ids=None, where=None):
+        self._store.delete(ids=ids, where=where)
+
+    def query(self, query_texts, n_results=5, where=None):
+        # All query texts are scored together in one matrix product per block
+        return self.query_embeddings(self._embed(query_texts), n_results, where)
+
+    def query_embeddings(self, embeddings, n_results=5, where=None):
+        return self._store.search(embeddings, n_results, where)
+
+    def count(self):
+        with self._store.lock:
+            return len(self._store.records)
+
+    def scan(self, batch_size=1000):
+        with self._store.lock:
+            records = list(self._store.records.values())
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            yield ([record[0] for record in batch], [record[1] for record in batch],
+                   [dict(record[2]) for record in batch])
+
+    def export_embeddings(self) -> tuple:
+        """(chunk ids, float32 embeddings matrix) of every stored chunk, e.g. for the recall audit."""
+        with self._store.lock:
+            rows = sorted(self._store.records)
+            return ([self._store.records[row][0] for row in rows],
+                    np.array(self._store.index.matrix[rows]) if rows else np.zeros((0, 0), dtype=np.float32))
@@ -0,0 +1,472 @@
+"""
+Graph Brain backend interface.
+
+GraphBackend is the public surface of the Graph Brain: the writers used by
+ingestion and the knowledge packet processor, and the queries used by the
+orchestrators. Two implementations exist:
+- GraphBrain (core/knowledge_graph.py), backed by a Neo4j server
+- EmbeddedGraphBrain (core/embedded_graph.py), an in-process property graph
+  persisted to DuckDB, for single-node deployments and CI
+
+create_graph_brain() returns the one selected by brains.graph.backend
+("neo4j" or "embedded"), which NANCY_GRAPH_BACKEND overrides.
+"""
+
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Optional
+
+from schemas.knowledge_packet import GRAPH_ENTITY_TYPES
+
+from .graph_cache import graph_cache
+
+# Labels covered by the entity index, which topic lookups start from: the
+# entity types of knowledge packets plus the labels ingestion writes
+ENTITY_LABELS = list(dict.fromkeys(GRAPH_ENTITY_TYPES + [
+    "Feature", "Era", "TemporalEvent", "Concept", "EngineeringDomain", "DecisionTarget",
+    "Subsystem", "Expertise", "Requirement", "Spreadsheet", "Column", "CodeFile", "Module"
+]))
+
+# Nodes an entity lookup resolves a topic to
+DEFAULT_ENTITY_LIMIT = 50
+
+# Relationships followed by find_related_documents when no types are given
+DEFAULT_DOCUMENT_RELATIONSHIP_TYPES = [
+    "REFERENCES", "AUTHORED", "MENTIONED_IN", "DISCUSSES", "INFLUENCED_BY", "CREATED_IN"
+]
+
+CAUSAL_RELATIONSHIP_TYPES = ["INFLUENCED", "HAPPENED_BEFORE", "DECISION_SEQUENCE"]
+
+# Traversal bounds: neighbours expanded per node and hop, nodes visited in
+# total, and the transaction timeout
+DEFAULT_TRAVERSAL_FANOUT = int(os.getenv("NANCY_GRAPH_TRAVERSAL_FANOUT", "50"))
+DEFAULT_TRAVERSAL_MAX_NODES = int(os.getenv("NANCY_GRAPH_TRAVERSAL_MAX_NODES", "5000"))
+DEFAULT_TRAVERSAL_TIMEOUT_SECONDS = float(os.getenv("NANCY_GRAPH_TRAVERSAL_TIMEOUT_SECONDS", "10"))
+
+_RELATIONSHIP_TYPE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Entity text is matched on words (runs of letters, so "thermal" finds
+# "thermal_analysis_report.txt") and on numbered terms (letters and digits
+# with at least one digit, so "S-400", "ISO 9001" and "rev2" stay findable)
+_ENTITY_WORD = re.compile(r"[^\W\d_]+")
+_ENTITY_NUMBERED_TERM = re.compile(r"[^\W_]*\d[^\W_]*")
+
+
+def entity_words(text: str) -> list:
+    """Lowercase letter runs of text."""
+    return _ENTITY_WORD.findall((text or "").lower())
+
+
+def entity_numbered_terms(text: str) -> list:
+    """Lowercase letter-and-digit terms of text that contain a digit."""
+    return _ENTITY_NUMBERED_TERM.findall((text or "").lower())
+
+
+def get_graph_backend_config() -> dict:
+    """
+    Backend name and connection settings of the Graph Brain, from
+    brains.graph in the Nancy configuration. NANCY_GRAPH_BACKEND and
+    NANCY_GRAPH_DATABASE_PATH override the configuration.
+    """
+    backend, connection = "neo4j", {}
+    try:
+        from .config_manager import get_config_manager
+        manager = get_config_manager()
+        config = manager.config or manager.load_config()
+        backend = config.brains.graph.backend.value
+        connection = dict(config.brains.graph.connection)
+    except Exception as e:
+        print(f"Graph configuration not loaded, using defaults: {e}")
+    backend = os.getenv("NANCY_GRAPH_BACKEND", backend).lower()
+    if os.getenv("NANCY_GRAPH_DATABASE_PATH"):
+        connection["database_path"] = os.getenv("NANCY_GRAPH_DATABASE_PATH")
+    return {"backend": backend, "connection": connection}
+
+
+def create_graph_brain() -> "GraphBackend":
+    """
+    Graph Brain for the configured backend. Only the selected backend's
+    driver is imported, so the embedded backend runs without the neo4j package.
+    """
+    settings = get_graph_backend_config()
+    if settings["backend"] == "embedded":
+        from .embedded_graph import EmbeddedGraphBrain
+        return EmbeddedGraphBrain(settings["connection"].get("database_path"))
+    if settings["backend"] != "neo4j":
+        raise ValueError(f"Unsupported graph backend: {settings['backend']}")
+    from .knowledge_graph import GraphBrain
+    return GraphBrain()
+
+
+class GraphBackend(ABC):
+    """
+    Public interface of the Graph Brain - the project knowledge graph.
+
+    Nodes are merged on their name (Document nodes on filename, CodeFile nodes
+    on file_path) and relationships on (source, type, target), so every writer
+    is idempotent. Queries return lists of plain dicts whose keys are the same
+    for every backend.
+    """
+    backend_name = None
+
+    def __init__(self):
+        # doc_id being ingested on this thread, recorded on the relationships it creates
+        self._provenance = threading.local()
+
+    @contextmanager
+    def provenance(self, doc_id: str):
+        """
+        Tag relationships created inside the block with doc_id (in r.source_doc_ids),
+        so remove_document_provenance can retire them when the document is replaced.
+        """
+        previous = getattr(self._provenance, "doc_id", None)
+        self._provenance.doc_id = doc_id
+        try:
+            yield
+        finally:
+            self._provenance.doc_id = previous
+
+    def get_cache_stats(self) -> dict:
+        """Entries, size and hit rate of the process-wide graph query cache."""
+        return graph_cache.get_stats()
+
+    @abstractmethod
+    def close(self):
+        """Release the connection or store behind this instance."""
+
+    @abstractmethod
+    def health_check(self) -> dict:
+        """{"status": "healthy"|"unhealthy", "details"|"error": ...} for the health endpoints."""
+
+    # ------------------------------------------------------------------
+    # Writers
+    # ------------------------------------------------------------------
+
+    @abstractmethod
+    def add_document_node(self, filename: str, file_type: str):
+        """Add a Document node."""
+
+    @abstractmethod
+    def add_author_relationship(self, filename: str, author_name: str):
+        """Link a Person to the Document they authored."""
+
+    @abstractmethod
+    def add_relationship(self, source_node_label: str, source_node_name: str, relationship_type: str,
+                         target_node_label: str, target_node_name: str, context: str = None):
+        """Create a relationship between two named nodes, tagged with the current provenance."""
+
+    @abstractmethod
+    def add_relationships(self, relationships: list[dict]):
+        """Create many relationships given as add_relationship keyword dicts."""
+
+    @abstractmethod
+    def add_concept_node(self, concept_name: str, concept_type: str = "Concept"):
+        """Add a named node of concept_type."""
+
+    @abstractmethod
+    def add_concept_nodes(self, nodes: list[tuple]):
+        """Add many (concept_name, concept_type) nodes."""
+
+    @abstractmethod
+    def remove_document_provenance(self, doc_ids: list[str], code_files: list[str] = None) -> dict:
+        """Retire the relationships and code nodes contributed by replaced or deleted documents."""
+
+    @abstractmethod
+    def add_decision_node(self, decision_name: str, decision_maker: str, context: str = None, era: str = None):
+        """Add a Decision made by a Person."""
+
+    @abstractmethod
+    def add_meeting_node(self, meeting_name: str, attendees: list, decisions_made: list = None, era: str = None):
+        """Add a Meeting with its attendees and resulting decisions."""
+
+    @abstractmethod
+    def add_feature_node(self, feature_name: str, owner: str = None, influenced_by_decisions: list = None,
+                         era: str = None):
+        """Add a Feature with its owner and the decisions that led to it."""
+
+    @abstractmethod
+    def add_era_node(self, era_name: str, description: str = None, start_date: str = None, end_date: str = None):
+        """Add a project Era."""
+
+    @abstractmethod
+    def link_document_to_era(self, filename: str, era_name: str):
+        """Link a Document to the Era it was created in."""
+
+    @abstractmethod
+    def add_foundational_relationships(self, relationships: list[dict]):
+        """Add {source: {type, name}, target: {type, name}, relationship, context} relationships."""
+
+    @abstractmethod
+    def add_code_file_node(self, file_path: str, language: str, author: str = None,
+                           lines_of_code: int = None, git_info: dict = None):
+        """Add a CodeFile with its author and git contributors."""
+
+    @abstractmethod
+    def add_function_node(self, function_name: str, file_path: str, language: str,
+                          line_start: int = None, line_end: int = None,
+                          docstring: str = None, args: list = None):
+        """Add a Function contained in a CodeFile."""
+
+    @abstractmethod
+    def add_class_node(self, class_name: str, file_path: str, language: str,
+                       line_start: int = None, line_end: int = None,
+                       docstring: str = None, base_classes: list = None):
+        """Add a Class contained in a CodeFile, with its base classes."""
+
+    @abstractmethod
+    def add_import_relationship(self, importing_file: str, imported_module: str,
+                                import_type: str = "import", alias: str = None):
+        """Link a CodeFile to a Module it imports."""
+
+    @abstractmethod
+    def add_temporal_event(self, event_name: str, event_type: str, timestamp: str = None,
+                           participants: list = None, era: str = None, context: str = None):
+        """Add a TemporalEvent, linked to its era, participants and the event before it."""
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @abstractmethod
+    def get_author_of_document(self, filename: str) -> Optional[str]:
+        """Name of the author of a document, or None."""
+
+    @abstractmethod
+    def get_documents_by_author(self, author_name: str) -> list[str]:
+        """Filenames of the documents a person authored."""
+
+    @abstractmethod
+    def get_authored_documents(self, author_name: str) -> list[dict]:
+        """[{"document", "file_type"}] authored by a person."""
+
+    @abstractmethod
+    def list_people(self) -> list[str]:
+        """Names of every Person node."""
+
+    @abstractmethod
+    def resolve_entities(self, text: str, labels: list = None, limit: int = DEFAULT_ENTITY_LIMIT,
+                         match_all: bool = True) -> list[dict]:
+        """
+        Nodes matching a free-text topic, best first: [{"id", "name", "labels", "score"}].
+        When the entity index finds nothing, nodes of any label whose name or
+        filename is exactly the text are returned.
+        """
+
+    @abstractmethod
+    def find_cross_team_influences(self, author1: str, author2: str) -> list[dict]:
+        """Relationships between the documents of two authors."""
+
+    @abstractmethod
+    def find_documents_that_reference_topic(self, topic: str) -> list[dict]:
+        """Documents that reference, mention, affect or influence a topic."""
+
+    @abstractmethod
+    def get_author_collaboration_network(self, author: str = None) -> list[dict]:
+        """Pairs of authors whose documents are related, with interaction counts."""
+
+    @abstractmethod
+    def find_decision_impact_chain(self, decision_maker: str, topic: str) -> list[dict]:
+        """Documents affected, within three hops, by a person's documents on a topic."""
+
+    @abstractmethod
+    def get_knowledge_graph_statistics(self, recompute: bool = False) -> dict:
+        """Node and relationship counts and the most connected documents."""
+
+    @abstractmethod
+    def recompute_degrees(self) -> int:
+        """Rebuild maintained node degrees; returns the number of nodes."""
+
+    @abstractmethod
+    def find_decision_provenance(self, feature_or_topic: str) -> list[dict]:
+        """Decisions, makers and meetings behind a feature or the documents on a topic."""
+
+    @abstractmethod
+    def find_knowledge_expert(self, topic: str) -> list[dict]:
+        """People ranked by the documents, decisions and features they hold on a topic."""
+
+    @abstractmethod
+    def find_impact_analysis(self, document_name: str) -> list[dict]:
+        """Decisions, features and documents affected by changing a document."""
+
+    @abstractmethod
+    def find_project_timeline(self, era_name: str = None) -> list[dict]:
+        """Documents, decisions and meetings per era."""
+
+    @abstractmethod
+    def find_knowledge_silos(self) -> list[dict]:
+        """Features, decisions and design documents connected to a single person."""
+
+    @abstractmethod
+    def explore_relationships(self, entity_name: str) -> list[dict]:
+        """Up to 20 relationships of a named entity."""
+
+    @abstractmethod
+    def get_cross_references(self) -> list[dict]:
+        """Every REFERENCES relationship between documents."""
+
+    @abstractmethod
+    def find_technical_relationships(self, component_or_subsystem: str) -> list[dict]:
+        """Parents, parts, interfaces, constraints and decisions of a component."""
+
+    @abstractmethod
+    def find_expertise_and_roles(self, person_name: str = None, topic: str = None) -> list[dict]:
+        """Expertise, roles and decisions of a person, of the experts on a topic, or of everyone."""
+
+    @abstractmethod
+    def find_code_experts(self, technology_or_language: str) -> list[dict]:
+        """Code contributors ranked for a language or technology."""
+
+    @abstractmethod
+    def get_codebase_statistics(self, repository_path: str = None) -> dict:
+        """Languages, entity counts, most called functions and top contributors."""
+
+    @abstractmethod
+    def get_temporal_sequence(self, start_date: str = None, end_date: str = None,
+                              event_types: list = None, limit: int = 50) -> list[dict]:
+        """Events, decisions and documents in chronological order."""
+
+    # ------------------------------------------------------------------
+    # Bounded traversals
+    # ------------------------------------------------------------------
+
+    @abstractmethod
+    def _breadth_first_traversal(self, anchor_labels: list, anchor_key: str, anchor_value,
+                                 relationship_types: list, direction: str, max_depth: int,
+                                 fanout: int, limit: int, timeout_seconds: float, is_match) -> dict:
+        """
+        Hop-by-hop BFS from the nodes with one of anchor_labels whose anchor_key
+        is anchor_value, over relationship_types in direction ("both", "in" or
+        "out"). Every node is visited once, on its shortest path; each hop
+        expands at most `fanout` relationships per node and the search stops
+        once `limit` nodes accepted by is_match are found, after max_depth hops
+        or after timeout_seconds.
+
+        Returns {"nodes": {id: node}, "matches": [id], "visited_nodes",
+        "pruned_by_fanout", "pruned_by_limit", "pruned_by_max_nodes",
+        "timed_out", "hops_expanded", "pruned_paths"}, where each node holds
+        parent, depth, is_anchor, labels, filename, name, timestamp, context,
+        relationship_type and the first relationship's type and context.
+        """
+
+    @staticmethod
+    def _validate_relationship_types(relationship_types: list) -> list:
+        """Relationship types are interpolated into queries; only plain identifiers are allowed."""
+        invalid = [t for t in relationship_types if not _RELATIONSHIP_TYPE.match(t)]
+        if invalid:
+            raise ValueError(f"Invalid relationship types: {invalid}")
+        return list(relationship_types)
+
+    @staticmethod
+    def _new_traversal_stats() -> dict:
+        return {
+            "visited_nodes": 0,
+            "pruned_by_fanout": 0,
+            "pruned_by_limit": 0,
+            "pruned_by_max_nodes": 0,
+            "timed_out": False
+        }
+
+    @staticmethod
+    def _finish_traversal_stats(stats: dict, nodes: dict, depth: int):
+        stats["visited_nodes"] = len(nodes)
+        stats["hops_expanded"] = depth
+        stats["pruned_paths"] = (stats["pruned_by_fanout"] + stats["pruned_by_limit"]
+                                 + stats["pruned_by_max_nodes"])
+
+    def find_related_documents(self, document_filename: str, relationship_types: list = None, max_depth: int = 2) -> list[dict]:
+        """
+        Find documents related to a given document through various relationship types.
+        See traverse_related_documents for the bounds applied.
+        """
+        return self.traverse_related_documents(document_filename, relationship_types, max_depth)["results"]
+
+    def traverse_related_documents(self, document_filename: str, relationship_types: list = None, max_depth: int = 2,
+                                   fanout: int = DEFAULT_TRAVERSAL_FANOUT, limit: int = 50,
+                                   timeout_seconds: float = DEFAULT_TRAVERSAL_TIMEOUT_SECONDS) -> dict:
+        """
+        Breadth-first search from the document over typed relationships
+        (DEFAULT_DOCUMENT_RELATIONSHIP_TYPES unless given), reporting each
+        related document once with its shortest path length and the first
+        relationship on that path.
+
+        Each hop expands at most `fanout` relationships per node, the search
+        stops once `limit` documents are found, and it is abandoned after
+        timeout_seconds. The result reports how many paths these bounds pruned.
+        """
+        relationship_types = self._validate_relationship_types(relationship_types or DEFAULT_DOCUMENT_RELATIONSHIP_TYPES)
+        traversal = self._breadth_first_traversal(
+            ["Document"], "filename", document_filename, relationship_types, "both",
+            max_depth, fanout, limit, timeout_seconds,
+            lambda node: "Document" in node["labels"]
+        )
+
+        results = []
+        for node_id in traversal.pop("matches"):
+            node = traversal["nodes"][node_id]
+            results.append({
+                "filename": node["filename"] or node["name"],
+                "relationship_type": node["first_relationship_type"],
+                "context": node["first_relationship_context"],
+                "path_length": node["depth"]
+            })
+        results.sort(key=lambda item: (item["path_length"], str(item["filename"])))
+        del traversal["nodes"]
+        return {"results": results, **traversal}
+
+    def find_causal_chain(self, target_decision_or_event: str, max_depth: int = 5) -> list[dict]:
+        """
+        Find the causal chain leading to a specific decision or event.
+        See trace_causal_chain for the bounds applied.
+        """
+        return self.trace_causal_chain(target_decision_or_event, max_depth)["results"]
+
+    def trace_causal_chain(self, target_decision_or_event: str, max_depth: int = 5,
+                           fanout: int = DEFAULT_TRAVERSAL_FANOUT, limit: int = 10,
+                           timeout_seconds: float = DEFAULT_TRAVERSAL_TIMEOUT_SECONDS) -> dict:
+        """
+        Walk INFLUENCED/HAPPENED_BEFORE/DECISION_SEQUENCE relationships backwards
+        from the Decision or TemporalEvent with this name. Each Decision,
+        TemporalEvent or Document reached is a cause, reported with its
+        shortest chain to the target, longest chains first.
+
+        Bounded like traverse_related_documents; the result reports how many
+        paths were pruned.
+        """
+        traversal = self._breadth_first_traversal(
+            ["Decision", "TemporalEvent"], "name", target_decision_or_event,
+            CAUSAL_RELATIONSHIP_TYPES, "in", max_depth, fanout, limit, timeout_seconds,
+            lambda node: any(label in node["labels"] for label in ("Decision", "TemporalEvent", "Document"))
+        )
+
+        nodes = traversal.pop("nodes")
+        results = []
+        for node_id in traversal.pop("matches"):
+            # Follow parent pointers from the cause back to the target
+            sequence, relationship_types = [], []
+            current = nodes[node_id]
+            while True:
+                sequence.append({
+                    "name": current["name"],
+                    "type": current["labels"][0] if current["labels"] else None,
+                    "timestamp": current["timestamp"],
+                    "context": current["context"]
+                })
+                if current["is_anchor"]:
+                    break
+                relationship_types.append(current["relationship_type"])
+                current = nodes[current["parent"]]
+            results.append({
+                "causal_sequence": sequence,
+                "relationship_types": relationship_types,
+                "chain_length": len(relationship_types)
+            })
+
+        results.sort(key=lambda chain: (
+            -chain["chain_length"],
+            chain["causal_sequence"][0]["timestamp"] is None,
+            str(chain["causal_sequence"][0]["timestamp"])
+        ))
+        return {"results": results, **traversal}
@@ -0,0 +1,164 @@
+"""
+Read-through cache for hot Graph Brain queries.
+
+Expertise, collaboration, cross-reference and timeline queries are asked over
+and over by the query orchestrators, while their answers only change when
+something is ingested. Results are cached per method and arguments and tagged
+with the graph write generation at the time of the read. Every GraphBrain
+write path bumps the generation, which retires all earlier entries at once
+without walking the cache.
+
+The cache and the generation are process-wide, because ingestion and the query
+orchestrators each hold their own GraphBrain instance. Entries are evicted in
+LRU order once the estimated size of the cached results exceeds max_bytes. A
+TTL bounds staleness from writes made by other processes.
+"""
+
+import copy
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+DEFAULT_MAX_BYTES = int(os.getenv("NANCY_GRAPH_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+DEFAULT_TTL_SECONDS = float(os.getenv("NANCY_GRAPH_CACHE_TTL_SECONDS", "300"))
+GRAPH_CACHE_ENABLED = os.getenv("NANCY_GRAPH_CACHE", "true").lower() == "true"
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory held by a query result (lists/dicts of primitives)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+def _freeze(value: Any):
+    """Hashable form of a method argument."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class GraphQueryCache:
+    """
+    Size-bounded LRU cache of graph query results, invalidated by a write generation.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 enabled: bool = GRAPH_CACHE_ENABLED):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple, Tuple[int, float, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.bytes = 0
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def bump_generation(self):
+        """Called after every graph write; all entries read before it become stale."""
+        with self._lock:
+            self._generation += 1
+
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        """(True, value) on a hit; stale and expired entries count as misses and are dropped."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            generation, stored_at, size, value = entry
+            if generation != self._generation or time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.bytes -= size
+                self.stale += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return True, copy.deepcopy(value)
+
+    def put(self, key: Tuple, value: Any, generation: int):
+        """Store a result read at `generation`; results of reads that raced a write are dropped."""
+        size = estimate_size(value)
+        with self._lock:
+            if generation != self._generation or size > self.max_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[2]
+            self._entries[key] = (generation, time.monotonic(), size, copy.deepcopy(value))
+            self.bytes += size
+            while self.bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted[2]
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "generation": self._generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+# Shared by every GraphBrain in the process
+graph_cache = GraphQueryCache()
+
+
+def cached_read(method):
+    """
+    Serve a read-only GraphBrain method from graph_cache, keyed by method name
+    and arguments; misses run the query and store its result.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not graph_cache.enabled:
+            return method(self, *args, **kwargs)
+        # Bind defaults so f(x) and f(name=x) share an entry
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__, _freeze(dict(list(bound.arguments.items())[1:])))
+        hit, value = graph_cache.get(key)
+        if hit:
+            return value
+        generation = graph_cache.generation
+        value = method(self, *args, **kwargs)
+        graph_cache.put(key, value, generation)
+        return value
+    return wrapper
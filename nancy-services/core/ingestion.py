@@ -1,19 +1,25 @@
-from .search import AnalyticalBrain
-from .knowledge_graph import GraphBrain
-from .nlp import VectorBrain
+from .brain_registry import (
+    get_analytical_brain, get_graph_brain, get_vector_brain, get_spacy_model,
+    get_ingestion_service, get_codebase_service
+)
+from .spreadsheet_streaming import (
+    SheetStatistics, iter_spreadsheet_chunks, header_to_column_names, rows_to_arrow, dataframe_to_arrow,
+    STREAMABLE_EXTENSIONS, STREAMING_THRESHOLD_BYTES
+)
+from .path_patterns import PathMatcher, compile_patterns
 import os
 import hashlib
-import spacy
 import re
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import json
-import fnmatch
+import weakref
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import ast
-import tree_sitter
-from tree_sitter import Language, Parser
 import git
 from git.exc import GitCommandError, InvalidGitRepositoryError
 
@@ -22,11 +28,19 @@ class IngestionService:
     Handles the ingestion of data from various sources.
     """
     def __init__(self):
-        self.analytical_brain = AnalyticalBrain()
-        self.graph_brain = GraphBrain()
-        self.vector_brain = VectorBrain()
-        # Load the spacy model
-        self.nlp = spacy.load("en_core_web_sm")
+        self.analytical_brain = get_analytical_brain()
+        self.graph_brain = get_graph_brain()
+        self.vector_brain = get_vector_brain()
+        # Column profiles per sheet DataFrame, see _get_sheet_profile
+        self._sheet_profiles = {}
+
+    @property
+    def nlp(self):
+        """
+        The spaCy pipeline, loaded by the first document that needs entity
+        extraction (spreadsheets and code do not) and shared by the process.
+        """
+        return get_spacy_model()
 
     def _get_file_type(self, filename: str):
         return os.path.splitext(filename)[1].lower()
@@ -54,6 +68,14 @@ class IngestionService:
         """Creates a unique ID for the document based on its name and content."""
         return hashlib.sha256(filename.encode() + content).hexdigest()
 
+    def _generate_doc_id_from_path(self, filename: str, file_path: str, block_size: int = 1024 * 1024) -> str:
+        """Same ID as _generate_doc_id, hashing the file in blocks instead of loading it."""
+        digest = hashlib.sha256(filename.encode())
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
     def _extract_entities(self, text: str, current_filename: str):
         """
         Enhanced entity extraction with relationship discovery using LLM if available.
@@ -246,62 +268,8 @@ class IngestionService:
         Handles Excel (.xlsx, .xls) and CSV files with robust error handling.
         """
         try:
-            import io
-            sheets_data = {}
-            
-            # Parse the spreadsheet based on file type
-            if file_type == '.csv':
-                try:
-                    # Try UTF-8 first, then fallback to other encodings
-                    try:
-                        df = pd.read_csv(io.BytesIO(content), encoding='utf-8')
-                    except UnicodeDecodeError:
-                        df = pd.read_csv(io.BytesIO(content), encoding='latin-1')
-                    
-                    sheets_data = {"Sheet1": df}
-                    print(f"Successfully parsed CSV file {filename} with {len(df)} rows and {len(df.columns)} columns")
-                except Exception as csv_error:
-                    print(f"Error parsing CSV file {filename}: {csv_error}")
-                    raise csv_error
-                    
-            else:
-                # For Excel files, read all sheets with enhanced error handling
-                try:
-                    excel_file = pd.ExcelFile(io.BytesIO(content), engine='openpyxl')
-                    print(f"Excel file {filename} contains sheets: {excel_file.sheet_names}")
-                    
-                    for sheet_name in excel_file.sheet_names:
-                        try:
-                            df = pd.read_excel(io.BytesIO(content), sheet_name=sheet_name, engine='openpyxl')
-                            if not df.empty:
-                                sheets_data[sheet_name] = df
-                                print(f"Successfully parsed sheet '{sheet_name}' with {len(df)} rows and {len(df.columns)} columns")
-                            else:
-                                print(f"Sheet '{sheet_name}' is empty, skipping")
-                        except Exception as sheet_error:
-                            print(f"Error reading sheet '{sheet_name}': {sheet_error}")
-                            continue
-                            
-                except Exception as excel_error:
-                    print(f"Error parsing Excel file {filename}: {excel_error}")
-                    # Try fallback with xlrd for older Excel files
-                    if file_type == '.xls':
-                        try:
-                            excel_file = pd.ExcelFile(io.BytesIO(content), engine='xlrd')
-                            for sheet_name in excel_file.sheet_names:
-                                try:
-                                    df = pd.read_excel(io.BytesIO(content), sheet_name=sheet_name, engine='xlrd')
-                                    if not df.empty:
-                                        sheets_data[sheet_name] = df
-                                        print(f"Successfully parsed sheet '{sheet_name}' with xlrd engine")
-                                except Exception as xlrd_error:
-                                    print(f"xlrd fallback failed for sheet '{sheet_name}': {xlrd_error}")
-                                    continue
-                        except Exception as xlrd_error:
-                            print(f"xlrd fallback failed completely: {xlrd_error}")
-                            raise excel_error
-                    else:
-                        raise excel_error
+            # Parse straight to Arrow tables; pandas views are derived only for analysis
+            sheets_data = self._read_spreadsheet_as_arrow(filename, content, file_type)
             
             if not sheets_data:
                 raise ValueError(f"No valid sheets found in {filename}")
@@ -310,23 +278,29 @@ class IngestionService:
             total_rows = 0
             total_cols = 0
             processed_sheets = []
+            sheet_chunk_stats = []
             
             print(f"Processing {len(sheets_data)} sheets through four-brain architecture")
             
-            for sheet_name, df in sheets_data.items():
-                if df.empty:
+            for sheet_name, arrow_table in sheets_data.items():
+                if arrow_table.num_rows == 0:
                     print(f"Skipping empty sheet: {sheet_name}")
                     continue
                 
-                print(f"Processing sheet '{sheet_name}' with {len(df)} rows and {len(df.columns)} columns")
+                print(f"Processing sheet '{sheet_name}' with {arrow_table.num_rows} rows and {arrow_table.num_columns} columns")
                 
-                total_rows += len(df)
-                total_cols = max(total_cols, len(df.columns))
+                total_rows += arrow_table.num_rows
+                total_cols = max(total_cols, arrow_table.num_columns)
                 
                 try:
-                    # 1. Analytical Brain: Store structured data directly
+                    # 1. Analytical Brain: Store structured data directly (columnar, from Arrow)
                     print(f"Storing {sheet_name} data in Analytical Brain (DuckDB)")
-                    self._store_spreadsheet_data(doc_id, filename, sheet_name, df)
+                    self._store_spreadsheet_data(doc_id, filename, sheet_name, arrow_table)
+                    
+                    df = arrow_table.to_pandas()
+                    
+                    # Profile the sheet once; graph extraction and summary reuse it
+                    self._get_sheet_profile(df)
                     
                     # 2. Graph Brain: Extract column relationships and dependencies
                     print(f"Extracting relationships for {sheet_name} in Graph Brain (Neo4j)")
@@ -337,11 +311,12 @@ class IngestionService:
                     summary_text = self._generate_spreadsheet_summary(filename, sheet_name, df)
                     if summary_text:
                         sheet_doc_id = f"{doc_id}_{sheet_name}"
-                        self.vector_brain.embed_and_store_text(
+                        sheet_chunk_stats.append(self.vector_brain.embed_and_store_text(
                             doc_id=sheet_doc_id, 
                             text=summary_text, 
-                            nlp=self.nlp
-                        )
+                            nlp=self.nlp,
+                            chunk_key=f"{filename}#{sheet_name}"
+                        ))
                         print(f"Successfully embedded summary for {sheet_name}")
                     
                     processed_sheets.append(sheet_name)
@@ -382,7 +357,8 @@ class IngestionService:
                 "sheets_processed": len(processed_sheets),
                 "total_rows": total_rows,
                 "total_columns": total_cols,
-                "processed_sheet_names": processed_sheets
+                "processed_sheet_names": processed_sheets,
+                "chunk_stats": self.vector_brain.combine_chunk_stats(sheet_chunk_stats)
             }
             
             print(f"Spreadsheet processing complete for {filename}: {len(processed_sheets)} sheets processed successfully")
@@ -402,18 +378,104 @@ class IngestionService:
                 "file_type": file_type
             }
     
-    def _store_spreadsheet_data(self, doc_id: str, filename: str, sheet_name: str, df: pd.DataFrame):
+    def _read_spreadsheet_as_arrow(self, filename: str, content: bytes, file_type: str) -> Dict[str, pa.Table]:
+        """
+        Parse spreadsheet content into one Arrow table per sheet.
+        CSV goes through the pyarrow CSV reader; Excel through openpyxl row iterators.
+        """
+        import io
+        sheets_data = {}
+        
+        if file_type == '.csv':
+            try:
+                # Try UTF-8 first, then fall back to latin-1
+                try:
+                    table = pa_csv.read_csv(io.BytesIO(content))
+                except (pa.ArrowInvalid, UnicodeDecodeError):
+                    table = pa_csv.read_csv(
+                        io.BytesIO(content),
+                        read_options=pa_csv.ReadOptions(encoding='latin-1')
+                    )
+                table = table.rename_columns(header_to_column_names(table.column_names))
+                
+                sheets_data = {"Sheet1": table}
+                print(f"Successfully parsed CSV file {filename} with {table.num_rows} rows and {table.num_columns} columns")
+            except Exception as csv_error:
+                print(f"Error parsing CSV file {filename}: {csv_error}")
+                raise csv_error
+            
+            return sheets_data
+        
+        try:
+            import openpyxl
+            workbook = openpyxl.load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+            print(f"Excel file {filename} contains sheets: {workbook.sheetnames}")
+            
+            try:
+                for sheet_name in workbook.sheetnames:
+                    try:
+                        table = self._worksheet_to_arrow(workbook[sheet_name].iter_rows(values_only=True))
+                        if table is not None and table.num_rows > 0:
+                            sheets_data[sheet_name] = table
+                            print(f"Successfully parsed sheet '{sheet_name}' with {table.num_rows} rows and {table.num_columns} columns")
+                        else:
+                            print(f"Sheet '{sheet_name}' is empty, skipping")
+                    except Exception as sheet_error:
+                        print(f"Error reading sheet '{sheet_name}': {sheet_error}")
+                        continue
+            finally:
+                workbook.close()
+                
+        except Exception as excel_error:
+            print(f"Error parsing Excel file {filename}: {excel_error}")
+            # openpyxl cannot read legacy .xls; fall back to xlrd via pandas
+            if file_type != '.xls':
+                raise excel_error
+            try:
+                excel_file = pd.ExcelFile(io.BytesIO(content), engine='xlrd')
+                for sheet_name in excel_file.sheet_names:
+                    try:
+                        df = pd.read_excel(excel_file, sheet_name=sheet_name)
+                        if not df.empty:
+                            sheets_data[sheet_name] = dataframe_to_arrow(df)
+                            print(f"Successfully parsed sheet '{sheet_name}' with xlrd engine")
+                    except Exception as xlrd_error:
+                        print(f"xlrd fallback failed for sheet '{sheet_name}': {xlrd_error}")
+                        continue
+            except Exception as xlrd_error:
+                print(f"xlrd fallback failed completely: {xlrd_error}")
+                raise excel_error
+        
+        return sheets_data
+    
+    def _worksheet_to_arrow(self, rows) -> Optional[pa.Table]:
+        """
+        Build an Arrow table from worksheet rows, using the first row as the header.
+        Columns with mixed cell types are stored as strings.
+        """
+        rows = iter(rows)
+        header = next(rows, None)
+        if header is None:
+            return None
+        
+        data_rows = [row for row in rows if row is not None and not all(value is None for value in row)]
+        return rows_to_arrow(header_to_column_names(header), data_rows)
+    
+    def _spreadsheet_table_name(self, doc_id: str, sheet_name: str) -> str:
+        """DuckDB table name for one sheet of a spreadsheet document."""
+        return f"spreadsheet_{doc_id[:8]}_{sheet_name}".replace(" ", "_").replace("-", "_")
+    
+    def _store_spreadsheet_data(self, doc_id: str, filename: str, sheet_name: str, data: pa.Table):
         """
         Store spreadsheet data in the Analytical Brain (DuckDB) for structured queries.
         """
         try:
             # Create a table name based on the document and sheet
-            table_name = f"spreadsheet_{doc_id[:8]}_{sheet_name}".replace(" ", "_").replace("-", "_")
+            table_name = self._spreadsheet_table_name(doc_id, sheet_name)
             
-            # Store the DataFrame in DuckDB via the analytical brain
-            # We'll add this method to the AnalyticalBrain class
+            # Store the Arrow table in DuckDB via the analytical brain
             if hasattr(self.analytical_brain, 'store_spreadsheet_data'):
-                self.analytical_brain.store_spreadsheet_data(table_name, df, {
+                self.analytical_brain.store_spreadsheet_data(table_name, data, {
                     "doc_id": doc_id,
                     "filename": filename,
                     "sheet_name": sheet_name
@@ -434,6 +496,7 @@ class IngestionService:
         """
         try:
             sheet_identifier = f"{filename}:{sheet_name}"
+            profile = self._get_sheet_profile(df)
             
             # Create sheet node with enhanced properties
             self.graph_brain.add_concept_node(sheet_identifier, "Spreadsheet")
@@ -445,25 +508,12 @@ class IngestionService:
                 relationship_type="CONTAINS_SHEET",
                 target_node_label="Spreadsheet",
                 target_node_name=sheet_identifier,
-                context=f"Document contains sheet {sheet_name} with {len(df)} rows and {len(df.columns)} columns"
+                context=f"Document contains sheet {sheet_name} with {profile['row_count']} rows and {len(df.columns)} columns"
             )
 
-            # Analyze column relationships with enhanced intelligence
-            column_types = {}
-            numeric_columns = []
-            categorical_columns = []
-            identifier_columns = []
-            
-            for col_name in df.columns:
+            # Analyze column relationships from the sheet profile
+            for col_name, col_info in profile['columns'].items():
                 col_identifier = f"{sheet_identifier}:{col_name}"
-                col_data = df[col_name].dropna()
-                
-                if col_data.empty:
-                    continue
-                
-                # Determine column characteristics
-                col_info = self._analyze_column_characteristics(col_name, col_data)
-                column_types[col_name] = col_info
                 
                 # Create column node with type information
                 self.graph_brain.add_concept_node(col_identifier, "Column")
@@ -472,7 +522,6 @@ class IngestionService:
                 context = f"Column {col_name} ({col_info['data_type']}) in sheet {sheet_name}"
                 if col_info.get('is_identifier'):
                     context += " - appears to be identifier/key column"
-                    identifier_columns.append(col_name)
                 elif col_info.get('is_calculated'):
                     context += " - appears to be calculated field"
                 
@@ -485,17 +534,11 @@ class IngestionService:
                     context=context
                 )
                 
-                # Categorize columns for relationship analysis
-                if col_info['data_type'] == 'numeric':
-                    numeric_columns.append(col_name)
-                elif col_info['data_type'] == 'categorical':
-                    categorical_columns.append(col_name)
-                
                 # Create relationships based on column content
-                self._create_column_content_relationships(col_identifier, col_name, col_data, col_info)
+                self._create_column_content_relationships(col_identifier, col_name, col_info)
 
             # Analyze cross-column relationships and dependencies
-            self._detect_advanced_column_relationships(df, sheet_identifier, numeric_columns, categorical_columns, identifier_columns)
+            self._detect_advanced_column_relationships(df, sheet_identifier, profile)
             
             # Create domain-specific relationships (engineering context)
             self._extract_engineering_domain_relationships(df, sheet_identifier)
@@ -507,71 +550,130 @@ class IngestionService:
             import traceback
             traceback.print_exc()
     
-    def _analyze_column_characteristics(self, col_name: str, col_data: pd.Series) -> Dict[str, Any]:
+    def _get_sheet_profile(self, df: pd.DataFrame, statistics: Optional[SheetStatistics] = None) -> Dict[str, Any]:
         """
-        Analyze individual column characteristics to determine data type, patterns, and purpose.
+        Return the column profile for a sheet, computing it on first use and caching
+        it against the DataFrame so the summary and every relationship detector share
+        one pass. The cache is keyed by identity and dropped when the frame is freed.
         """
-        try:
+        key = id(df)
+        cached = self._sheet_profiles.get(key)
+        if cached is not None and cached[0]() is df and statistics is None:
+            return cached[1]
+        
+        profile = self._profile_sheet(df, statistics)
+        frame_ref = weakref.ref(df, lambda _ref, key=key: self._sheet_profiles.pop(key, None))
+        self._sheet_profiles[key] = (frame_ref, profile)
+        return profile
+    
+    def _profile_sheet(self, df: pd.DataFrame, statistics: Optional[SheetStatistics] = None) -> Dict[str, Any]:
+        """
+        Profile every column of a sheet in one vectorized pass: counts, distinct
+        counts, numeric min/max/mean, correlations and the zero-filled covariance
+        used for calculated-field detection. When the sheet is a row sample of a
+        streamed file, the full-data statistics replace the sample's counts and
+        ranges.
+        """
+        non_null_counts = df.notna().sum()
+        unique_counts = df.nunique(dropna=True)
+        numeric_df = df.select_dtypes(include=['number'])
+        numeric_mins = numeric_df.min()
+        numeric_maxs = numeric_df.max()
+        numeric_means = numeric_df.mean()
+        
+        calc_keywords = ['total', 'sum', 'avg', 'average', 'calc', 'computed', 'result', 'score']
+        numeric_id_keywords = ['id', 'key', 'index', 'number', 'sequence']
+        categorical_id_keywords = ['id', 'key', 'name', 'code', 'reference', 'part']
+        
+        columns = {}
+        for col_name in df.columns:
+            row_count = int(non_null_counts[col_name])
+            if row_count == 0:
+                continue
+            
+            dtype = df[col_name].dtype
             characteristics = {
                 'name': col_name,
-                'row_count': len(col_data),
-                'null_count': col_data.isna().sum(),
-                'unique_count': col_data.nunique(),
+                'row_count': row_count,
+                'null_count': int(len(df) - row_count),
+                'unique_count': int(unique_counts[col_name]),
+                'unique_count_exact': True,
                 'is_identifier': False,
                 'is_calculated': False,
                 'data_type': 'unknown'
             }
             
-            # Determine basic data type
-            if col_data.dtype in ['int64', 'float64']:
+            if col_name in numeric_df.columns:
                 characteristics['data_type'] = 'numeric'
-                characteristics['min_value'] = float(col_data.min())
-                characteristics['max_value'] = float(col_data.max())
-                characteristics['mean_value'] = float(col_data.mean())
-                
-                # Check if it might be an identifier (sequential, unique)
-                if characteristics['unique_count'] == characteristics['row_count']:
-                    # All values are unique - might be an ID column
-                    if col_name.lower() in ['id', 'key', 'index', 'number', 'sequence']:
-                        characteristics['is_identifier'] = True
-                
-                # Check if it might be calculated (certain naming patterns)
-                calc_keywords = ['total', 'sum', 'avg', 'average', 'calc', 'computed', 'result', 'score']
-                if any(keyword in col_name.lower() for keyword in calc_keywords):
-                    characteristics['is_calculated'] = True
-                    
-            elif col_data.dtype == 'object':
+                characteristics['min_value'] = float(numeric_mins[col_name])
+                characteristics['max_value'] = float(numeric_maxs[col_name])
+                characteristics['mean_value'] = float(numeric_means[col_name])
+            elif pd.api.types.is_object_dtype(dtype) or isinstance(dtype, pd.StringDtype):
                 characteristics['data_type'] = 'categorical'
-                
-                # Sample some values for analysis
-                sample_values = col_data.dropna().head(10).tolist()
-                characteristics['sample_values'] = [str(v)[:50] for v in sample_values]
-                
-                # Check if it's an identifier column
-                if characteristics['unique_count'] == characteristics['row_count']:
-                    id_keywords = ['id', 'key', 'name', 'code', 'reference', 'part']
-                    if any(keyword in col_name.lower() for keyword in id_keywords):
-                        characteristics['is_identifier'] = True
-                        
-            elif pd.api.types.is_datetime64_any_dtype(col_data):
+                values = df[col_name].dropna()
+                characteristics['sample_values'] = [str(v)[:50] for v in values.head(10).tolist()]
+                unique_values = values.unique()
+                if len(unique_values) <= 20:
+                    characteristics['unique_values'] = unique_values.tolist()
+                characteristics['has_pass_fail'] = any(
+                    'pass' in str(v).lower() or 'fail' in str(v).lower() for v in unique_values[:10]
+                )
+            elif pd.api.types.is_datetime64_any_dtype(dtype):
                 characteristics['data_type'] = 'datetime'
-                characteristics['min_date'] = str(col_data.min())
-                characteristics['max_date'] = str(col_data.max())
-                
-            return characteristics
+                characteristics['min_date'] = str(df[col_name].min())
+                characteristics['max_date'] = str(df[col_name].max())
             
-        except Exception as e:
-            print(f"Error analyzing column characteristics for {col_name}: {e}")
-            return {'name': col_name, 'data_type': 'unknown', 'error': str(e)}
+            columns[col_name] = characteristics
+        
+        row_count = len(df)
+        if statistics is not None:
+            row_count = statistics.row_count
+            for col_name, characteristics in columns.items():
+                col_stats = statistics.columns.get(col_name)
+                if col_stats is None:
+                    continue
+                characteristics['row_count'] = col_stats.non_null_count
+                characteristics['null_count'] = col_stats.null_count
+                characteristics['unique_count_exact'] = col_stats.nunique is not None
+                # Past the distinct limit the exact count is unknown; treat as high-cardinality
+                characteristics['unique_count'] = col_stats.nunique if col_stats.nunique is not None else col_stats.non_null_count
+                if characteristics['data_type'] == 'numeric' and col_stats.is_numeric and col_stats.numeric_count:
+                    characteristics['min_value'] = float(col_stats.min_value)
+                    characteristics['max_value'] = float(col_stats.max_value)
+                    characteristics['mean_value'] = float(col_stats.mean)
+        
+        # Identifier and calculated-field flags depend on the final counts
+        for col_name, characteristics in columns.items():
+            all_unique = characteristics['unique_count'] == characteristics['row_count']
+            name_lower = str(col_name).lower()
+            if characteristics['data_type'] == 'numeric':
+                characteristics['is_identifier'] = all_unique and name_lower in numeric_id_keywords
+                characteristics['is_calculated'] = any(keyword in name_lower for keyword in calc_keywords)
+            elif characteristics['data_type'] == 'categorical':
+                characteristics['is_identifier'] = all_unique and any(keyword in name_lower for keyword in categorical_id_keywords)
+        
+        numeric_columns = [c for c, info in columns.items() if info['data_type'] == 'numeric']
+        profiled_numeric = numeric_df[numeric_columns]
+        
+        return {
+            'row_count': row_count,
+            'column_names': list(df.columns),
+            'columns': columns,
+            'numeric_columns': numeric_columns,
+            'categorical_columns': [c for c, info in columns.items() if info['data_type'] == 'categorical'],
+            'identifier_columns': [c for c, info in columns.items() if info['is_identifier']],
+            'correlation': profiled_numeric.corr() if len(numeric_columns) > 1 else None,
+            'filled_covariance': profiled_numeric.fillna(0).cov() if len(numeric_columns) > 2 else None
+        }
     
-    def _create_column_content_relationships(self, col_identifier: str, col_name: str, col_data: pd.Series, col_info: Dict[str, Any]):
+    def _create_column_content_relationships(self, col_identifier: str, col_name: str, col_info: Dict[str, Any]):
         """
         Create relationships based on column content and characteristics.
         """
         try:
             # For categorical columns, create relationships with important values
             if col_info['data_type'] == 'categorical' and col_info['unique_count'] <= 20:
-                for value in col_data.unique():
+                for value in col_info.get('unique_values', []):
                     if pd.notna(value) and len(str(value).strip()) > 0:
                         value_str = str(value)[:50]
                         concept_name = f"{col_name}:{value_str}"
@@ -618,101 +720,106 @@ class IngestionService:
         except Exception as e:
             print(f"Error creating content relationships for {col_name}: {e}")
     
-    def _detect_advanced_column_relationships(self, df: pd.DataFrame, sheet_identifier: str, numeric_columns: List[str], categorical_columns: List[str], identifier_columns: List[str]):
+    def _detect_advanced_column_relationships(self, df: pd.DataFrame, sheet_identifier: str, profile: Dict[str, Any]):
         """
         Detect advanced relationships between columns including correlations, hierarchies, and dependencies.
         """
         try:
-            # Analyze numeric column correlations
-            if len(numeric_columns) > 1:
-                numeric_df = df[numeric_columns].select_dtypes(include=['number'])
-                
+            numeric_columns = profile['numeric_columns']
+            correlations = profile['correlation']
+            
+            # Analyze numeric column correlations from the profiled correlation matrix
+            if correlations is not None:
                 for i, col1 in enumerate(numeric_columns):
                     for col2 in numeric_columns[i+1:]:
-                        try:
-                            correlation = numeric_df[col1].corr(numeric_df[col2])
-                            if abs(correlation) > 0.7:  # Strong correlation
-                                col1_id = f"{sheet_identifier}:{col1}"
-                                col2_id = f"{sheet_identifier}:{col2}"
-                                
-                                relationship_type = "STRONGLY_CORRELATED" if correlation > 0 else "INVERSELY_CORRELATED"
-                                
-                                self.graph_brain.add_relationship(
-                                    source_node_label="Column",
-                                    source_node_name=col1_id,
-                                    relationship_type=relationship_type,
-                                    target_node_label="Column",
-                                    target_node_name=col2_id,
-                                    context=f"Correlation coefficient: {correlation:.3f}"
-                                )
-                        except Exception as corr_error:
-                            continue
+                        correlation = correlations.at[col1, col2]
+                        if pd.notna(correlation) and abs(correlation) > 0.7:  # Strong correlation
+                            col1_id = f"{sheet_identifier}:{col1}"
+                            col2_id = f"{sheet_identifier}:{col2}"
+                            
+                            relationship_type = "STRONGLY_CORRELATED" if correlation > 0 else "INVERSELY_CORRELATED"
+                            
+                            self.graph_brain.add_relationship(
+                                source_node_label="Column",
+                                source_node_name=col1_id,
+                                relationship_type=relationship_type,
+                                target_node_label="Column",
+                                target_node_name=col2_id,
+                                context=f"Correlation coefficient: {correlation:.3f}"
+                            )
             
             # Look for potential calculated field relationships
-            self._detect_calculated_field_relationships(df, sheet_identifier, numeric_columns)
+            self._detect_calculated_field_relationships(sheet_identifier, profile)
             
             # Detect hierarchical relationships in categorical data
-            self._detect_categorical_hierarchies(df, sheet_identifier, categorical_columns)
+            self._detect_categorical_hierarchies(df, sheet_identifier, profile)
             
         except Exception as e:
             print(f"Error detecting advanced column relationships: {e}")
     
-    def _detect_calculated_field_relationships(self, df: pd.DataFrame, sheet_identifier: str, numeric_columns: List[str]):
+    def _detect_calculated_field_relationships(self, sheet_identifier: str, profile: Dict[str, Any]):
         """
         Detect columns that might be calculated from other columns (sums, products, etc.).
+        
+        corr(c, a + b) is derived from the profiled covariance matrix as
+        (cov(c,a) + cov(c,b)) / (std(c) * sqrt(var(a) + var(b) + 2 cov(a,b))),
+        so no per-pair sum series is materialized.
         """
         try:
+            covariance = profile['filled_covariance']
+            if covariance is None:
+                return
+            
+            numeric_columns = [c for c in profile['numeric_columns'] if profile['columns'][c]['row_count'] >= 3]
+            cov = covariance.to_numpy()
+            index = {col: i for i, col in enumerate(covariance.columns)}
+            variances = np.diag(cov)
+            
             for col_name in numeric_columns:
-                col_data = df[col_name].dropna()
-                if len(col_data) < 3:
+                c = index[col_name]
+                if variances[c] <= 0:
                     continue
+                others = [index[col] for col in profile['numeric_columns'] if col != col_name]
+                if len(others) < 2:
+                    continue
+                
+                a, b = np.triu_indices(len(others), k=1)
+                a = np.array(others)[a]
+                b = np.array(others)[b]
+                sum_variance = variances[a] + variances[b] + 2 * cov[a, b]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    sum_corr = (cov[c, a] + cov[c, b]) / np.sqrt(variances[c] * sum_variance)
                 
-                # Check if this column might be a sum of other columns
-                for other_col1 in numeric_columns:
-                    for other_col2 in numeric_columns:
-                        if col_name != other_col1 and col_name != other_col2 and other_col1 != other_col2:
-                            try:
-                                sum_data = df[other_col1].fillna(0) + df[other_col2].fillna(0)
-                                if abs(col_data.corr(sum_data)) > 0.95:  # Very high correlation with sum
-                                    col_id = f"{sheet_identifier}:{col_name}"
-                                    col1_id = f"{sheet_identifier}:{other_col1}"
-                                    col2_id = f"{sheet_identifier}:{other_col2}"
-                                    
-                                    self.graph_brain.add_relationship(
-                                        source_node_label="Column",
-                                        source_node_name=col_id,
-                                        relationship_type="SUM_OF",
-                                        target_node_label="Column",
-                                        target_node_name=col1_id,
-                                        context=f"Column {col_name} appears to be sum of {other_col1} and {other_col2}"
-                                    )
-                                    
-                                    self.graph_brain.add_relationship(
-                                        source_node_label="Column",
-                                        source_node_name=col_id,
-                                        relationship_type="SUM_OF",
-                                        target_node_label="Column",
-                                        target_node_name=col2_id,
-                                        context=f"Column {col_name} appears to be sum of {other_col1} and {other_col2}"
-                                    )
-                                    break
-                            except:
-                                continue
+                for k in np.nonzero(np.abs(np.nan_to_num(sum_corr)) > 0.95)[0]:  # Very high correlation with sum
+                    other_col1 = covariance.columns[a[k]]
+                    other_col2 = covariance.columns[b[k]]
+                    col_id = f"{sheet_identifier}:{col_name}"
+                    
+                    for other_col in (other_col1, other_col2):
+                        self.graph_brain.add_relationship(
+                            source_node_label="Column",
+                            source_node_name=col_id,
+                            relationship_type="SUM_OF",
+                            target_node_label="Column",
+                            target_node_name=f"{sheet_identifier}:{other_col}",
+                            context=f"Column {col_name} appears to be sum of {other_col1} and {other_col2}"
+                        )
                         
         except Exception as e:
             print(f"Error detecting calculated field relationships: {e}")
     
-    def _detect_categorical_hierarchies(self, df: pd.DataFrame, sheet_identifier: str, categorical_columns: List[str]):
+    def _detect_categorical_hierarchies(self, df: pd.DataFrame, sheet_identifier: str, profile: Dict[str, Any]):
         """
         Detect hierarchical relationships in categorical data (e.g., category -> subcategory).
         """
         try:
+            categorical_columns = profile['categorical_columns']
             for i, col1 in enumerate(categorical_columns):
                 for col2 in categorical_columns[i+1:]:
                     try:
                         # Check if one column might be a breakdown of another
-                        col1_unique = df[col1].nunique()
-                        col2_unique = df[col2].nunique()
+                        col1_unique = profile['columns'][col1]['unique_count']
+                        col2_unique = profile['columns'][col2]['unique_count']
                         
                         if col1_unique < col2_unique and col1_unique > 1:
                             # col1 might be a higher-level category
@@ -852,9 +959,11 @@ class IngestionService:
         try:
             if df.empty:
                 return None
+            
+            profile = self._get_sheet_profile(df)
                 
             # Basic statistics
-            num_rows = len(df)
+            num_rows = profile['row_count']
             num_cols = len(df.columns)
             
             # Enhanced column analysis
@@ -874,14 +983,7 @@ class IngestionService:
                 'design': ['specification', 'requirement', 'target', 'limit', 'tolerance']
             }
             
-            for col_name in df.columns:
-                col_data = df[col_name].dropna()
-                if col_data.empty:
-                    continue
-                
-                # Analyze column characteristics
-                col_characteristics = self._analyze_column_characteristics(col_name, col_data)
-                
+            for col_name, col_characteristics in profile['columns'].items():
                 # Detect domain keywords in column names
                 col_name_lower = col_name.lower()
                 for domain, keywords in engineering_domains.items():
@@ -958,7 +1060,7 @@ class IngestionService:
                 content_patterns = []
                 
                 # Check for test/quality data patterns
-                if any('pass' in str(val).lower() or 'fail' in str(val).lower() for col in categorical_cols for val in df[col].dropna().unique()[:10]):
+                if any(profile['columns'][col].get('has_pass_fail') for col in categorical_cols):
                     content_patterns.append("contains test results and quality status information")
                 
                 # Check for cost/budget patterns
@@ -1009,19 +1111,16 @@ class IngestionService:
             # Return basic summary as fallback
             return f"Engineering Spreadsheet: {filename}, Sheet: {sheet_name} with {len(df)} rows and {len(df.columns)} columns of data"
 
-    def ingest_file(self, filename: str, content: bytes, author: str = "Unknown", 
-                    creation_timestamp: str = None, era: str = None):
+    def _register_document(self, filename: str, doc_id: str, size: int, file_type: str, author: str,
+                           creation_timestamp: str = None, era: str = None):
         """
-        Processes an uploaded file and stores it in the three brains.
+        Record a document in the Analytical Brain and create its Graph Brain node.
         """
-        file_type = self._get_file_type(filename)
-        doc_id = self._generate_doc_id(filename, content)
-
         # 1. Analytical Brain: Store metadata
         self.analytical_brain.insert_document_metadata(
             doc_id=doc_id, # Pass the hash as a string
             filename=filename,
-            size=len(content),
+            size=size,
             file_type=file_type
         )
 
@@ -1043,6 +1142,211 @@ class IngestionService:
             self.graph_brain.add_document_node(filename=filename, file_type=file_type)
             self.graph_brain.add_author_relationship(filename=filename, author_name=author)
 
+    def ingest_spreadsheet_path(self, filename: str, file_path: str, author: str = "Unknown",
+                                creation_timestamp: str = None, era: str = None) -> Dict[str, Any]:
+        """
+        Ingest a spreadsheet from disk. CSV and XLSX files above
+        STREAMING_THRESHOLD_BYTES are streamed chunk by chunk without loading them
+        into memory; everything else goes through ingest_file.
+        """
+        file_type = self._get_file_type(filename)
+        if file_type not in STREAMABLE_EXTENSIONS or os.path.getsize(file_path) <= STREAMING_THRESHOLD_BYTES:
+            with open(file_path, 'rb') as f:
+                return self.ingest_file(filename, f.read(), author, creation_timestamp, era)
+        
+        doc_id = self._generate_doc_id_from_path(filename, file_path)
+        with self.graph_brain.provenance(doc_id):
+            self._register_document(filename, doc_id, os.path.getsize(file_path), file_type, author, creation_timestamp, era)
+            return self._process_spreadsheet_stream(filename, file_path, doc_id, file_type, author)
+
+    def purge_documents(self, doc_ids: List[str], keep_vectors: bool = False) -> Dict[str, Any]:
+        """
+        Remove stored versions of documents from all three brains: their vector
+        chunks, their DuckDB metadata and spreadsheet tables, and the graph
+        relationships only they supported. Called before a changed file is
+        re-ingested and when a tracked file is deleted.
+        
+        With keep_vectors the chunks are left in place and their sources are
+        returned, so a re-ingest can reuse unchanged chunks first and delete
+        the leftovers afterwards.
+        """
+        doc_ids = [doc_id for doc_id in dict.fromkeys(doc_ids) if doc_id]
+        if not doc_ids:
+            return {"documents_purged": 0, "vector_sources": []}
+        
+        # Read what the Analytical Brain knows before deleting it
+        documents = self.analytical_brain.get_documents_by_ids(doc_ids)
+        sheet_names = self.analytical_brain.get_document_sheet_names(doc_ids)
+        code_extensions = ('.py', '.js', '.ts', '.java', '.c', '.cpp', '.h', '.hpp')
+        code_files = [doc['filename'] for doc in documents if (doc.get('file_type') or '') in code_extensions]
+        
+        # 1. Vector Brain: chunks of the document and of each of its sheets
+        sources = list(doc_ids)
+        for doc_id, names in sheet_names.items():
+            sources.extend(f"{doc_id}_{sheet_name}" for sheet_name in names)
+        if not keep_vectors:
+            self.vector_brain.delete_by_sources(sources)
+        
+        # 2. Graph Brain: provenance-tagged relationships and code structure
+        graph_result = self.graph_brain.remove_document_provenance(doc_ids, code_files)
+        
+        # 3. Analytical Brain last, so a failed purge can be retried from its records
+        analytical_result = self.analytical_brain.delete_documents(doc_ids)
+        
+        print(f"Purged {len(doc_ids)} document versions from the three brains")
+        return {
+            "documents_purged": analytical_result["documents"],
+            "tables_dropped": analytical_result["tables"],
+            "vector_sources": sources,
+            "vector_sources_deleted": 0 if keep_vectors else len(sources),
+            "graph": graph_result
+        }
+
+    def _process_spreadsheet_stream(self, filename: str, file_path: str, doc_id: str, file_type: str, author: str) -> Dict[str, Any]:
+        """
+        Streaming counterpart of _process_spreadsheet for files larger than memory.
+        
+        Each chunk is appended to DuckDB as soon as it is read and folded into
+        one-pass column statistics; only a bounded row sample is kept for the
+        graph and summary steps, so peak memory is set by the chunk size.
+        """
+        try:
+            total_rows = 0
+            total_cols = 0
+            sheets_found = 0
+            processed_sheets = []
+            failed_sheets = {}
+            sheet_chunk_stats = []
+            column_statistics = {}
+            
+            for sheet_name, chunks in iter_spreadsheet_chunks(file_path, file_type):
+                sheets_found += 1
+                table_name = self._spreadsheet_table_name(doc_id, sheet_name)
+                stats = SheetStatistics()
+                registered = False
+                
+                try:
+                    # 1. Analytical Brain: append each chunk as it arrives
+                    for chunk in chunks:
+                        if chunk.num_rows == 0:
+                            continue
+                        self.analytical_brain.append_spreadsheet_data(table_name, chunk, create=stats.row_count == 0)
+                        stats.update(chunk)
+                        print(f"Streamed {stats.row_count} rows of '{sheet_name}' into DuckDB")
+                    
+                    if stats.row_count == 0:
+                        print(f"Skipping empty sheet: {sheet_name}")
+                        continue
+                    
+                    self.analytical_brain.register_spreadsheet_table(
+                        self.analytical_brain.clean_table_name(table_name),
+                        {"doc_id": doc_id, "filename": filename, "sheet_name": sheet_name},
+                        stats.row_count,
+                        len(stats.columns)
+                    )
+                    registered = True
+                    total_rows += stats.row_count
+                    total_cols = max(total_cols, len(stats.columns))
+                    column_statistics[sheet_name] = stats.to_dict()["columns"]
+                    
+                    # 2-3. Graph and Vector Brain work from the bounded row sample,
+                    # profiled with the full-data column statistics
+                    sample_df = stats.sample_frame()
+                    self._get_sheet_profile(sample_df, statistics=stats)
+                    self._extract_spreadsheet_relationships(filename, sheet_name, sample_df)
+                    
+                    summary_text = self._generate_spreadsheet_summary(filename, sheet_name, sample_df)
+                    if summary_text:
+                        sheet_chunk_stats.append(self.vector_brain.embed_and_store_text(
+                            doc_id=f"{doc_id}_{sheet_name}",
+                            text=summary_text,
+                            nlp=self.nlp,
+                            chunk_key=f"{filename}#{sheet_name}"
+                        ))
+                    
+                    processed_sheets.append(sheet_name)
+                    print(f"Successfully streamed sheet '{sheet_name}': {stats.row_count} rows, {len(stats.columns)} columns")
+                    
+                except Exception as sheet_processing_error:
+                    print(f"Error streaming sheet '{sheet_name}': {sheet_processing_error}")
+                    failed_sheets[sheet_name] = str(sheet_processing_error)
+                    if not registered:
+                        # Do not leave a half-appended, unregistered table behind
+                        try:
+                            self.analytical_brain.drop_spreadsheet_table(table_name)
+                        except Exception as drop_error:
+                            print(f"Could not drop partial table for sheet '{sheet_name}': {drop_error}")
+                    continue
+            
+            if not sheets_found:
+                raise ValueError(f"No valid sheets found in {filename}")
+            if failed_sheets and not processed_sheets:
+                raise ValueError(f"Every sheet of {filename} failed: {failed_sheets}")
+            
+            try:
+                self.analytical_brain.update_document_metadata(
+                    doc_id=doc_id,
+                    additional_metadata={
+                        "spreadsheet_type": file_type,
+                        "sheets_count": len(processed_sheets),
+                        "total_rows": total_rows,
+                        "total_columns": total_cols,
+                        "sheet_names": processed_sheets,
+                        "column_statistics": column_statistics,
+                        "ingestion_mode": "streaming",
+                        "processing_status": "partial" if failed_sheets else "complete",
+                        "failed_sheets": failed_sheets,
+                        "author": author
+                    }
+                )
+            except Exception as metadata_error:
+                print(f"Warning: Could not update document metadata: {metadata_error}")
+            
+            return {
+                "filename": filename,
+                "doc_id": doc_id,
+                "status": "spreadsheet ingestion partial" if failed_sheets else "spreadsheet ingestion complete",
+                "file_type": file_type,
+                "ingestion_mode": "streaming",
+                "failed_sheets": failed_sheets,
+                "sheets_found": sheets_found,
+                "sheets_processed": len(processed_sheets),
+                "total_rows": total_rows,
+                "total_columns": total_cols,
+                "processed_sheet_names": processed_sheets,
+                "chunk_stats": self.vector_brain.combine_chunk_stats(sheet_chunk_stats)
+            }
+            
+        except Exception as e:
+            print(f"Critical error streaming spreadsheet {filename}: {e}")
+            import traceback
+            traceback.print_exc()
+            
+            return {
+                "filename": filename,
+                "doc_id": doc_id,
+                "status": "spreadsheet ingestion failed",
+                "error": str(e),
+                "file_type": file_type
+            }
+    
+    def ingest_file(self, filename: str, content: bytes, author: str = "Unknown", 
+                    creation_timestamp: str = None, era: str = None):
+        """
+        Processes an uploaded file and stores it in the three brains.
+        """
+        doc_id = self._generate_doc_id(filename, content)
+        # Graph relationships record the doc_id so a later version can retire them
+        with self.graph_brain.provenance(doc_id):
+            return self._ingest_file(filename, content, doc_id, author, creation_timestamp, era)
+
+    def _ingest_file(self, filename: str, content: bytes, doc_id: str, author: str,
+                     creation_timestamp: str = None, era: str = None):
+        file_type = self._get_file_type(filename)
+
+        # 1-2. Analytical and Graph Brain document records
+        self._register_document(filename, doc_id, len(content), file_type, author, creation_timestamp, era)
+
         # 3. Vector Brain & Entity Extraction
         # Define a list of text-based file extensions to process
         text_based_extensions = ['.txt', '.md', '.log', '.py', '.js', '.html', '.css', '.json']
@@ -1073,20 +1377,24 @@ class IngestionService:
         if file_type in text_based_extensions or file_type == '.txt':
             try:
                 text = content.decode('utf-8')
-                # Embed and store the text
-                self.vector_brain.embed_and_store_text(doc_id=doc_id, text=text, nlp=self.nlp)
+                # Embed and store the text, reusing unchanged chunks of a previous version
+                chunk_stats = self.vector_brain.embed_and_store_text(
+                    doc_id=doc_id, text=text, nlp=self.nlp, chunk_key=filename
+                )
                 # Extract entities and create relationships
                 self._extract_entities(text, filename)
             except UnicodeDecodeError:
                 return {"error": f"Could not decode file {filename} as UTF-8 text."}
         else:
             print(f"Skipping vector embedding and entity extraction for non-text file: {filename}")
+            chunk_stats = None
 
 
         return {
             "filename": filename,
             "doc_id": doc_id,
             "status": "ingestion complete",
+            "chunk_stats": chunk_stats,
         }
     
     def _process_code_file(self, filename: str, content: bytes, doc_id: str, file_type: str, author: str) -> Dict[str, Any]:
@@ -1115,7 +1423,9 @@ class IngestionService:
             )
             
             # 2. Vector Brain: Embed text content for semantic search
-            self.vector_brain.embed_and_store_text(doc_id=doc_id, text=text_content, nlp=self.nlp)
+            chunk_stats = self.vector_brain.embed_and_store_text(
+                doc_id=doc_id, text=text_content, nlp=self.nlp, chunk_key=filename
+            )
             
             # 3. Enhanced Code Analysis with AST and Git
             full_path = filename  # Assuming filename contains full path for code analysis
@@ -1149,7 +1459,8 @@ class IngestionService:
                 "ast_analysis_success": code_analysis is not None,
                 "language": code_analysis.get("ast_analysis", {}).get("language", "unknown") if code_analysis else "unknown",
                 "functions_found": len(code_analysis.get("ast_analysis", {}).get("functions", [])) if code_analysis else 0,
-                "classes_found": len(code_analysis.get("ast_analysis", {}).get("classes", [])) if code_analysis else 0
+                "classes_found": len(code_analysis.get("ast_analysis", {}).get("classes", [])) if code_analysis else 0,
+                "chunk_stats": chunk_stats
             }
             
             print(f"Code processing complete for {filename}: {result['language']} file with {result['functions_found']} functions and {result['classes_found']} classes")
@@ -1287,11 +1598,19 @@ class DirectoryIngestionService:
     """
     
     def __init__(self):
-        self.analytical_brain = AnalyticalBrain()
-        self.ingestion_service = IngestionService()
-        self.codebase_service = CodebaseIngestionService()
+        self.analytical_brain = get_analytical_brain()
         print("DirectoryIngestionService initialized with four-brain architecture and codebase analysis")
     
+    @property
+    def ingestion_service(self):
+        """Document ingestion, created by the first file processed (see core/brain_registry.py)."""
+        return get_ingestion_service()
+    
+    @property
+    def codebase_service(self):
+        """Source code analysis, created by the first code file processed."""
+        return get_codebase_service()
+    
     def _calculate_file_hash(self, file_path: str) -> str:
         """
         Calculate SHA256 hash of file content for change detection.
@@ -1310,25 +1629,26 @@ class DirectoryIngestionService:
         if not patterns:
             return True
         
-        pattern_list = [p.strip() for p in patterns.split(',')]
-        file_name = os.path.basename(file_path)
-        relative_path = file_path
-        
-        for pattern in pattern_list:
-            # Check both filename and relative path
-            if fnmatch.fnmatch(file_name, pattern) or fnmatch.fnmatch(relative_path, pattern):
-                return True
-        
-        return False
+        return compile_patterns(patterns).matches(file_path)
     
     def _should_ignore_file(self, file_path: str, ignore_patterns: str) -> bool:
         """
-        Check if file should be ignored based on ignore patterns.
+        Check if file should be ignored based on ignore patterns, including
+        patterns matching one of its parent directories.
         """
         if not ignore_patterns:
             return False
         
-        return self._matches_patterns(file_path, ignore_patterns)
+        return compile_patterns(ignore_patterns).ignores(file_path)
+    
+    def _should_ignore_directory(self, directory_path: str, ignore_patterns: str) -> bool:
+        """
+        Check if a directory, and everything below it, is excluded by the ignore patterns.
+        """
+        if not ignore_patterns:
+            return False
+        
+        return compile_patterns(ignore_patterns).matches_directory(directory_path)
     
     def _is_supported_file_type(self, file_path: str) -> bool:
         """
@@ -1360,7 +1680,7 @@ class DirectoryIngestionService:
             if file_patterns is None:
                 file_patterns = "*.txt,*.md,*.py,*.js,*.ts,*.java,*.c,*.cpp,*.h,*.hpp,*.html,*.css,*.json,*.csv,*.xlsx,*.xls"
             if ignore_patterns is None:
-                ignore_patterns = ".git/*,.env*,node_modules/*,__pycache__/*,*.pyc"
+                ignore_patterns = ".git/,.env*,node_modules/,__pycache__/,*.pyc"
             
             directory_path = os.path.abspath(directory_path)
             print(f"Scanning directory: {directory_path} (recursive={recursive})")
@@ -1373,32 +1693,42 @@ class DirectoryIngestionService:
             ignored_files = 0
             unsupported_files = 0
             
-            # Walk through directory
-            if recursive:
-                for root, dirs, files in os.walk(directory_path):
-                    # Skip ignored directories
-                    dirs[:] = [d for d in dirs if not self._should_ignore_file(os.path.join(root, d), ignore_patterns)]
+            # Compile the pattern sets once for the whole walk
+            include_matcher = compile_patterns(file_patterns)
+            ignore_matcher = compile_patterns(ignore_patterns)
+            
+            # Walk with scandir so each entry's stat result is reused, and prune
+            # ignored directories before descending into them
+            pending_directories = [directory_path]
+            while pending_directories:
+                current = pending_directories.pop()
+                try:
+                    entries = list(os.scandir(current))
+                except OSError as e:
+                    print(f"Error reading directory {current}: {e}")
+                    continue
+                
+                for entry in entries:
+                    relative_path = os.path.relpath(entry.path, directory_path)
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive and not ignore_matcher.matches_directory(relative_path):
+                                pending_directories.append(entry.path)
+                            continue
+                        if not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
                     
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        self._process_discovered_file(
-                            file_path, directory_path, file_patterns, ignore_patterns,
-                            discovered_files, existing_file_paths, 
-                            new_files, changed_files, unchanged_files, ignored_files, unsupported_files
-                        )
-            else:
-                # Non-recursive scan
-                for item in os.listdir(directory_path):
-                    file_path = os.path.join(directory_path, item)
-                    if os.path.isfile(file_path):
-                        new_files, changed_files, unchanged_files, ignored_files, unsupported_files = self._process_discovered_file(
-                            file_path, directory_path, file_patterns, ignore_patterns,
-                            discovered_files, existing_file_paths,
-                            new_files, changed_files, unchanged_files, ignored_files, unsupported_files
-                        )
+                    new_files, changed_files, unchanged_files, ignored_files, unsupported_files = self._process_discovered_file(
+                        entry, relative_path, directory_path, include_matcher, ignore_matcher,
+                        discovered_files, existing_file_paths,
+                        new_files, changed_files, unchanged_files, ignored_files, unsupported_files
+                    )
             
-            # Mark deleted files
+            # Mark deleted files and remove their content from the brains
             deleted_count = self.analytical_brain.mark_deleted_files(existing_file_paths, directory_path)
+            purged_count = self.purge_deleted_files() if deleted_count else 0
             
             scan_results = {
                 "directory_path": directory_path,
@@ -1410,6 +1740,7 @@ class DirectoryIngestionService:
                 "ignored_files": ignored_files,
                 "unsupported_files": unsupported_files,
                 "deleted_files": deleted_count,
+                "purged_documents": purged_count,
                 "files_to_process": new_files + changed_files,
                 "scan_timestamp": datetime.utcnow().isoformat(),
                 "file_patterns": file_patterns,
@@ -1427,25 +1758,25 @@ class DirectoryIngestionService:
             traceback.print_exc()
             return {"error": str(e)}
     
-    def _process_discovered_file(self, file_path: str, directory_root: str, 
-                               file_patterns: str, ignore_patterns: str,
+    def _process_discovered_file(self, entry: os.DirEntry, relative_path: str, directory_root: str,
+                               include_matcher: PathMatcher, ignore_matcher: PathMatcher,
                                discovered_files: list, existing_file_paths: set,
                                new_files: int, changed_files: int, unchanged_files: int,
                                ignored_files: int, unsupported_files: int) -> tuple:
         """
         Process a single discovered file for hash-based change detection.
         """
+        file_path = entry.path
         try:
-            relative_path = os.path.relpath(file_path, directory_root)
             existing_file_paths.add(file_path)
             
-            # Check if file should be ignored
-            if self._should_ignore_file(relative_path, ignore_patterns):
+            # Check if file should be ignored (ignored parent directories were pruned by the walk)
+            if ignore_matcher and ignore_matcher.matches(relative_path):
                 ignored_files += 1
                 return new_files, changed_files, unchanged_files, ignored_files, unsupported_files
             
             # Check if file matches include patterns
-            if not self._matches_patterns(relative_path, file_patterns):
+            if include_matcher and not include_matcher.matches(relative_path):
                 ignored_files += 1
                 return new_files, changed_files, unchanged_files, ignored_files, unsupported_files
             
@@ -1454,8 +1785,8 @@ class DirectoryIngestionService:
                 unsupported_files += 1
                 return new_files, changed_files, unchanged_files, ignored_files, unsupported_files
             
-            # Get file stats
-            file_stat = os.stat(file_path)
+            # Get file stats (cached on the scandir entry)
+            file_stat = entry.stat()
             file_size = file_stat.st_size
             last_modified = datetime.fromtimestamp(file_stat.st_mtime)
             
@@ -1501,6 +1832,153 @@ class DirectoryIngestionService:
             print(f"Error processing file {file_path}: {e}")
             return new_files, changed_files, unchanged_files, ignored_files, unsupported_files
     
+    def track_file_change(self, file_path: str, directory_root: str,
+                          file_patterns: str, ignore_patterns: str) -> str:
+        """
+        Re-check a single file reported by the directory watcher and queue it as
+        pending if it is new or changed. Returns "queued", "unchanged", "ignored",
+        "unsupported" or "deleted".
+        """
+        if not os.path.isfile(file_path):
+            self.remove_path(file_path)
+            return "deleted"
+        
+        relative_path = os.path.relpath(file_path, directory_root)
+        if self._should_ignore_file(relative_path, ignore_patterns) or not self._matches_patterns(relative_path, file_patterns):
+            return "ignored"
+        if not self._is_supported_file_type(file_path):
+            return "unsupported"
+        
+        file_stat = os.stat(file_path)
+        content_hash = self._calculate_file_hash(file_path)
+        if not content_hash:
+            return "ignored"
+        
+        needs_processing = self.analytical_brain.upsert_file_state(
+            file_path, content_hash, datetime.fromtimestamp(file_stat.st_mtime),
+            file_stat.st_size, directory_root, relative_path
+        )
+        return "queued" if needs_processing else "unchanged"
+    
+    def remove_path(self, path: str) -> int:
+        """
+        Mark a removed file, or every tracked file under a removed directory, as
+        deleted and purge their content from the brains.
+        """
+        deleted = self.analytical_brain.mark_paths_deleted(path)
+        if deleted:
+            self.purge_deleted_files()
+        return deleted
+    
+    def purge_deleted_files(self, batch_size: int = 500) -> int:
+        """
+        Purge the last ingested version of every deleted file from all three
+        brains. A file keeps its doc_id until its purge succeeds, so an
+        interrupted purge is picked up again by the next call.
+        """
+        purged = 0
+        while True:
+            files = self.analytical_brain.get_deleted_files_to_purge(batch_size)
+            if not files:
+                return purged
+            
+            try:
+                self.ingestion_service.purge_documents([f['doc_id'] for f in files])
+            except Exception as e:
+                print(f"Error purging deleted files: {e}")
+                return purged
+            
+            self.analytical_brain.clear_file_doc_ids([f['file_path'] for f in files])
+            purged += len(files)
+    
+    def process_file_state(self, file_info: Dict[str, Any], author: str) -> Dict[str, Any]:
+        """
+        Ingest one tracked file through the four-brain architecture and commit
+        its processing status. Returns the per-file result.
+        """
+        file_path = file_info['file_path']
+        relative_path = file_info['relative_path']
+        
+        try:
+            # Read file content
+            if not os.path.exists(file_path):
+                # File was deleted between scan and processing
+                self.analytical_brain.update_file_processing_status(
+                    file_path, 'deleted', error_message="File no longer exists"
+                )
+                self.purge_deleted_files()
+                return {
+                    "file_path": file_path,
+                    "status": "deleted",
+                    "message": "File no longer exists"
+                }
+            
+            with open(file_path, 'rb') as f:
+                content = f.read()
+            
+            # Use filename from relative path for better naming
+            display_filename = relative_path
+            
+            # Retire the previously ingested version before writing the new one.
+            # Its vector chunks stay until the new version has reused the
+            # unchanged ones (re-tagging them with the new doc_id)
+            previous_doc_id = file_info.get('doc_id')
+            stale_sources = []
+            if previous_doc_id:
+                stale_sources = self.ingestion_service.purge_documents(
+                    [previous_doc_id], keep_vectors=True
+                )["vector_sources"]
+            
+            # Process through existing ingestion service (four-brain architecture);
+            # only the previous version's chunks may be reused or retired
+            with self.ingestion_service.vector_brain.superseding(stale_sources):
+                ingestion_result = self.ingestion_service.ingest_file(
+                    filename=display_filename,
+                    content=content,
+                    author=author
+                )
+            
+            # Whatever is still tagged with the old version was not reused
+            # (e.g. a removed sheet, or chunks stored before chunk-level diffing)
+            if stale_sources and ingestion_result.get("doc_id") != previous_doc_id:
+                self.ingestion_service.vector_brain.delete_by_sources(stale_sources)
+            
+            if "error" in ingestion_result:
+                # Ingestion failed
+                self.analytical_brain.update_file_processing_status(
+                    file_path, 'error', error_message=ingestion_result["error"]
+                )
+                return {
+                    "file_path": file_path,
+                    "status": "error",
+                    "error": ingestion_result["error"]
+                }
+            
+            # Ingestion successful
+            self.analytical_brain.update_file_processing_status(
+                file_path, 'completed', doc_id=ingestion_result.get("doc_id")
+            )
+            return {
+                "file_path": file_path,
+                "status": "completed",
+                "doc_id": ingestion_result.get("doc_id"),
+                "chunk_stats": ingestion_result.get("chunk_stats"),
+                "ingestion_result": ingestion_result
+            }
+            
+        except Exception as e:
+            error_msg = str(e)
+            print(f"Error processing file {file_path}: {error_msg}")
+            
+            self.analytical_brain.update_file_processing_status(
+                file_path, 'error', error_message=error_msg
+            )
+            return {
+                "file_path": file_path,
+                "status": "error",
+                "error": error_msg
+            }
+    
     def process_pending_files(self, limit: int = 50, author: str = "Directory Processing") -> Dict[str, Any]:
         """
         Process files that are pending ingestion through the four-brain architecture.
@@ -1524,73 +2002,11 @@ class DirectoryIngestionService:
             failed = 0
             
             for file_info in pending_files:
-                file_path = file_info['file_path']
-                relative_path = file_info['relative_path']
-                
-                try:
-                    # Read file content
-                    if not os.path.exists(file_path):
-                        # File was deleted between scan and processing
-                        self.analytical_brain.update_file_processing_status(
-                            file_path, 'deleted', error_message="File no longer exists"
-                        )
-                        results.append({
-                            "file_path": file_path,
-                            "status": "deleted",
-                            "message": "File no longer exists"
-                        })
-                        failed += 1
-                        continue
-                    
-                    with open(file_path, 'rb') as f:
-                        content = f.read()
-                    
-                    # Use filename from relative path for better naming
-                    display_filename = relative_path
-                    
-                    # Process through existing ingestion service (four-brain architecture)
-                    ingestion_result = self.ingestion_service.ingest_file(
-                        filename=display_filename,
-                        content=content,
-                        author=author
-                    )
-                    
-                    if "error" in ingestion_result:
-                        # Ingestion failed
-                        self.analytical_brain.update_file_processing_status(
-                            file_path, 'error', error_message=ingestion_result["error"]
-                        )
-                        results.append({
-                            "file_path": file_path,
-                            "status": "error",
-                            "error": ingestion_result["error"]
-                        })
-                        failed += 1
-                    else:
-                        # Ingestion successful
-                        self.analytical_brain.update_file_processing_status(
-                            file_path, 'completed', doc_id=ingestion_result.get("doc_id")
-                        )
-                        results.append({
-                            "file_path": file_path,
-                            "status": "completed",
-                            "doc_id": ingestion_result.get("doc_id"),
-                            "ingestion_result": ingestion_result
-                        })
-                        successful += 1
-                    
-                except Exception as e:
-                    error_msg = str(e)
-                    print(f"Error processing file {file_path}: {error_msg}")
-                    
-                    self.analytical_brain.update_file_processing_status(
-                        file_path, 'error', error_message=error_msg
-                    )
-                    results.append({
-                        "file_path": file_path,
-                        "status": "error",
-                        "error": error_msg
-                    })
+                result = self.process_file_state(file_info, author)
+                results.append(result)
+                if result["status"] == "completed":
+                    successful += 1
+                else:
                     failed += 1
             
             processing_summary = {
@@ -1599,6 +2015,9 @@ class DirectoryIngestionService:
                 "successful": successful,
                 "failed": failed,
                 "success_rate": successful / len(pending_files) if pending_files else 0,
+                "chunk_stats": self.ingestion_service.vector_brain.combine_chunk_stats(
+                    [result.get("chunk_stats") for result in results]
+                ),
                 "processing_timestamp": datetime.utcnow().isoformat(),
                 "results": results
             }
@@ -1922,6 +2341,8 @@ class CodebaseIngestionService:
         Initialize tree-sitter parsers for supported languages.
         """
         try:
+            from tree_sitter import Language, Parser
+            
             # Dictionary mapping file extensions to tree-sitter language names
             self.language_map = {
                 '.py': 'python',
@@ -1974,7 +2395,7 @@ class CodebaseIngestionService:
         except Exception as e:
             print(f"Error initializing tree-sitter: {e}")
     
-    def _get_parser_for_file(self, file_path: str) -> Optional[Parser]:
+    def _get_parser_for_file(self, file_path: str) -> Optional[Any]:
         """
         Get the appropriate tree-sitter parser for a file.
         """
@@ -0,0 +1,260 @@
+"""
+Durable background jobs for directory ingestion.
+
+Scan and process requests are stored as rows in the ingestion_jobs table and
+return a job id immediately. Worker threads lease jobs, and process jobs lease
+file_state rows in small batches; every file's status is committed as soon as it
+is ingested. While a job runs, a heartbeat thread renews its lease and the
+leases of its uncommitted files, so slow files are not reclaimed by another
+worker. If the process dies, the heartbeat stops, the leases expire and the
+next worker resumes from the last committed file.
+"""
+
+import os
+import socket
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from .brain_registry import get_analytical_brain
+
+JOB_TYPES = ("scan", "process", "scan_and_process")
+
+# Worker threads per process
+JOB_WORKERS = int(os.getenv("NANCY_JOB_WORKERS", "1"))
+
+# A lease not renewed for this long is considered abandoned by a crashed worker
+JOB_LEASE_SECONDS = int(os.getenv("NANCY_JOB_LEASE_SECONDS", "300"))
+
+# Files leased per claim; small batches keep the resume point close to the crash
+FILE_CLAIM_BATCH = 10
+
+# Lease renewals per lease period, so one late heartbeat does not lose the lease
+HEARTBEATS_PER_LEASE = 3
+
+POLL_INTERVAL_SECONDS = 2.0
+
+
+class IngestionJobManager:
+    """
+    Runs directory scan/process jobs on background worker threads and reports
+    their progress.
+    """
+
+    def __init__(self, directory_service, workers: int = JOB_WORKERS, lease_seconds: int = JOB_LEASE_SECONDS):
+        self.directory_service = directory_service
+        # Job bookkeeping goes through the process-wide Analytical Brain
+        self.analytical_brain = get_analytical_brain()
+        self.workers = max(1, workers)
+        self.lease_seconds = lease_seconds
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._threads = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the worker threads; queued and abandoned jobs are picked up right away."""
+        with self._lock:
+            if any(thread.is_alive() for thread in self._threads):
+                return
+            self._stop.clear()
+            self._threads = [
+                threading.Thread(target=self._worker_loop, args=(f"{self.worker_prefix}:{i}",),
+                                 name=f"nancy-job-worker-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+        print(f"Ingestion job manager started with {self.workers} workers")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the workers; a job interrupted mid-way is requeued and resumes on restart."""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, job_type: str, params: Dict[str, Any]) -> str:
+        """Queue a job and return its id."""
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Unknown job type: {job_type}. Must be one of {JOB_TYPES}")
+        if job_type in ("scan", "scan_and_process") and not params.get("directory_path"):
+            raise ValueError(f"{job_type} jobs require directory_path")
+
+        job_id = str(uuid.uuid4())
+        self.analytical_brain.create_ingestion_job(job_id, job_type, params)
+        self.start()
+        self._wake.set()
+        print(f"Queued {job_type} job {job_id}")
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job row plus derived progress: files processed, throughput and ETA."""
+        job = self.analytical_brain.get_ingestion_job(job_id)
+        if job is None:
+            return None
+
+        processed = job["files_done"] + job["files_failed"]
+        total = job["files_total"] or 0
+        throughput = None
+        eta_seconds = None
+        if job["progress_started_at"] and processed:
+            end = job["finished_at"] if job["status"] in ("completed", "failed") else datetime.utcnow()
+            elapsed = max((end - job["progress_started_at"]).total_seconds(), 1e-6)
+            throughput = processed / elapsed
+            if job["status"] == "running":
+                eta_seconds = max(total - processed, 0) / throughput
+
+        job["progress"] = {
+            "files_total": total,
+            "files_processed": processed,
+            "files_done": job["files_done"],
+            "files_failed": job["files_failed"],
+            "percent_complete": round(100 * processed / total, 1) if total else None,
+            "throughput_files_per_second": throughput,
+            "eta_seconds": eta_seconds
+        }
+        return job
+
+    def list_jobs(self, limit: int = 50) -> list:
+        return self.analytical_brain.list_ingestion_jobs(limit)
+
+    def has_queued_process_job(self, directory_root: str) -> bool:
+        return self.analytical_brain.has_queued_process_job(directory_root)
+
+    # Worker side
+
+    def _worker_loop(self, worker_id: str):
+        while not self._stop.is_set():
+            try:
+                job = self.analytical_brain.claim_ingestion_job(worker_id, self.lease_seconds)
+            except Exception as e:
+                print(f"Error claiming ingestion job: {e}")
+                job = None
+
+            if job is None:
+                self._wake.wait(POLL_INTERVAL_SECONDS)
+                self._wake.clear()
+                continue
+
+            with self._lease_heartbeat(job["id"], worker_id):
+                self._run_job(job, worker_id)
+
+    @contextmanager
+    def _lease_heartbeat(self, job_id: str, worker_id: str):
+        """Renew the job's lease and its files' leases in the background while the block runs."""
+        done = threading.Event()
+
+        def beat():
+            while not done.wait(self.lease_seconds / HEARTBEATS_PER_LEASE):
+                try:
+                    if not self.analytical_brain.renew_ingestion_job_lease(job_id, worker_id, self.lease_seconds):
+                        print(f"Worker {worker_id} no longer holds job {job_id}")
+                        return
+                except Exception as e:
+                    print(f"Error renewing lease of job {job_id}: {e}")
+
+        thread = threading.Thread(target=beat, name=f"nancy-job-heartbeat-{worker_id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def _run_job(self, job: Dict[str, Any], worker_id: str):
+        job_id = job["id"]
+        job_type = job["job_type"]
+        params = job["params"]
+        print(f"Worker {worker_id} running {job_type} job {job_id} (phase: {job['phase'] or 'start'})")
+
+        try:
+            result = {}
+
+            # A resumed job that already finished scanning goes straight to processing
+            if job_type in ("scan", "scan_and_process") and job["phase"] != "process":
+                self.analytical_brain.start_ingestion_job_phase(job_id, "scan")
+                scan_results = self.directory_service.scan_directory(
+                    directory_path=params["directory_path"],
+                    recursive=params.get("recursive", True),
+                    file_patterns=params.get("file_patterns"),
+                    ignore_patterns=params.get("ignore_patterns"),
+                    author=params.get("author", "Directory Scan")
+                )
+                if "error" in scan_results:
+                    self.analytical_brain.finish_ingestion_job(job_id, "failed", error_message=scan_results["error"])
+                    return
+                result["scan_results"] = scan_results
+
+                if job_type == "scan":
+                    self.analytical_brain.finish_ingestion_job(job_id, "completed", result=result)
+                    return
+
+            directory_root = None
+            if job_type == "scan_and_process":
+                directory_root = os.path.abspath(params["directory_path"])
+            elif params.get("directory_path"):
+                directory_root = os.path.abspath(params["directory_path"])
+            limit = params.get("limit")
+
+            if job["phase"] != "process":
+                files_total = self.analytical_brain.count_claimable_files(directory_root)
+                if limit:
+                    files_total = min(files_total, limit)
+                self.analytical_brain.start_ingestion_job_phase(job_id, "process", files_total, result or None)
+
+            if not self._process_files(job_id, worker_id, directory_root, limit, params.get("author", "Directory Processing")):
+                # Interrupted by shutdown: hand the job back for the next start
+                self.analytical_brain.release_ingestion_job(job_id, worker_id)
+                print(f"Job {job_id} interrupted, requeued for resume")
+                return
+
+            self.analytical_brain.finish_ingestion_job(job_id, "completed")
+            print(f"Job {job_id} completed")
+
+        except Exception as e:
+            print(f"Error running ingestion job {job_id}: {e}")
+            import traceback
+            traceback.print_exc()
+            self.analytical_brain.finish_ingestion_job(job_id, "failed", error_message=str(e))
+
+    def _process_files(self, job_id: str, worker_id: str, directory_root: Optional[str],
+                       limit: Optional[int], author: str) -> bool:
+        """
+        Lease and ingest pending files until none are left or the job's limit is
+        reached. Returns False if interrupted by stop().
+        """
+        job = self.analytical_brain.get_ingestion_job(job_id, error_limit=0)
+        processed = job["files_done"] + job["files_failed"]
+
+        while True:
+            if self._stop.is_set():
+                return False
+
+            batch_size = FILE_CLAIM_BATCH
+            if limit:
+                batch_size = min(batch_size, limit - processed)
+                if batch_size <= 0:
+                    return True
+
+            batch = self.analytical_brain.claim_pending_files(
+                job_id, worker_id, batch_size, self.lease_seconds, directory_root
+            )
+            if not batch:
+                return True
+
+            for file_info in batch:
+                if self._stop.is_set():
+                    return False
+
+                # process_file_state commits the file's status and clears its lease
+                file_result = self.directory_service.process_file_state(file_info, author)
+                error = None
+                if file_result["status"] != "completed":
+                    error = file_result.get("error") or file_result.get("message") or file_result["status"]
+                self.analytical_brain.record_ingestion_job_file(job_id, file_info["file_path"], error)
+                processed += 1
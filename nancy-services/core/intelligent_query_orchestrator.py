@@ -6,10 +6,8 @@ Uses LLM for query analysis and response synthesis as advertised in README.md
 import json
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-from .search import AnalyticalBrain
-from .knowledge_graph import GraphBrain
-from .nlp import VectorBrain
-from .llm_client import LLMClient, QueryIntent, QueryType
+from .brain_registry import get_analytical_brain, get_graph_brain, get_vector_brain, get_llm_client
+from .llm_client import QueryIntent, QueryType
 
 class IntelligentQueryOrchestrator:
     """
@@ -33,7 +31,7 @@ class IntelligentQueryOrchestrator:
         """Lazy-load VectorBrain only when needed"""
         if self._vector_brain is None:
             print("  → Initializing VectorBrain (ChromaDB)...")
-            self._vector_brain = VectorBrain()
+            self._vector_brain = get_vector_brain()
             print("  ✓ VectorBrain ready")
         return self._vector_brain
     
@@ -42,7 +40,7 @@ class IntelligentQueryOrchestrator:
         """Lazy-load AnalyticalBrain only when needed"""
         if self._analytical_brain is None:
             print("  → Initializing AnalyticalBrain (DuckDB)...")
-            self._analytical_brain = AnalyticalBrain()
+            self._analytical_brain = get_analytical_brain()
             print("  ✓ AnalyticalBrain ready")
         return self._analytical_brain
     
@@ -50,8 +48,8 @@ class IntelligentQueryOrchestrator:
     def graph_brain(self):
         """Lazy-load GraphBrain only when needed"""
         if self._graph_brain is None:
-            print("  → Initializing GraphBrain (Neo4j)...")
-            self._graph_brain = GraphBrain()
+            print("  → Initializing GraphBrain...")
+            self._graph_brain = get_graph_brain()
             print("  ✓ GraphBrain ready")
         return self._graph_brain
     
@@ -60,7 +58,7 @@ class IntelligentQueryOrchestrator:
         """Lazy-load LLM Client only when needed"""
         if self._llm_client is None:
             print("  → Initializing LinguisticBrain (Local LLM)...")
-            self._llm_client = LLMClient(preferred_llm="gemini")
+            self._llm_client = get_llm_client("gemini")
             print("  ✓ LinguisticBrain ready")
         return self._llm_client
     
@@ -307,12 +305,9 @@ class IntelligentQueryOrchestrator:
         
         # Check VectorBrain
         try:
-            collections = self.vector_brain.client.list_collections()
-            health["brains"]["vector"] = {
-                "status": "healthy",
-                "collections": len(collections),
-                "details": "ChromaDB operational"
-            }
+            health["brains"]["vector"] = self.vector_brain.health_check()
+            if health["brains"]["vector"]["status"] != "healthy":
+                health["overall"] = "degraded"
         except Exception as e:
             health["brains"]["vector"] = {
                 "status": "unhealthy", 
@@ -338,14 +333,9 @@ class IntelligentQueryOrchestrator:
         
         # Check GraphBrain  
         try:
-            # Simple test query
-            with self.graph_brain.driver.session() as session:
-                result = session.run("RETURN 'Neo4j is working' as message")
-                record = result.single()
-                health["brains"]["graph"] = {
-                    "status": "healthy",
-                    "details": record["message"] if record else "Neo4j operational"
-                }
+            health["brains"]["graph"] = self.graph_brain.health_check()
+            if health["brains"]["graph"]["status"] != "healthy":
+                health["overall"] = "degraded"
         except Exception as e:
             health["brains"]["graph"] = {
                 "status": "unhealthy",
@@ -1,7 +1,44 @@
 from neo4j import GraphDatabase
+from neo4j.exceptions import Neo4jError
 import os
+import time
 from typing import Optional
 
+from .graph_backend import (
+    GraphBackend, ENTITY_LABELS, DEFAULT_ENTITY_LIMIT, DEFAULT_TRAVERSAL_MAX_NODES,
+    entity_words, entity_numbered_terms
+)
+from .graph_cache import graph_cache, cached_read
+
+# Indexes behind the anchored lookups and the statistics queries
+GRAPH_INDEXES = [
+    "CREATE INDEX document_filename IF NOT EXISTS FOR (d:Document) ON (d.filename)",
+    "CREATE INDEX document_degree IF NOT EXISTS FOR (d:Document) ON (d.degree)",
+    "CREATE INDEX decision_name IF NOT EXISTS FOR (d:Decision) ON (d.name)",
+    "CREATE INDEX temporal_event_name IF NOT EXISTS FOR (e:TemporalEvent) ON (e.name)",
+    "CREATE INDEX code_file_path IF NOT EXISTS FOR (cf:CodeFile) ON (cf.file_path)",
+    "CREATE INDEX document_provenance_doc_id IF NOT EXISTS FOR (p:DocumentProvenance) ON (p.doc_id)",
+]
+
+# Bookkeeping nodes, left out of statistics and degrees. A DocumentProvenance
+# node lists the ids of the relationships one doc_id asserted, so retiring a
+# document seeks those relationships instead of scanning the graph.
+INTERNAL_LABELS = ["GraphStatistics", "DocumentProvenance"]
+
+# Entity full-text indexes over the same properties: entity_words uses the
+# "simple" analyzer, which splits on every non-letter, so "thermal" finds
+# "thermal_analysis_report.txt" as CONTAINS did; entity_terms uses the
+# "standard" analyzer, which keeps digits, for numbered terms like "S-400".
+# An index's labels are fixed when it is created, so changing ENTITY_LABELS
+# needs new index names.
+ENTITY_INDEX_PROPERTIES = "ON EACH [n.name, n.filename, n.context]"
+ENTITY_FULLTEXT_INDEXES = [
+    f"CREATE FULLTEXT INDEX entity_words IF NOT EXISTS FOR (n:{'|'.join(ENTITY_LABELS)}) "
+    f"{ENTITY_INDEX_PROPERTIES} OPTIONS {{indexConfig: {{`fulltext.analyzer`: 'simple'}}}}",
+    f"CREATE FULLTEXT INDEX entity_terms IF NOT EXISTS FOR (n:{'|'.join(ENTITY_LABELS)}) "
+    f"{ENTITY_INDEX_PROPERTIES} OPTIONS {{indexConfig: {{`fulltext.analyzer`: 'standard-no-stop-words'}}}}",
+]
+
 
 def get_neo4j_driver():
     """
@@ -14,30 +51,55 @@ def get_neo4j_driver():
     driver = GraphDatabase.driver(uri, auth=(user, password))
     return driver
 
-class GraphBrain:
+class GraphBrain(GraphBackend):
     """
     Handles interactions with the Graph Brain (Neo4j) - the project knowledge graph.
     Captures the complete story of project decisions, relationships, and evolution.
     """
+    backend_name = "neo4j"
+
     def __init__(self):
+        super().__init__()
         self.driver = get_neo4j_driver()
+        # Set once node degrees are known to be maintained (see get_knowledge_graph_statistics)
+        self._degrees_ready = False
+        self._indexes_ready = False
 
     def close(self):
         self.driver.close()
 
+    def health_check(self) -> dict:
+        try:
+            with self.driver.session() as session:
+                record = session.run("RETURN 'Neo4j is working' AS message").single()
+            return {"status": "healthy", "details": record["message"] if record else "Neo4j operational"}
+        except Exception as e:
+            return {"status": "unhealthy", "error": str(e)}
+
+    @staticmethod
+    def _write_transaction(session, transaction_function, *args):
+        """
+        Run a write transaction and bump the graph write generation, retiring
+        every cached read (see core/graph_cache.py).
+        """
+        try:
+            return session.write_transaction(transaction_function, *args)
+        finally:
+            graph_cache.bump_generation()
+
     def add_document_node(self, filename: str, file_type: str):
         """
         Adds a new Document node to the graph.
         """
         with self.driver.session() as session:
-            session.write_transaction(self._create_document_node, filename, file_type)
+            self._write_transaction(session, self._create_document_node, filename, file_type)
             print(f"Added Document node for {filename} to Neo4j.")
 
     @staticmethod
     def _create_document_node(tx, filename, file_type):
         query = (
             "MERGE (d:Document {filename: $filename}) "
-            "ON CREATE SET d.file_type = $file_type"
+            "ON CREATE SET d.file_type = $file_type, d.degree = 0"
         )
         tx.run(query, filename=filename, file_type=file_type)
 
@@ -47,7 +109,10 @@ class GraphBrain:
         """
         with self.driver.session() as session:
             result = session.run(cypher_query, params)
-            return [record.data() for record in result]
+            records = [record.data() for record in result]
+            if result.consume().counters.contains_updates:
+                graph_cache.bump_generation()
+            return records
 
     def get_author_of_document(self, filename: str) -> Optional[str]:
         """
@@ -72,7 +137,7 @@ class GraphBrain:
         and links it to the Document node.
         """
         with self.driver.session() as session:
-            session.write_transaction(self._create_author_relationship, filename, author_name)
+            self._write_transaction(session, self._create_author_relationship, filename, author_name)
             print(f"Linked author {author_name} to document {filename} in Neo4j.")
 
     @staticmethod
@@ -80,7 +145,8 @@ class GraphBrain:
         query = (
             "MERGE (p:Person {name: $author_name}) "
             "MERGE (d:Document {filename: $filename}) "
-            "MERGE (p)-[:AUTHORED]->(d)"
+            "MERGE (p)-[:AUTHORED]->(d) "
+            "ON CREATE SET p.degree = coalesce(p.degree, 0) + 1, d.degree = coalesce(d.degree, 0) + 1"
         )
         tx.run(query, author_name=author_name, filename=filename)
 
@@ -105,63 +171,282 @@ class GraphBrain:
         """
         Creates a generic relationship between two nodes with optional context.
         """
+        source_doc_id = getattr(self._provenance, "doc_id", None)
         with self.driver.session() as session:
-            session.write_transaction(self._create_relationship, source_node_label, source_node_name, relationship_type, target_node_label, target_node_name, context)
+            self._write_transaction(session, self._create_relationship, source_node_label, source_node_name, relationship_type, target_node_label, target_node_name, context, source_doc_id)
             print(f"Linked {source_node_name} -[:{relationship_type}]-> {target_node_name} in Neo4j.")
 
     @staticmethod
-    def _create_relationship(tx, source_node_label, source_node_name, relationship_type, target_node_label, target_node_name, context):
+    def _create_relationship(tx, source_node_label, source_node_name, relationship_type, target_node_label, target_node_name, context, source_doc_id=None):
+        query = (
+            f"MERGE (a:{source_node_label} {{name: $source_name}}) "
+            f"MERGE (b:{target_node_label} {{name: $target_name}}) "
+            f"MERGE (a)-[r:{relationship_type}]->(b) "
+            "ON CREATE SET a.degree = coalesce(a.degree, 0) + 1, b.degree = coalesce(b.degree, 0) + 1 "
+        )
         if context:
-            query = (
-                f"MERGE (a:{source_node_label} {{name: $source_name}}) "
-                f"MERGE (b:{target_node_label} {{name: $target_name}}) "
-                f"MERGE (a)-[r:{relationship_type}]->(b) "
-                f"SET r.context = $context"
+            query += "SET r.context = $context "
+        if source_doc_id:
+            # Several documents can assert the same edge; keep every source
+            query += (
+                "SET r.source_doc_ids = CASE WHEN $source_doc_id IN coalesce(r.source_doc_ids, []) "
+                "THEN r.source_doc_ids ELSE coalesce(r.source_doc_ids, []) + $source_doc_id END "
+                "WITH r "
+                "MERGE (p:DocumentProvenance {doc_id: $source_doc_id}) "
+                "SET p.relationship_ids = CASE WHEN id(r) IN coalesce(p.relationship_ids, []) "
+                "THEN p.relationship_ids ELSE coalesce(p.relationship_ids, []) + id(r) END"
             )
-            tx.run(query, source_name=source_node_name, target_name=target_node_name, context=context)
-        else:
-            query = (
-                f"MERGE (a:{source_node_label} {{name: $source_name}}) "
-                f"MERGE (b:{target_node_label} {{name: $target_name}}) "
-                f"MERGE (a)-[:{relationship_type}]->(b)"
-            )
-            tx.run(query, source_name=source_node_name, target_name=target_node_name)
+        tx.run(query, source_name=source_node_name, target_name=target_node_name, context=context, source_doc_id=source_doc_id)
+
+    def remove_document_provenance(self, doc_ids: list[str], code_files: list[str] = None) -> dict:
+        """
+        Retire the graph facts contributed by replaced or deleted documents.
+        
+        doc_ids are removed from each relationship's source_doc_ids; relationships
+        no other document supports are deleted. Function and Class nodes of
+        code_files are removed outright, as they are rebuilt from the new version.
+        Relationships are reached through each document's DocumentProvenance node
+        and code nodes through their CodeFile, both index seeks, so the cost
+        follows the size of the documents rather than of the graph.
+        """
+        self._ensure_indexes()
+        with self.driver.session() as session:
+            result = self._write_transaction(session, self._remove_document_provenance, doc_ids, code_files or [])
+            print(f"Retired {result['relationships_deleted']} relationships and "
+                  f"{result['code_nodes_deleted']} code nodes for {len(doc_ids)} documents in Neo4j.")
+            return result
+
+    @staticmethod
+    def _remove_document_provenance(tx, doc_ids, code_files):
+        # A relationship id can be reused after a delete: only edges still tagged with a doc_id count
+        record = tx.run("""
+            MATCH (p:DocumentProvenance)
+            WHERE p.doc_id IN $doc_ids
+            UNWIND p.relationship_ids AS rel_id
+            MATCH ()-[r]->()
+            WHERE id(r) = rel_id AND any(id IN coalesce(r.source_doc_ids, []) WHERE id IN $doc_ids)
+            WITH DISTINCT r
+            SET r.source_doc_ids = [id IN r.source_doc_ids WHERE NOT id IN $doc_ids]
+            WITH r, startNode(r) AS a, endNode(r) AS b, size(r.source_doc_ids) = 0 AS orphaned
+            FOREACH (_ IN CASE WHEN orphaned THEN [1] ELSE [] END |
+                SET a.degree = coalesce(a.degree, 1) - 1, b.degree = coalesce(b.degree, 1) - 1
+                DELETE r)
+            RETURN count(*) AS updated, sum(CASE WHEN orphaned THEN 1 ELSE 0 END) AS deleted
+        """, doc_ids=doc_ids).single()
+        tx.run("MATCH (p:DocumentProvenance) WHERE p.doc_id IN $doc_ids DELETE p", doc_ids=doc_ids)
+        
+        code_nodes_deleted = 0
+        if code_files:
+            code_record = tx.run("""
+                MATCH (cf:CodeFile)-[:CONTAINS_FUNCTION|CONTAINS_CLASS]->(n)
+                WHERE cf.file_path IN $code_files AND n.file_path = cf.file_path
+                WITH DISTINCT n
+                OPTIONAL MATCH (n)--(neighbor)
+                WHERE NOT ((neighbor:Function OR neighbor:Class) AND neighbor.file_path IN $code_files)
+                WITH n, collect(neighbor) AS neighbors
+                FOREACH (neighbor IN neighbors | SET neighbor.degree = coalesce(neighbor.degree, 1) - 1)
+                DETACH DELETE n
+                RETURN count(*) AS deleted
+            """, code_files=code_files).single()
+            code_nodes_deleted = code_record["deleted"]
+            tx.run("""
+                MATCH (cf:CodeFile)-[r:IMPORTS]->(m)
+                WHERE cf.file_path IN $code_files
+                SET cf.degree = coalesce(cf.degree, 1) - 1, m.degree = coalesce(m.degree, 1) - 1
+                DELETE r
+            """, code_files=code_files)
+        
+        return {
+            "relationships_updated": record["updated"],
+            "relationships_deleted": record["deleted"],
+            "code_nodes_deleted": code_nodes_deleted
+        }
     
-    def find_related_documents(self, document_filename: str, relationship_types: list = None, max_depth: int = 2) -> list[dict]:
+    def resolve_entities(self, text: str, labels: list = None, limit: int = DEFAULT_ENTITY_LIMIT,
+                         match_all: bool = True) -> list[dict]:
         """
-        Find documents related to a given document through various relationship types.
+        Resolve a free-text topic to graph nodes through the entity full-text
+        indexes, best match first: [{"id", "name", "labels", "score"}]. Falls
+        back to nodes of any label named exactly text when the indexes find none.
         """
+        self._ensure_indexes()
         with self.driver.session() as session:
-            return session.read_transaction(self._find_related_documents, document_filename, relationship_types, max_depth)
+            return session.read_transaction(self._resolve_entities, text, labels, limit, match_all)
     
     @staticmethod
-    def _find_related_documents(tx, document_filename, relationship_types, max_depth):
-        if relationship_types:
-            rel_filter = "|".join(relationship_types)
-            query = f"""
-                MATCH (d1:Document {{filename: $filename}})
-                MATCH (d1)-[r:{rel_filter}*1..{max_depth}]-(d2:Document)
-                WHERE d1 <> d2
-                RETURN DISTINCT d2.filename as filename, 
-                       type(r[0]) as relationship_type,
-                       r[0].context as context,
-                       length(r) as path_length
-                ORDER BY path_length, d2.filename
-            """
-        else:
-            query = f"""
-                MATCH (d1:Document {{filename: $filename}})
-                MATCH (d1)-[r*1..{max_depth}]-(d2:Document)
-                WHERE d1 <> d2
-                RETURN DISTINCT d2.filename as filename,
-                       type(r[0]) as relationship_type,
-                       r[0].context as context,
-                       length(r) as path_length
-                ORDER BY path_length, d2.filename
-            """
+    def _lucene_query(terms: list, match_all: bool = True) -> Optional[str]:
+        """Each term matches whole (boosted) or as a prefix; all terms must match unless match_all is False."""
+        if not terms:
+            return None
+        # Single letters only match whole; as prefixes they would match nearly everything
+        clauses = [f"({term}^2 OR {term}*)" if len(term) > 1 else term for term in terms]
+        return (" AND " if match_all else " OR ").join(clauses)
+    
+    @staticmethod
+    def _entity_query(text: str, match_all: bool = True) -> dict:
+        """
+        Lucene queries for a topic per entity index: its words against
+        entity_words and its numbered terms against entity_terms.
+        """
+        queries = {
+            "entity_words": GraphBrain._lucene_query(entity_words(text), match_all),
+            "entity_terms": GraphBrain._lucene_query(entity_numbered_terms(text), match_all),
+        }
+        return {index: query for index, query in queries.items() if query}
+    
+    @staticmethod
+    def _resolve_entities(tx, text, labels=None, limit=DEFAULT_ENTITY_LIMIT, match_all=True):
+        """Entity lookup inside a caller's transaction; topic queries start from these ids."""
+        queries = GraphBrain._entity_query(text, match_all)
+        records = []
+        if queries:
+            # A node must be found by every index queried unless match_all is False
+            hits = " UNION ALL ".join(
+                f"CALL db.index.fulltext.queryNodes('{index}', $queries.{index}) YIELD node, score RETURN node, score"
+                for index in queries
+            )
+            records = tx.run(f"""
+                CALL {{ {hits} }}
+                WITH node, sum(score) AS score, count(*) AS matched
+                WHERE (NOT $match_all OR matched = $indexes)
+                AND ($labels IS NULL OR any(label IN labels(node) WHERE label IN $labels))
+                RETURN id(node) AS id, coalesce(node.name, node.filename) AS name, labels(node) AS labels, score
+                ORDER BY score DESC
+                LIMIT $limit
+            """, queries=queries, indexes=len(queries), match_all=match_all, labels=labels, limit=limit).data()
+        if records or not (text or "").strip():
+            return records
+        return tx.run("""
+            MATCH (node) WHERE node.name = $text OR node.filename = $text
+            WITH node WHERE $labels IS NULL OR any(label IN labels(node) WHERE label IN $labels)
+            RETURN id(node) AS id, coalesce(node.name, node.filename) AS name, labels(node) AS labels, 1.0 AS score
+            LIMIT $limit
+        """, text=text.strip(), labels=labels, limit=limit).data()
+    
+    @staticmethod
+    def _resolve_entity_ids(tx, text, labels=None, limit=DEFAULT_ENTITY_LIMIT, match_all=True) -> list:
+        return [entity["id"] for entity in GraphBrain._resolve_entities(tx, text, labels, limit, match_all)]
+    
+    def _breadth_first_traversal(self, anchor_labels: list, anchor_key: str, anchor_value,
+                                 relationship_types: list, direction: str, max_depth: int,
+                                 fanout: int, limit: int, timeout_seconds: float, is_match) -> dict:
+        """Anchors are found through the name indexes; the search runs in one timed-out transaction."""
+        self._ensure_indexes()
+        anchor_query = " UNION ".join(
+            f"MATCH (node:{label} {{{anchor_key}: $name}}) RETURN node" for label in anchor_labels
+        )
+        return self._run_traversal(
+            self._breadth_first_search, timeout_seconds,
+            anchor_query, anchor_value, relationship_types, direction, max_depth, fanout, limit, is_match
+        )
+    
+    def _run_traversal(self, traversal, timeout_seconds: float, *args) -> dict:
+        """Run a read-only traversal in one transaction that the server aborts after timeout_seconds."""
+        with self.driver.session() as session:
+            tx = session.begin_transaction(timeout=timeout_seconds)
+            try:
+                return traversal(tx, time.monotonic() + timeout_seconds, *args)
+            finally:
+                tx.close()
+    
+    @staticmethod
+    def _breadth_first_search(tx, deadline, anchor_query, anchor_name, relationship_types, direction,
+                              max_depth, fanout, limit, is_match):
+        """
+        Hop-by-hop BFS from the nodes returned by anchor_query. Every node is
+        visited once, on its shortest path, so the work per hop is bounded by
+        frontier size x fanout instead of growing with the number of paths.
         
-        result = tx.run(query, filename=document_filename)
-        return [record.data() for record in result]
+        Returns the visited nodes (with parent pointers), the ids of nodes
+        accepted by is_match in visiting order, and the pruning counters.
+        """
+        pattern = {"both": "(n)-[r:{types}]-(m)", "in": "(n)<-[r:{types}]-(m)", "out": "(n)-[r:{types}]->(m)"}[direction]
+        types = "|".join(f"`{t}`" for t in relationship_types)
+        pattern = pattern.format(types=types)
+        degree_pattern = pattern.replace("(m)", "()").replace("[r:", "[:")
+        expand_query = f"""
+            UNWIND $frontier AS node_id
+            MATCH (n) WHERE id(n) = node_id
+            CALL {{
+                WITH n
+                MATCH {pattern}
+                RETURN r, m
+                LIMIT $fanout
+            }}
+            RETURN node_id, size({degree_pattern}) AS degree,
+                   id(m) AS id, labels(m) AS labels, m.filename AS filename, m.name AS name,
+                   m.timestamp AS timestamp, coalesce(m.context, m.description) AS context,
+                   type(r) AS relationship_type, r.context AS relationship_context
+        """
+        
+        stats = GraphBackend._new_traversal_stats()
+        nodes, matches = {}, []
+        for record in tx.run(anchor_query, name=anchor_name):
+            anchor = record["node"]
+            nodes[anchor.id] = {
+                "parent": None,
+                "depth": 0,
+                "is_anchor": True,
+                "labels": list(anchor.labels),
+                "filename": anchor.get("filename"),
+                "name": anchor.get("name"),
+                "timestamp": anchor.get("timestamp"),
+                "context": anchor.get("context", anchor.get("description"))
+            }
+        frontier = list(nodes)
+        
+        depth = 0
+        while frontier and depth < max_depth and len(matches) < limit:
+            if time.monotonic() >= deadline:
+                stats["timed_out"] = True
+                break
+            depth += 1
+            try:
+                records = tx.run(expand_query, frontier=frontier, fanout=fanout).data()
+            except Neo4jError as e:
+                if "Timed" in str(e.code) or "Terminated" in str(e.code):
+                    stats["timed_out"] = True
+                    break
+                raise
+            
+            expanded = {}
+            next_frontier = []
+            for record in records:
+                expanded[record["node_id"]] = record["degree"]
+                node_id = record["id"]
+                if node_id in nodes:
+                    continue
+                if len(nodes) >= DEFAULT_TRAVERSAL_MAX_NODES:
+                    stats["pruned_by_max_nodes"] += 1
+                    continue
+                parent = nodes[record["node_id"]]
+                first_hop = parent["is_anchor"]
+                nodes[node_id] = {
+                    "parent": record["node_id"],
+                    "depth": depth,
+                    "is_anchor": False,
+                    "labels": record["labels"],
+                    "filename": record["filename"],
+                    "name": record["name"],
+                    "timestamp": record["timestamp"],
+                    "context": record["context"],
+                    "relationship_type": record["relationship_type"],
+                    "first_relationship_type": record["relationship_type"] if first_hop else parent["first_relationship_type"],
+                    "first_relationship_context": record["relationship_context"] if first_hop else parent["first_relationship_context"]
+                }
+                next_frontier.append(node_id)
+                if is_match(nodes[node_id]):
+                    if len(matches) < limit:
+                        matches.append(node_id)
+                    else:
+                        stats["pruned_by_limit"] += 1
+            
+            # Relationships beyond the fanout cap were never followed
+            stats["pruned_by_fanout"] += sum(max(0, degree - fanout) for degree in expanded.values())
+            frontier = next_frontier
+        
+        GraphBackend._finish_traversal_stats(stats, nodes, depth)
+        return {"nodes": nodes, "matches": matches, **stats}
     
     def find_cross_team_influences(self, author1: str, author2: str) -> list[dict]:
         """
@@ -190,13 +475,17 @@ class GraphBrain:
         """
         Find documents that reference or mention a specific topic/concept.
         """
+        self._ensure_indexes()
         with self.driver.session() as session:
             return session.read_transaction(self._find_documents_referencing_topic, topic)
     
     @staticmethod
     def _find_documents_referencing_topic(tx, topic):
+        concept_ids = GraphBrain._resolve_entity_ids(tx, topic)
         query = """
-            MATCH (concept {name: $topic})<-[r:REFERENCES|MENTIONS|AFFECTS|INFLUENCES]-(d:Document)
+            MATCH (concept)
+            WHERE id(concept) IN $concept_ids AND concept.name = $topic
+            MATCH (concept)<-[r:REFERENCES|MENTIONS|AFFECTS|INFLUENCES]-(d:Document)
             RETURN d.filename as filename,
                    type(r) as relationship_type,
                    r.context as context
@@ -204,16 +493,19 @@ class GraphBrain:
             
             UNION
             
-            MATCH (d:Document)-[r:REFERENCES|MENTIONS|AFFECTS|INFLUENCES]->(concept {name: $topic})
+            MATCH (concept)
+            WHERE id(concept) IN $concept_ids AND concept.name = $topic
+            MATCH (d:Document)-[r:REFERENCES|MENTIONS|AFFECTS|INFLUENCES]->(concept)
             RETURN d.filename as filename,
                    type(r) as relationship_type,
                    r.context as context
             ORDER BY d.filename
         """
         
-        result = tx.run(query, topic=topic)
+        result = tx.run(query, topic=topic, concept_ids=concept_ids)
         return [record.data() for record in result]
     
+    @cached_read
     def get_author_collaboration_network(self, author: str = None) -> list[dict]:
         """
         Get the collaboration network - who works with whom through document relationships.
@@ -260,15 +552,17 @@ class GraphBrain:
         """
         Find how a decision maker's choices impacted other work on a topic.
         """
+        self._ensure_indexes()
         with self.driver.session() as session:
             return session.read_transaction(self._find_decision_impact_chain, decision_maker, topic)
     
     @staticmethod
     def _find_decision_impact_chain(tx, decision_maker, topic):
+        topic_ids = GraphBrain._resolve_entity_ids(tx, topic, labels=["Document"])
         query = """
             MATCH (p:Person {name: $decision_maker})-[:AUTHORED]->(d1:Document)
             MATCH (d1)-[:AFFECTS|INFLUENCES|CONSTRAINS*1..3]->(d2:Document)
-            WHERE d1.filename CONTAINS $topic OR d2.filename CONTAINS $topic
+            WHERE id(d1) IN $topic_ids OR id(d2) IN $topic_ids
             MATCH (d2)<-[:AUTHORED]-(p2:Person)
             RETURN d1.filename as decision_document,
                    d2.filename as affected_document,
@@ -277,7 +571,7 @@ class GraphBrain:
             ORDER BY impact_distance, affected_author
         """
         
-        result = tx.run(query, decision_maker=decision_maker, topic=topic)
+        result = tx.run(query, decision_maker=decision_maker, topic_ids=topic_ids)
         return [record.data() for record in result]
     
     def add_concept_node(self, concept_name: str, concept_type: str = "Concept"):
@@ -285,7 +579,7 @@ class GraphBrain:
         Add a concept node to the graph (for topics, technologies, constraints, etc.)
         """
         with self.driver.session() as session:
-            session.write_transaction(self._create_concept_node, concept_name, concept_type)
+            self._write_transaction(session, self._create_concept_node, concept_name, concept_type)
             print(f"Added {concept_type} node for {concept_name} to Neo4j.")
     
     @staticmethod
@@ -293,53 +587,154 @@ class GraphBrain:
         query = f"MERGE (c:{concept_type} {{name: $name}})"
         tx.run(query, name=concept_name)
     
-    def get_knowledge_graph_statistics(self) -> dict:
+    def add_concept_nodes(self, nodes: list[tuple]):
         """
-        Get statistics about the knowledge graph structure.
+        Add many (concept_name, concept_type) nodes, one UNWIND per node label in a single transaction.
         """
+        names_by_type = {}
+        for concept_name, concept_type in nodes:
+            names_by_type.setdefault(concept_type or "Concept", set()).add(concept_name)
+        
+        with self.driver.session() as session:
+            self._write_transaction(session, self._create_concept_nodes, names_by_type)
+        print(f"Added {len(nodes)} concept nodes to Neo4j in {len(names_by_type)} label groups.")
+    
+    @staticmethod
+    def _create_concept_nodes(tx, names_by_type):
+        for concept_type, names in names_by_type.items():
+            query = f"UNWIND $names AS name MERGE (c:{concept_type} {{name: name}})"
+            tx.run(query, names=list(names))
+    
+    def add_relationships(self, relationships: list[dict]):
+        """
+        Create many relationships at once. Each dict has the add_relationship arguments:
+        source_node_label, source_node_name, relationship_type, target_node_label,
+        target_node_name and optional context. Relationships are grouped by
+        (source label, type, target label) and written with one UNWIND per group.
+        """
+        groups = {}
+        for rel in relationships:
+            key = (rel["source_node_label"], rel["relationship_type"], rel["target_node_label"])
+            groups.setdefault(key, []).append({
+                "source_name": rel["source_node_name"],
+                "target_name": rel["target_node_name"],
+                "context": rel.get("context")
+            })
+        
+        with self.driver.session() as session:
+            self._write_transaction(session, self._create_relationships, groups)
+        print(f"Linked {len(relationships)} relationships in Neo4j in {len(groups)} groups.")
+    
+    @staticmethod
+    def _create_relationships(tx, groups):
+        for (source_node_label, relationship_type, target_node_label), rows in groups.items():
+            query = (
+                f"UNWIND $rows AS row "
+                f"MERGE (a:{source_node_label} {{name: row.source_name}}) "
+                f"MERGE (b:{target_node_label} {{name: row.target_name}}) "
+                f"MERGE (a)-[r:{relationship_type}]->(b) "
+                f"ON CREATE SET a.degree = coalesce(a.degree, 0) + 1, b.degree = coalesce(b.degree, 0) + 1 "
+                f"SET r.context = coalesce(row.context, r.context)"
+            )
+            tx.run(query, rows=rows)
+    
+    def get_knowledge_graph_statistics(self, recompute: bool = False) -> dict:
+        """
+        Get statistics about the knowledge graph structure.
+        
+        Node counts per label and relationship counts per type come from Neo4j's
+        count store, which each write transaction keeps current, and the most
+        connected documents from the indexed degree property maintained by the
+        writers in this class, so a call is a handful of O(1) lookups however
+        large the graph. recompute=True first rebuilds every node's degree from
+        its relationships, e.g. after writes made through query(); this also
+        happens once automatically for graphs built before degrees were kept.
+        """
+        self._ensure_indexes()
+        if recompute or not self._degrees_ready:
+            with self.driver.session() as session:
+                ready = session.read_transaction(self._get_degrees_recomputed_at) is not None
+            if recompute or not ready:
+                self.recompute_degrees()
+            self._degrees_ready = True
+        
         with self.driver.session() as session:
             return session.read_transaction(self._get_graph_statistics)
     
+    def recompute_degrees(self) -> int:
+        """
+        Rebuild the degree property of every node from its relationships, in
+        batches of 10,000 nodes. Returns the number of nodes updated.
+        """
+        with self.driver.session() as session:
+            nodes = session.run("""
+                MATCH (n)
+                WHERE none(label IN labels(n) WHERE label IN $internal_labels)
+                CALL {
+                    WITH n
+                    SET n.degree = size((n)--())
+                } IN TRANSACTIONS OF 10000 ROWS
+                RETURN count(n) AS nodes
+            """, internal_labels=INTERNAL_LABELS).single()["nodes"]
+            session.run("MERGE (s:GraphStatistics {name: 'degrees'}) SET s.recomputed_at = datetime()")
+        graph_cache.bump_generation()
+        print(f"Recomputed degrees of {nodes} nodes in Neo4j.")
+        return nodes
+    
+    def _ensure_indexes(self):
+        """Create GRAPH_INDEXES once per instance; lookups and top-degree reads become index seeks."""
+        if self._indexes_ready:
+            return
+        try:
+            with self.driver.session() as session:
+                for statement in GRAPH_INDEXES + ENTITY_FULLTEXT_INDEXES:
+                    session.run(statement).consume()
+                session.run("CALL db.awaitIndexes(300)").consume()
+            self._indexes_ready = True
+        except Exception as e:
+            print(f"Could not create graph indexes: {e}")
+    
+    @staticmethod
+    def _get_degrees_recomputed_at(tx):
+        record = tx.run("MATCH (s:GraphStatistics {name: 'degrees'}) RETURN s.recomputed_at AS recomputed_at").single()
+        return record["recomputed_at"] if record else None
+    
     @staticmethod
     def _get_graph_statistics(tx):
         stats = {}
         
-        # Node counts by label
-        node_counts = tx.run("""
-            CALL db.labels() YIELD label
-            CALL apoc.cypher.run('MATCH (n:' + label + ') RETURN count(n) as count', {}) YIELD value
-            RETURN label, value.count as count
-        """).data()
-        
-        if not node_counts:  # Fallback if APOC is not available
-            node_counts = [
-                {"label": "Person", "count": tx.run("MATCH (p:Person) RETURN count(p) as count").single()["count"]},
-                {"label": "Document", "count": tx.run("MATCH (d:Document) RETURN count(d) as count").single()["count"]},
-                {"label": "Concept", "count": tx.run("MATCH (c:Concept) RETURN count(c) as count").single()["count"]}
-            ]
-        
-        stats['node_counts'] = {item['label']: item['count'] for item in node_counts}
+        # Node counts by label; a single-label count is served by the count store
+        labels = [record["label"] for record in tx.run("CALL db.labels() YIELD label RETURN label")]
+        stats['node_counts'] = {
+            label: tx.run(f"MATCH (n:`{label.replace('`', '``')}`) RETURN count(n) AS count").single()["count"]
+            for label in labels if label not in INTERNAL_LABELS
+        }
         
-        # Relationship counts
-        rel_counts = tx.run("""
-            MATCH ()-[r]->()
-            RETURN type(r) as relationship_type, count(r) as count
-            ORDER BY count DESC
-        """).data()
+        # Relationship counts by type, likewise one count store lookup per type
+        types = [record["relationshipType"] for record in tx.run("CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType")]
+        rel_counts = {
+            rel_type: tx.run(f"MATCH ()-[r:`{rel_type.replace('`', '``')}`]->() RETURN count(r) AS count").single()["count"]
+            for rel_type in types
+        }
+        stats['relationship_counts'] = dict(sorted(rel_counts.items(), key=lambda item: -item[1]))
         
-        stats['relationship_counts'] = {item['relationship_type']: item['count'] for item in rel_counts}
+        stats['total_nodes'] = tx.run("MATCH (n) RETURN count(n) AS count").single()["count"]
+        stats['total_relationships'] = tx.run("MATCH ()-[r]->() RETURN count(r) AS count").single()["count"]
         
-        # Most connected documents
+        # Most connected documents, read in degree order from the index
         connected_docs = tx.run("""
             MATCH (d:Document)
-            OPTIONAL MATCH (d)-[r]-()
-            RETURN d.filename as filename, count(r) as connection_count
-            ORDER BY connection_count DESC
+            WHERE d.degree IS NOT NULL
+            RETURN d.filename as filename, d.degree as connection_count
+            ORDER BY d.degree DESC
             LIMIT 10
         """).data()
         
         stats['most_connected_documents'] = connected_docs
         
+        recomputed_at = GraphBrain._get_degrees_recomputed_at(tx)
+        stats['degrees_recomputed_at'] = str(recomputed_at) if recomputed_at is not None else None
+        
         return stats
     
     # ============================================================================
@@ -352,7 +747,7 @@ class GraphBrain:
         Add a decision node with the person who made it and optional context.
         """
         with self.driver.session() as session:
-            session.write_transaction(self._create_decision_node, decision_name, decision_maker, context, era)
+            self._write_transaction(session, self._create_decision_node, decision_name, decision_maker, context, era)
             print(f"Added Decision '{decision_name}' by {decision_maker} to GraphBrain.")
     
     @staticmethod
@@ -370,6 +765,7 @@ class GraphBrain:
             MERGE (p:Person {name: $decision_maker})
             MERGE (d:Decision {name: $decision_name})
             MERGE (p)-[:MADE]->(d)
+            ON CREATE SET p.degree = coalesce(p.degree, 0) + 1, d.degree = coalesce(d.degree, 0) + 1
         """, decision_maker=decision_maker, decision_name=decision_name)
     
     def add_meeting_node(self, meeting_name: str, attendees: list, decisions_made: list = None, era: str = None):
@@ -377,7 +773,7 @@ class GraphBrain:
         Add a meeting node with attendees and any decisions that resulted.
         """
         with self.driver.session() as session:
-            session.write_transaction(self._create_meeting_node, meeting_name, attendees, decisions_made, era)
+            self._write_transaction(session, self._create_meeting_node, meeting_name, attendees, decisions_made, era)
             print(f"Added Meeting '{meeting_name}' with {len(attendees)} attendees to GraphBrain.")
     
     @staticmethod
@@ -394,6 +790,7 @@ class GraphBrain:
                 MERGE (p:Person {name: $attendee})
                 MERGE (m:Meeting {name: $meeting_name})
                 MERGE (p)-[:ATTENDED]->(m)
+                ON CREATE SET p.degree = coalesce(p.degree, 0) + 1, m.degree = coalesce(m.degree, 0) + 1
             """, attendee=attendee, meeting_name=meeting_name)
         
         # Link decisions made in meeting
@@ -403,6 +800,7 @@ class GraphBrain:
                     MERGE (m:Meeting {name: $meeting_name})
                     MERGE (d:Decision {name: $decision})
                     MERGE (m)-[:RESULTED_IN]->(d)
+                    ON CREATE SET m.degree = coalesce(m.degree, 0) + 1, d.degree = coalesce(d.degree, 0) + 1
                 """, meeting_name=meeting_name, decision=decision)
     
     def add_feature_node(self, feature_name: str, owner: str = None, influenced_by_decisions: list = None, era: str = None):
@@ -410,7 +808,7 @@ class GraphBrain:
         Add a feature node and link it to decisions that influenced it.
         """
         with self.driver.session() as session:
-            session.write_transaction(self._create_feature_node, feature_name, owner, influenced_by_decisions, era)
+            self._write_transaction(session, self._create_feature_node, feature_name, owner, influenced_by_decisions, era)
             print(f"Added Feature '{feature_name}' to GraphBrain.")
     
     @staticmethod
@@ -427,6 +825,7 @@ class GraphBrain:
                 MERGE (p:Person {name: $owner})
                 MERGE (f:Feature {name: $feature_name})
                 MERGE (p)-[:OWNS]->(f)
+                ON CREATE SET p.degree = coalesce(p.degree, 0) + 1, f.degree = coalesce(f.degree, 0) + 1
             """, owner=owner, feature_name=feature_name)
         
         # Link to influencing decisions
@@ -436,6 +835,7 @@ class GraphBrain:
                     MERGE (d:Decision {name: $decision})
                     MERGE (f:Feature {name: $feature_name})
                     MERGE (d)-[:LED_TO]->(f)
+                    ON CREATE SET d.degree = coalesce(d.degree, 0) + 1, f.degree = coalesce(f.degree, 0) + 1
                 """, decision=decision, feature_name=feature_name)
     
     def add_era_node(self, era_name: str, description: str = None, start_date: str = None, end_date: str = None):
@@ -443,7 +843,7 @@ class GraphBrain:
         Add a project era/phase node (e.g., "Initial Research", "Q3 2025", "MVP Development").
         """
         with self.driver.session() as session:
-            session.write_transaction(self._create_era_node, era_name, description, start_date, end_date)
+            self._write_transaction(session, self._create_era_node, era_name, description, start_date, end_date)
             print(f"Added Era '{era_name}' to GraphBrain.")
     
     @staticmethod
@@ -462,7 +862,7 @@ class GraphBrain:
         Link a document to the era when it was created.
         """
         with self.driver.session() as session:
-            session.write_transaction(self._link_document_era, filename, era_name)
+            self._write_transaction(session, self._link_document_era, filename, era_name)
             print(f"Linked document {filename} to era {era_name}.")
     
     @staticmethod
@@ -471,22 +871,27 @@ class GraphBrain:
             MERGE (d:Document {filename: $filename})
             MERGE (e:Era {name: $era_name})
             MERGE (d)-[:CREATED_IN]->(e)
+            ON CREATE SET d.degree = coalesce(d.degree, 0) + 1, e.degree = coalesce(e.degree, 0) + 1
         """, filename=filename, era_name=era_name)
     
+    @cached_read
     def find_decision_provenance(self, feature_or_topic: str) -> list[dict]:
         """
         Trace back to find what decisions led to a feature or influenced work on a topic.
         This answers "Why did we build this feature this way?"
         """
+        self._ensure_indexes()
         with self.driver.session() as session:
             return session.read_transaction(self._find_decision_provenance, feature_or_topic)
     
     @staticmethod
     def _find_decision_provenance(tx, feature_or_topic):
+        topic_ids = GraphBrain._resolve_entity_ids(tx, feature_or_topic, labels=["Feature", "Document"])
         query = """
             // Find decisions that led to features
-            MATCH (d:Decision)-[:LED_TO]->(f:Feature)
-            WHERE f.name CONTAINS $topic
+            MATCH (f:Feature)
+            WHERE id(f) IN $topic_ids
+            MATCH (d:Decision)-[:LED_TO]->(f)
             MATCH (p:Person)-[:MADE]->(d)
             OPTIONAL MATCH (m:Meeting)-[:RESULTED_IN]->(d)
             OPTIONAL MATCH (doc:Document)-[:INFLUENCED_BY]->(d)
@@ -502,8 +907,9 @@ class GraphBrain:
             UNION
             
             // Find decisions that influenced documents about the topic
-            MATCH (d:Decision)<-[:INFLUENCED_BY]-(doc:Document)
-            WHERE doc.filename CONTAINS $topic
+            MATCH (doc:Document)
+            WHERE id(doc) IN $topic_ids
+            MATCH (d:Decision)<-[:INFLUENCED_BY]-(doc)
             MATCH (p:Person)-[:MADE]->(d)
             OPTIONAL MATCH (m:Meeting)-[:RESULTED_IN]->(d)
             RETURN 'document' as type,
@@ -518,7 +924,7 @@ class GraphBrain:
             ORDER BY era, decision_maker
         """
         
-        result = tx.run(query, topic=feature_or_topic)
+        result = tx.run(query, topic_ids=topic_ids)
         return [record.data() for record in result]
     
     def find_knowledge_expert(self, topic: str) -> list[dict]:
@@ -526,27 +932,28 @@ class GraphBrain:
         Find who are the real experts on a topic by analyzing their connections
         to decisions, documents, and features related to that topic.
         """
+        self._ensure_indexes()
         with self.driver.session() as session:
             return session.read_transaction(self._find_knowledge_expert, topic)
     
     @staticmethod
     def _find_knowledge_expert(tx, topic):
+        topic_ids = GraphBrain._resolve_entity_ids(tx, topic, labels=["Document", "Decision", "Feature"])
         query = """
-            MATCH (p:Person)
-            OPTIONAL MATCH (p)-[:AUTHORED]->(doc:Document)
-            WHERE doc.filename CONTAINS $topic
-            OPTIONAL MATCH (p)-[:MADE]->(d:Decision)
-            WHERE d.name CONTAINS $topic OR d.context CONTAINS $topic
-            OPTIONAL MATCH (p)-[:OWNS]->(f:Feature)
-            WHERE f.name CONTAINS $topic
-            
-            WITH p, 
-                 count(DISTINCT doc) as documents_authored,
-                 count(DISTINCT d) as decisions_made,
-                 count(DISTINCT f) as features_owned,
-                 (count(DISTINCT doc) + count(DISTINCT d) * 2 + count(DISTINCT f) * 3) as expertise_score
+            // Start from the topic's documents, decisions and features, not from every person
+            MATCH (item)
+            WHERE id(item) IN $topic_ids
+            MATCH (p:Person)-[r:AUTHORED|MADE|OWNS]->(item)
+            WHERE (type(r) = 'AUTHORED' AND item:Document)
+               OR (type(r) = 'MADE' AND item:Decision)
+               OR (type(r) = 'OWNS' AND item:Feature)
             
-            WHERE expertise_score > 0
+            WITH p,
+                 count(DISTINCT CASE WHEN item:Document THEN item END) as documents_authored,
+                 count(DISTINCT CASE WHEN item:Decision THEN item END) as decisions_made,
+                 count(DISTINCT CASE WHEN item:Feature THEN item END) as features_owned
+            WITH p, documents_authored, decisions_made, features_owned,
+                 (documents_authored + decisions_made * 2 + features_owned * 3) as expertise_score
             
             RETURN p.name as expert,
                    documents_authored,
@@ -557,7 +964,7 @@ class GraphBrain:
             LIMIT 10
         """
         
-        result = tx.run(query, topic=topic)
+        result = tx.run(query, topic_ids=topic_ids)
         return [record.data() for record in result]
     
     def find_impact_analysis(self, document_name: str) -> list[dict]:
@@ -658,16 +1065,24 @@ class GraphBrain:
         """
         Identify potential knowledge silos - people who are the only ones connected to certain topics.
         """
+        self._ensure_indexes()
         with self.driver.session() as session:
             return session.read_transaction(self._find_knowledge_silos)
     
     @staticmethod
     def _find_knowledge_silos(tx):
+        design_document_ids = GraphBrain._resolve_entity_ids(
+            tx, "spec design architecture", labels=["Document"], limit=10000, match_all=False
+        )
         query = """
             // Find concepts/topics that only one person is connected to
-            MATCH (concept)
-            WHERE concept:Feature OR concept:Decision OR 
-                  (concept:Document AND concept.filename =~ '.*(?i)(spec |design |architecture ).*')
+            CALL {
+                MATCH (concept:Feature) RETURN concept
+                UNION
+                MATCH (concept:Decision) RETURN concept
+                UNION
+                MATCH (concept:Document) WHERE id(concept) IN $design_document_ids RETURN concept
+            }
             
             MATCH (concept)<-[r]-(p:Person)
             
@@ -682,7 +1097,7 @@ class GraphBrain:
             ORDER BY concept_type, concept_name
         """
         
-        result = tx.run(query)
+        result = tx.run(query, design_document_ids=design_document_ids)
         return [record.data() for record in result]
     
     def get_authored_documents(self, author_name: str) -> list[dict]:
@@ -702,18 +1117,33 @@ class GraphBrain:
         result = tx.run(query, author_name=author_name)
         return [record.data() for record in result]
     
+    def list_people(self) -> list[str]:
+        """
+        Names of every Person in the graph.
+        """
+        with self.driver.session() as session:
+            return session.read_transaction(self._list_people)
+    
+    @staticmethod
+    def _list_people(tx):
+        result = tx.run("MATCH (p:Person) RETURN p.name AS name ORDER BY p.name")
+        return [record["name"] for record in result]
+    
+    @cached_read
     def explore_relationships(self, entity_name: str) -> list[dict]:
         """
         Explore relationships for a specific entity (for IntelligentQueryOrchestrator).
         """
+        self._ensure_indexes()
         with self.driver.session() as session:
             return session.read_transaction(self._explore_relationships, entity_name)
     
     @staticmethod
     def _explore_relationships(tx, entity_name):
+        entity_ids = GraphBrain._resolve_entity_ids(tx, entity_name)
         query = """
             MATCH (entity)
-            WHERE entity.name = $entity_name
+            WHERE id(entity) IN $entity_ids AND entity.name = $entity_name
             MATCH (entity)-[r]-(related)
             RETURN entity.name as source,
                    type(r) as relationship,
@@ -722,9 +1152,10 @@ class GraphBrain:
                    r.context as context
             LIMIT 20
         """
-        result = tx.run(query, entity_name=entity_name)
+        result = tx.run(query, entity_name=entity_name, entity_ids=entity_ids)
         return [record.data() for record in result]
     
+    @cached_read
     def get_cross_references(self) -> list[dict]:
         """
         Get documents that reference each other (for IntelligentQueryOrchestrator).
@@ -758,7 +1189,7 @@ class GraphBrain:
         """
         with self.driver.session() as session:
             for rel in relationships:
-                session.write_transaction(self._create_foundational_relationship, rel)
+                self._write_transaction(session, self._create_foundational_relationship, rel)
     
     @staticmethod
     def _create_foundational_relationship(tx, relationship):
@@ -774,24 +1205,28 @@ class GraphBrain:
             MERGE (a:{source['type']} {{name: $source_name}})
             MERGE (b:{target['type']} {{name: $target_name}})
             MERGE (a)-[r:{rel_type}]->(b)
+            ON CREATE SET a.degree = coalesce(a.degree, 0) + 1, b.degree = coalesce(b.degree, 0) + 1
         """
         if context:
             query += " SET r.context = $context"
         
         tx.run(query, source_name=source['name'], target_name=target['name'], context=context)
     
+    @cached_read
     def find_technical_relationships(self, component_or_subsystem: str) -> list[dict]:
         """
         Find technical relationships for components/subsystems using foundational schema
         """
+        self._ensure_indexes()
         with self.driver.session() as session:
             return session.read_transaction(self._find_technical_relationships, component_or_subsystem)
     
     @staticmethod
     def _find_technical_relationships(tx, entity):
+        entity_ids = GraphBrain._resolve_entity_ids(tx, entity)
         query = """
             MATCH (entity)
-            WHERE entity.name CONTAINS $entity OR entity.name = $entity
+            WHERE id(entity) IN $entity_ids
             
             OPTIONAL MATCH (entity)-[:PART_OF]->(parent)
             OPTIONAL MATCH (part)-[:PART_OF]->(entity)
@@ -807,13 +1242,16 @@ class GraphBrain:
                    collect(DISTINCT constraint.name) as constraints,
                    collect(DISTINCT decision.name) as affected_by_decisions
         """
-        result = tx.run(query, entity=entity)
+        result = tx.run(query, entity_ids=entity_ids)
         return [record.data() for record in result]
     
+    @cached_read
     def find_expertise_and_roles(self, person_name: str = None, topic: str = None) -> list[dict]:
         """
         Find people's expertise and roles using foundational schema
         """
+        if topic:
+            self._ensure_indexes()
         with self.driver.session() as session:
             return session.read_transaction(self._find_expertise_and_roles, person_name, topic)
 
@@ -829,7 +1267,7 @@ class GraphBrain:
         Add a code file node with programming language and metadata.
         """
         with self.driver.session() as session:
-            session.write_transaction(self._create_code_file_node, file_path, language, 
+            self._write_transaction(session, self._create_code_file_node, file_path, language, 
                                     author, lines_of_code, git_info)
             print(f"Added CodeFile node for {file_path} ({language}) to Neo4j.")
     
@@ -852,6 +1290,7 @@ class GraphBrain:
                 MERGE (p:Person {name: $author})
                 MERGE (cf:CodeFile {file_path: $file_path})
                 MERGE (p)-[:AUTHORED]->(cf)
+                ON CREATE SET p.degree = coalesce(p.degree, 0) + 1, cf.degree = coalesce(cf.degree, 0) + 1
             """, author=author, file_path=file_path)
         
         # Add Git information if available
@@ -862,6 +1301,7 @@ class GraphBrain:
                     MERGE (p:Person {name: $contributor})
                     MERGE (cf:CodeFile {file_path: $file_path})
                     MERGE (p)-[:CONTRIBUTED_TO]->(cf)
+                    ON CREATE SET p.degree = coalesce(p.degree, 0) + 1, cf.degree = coalesce(cf.degree, 0) + 1
                 """, contributor=contributor, file_path=file_path)
     
     def add_function_node(self, function_name: str, file_path: str, language: str,
@@ -871,7 +1311,7 @@ class GraphBrain:
         Add a function/method node and link it to its containing file.
         """
         with self.driver.session() as session:
-            session.write_transaction(self._create_function_node, function_name, file_path,
+            self._write_transaction(session, self._create_function_node, function_name, file_path,
                                     language, line_start, line_end, docstring, args)
             print(f"Added Function node for {function_name} in {file_path} to Neo4j.")
     
@@ -907,6 +1347,7 @@ class GraphBrain:
             MERGE (cf:CodeFile {file_path: $file_path})
             MERGE (f:Function {name: $function_name, file_path: $file_path})
             MERGE (cf)-[:CONTAINS_FUNCTION]->(f)
+            ON CREATE SET cf.degree = coalesce(cf.degree, 0) + 1, f.degree = coalesce(f.degree, 0) + 1
         """, function_name=function_name, file_path=file_path)
     
     def add_class_node(self, class_name: str, file_path: str, language: str,
@@ -916,7 +1357,7 @@ class GraphBrain:
         Add a class node and link it to its containing file.
         """
         with self.driver.session() as session:
-            session.write_transaction(self._create_class_node, class_name, file_path,
+            self._write_transaction(session, self._create_class_node, class_name, file_path,
                                     language, line_start, line_end, docstring, base_classes)
             print(f"Added Class node for {class_name} in {file_path} to Neo4j.")
     
@@ -949,6 +1390,7 @@ class GraphBrain:
             MERGE (cf:CodeFile {file_path: $file_path})
             MERGE (c:Class {name: $class_name, file_path: $file_path})
             MERGE (cf)-[:CONTAINS_CLASS]->(c)
+            ON CREATE SET cf.degree = coalesce(cf.degree, 0) + 1, c.degree = coalesce(c.degree, 0) + 1
         """, class_name=class_name, file_path=file_path)
         
         # Create inheritance relationships
@@ -958,6 +1400,7 @@ class GraphBrain:
                     MERGE (c:Class {name: $class_name, file_path: $file_path})
                     MERGE (base:Class {name: $base_class})
                     MERGE (c)-[:INHERITS_FROM]->(base)
+                    ON CREATE SET c.degree = coalesce(c.degree, 0) + 1, base.degree = coalesce(base.degree, 0) + 1
                 """, class_name=class_name, file_path=file_path, base_class=base_class)
     
     def add_import_relationship(self, importing_file: str, imported_module: str, 
@@ -966,7 +1409,7 @@ class GraphBrain:
         Add import/dependency relationships between code files and modules.
         """
         with self.driver.session() as session:
-            session.write_transaction(self._create_import_relationship, importing_file, 
+            self._write_transaction(session, self._create_import_relationship, importing_file, 
                                     imported_module, import_type, alias)
             print(f"Added import relationship: {importing_file} imports {imported_module}")
     
@@ -980,6 +1423,7 @@ class GraphBrain:
             MERGE (cf:CodeFile {file_path: $importing_file})
             MERGE (m:Module {name: $imported_module})
             MERGE (cf)-[r:IMPORTS]->(m)
+            ON CREATE SET cf.degree = coalesce(cf.degree, 0) + 1, m.degree = coalesce(m.degree, 0) + 1
             SET r.import_type = $import_type
         """
         
@@ -1113,18 +1557,21 @@ class GraphBrain:
             """
             result = tx.run(query, person_name=person_name)
         elif topic:
+            topic_ids = GraphBrain._resolve_entity_ids(tx, topic)
             query = """
-                MATCH (expertise {name: $topic})<-[:HAS_EXPERTISE]-(p:Person)
+                MATCH (expertise)
+                WHERE id(expertise) IN $topic_ids AND expertise.name = $topic
+                MATCH (expertise)<-[:HAS_EXPERTISE]-(p:Person)
                 OPTIONAL MATCH (p)-[:HAS_ROLE]->(role)
                 OPTIONAL MATCH (p)-[:MADE]->(decision)
-                WHERE decision.name CONTAINS $topic OR decision.context CONTAINS $topic
+                WHERE id(decision) IN $topic_ids
                 
                 RETURN p.name as person,
                        collect(DISTINCT role.name) as roles,
                        collect(DISTINCT decision.name) as related_decisions
                 ORDER BY size(related_decisions) DESC
             """
-            result = tx.run(query, topic=topic)
+            result = tx.run(query, topic=topic, topic_ids=topic_ids)
         else:
             query = """
                 MATCH (p:Person)-[:HAS_EXPERTISE]->(expertise)
@@ -1151,7 +1598,7 @@ class GraphBrain:
         with precise timestamp tracking and sequential relationships.
         """
         with self.driver.session() as session:
-            session.write_transaction(self._create_temporal_event, event_name, event_type, 
+            self._write_transaction(session, self._create_temporal_event, event_name, event_type, 
                                     timestamp, participants, era, context)
             print(f"Added Temporal Event '{event_name}' ({event_type}) to GraphBrain.")
     
@@ -1184,6 +1631,7 @@ class GraphBrain:
                 MERGE (te:TemporalEvent {name: $event_name})
                 MERGE (e:Era {name: $era})
                 MERGE (te)-[:OCCURRED_IN]->(e)
+                ON CREATE SET te.degree = coalesce(te.degree, 0) + 1, e.degree = coalesce(e.degree, 0) + 1
             """, event_name=event_name, era=era)
         
         # Link participants
@@ -1193,6 +1641,7 @@ class GraphBrain:
                     MERGE (p:Person {name: $participant})
                     MERGE (te:TemporalEvent {name: $event_name})
                     MERGE (p)-[:PARTICIPATED_IN]->(te)
+                    ON CREATE SET p.degree = coalesce(p.degree, 0) + 1, te.degree = coalesce(te.degree, 0) + 1
                 """, participant=participant, event_name=event_name)
         
         # Create sequential relationships with other events
@@ -1206,8 +1655,10 @@ class GraphBrain:
                 ORDER BY previous.timestamp DESC
                 LIMIT 1
                 MERGE (previous)-[:HAPPENED_BEFORE]->(current)
+                ON CREATE SET previous.degree = coalesce(previous.degree, 0) + 1, current.degree = coalesce(current.degree, 0) + 1
             """, event_name=event_name)
     
+    @cached_read
     def get_temporal_sequence(self, start_date: str = None, end_date: str = None,
                              event_types: list = None, limit: int = 50) -> list[dict]:
         """
@@ -1281,37 +1732,3 @@ class GraphBrain:
         
         result = tx.run(query, start_date=start_date, end_date=end_date, limit=limit)
         return [record.data() for record in result]
-    
-    def find_causal_chain(self, target_decision_or_event: str, max_depth: int = 5) -> list[dict]:
-        """
-        Find the causal chain leading to a specific decision or event.
-        """
-        with self.driver.session() as session:
-            return session.read_transaction(self._find_causal_chain, target_decision_or_event, max_depth)
-    
-    @staticmethod  
-    def _find_causal_chain(tx, target, max_depth):
-        query = f"""
-            MATCH (target)
-            WHERE target.name = $target AND (target:Decision OR target:TemporalEvent)
-            
-            MATCH path = (cause)-[:INFLUENCED|HAPPENED_BEFORE|DECISION_SEQUENCE*1..{max_depth}]->(target)
-            WHERE cause:Decision OR cause:TemporalEvent OR cause:Document
-            
-            WITH path, relationships(path) as rels, nodes(path) as path_nodes
-            
-            RETURN [node in path_nodes | {{
-                name: node.name,
-                type: labels(node)[0],
-                timestamp: node.timestamp,
-                context: coalesce(node.context, node.description)
-            }}] as causal_sequence,
-            [rel in rels | type(rel)] as relationship_types,
-            length(path) as chain_length
-            
-            ORDER BY chain_length DESC, path_nodes[0].timestamp ASC
-            LIMIT 10
-        """
-        
-        result = tx.run(query, target=target, max_depth=max_depth)
-        return [record.data() for record in result]
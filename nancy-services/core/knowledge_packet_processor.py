@@ -11,9 +11,7 @@ from enum import Enum
 
 from schemas.knowledge_packet import NancyKnowledgePacket, KnowledgePacketValidator
 from .config_manager import NancyConfiguration
-from .search import AnalyticalBrain
-from .knowledge_graph import GraphBrain
-from .nlp import VectorBrain
+from .brain_registry import get_analytical_brain, get_graph_brain, get_vector_brain
 
 logger = logging.getLogger(__name__)
 
@@ -120,10 +118,10 @@ class KnowledgePacketProcessor:
         self.validator = KnowledgePacketValidator()
         self.router = BrainRouter(config)
         
-        # Initialize brains
-        self.vector_brain = VectorBrain()
-        self.analytical_brain = AnalyticalBrain()
-        self.graph_brain = GraphBrain()
+        # Process-wide brains (core/brain_registry.py)
+        self.vector_brain = get_vector_brain()
+        self.analytical_brain = get_analytical_brain()
+        self.graph_brain = get_graph_brain()
         
         # Processing metrics
         self.total_processed = 0
@@ -174,6 +172,14 @@ class KnowledgePacketProcessor:
             brain_results = {}
             errors = []
             
+            # Metadata first: stored tables reference the document row
+            if routing.get("metadata"):
+                try:
+                    brain_results["metadata"] = await self._process_metadata(packet)
+                except Exception as e:
+                    errors.append(f"Metadata processing failed: {e}")
+                    logger.error(f"Metadata processing failed for packet {packet.packet_id}: {e}")
+            
             if routing.get("vector"):
                 try:
                     brain_results["vector"] = await self._process_vector_brain(packet)
@@ -195,13 +201,6 @@ class KnowledgePacketProcessor:
                     errors.append(f"Graph brain processing failed: {e}")
                     logger.error(f"Graph brain processing failed for packet {packet.packet_id}: {e}")
             
-            if routing.get("metadata"):
-                try:
-                    brain_results["metadata"] = await self._process_metadata(packet)
-                except Exception as e:
-                    errors.append(f"Metadata processing failed: {e}")
-                    logger.error(f"Metadata processing failed for packet {packet.packet_id}: {e}")
-            
             # Calculate processing time
             processing_time = (datetime.utcnow() - start_time).total_seconds()
             self.processing_times.append(processing_time)
@@ -256,20 +255,13 @@ class KnowledgePacketProcessor:
                 errors=[str(e)]
             )
     
-    async def _process_vector_brain(self, packet: NancyKnowledgePacket) -> Dict[str, Any]:
-        """Process packet through Vector Brain."""
-        vector_data = packet.content.get("vector_data", {})
-        chunks = vector_data.get("chunks", [])
-        
-        processed_chunks = 0
-        
-        for chunk in chunks:
-            chunk_text = chunk.get("text", "")
-            chunk_metadata = chunk.get("chunk_metadata", {})
-            
+    def _vector_records(self, packet: NancyKnowledgePacket) -> List[Dict[str, Any]]:
+        """Build the vector brain records (text, metadata, doc_id) for a packet's chunks."""
+        records = []
+        for position, chunk in enumerate(packet.content.get("vector_data", {}).get("chunks", [])):
             # Enhance metadata with packet information
             enhanced_metadata = {
-                **chunk_metadata,
+                **chunk.get("chunk_metadata", {}),
                 "packet_id": packet.packet_id,
                 "source_file": packet.source.get("original_location"),
                 "author": packet.metadata.get("author"),
@@ -277,21 +269,29 @@ class KnowledgePacketProcessor:
                 "content_type": packet.source.get("content_type"),
                 "mcp_server": packet.source.get("mcp_server")
             }
-            
-            # Generate document ID for chunk
-            doc_id = f"{packet.packet_id}_{chunk.get('chunk_id', f'chunk_{processed_chunks}')}"
-            
+            records.append({
+                "text": chunk.get("text", ""),
+                # Vector store metadata cannot hold None
+                "metadata": {k: v for k, v in enhanced_metadata.items() if v is not None},
+                "doc_id": f"{packet.packet_id}_{chunk.get('chunk_id', f'chunk_{position}')}"
+            })
+        return records
+    
+    async def _process_vector_brain(self, packet: NancyKnowledgePacket) -> Dict[str, Any]:
+        """Process packet through Vector Brain."""
+        vector_data = packet.content.get("vector_data", {})
+        records = self._vector_records(packet)
+        
+        for record in records:
             # Store in vector brain
             self.vector_brain.add_text(
-                text=chunk_text,
-                metadata=enhanced_metadata,
-                doc_id=doc_id
+                text=record["text"],
+                metadata=record["metadata"],
+                doc_id=record["doc_id"]
             )
-            
-            processed_chunks += 1
         
         return {
-            "chunks_processed": processed_chunks,
+            "chunks_processed": len(records),
             "embedding_model": vector_data.get("embedding_model"),
             "chunk_strategy": vector_data.get("chunk_strategy")
         }
@@ -306,10 +306,15 @@ class KnowledgePacketProcessor:
         
         # Process table data
         table_data = analytical_data.get("table_data", [])
+        rows_stored = 0
         for table in table_data:
-            # TODO: Implement table data storage in analytical brain
-            # For now, just count tables
+            self.analytical_brain.store_packet_table(
+                doc_id=packet.packet_id,
+                filename=packet.metadata.get("title", "Unknown"),
+                table=table
+            )
             tables_processed += 1
+            rows_stored += table.get("row_count", len(table.get("rows", [])))
         
         # Process time series data
         time_series = analytical_data.get("time_series", [])
@@ -317,61 +322,53 @@ class KnowledgePacketProcessor:
         return {
             "structured_fields_count": len(structured_fields),
             "tables_processed": tables_processed,
+            "rows_stored": rows_stored,
             "time_series_points": len(time_series),
             "statistics": analytical_data.get("statistics", {})
         }
     
+    def _graph_records(self, packet: NancyKnowledgePacket) -> Dict[str, List]:
+        """Build concept nodes and relationship arguments for a packet's graph data."""
+        graph_data = packet.content.get("graph_data", {})
+        
+        nodes = [
+            (entity.get("name"), entity.get("type"))
+            for entity in graph_data.get("entities", [])
+        ]
+        
+        # Create context from packet
+        context = f"From {packet.metadata.get('title', 'Unknown')} (packet: {packet.packet_id})"
+        relationships = []
+        for rel in graph_data.get("relationships", []):
+            source = rel.get("source", {})
+            target = rel.get("target", {})
+            relationships.append({
+                "source_node_label": source.get("type"),
+                "source_node_name": source.get("name"),
+                "relationship_type": rel.get("relationship"),
+                "target_node_label": target.get("type"),
+                "target_node_name": target.get("name"),
+                "context": context
+            })
+        
+        return {"nodes": nodes, "relationships": relationships}
+    
     async def _process_graph_brain(self, packet: NancyKnowledgePacket) -> Dict[str, Any]:
         """Process packet through Graph Brain."""
         graph_data = packet.content.get("graph_data", {})
+        records = self._graph_records(packet)
         
-        entities_created = 0
-        relationships_created = 0
-        
-        # Process entities
-        entities = graph_data.get("entities", [])
-        for entity in entities:
-            entity_type = entity.get("type")
-            entity_name = entity.get("name")
-            properties = entity.get("properties", {})
-            
-            # Enhance properties with packet context
-            enhanced_properties = {
-                **properties,
-                "packet_id": packet.packet_id,
-                "source_file": packet.source.get("original_location"),
-                "extraction_confidence": entity.get("confidence", 1.0)
-            }
-            
-            # Create entity node
+        # Create entity nodes
+        for entity_name, entity_type in records["nodes"]:
             self.graph_brain.add_concept_node(entity_name, entity_type)
-            entities_created += 1
         
-        # Process relationships
-        relationships = graph_data.get("relationships", [])
-        for rel in relationships:
-            source = rel.get("source", {})
-            target = rel.get("target", {})
-            rel_type = rel.get("relationship")
-            rel_properties = rel.get("properties", {})
-            
-            # Create context from packet
-            context = f"From {packet.metadata.get('title', 'Unknown')} (packet: {packet.packet_id})"
-            
-            # Create relationship
-            self.graph_brain.add_relationship(
-                source_node_label=source.get("type"),
-                source_node_name=source.get("name"),
-                relationship_type=rel_type,
-                target_node_label=target.get("type"),
-                target_node_name=target.get("name"),
-                context=context
-            )
-            relationships_created += 1
+        # Create relationships
+        for rel in records["relationships"]:
+            self.graph_brain.add_relationship(**rel)
         
         return {
-            "entities_created": entities_created,
-            "relationships_created": relationships_created,
+            "entities_created": len(records["nodes"]),
+            "relationships_created": len(records["relationships"]),
             "extraction_method": graph_data.get("context", {}).get("extraction_method")
         }
     
@@ -398,37 +395,144 @@ class KnowledgePacketProcessor:
     
     async def process_batch(self, packets: List[NancyKnowledgePacket]) -> List[PacketProcessingResult]:
         """
-        Process a batch of Knowledge Packets concurrently.
+        Process a batch of Knowledge Packets with coalesced brain writes.
+        
+        Metadata rows, vector chunks and graph nodes/relationships of the whole
+        batch are each written in one bulk operation; tables are loaded per table.
+        A failed bulk write is reported against every packet that contributed to it.
         
         Args:
             packets: List of Knowledge Packets to process
             
         Returns:
-            List of PacketProcessingResult objects
+            List of PacketProcessingResult objects, in packet order
         """
         logger.info(f"Processing batch of {len(packets)} Knowledge Packets")
+        start_time = datetime.utcnow()
+        
+        routings: Dict[int, Dict[str, bool]] = {}
+        errors: Dict[int, List[str]] = {i: [] for i in range(len(packets))}
+        brains: Dict[int, List[str]] = {i: [] for i in range(len(packets))}
+        
+        for i, packet in enumerate(packets):
+            for hook in self.pre_processing_hooks:
+                try:
+                    hook(packet)
+                except Exception as e:
+                    logger.warning(f"Pre-processing hook failed: {e}")
+            try:
+                self.validator.validate_packet(packet)
+                routings[i] = self.router.determine_routing(packet)
+            except Exception as e:
+                errors[i].append(str(e))
         
-        # Process packets concurrently
-        tasks = [self.process_packet(packet) for packet in packets]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Handle any exceptions in results
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"Batch processing failed for packet {packets[i].packet_id}: {result}")
-                processed_results.append(
-                    PacketProcessingResult(
-                        packet_id=packets[i].packet_id,
-                        status=ProcessingStatus.FAILED,
-                        message=f"Batch processing exception: {result}",
-                        errors=[str(result)]
-                    )
-                )
+        def run_bulk(brain: str, members: List[int], write: Callable[[], Any]):
+            if not members:
+                return
+            try:
+                write()
+                for i in members:
+                    brains[i].append(brain)
+            except Exception as e:
+                logger.error(f"Bulk {brain} write failed for batch of {len(members)} packets: {e}")
+                for i in members:
+                    errors[i].append(f"{brain.capitalize()} processing failed: {e}")
+        
+        def selected(brain: str) -> List[int]:
+            return [i for i, routing in routings.items() if routing.get(brain)]
+        
+        # Metadata first: stored tables reference the document rows
+        metadata_members = selected("metadata")
+        run_bulk("metadata", metadata_members, lambda: self.analytical_brain.insert_documents_metadata([
+            {
+                "doc_id": packets[i].packet_id,
+                "filename": packets[i].metadata.get("title", "Unknown"),
+                "size": packets[i].metadata.get("file_size", 0),
+                "file_type": packets[i].source.get("content_type", "unknown")
+            }
+            for i in metadata_members
+        ]))
+        
+        vector_members = selected("vector")
+        vector_records = [record for i in vector_members for record in self._vector_records(packets[i])]
+        run_bulk("vector", vector_members, lambda: self.vector_brain.add_texts(
+            texts=[record["text"] for record in vector_records],
+            metadatas=[record["metadata"] for record in vector_records],
+            doc_ids=[record["doc_id"] for record in vector_records]
+        ))
+        
+        # Tables are already bulk-loaded column-wise, one per table
+        for i in selected("analytical"):
+            run_bulk("analytical", [i], lambda i=i: self._store_packet_tables(packets[i]))
+        
+        graph_members = selected("graph")
+        graph_records = [self._graph_records(packets[i]) for i in graph_members]
+        
+        def write_graph():
+            nodes = [node for records in graph_records for node in records["nodes"]]
+            relationships = [rel for records in graph_records for rel in records["relationships"]]
+            if nodes:
+                self.graph_brain.add_concept_nodes(nodes)
+            if relationships:
+                self.graph_brain.add_relationships(relationships)
+        
+        run_bulk("graph", graph_members, write_graph)
+        
+        processing_time = (datetime.utcnow() - start_time).total_seconds()
+        self.processing_times.append(processing_time)
+        
+        results = []
+        for i, packet in enumerate(packets):
+            if i not in routings:
+                status = ProcessingStatus.FAILED
+                message = f"Validation failed: {errors[i][0]}"
+            elif errors[i] and not brains[i]:
+                status = ProcessingStatus.FAILED
+                message = f"Processed with {len(errors[i])} errors"
+            elif errors[i]:
+                status = ProcessingStatus.COMPLETED
+                message = f"Processed with {len(errors[i])} errors"
+            else:
+                status = ProcessingStatus.COMPLETED
+                message = f"Successfully processed through {len(brains[i])} brains"
+            
+            result = PacketProcessingResult(
+                packet_id=packet.packet_id,
+                status=status,
+                message=message,
+                metrics={
+                    "batch_processing_time_seconds": processing_time,
+                    "batch_size": len(packets),
+                    "brains_processed": brains[i],
+                    "routing_decisions": routings.get(i, {})
+                },
+                errors=errors[i]
+            )
+            
+            if status == ProcessingStatus.COMPLETED:
+                self.total_processed += 1
             else:
-                processed_results.append(result)
+                self.total_failed += 1
+            
+            for hook in self.post_processing_hooks:
+                try:
+                    hook(packet, result)
+                except Exception as e:
+                    logger.warning(f"Post-processing hook failed: {e}")
+            
+            results.append(result)
         
-        return processed_results
+        logger.info(f"Processed batch of {len(packets)} Knowledge Packets in {processing_time:.2f}s")
+        return results
+    
+    def _store_packet_tables(self, packet: NancyKnowledgePacket):
+        """Load every table_data entry of a packet into the Analytical Brain."""
+        for table in packet.content.get("analytical_data", {}).get("table_data", []):
+            self.analytical_brain.store_packet_table(
+                doc_id=packet.packet_id,
+                filename=packet.metadata.get("title", "Unknown"),
+                table=table
+            )
     
     def get_processing_metrics(self) -> Dict[str, Any]:
         """Get processing performance metrics."""
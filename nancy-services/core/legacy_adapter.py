@@ -3,6 +3,7 @@ Nancy Legacy Adapter
 Provides backwards compatibility for existing Nancy API while transitioning to MCP architecture.
 """
 
+import asyncio
 import os
 import logging
 from typing import Dict, Any, Optional, List
@@ -12,11 +13,14 @@ from datetime import datetime
 from .config_manager import NancyConfiguration, get_config_manager
 from .mcp_host import NancyMCPHost
 from schemas.knowledge_packet import NancyKnowledgePacket
-from .ingestion import IngestionService  # Legacy ingestion service
-from .langchain_orchestrator import LangChainOrchestrator
+from .concurrency import run_blocking
+from .brain_registry import get_ingestion_service, get_langchain_orchestrator
 
 logger = logging.getLogger(__name__)
 
+# How long a synchronous caller waits for MCP ingestion on the event loop
+MCP_INGEST_TIMEOUT_SECONDS = 30
+
 
 class LegacyNancyAdapter:
     """
@@ -35,8 +39,12 @@ class LegacyNancyAdapter:
         """
         self.config = config or get_config_manager().get_config()
         self.mcp_host: Optional[NancyMCPHost] = None
-        self.legacy_ingestion: Optional[IngestionService] = None
-        self.legacy_orchestrator: Optional[LangChainOrchestrator] = None
+        # Legacy IngestionService and LangChainOrchestrator (legacy and hybrid modes)
+        self.legacy_ingestion = None
+        self.legacy_orchestrator = None
+        
+        # Event loop the MCP host runs on; sync callers submit coroutines to it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         
         # Migration mode controls behavior
         self.migration_mode = os.getenv("NANCY_MIGRATION_MODE", "mcp")  # "legacy", "hybrid", "mcp"
@@ -45,6 +53,7 @@ class LegacyNancyAdapter:
     
     async def initialize(self) -> bool:
         """Initialize the adapter based on migration mode."""
+        self._loop = asyncio.get_running_loop()
         try:
             if self.migration_mode == "legacy":
                 return await self._initialize_legacy_mode()
@@ -60,9 +69,9 @@ class LegacyNancyAdapter:
         """Initialize legacy-only mode."""
         logger.info("Initializing in legacy mode")
         
-        # Use original ingestion service and orchestrator
-        self.legacy_ingestion = IngestionService()
-        self.legacy_orchestrator = LangChainOrchestrator()
+        # Use original ingestion service and orchestrator, shared with the API endpoints
+        self.legacy_ingestion = get_ingestion_service()
+        self.legacy_orchestrator = get_langchain_orchestrator()
         
         return True
     
@@ -119,6 +128,65 @@ class LegacyNancyAdapter:
                 "doc_id": None
             }
     
+    def ingest_file_path(self, filename: str, file_path: str, author: str = "Unknown") -> Dict[str, Any]:
+        """
+        Ingest a file already spooled to disk. In legacy mode large spreadsheets
+        are streamed from the path instead of being read into memory.
+        """
+        try:
+            if self.migration_mode == "legacy" or (self.migration_mode == "hybrid" and not self.mcp_host):
+                return self._legacy_ingest_file_path(filename, file_path, author)
+            
+            with open(file_path, 'rb') as f:
+                content = f.read()
+            return self._mcp_ingest_file(filename, content, author)
+        except Exception as e:
+            logger.error(f"File ingestion failed for {filename}: {e}")
+            return {
+                "status": "error",
+                "message": f"Ingestion failed: {e}",
+                "doc_id": None
+            }
+    
+    async def ingest_file_async(self, filename: str, content: bytes, author: str = "Unknown") -> Dict[str, Any]:
+        """
+        Async counterpart of ingest_file for request handlers. Blocking legacy
+        ingestion runs in the bounded worker threadpool; MCP ingestion runs on
+        the caller's event loop.
+        """
+        try:
+            if self.migration_mode == "legacy" or (self.migration_mode == "hybrid" and not self.mcp_host):
+                return await run_blocking(self._legacy_ingest_file, filename, content, author)
+            
+            if not self.mcp_host:
+                raise RuntimeError("MCP host not initialized")
+            return await self._mcp_ingest_async(filename, content, author)
+        except Exception as e:
+            logger.error(f"File ingestion failed for {filename}: {e}")
+            return {
+                "status": "error",
+                "message": f"Ingestion failed: {e}",
+                "doc_id": None
+            }
+    
+    async def ingest_file_path_async(self, filename: str, file_path: str, author: str = "Unknown") -> Dict[str, Any]:
+        """Async counterpart of ingest_file_path for request handlers."""
+        try:
+            if self.migration_mode == "legacy" or (self.migration_mode == "hybrid" and not self.mcp_host):
+                return await run_blocking(self._legacy_ingest_file_path, filename, file_path, author)
+            
+            if not self.mcp_host:
+                raise RuntimeError("MCP host not initialized")
+            content = await run_blocking(Path(file_path).read_bytes)
+            return await self._mcp_ingest_async(filename, content, author)
+        except Exception as e:
+            logger.error(f"File ingestion failed for {filename}: {e}")
+            return {
+                "status": "error",
+                "message": f"Ingestion failed: {e}",
+                "doc_id": None
+            }
+    
     def _legacy_ingest_file(self, filename: str, content: bytes, author: str) -> Dict[str, Any]:
         """Use legacy ingestion service."""
         if not self.legacy_ingestion:
@@ -134,33 +202,45 @@ class LegacyNancyAdapter:
             "legacy_result": result
         }
     
+    def _legacy_ingest_file_path(self, filename: str, file_path: str, author: str) -> Dict[str, Any]:
+        """Use legacy ingestion service on a file spooled to disk."""
+        if not self.legacy_ingestion:
+            raise RuntimeError("Legacy ingestion service not initialized")
+        
+        result = self.legacy_ingestion.ingest_spreadsheet_path(filename, file_path, author)
+        return {
+            "status": "success",
+            "message": "File ingested via legacy system",
+            "doc_id": result.get("doc_id"),
+            "legacy_result": result
+        }
+    
     def _mcp_ingest_file(self, filename: str, content: bytes, author: str) -> Dict[str, Any]:
-        """Use MCP ingestion with proper async/sync bridging."""
+        """
+        Synchronous MCP ingestion for callers outside the event loop (scripts,
+        worker threads). The coroutine is submitted to the loop the MCP host runs
+        on rather than to a new per-call loop.
+        """
         if not self.mcp_host:
             raise RuntimeError("MCP host not initialized")
         
         try:
-            # Use asyncio to run the async MCP ingestion safely
-            import asyncio
-            import concurrent.futures
-            
-            # Check if we're already in an event loop
             try:
-                loop = asyncio.get_running_loop()
-                # We're in an async context, need to use a thread pool
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(self._run_mcp_ingestion_sync, filename, content, author)
-                    result = future.result(timeout=30)
-                    return result
+                running_loop = asyncio.get_running_loop()
             except RuntimeError:
-                # No running loop, we can create one
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    result = loop.run_until_complete(self._mcp_ingest_async(filename, content, author))
-                    return result
-                finally:
-                    loop.close()
+                running_loop = None
+            
+            if running_loop is not None:
+                raise RuntimeError("Synchronous ingestion called from the event loop; use ingest_file_async")
+            
+            if self._loop is not None and self._loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(
+                    self._mcp_ingest_async(filename, content, author), self._loop
+                )
+                return future.result(timeout=MCP_INGEST_TIMEOUT_SECONDS)
+            
+            # Standalone use without a serving loop
+            return asyncio.run(self._mcp_ingest_async(filename, content, author))
                     
         except Exception as e:
             logger.error(f"MCP ingestion failed: {e}")
@@ -170,17 +250,6 @@ class LegacyNancyAdapter:
                 "doc_id": None
             }
     
-    def _run_mcp_ingestion_sync(self, filename: str, content: bytes, author: str) -> Dict[str, Any]:
-        """Run MCP ingestion in a separate thread with its own event loop."""
-        import asyncio
-        
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._mcp_ingest_async(filename, content, author))
-        finally:
-            loop.close()
-    
     async def _mcp_ingest_async(self, filename: str, content: bytes, author: str) -> Dict[str, Any]:
         """Async MCP ingestion implementation."""
         # Create a temporary file for MCP processing
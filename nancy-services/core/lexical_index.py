@@ -0,0 +1,297 @@
+"""
+BM25 lexical index of the Vector Brain's chunks.
+
+Dense similarity misses exact tokens - part numbers, requirement IDs, error
+strings - that a lexical index finds directly. Every chunk VectorBrain stores
+is also tokenized into a posting list in DuckDB (lexical_chunks,
+lexical_postings), maintained incrementally by the same add, metadata update
+and delete calls, under the same chunk IDs. Queries are scored with Okapi BM25
+in one SQL statement over the postings of the query terms.
+
+DuckDB's FTS extension was not used: its index is rebuilt in full by
+create_fts_index and does not follow inserts or deletes.
+
+Tokens are lowercase alphanumeric runs; compound tokens joined by - _ . / :
+(REQ-042, 3.3V, tps54331.c) are indexed whole and as their parts, so both
+"REQ-042" and "042" match.
+
+Like the other embedded stores, one index per database file is shared by
+every VectorBrain in the process.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import Counter
+
+import duckdb
+import pandas as pd
+
+from .vector_backend import matches_where
+
+DEFAULT_LEXICAL_INDEX_PATH = "./data/nancy_lexical.duckdb"
+
+# Okapi BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Results fetched per requested result when a metadata filter is applied afterwards
+FILTER_OVERFETCH = 20
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[-_./:][a-z0-9]+)*")
+_SEPARATOR = re.compile(r"[-_./:]")
+# A token with a digit, or a quoted phrase: worth an exact lexical match
+_EXACT_TERM = re.compile(r'"[^"]+"|\b[A-Za-z]*\d[\w\-./:]*\b')
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have how in is it its of on or that the this "
+    "to was were what when where which who why will with".split()
+)
+
+
+def tokenize(text: str) -> list:
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in STOP_WORDS:
+            continue
+        tokens.append(token)
+        if _SEPARATOR.search(token):
+            tokens.extend(part for part in _SEPARATOR.split(token) if part and part not in STOP_WORDS)
+    return tokens
+
+
+def has_exact_terms(text: str) -> bool:
+    """Whether a query holds identifiers or quoted phrases (the "auto" retrieval mode uses hybrid then)."""
+    return bool(_EXACT_TERM.search(text))
+
+
+class LexicalIndex:
+    """
+    Chunk texts and their BM25 postings in one DuckDB file.
+    """
+
+    def __init__(self, database_path: str):
+        self.database_path = database_path
+        self.lock = threading.RLock()
+        self.references = 0
+        if database_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(database_path)), exist_ok=True)
+        self.connection = duckdb.connect(database_path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS lexical_chunks (
+                chunk_id VARCHAR PRIMARY KEY,
+                source VARCHAR,
+                document VARCHAR,
+                metadata VARCHAR,
+                length INTEGER
+            )
+        """)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS lexical_postings (
+                term VARCHAR,
+                chunk_id VARCHAR,
+                tf INTEGER
+            )
+        """)
+
+    def close(self):
+        self.connection.close()
+
+    def _transaction(self, statements):
+        self.connection.execute("BEGIN TRANSACTION")
+        try:
+            statements()
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+
+    def _delete_ids(self, ids: list):
+        self.connection.execute("DELETE FROM lexical_postings WHERE chunk_id IN (SELECT unnest(?))", [ids])
+        self.connection.execute("DELETE FROM lexical_chunks WHERE chunk_id IN (SELECT unnest(?))", [ids])
+
+    def add(self, ids: list, documents: list, metadatas: list):
+        """Index chunks, replacing any already indexed under the same IDs."""
+        # A repeated ID within the batch keeps its last occurrence
+        chunks = {chunk_id: (document or "", metadata or {})
+                  for chunk_id, document, metadata in zip(ids, documents, metadatas)}
+        if not chunks:
+            return
+        rows, postings = [], {"term": [], "chunk_id": [], "tf": []}
+        for chunk_id, (document, metadata) in chunks.items():
+            terms = Counter(tokenize(document))
+            rows.append((chunk_id, metadata.get("source"), document,
+                         json.dumps(metadata, default=str), sum(terms.values())))
+            for term, tf in terms.items():
+                postings["term"].append(term)
+                postings["chunk_id"].append(chunk_id)
+                postings["tf"].append(tf)
+        chunk_frame = pd.DataFrame(rows, columns=["chunk_id", "source", "document", "metadata", "length"])
+        posting_frame = pd.DataFrame(postings)
+
+        def statements():
+            self._delete_ids(list(chunks))
+            self.connection.register("lexical_chunk_rows", chunk_frame)
+            self.connection.register("lexical_posting_rows", posting_frame)
+            self.connection.execute("INSERT INTO lexical_chunks SELECT * FROM lexical_chunk_rows")
+            self.connection.execute("INSERT INTO lexical_postings SELECT * FROM lexical_posting_rows")
+            self.connection.unregister("lexical_chunk_rows")
+            self.connection.unregister("lexical_posting_rows")
+        with self.lock:
+            self._transaction(statements)
+
+    def missing_ids(self, ids: list) -> list:
+        """The given chunk IDs that are not indexed (e.g. stored before the index existed)."""
+        if not ids:
+            return []
+        with self.lock:
+            present = {row[0] for row in self.connection.execute(
+                "SELECT chunk_id FROM lexical_chunks WHERE chunk_id IN (SELECT unnest(?))", [list(ids)]).fetchall()}
+        return [chunk_id for chunk_id in ids if chunk_id not in present]
+
+    def update(self, ids: list, metadatas: list):
+        """Replace chunk metadata; postings are unchanged."""
+        frame = pd.DataFrame({
+            "chunk_id": list(ids),
+            "source": [(metadata or {}).get("source") for metadata in metadatas],
+            "metadata": [json.dumps(metadata or {}, default=str) for metadata in metadatas]
+        })
+        if frame.empty:
+            return
+
+        def statements():
+            self.connection.register("lexical_metadata_rows", frame)
+            self.connection.execute("""
+                UPDATE lexical_chunks SET source = r.source, metadata = r.metadata
+                FROM lexical_metadata_rows r WHERE lexical_chunks.chunk_id = r.chunk_id
+            """)
+            self.connection.unregister("lexical_metadata_rows")
+        with self.lock:
+            self._transaction(statements)
+
+    def delete(self, ids: list = None, where: dict = None):
+        with self.lock:
+            targets = list(ids or [])
+            if where:
+                sources = self._source_filter(where)
+                if sources is not None:
+                    targets += [row[0] for row in self.connection.execute(
+                        "SELECT chunk_id FROM lexical_chunks WHERE source IN (SELECT unnest(?))", [sources]).fetchall()]
+                else:
+                    targets += [chunk_id for chunk_id, metadata in self.connection.execute(
+                        "SELECT chunk_id, metadata FROM lexical_chunks").fetchall()
+                        if matches_where(json.loads(metadata), where)]
+            if targets:
+                self._transaction(lambda: self._delete_ids(targets))
+
+    @staticmethod
+    def _source_filter(where: dict):
+        """Sources of a {"source": x} or {"source": {"$in": [...]}} filter, else None."""
+        if list(where) != ["source"]:
+            return None
+        condition = where["source"]
+        if isinstance(condition, dict):
+            return list(condition["$in"]) if list(condition) == ["$in"] else None
+        return [condition]
+
+    def clear(self):
+        with self.lock:
+            self._transaction(lambda: (self.connection.execute("DELETE FROM lexical_postings"),
+                                       self.connection.execute("DELETE FROM lexical_chunks")))
+
+    def count(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT count(*) FROM lexical_chunks").fetchone()[0]
+
+    def search(self, text: str, n_results: int = 5, where: dict = None) -> list:
+        """
+        Top chunks by BM25 score for the query text, as dicts with id,
+        document, metadata and score, best first.
+
+        A source filter is applied in SQL; any other metadata filter is
+        applied to the scored chunks, fetching more of them until enough
+        match or none are left.
+        """
+        terms = sorted(set(tokenize(text)))
+        if not terms or n_results <= 0:
+            return []
+        sources = self._source_filter(where) if where else None
+        residual = where if where and sources is None else None
+        limit = n_results * FILTER_OVERFETCH if residual else n_results
+        while True:
+            rows = self._score(terms, sources, limit)
+            results = []
+            for chunk_id, score, document, metadata in rows:
+                metadata = json.loads(metadata)
+                if residual and not matches_where(metadata, residual):
+                    continue
+                results.append({"id": chunk_id, "document": document, "metadata": metadata, "score": float(score)})
+                if len(results) == n_results:
+                    return results
+            if len(rows) < limit:
+                return results
+            limit *= 4
+
+    def _score(self, terms: list, sources: list, limit: int) -> list:
+        """BM25 rows (chunk_id, score, document, metadata) of the best chunks, optionally of given sources."""
+        # Document frequencies and lengths stay corpus-wide; only the scored chunks are filtered
+        source_clause = "WHERE c.source IN (SELECT unnest(?::VARCHAR[]))" if sources is not None else ""
+        parameters = [terms, BM25_K1, BM25_K1, BM25_B, BM25_B]
+        if sources is not None:
+            parameters.append(sources)
+        parameters.append(limit)
+        with self.lock:
+            return self.connection.execute(f"""
+                WITH matched AS (
+                    SELECT term, chunk_id, tf FROM lexical_postings
+                    WHERE term IN (SELECT unnest(?::VARCHAR[]))
+                ),
+                df AS (SELECT term, count(*) AS df FROM matched GROUP BY term),
+                stats AS (SELECT count(*) AS n, avg(length) AS avgdl FROM lexical_chunks),
+                scored AS (
+                    SELECT m.chunk_id,
+                           sum(ln(1 + (stats.n - df.df + 0.5) / (df.df + 0.5))
+                               * m.tf * (? + 1)
+                               / (m.tf + ? * (1 - ? + ? * c.length / stats.avgdl))) AS score
+                    FROM matched m
+                    JOIN df USING (term)
+                    JOIN lexical_chunks c USING (chunk_id)
+                    CROSS JOIN stats
+                    {source_clause}
+                    GROUP BY m.chunk_id
+                    ORDER BY score DESC, m.chunk_id
+                    LIMIT ?
+                )
+                SELECT s.chunk_id, s.score, c.document, c.metadata
+                FROM scored s JOIN lexical_chunks c USING (chunk_id)
+                ORDER BY s.score DESC, s.chunk_id
+            """, parameters).fetchall()
+
+
+# One index per database file, shared by every VectorBrain in the process
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _index_key(database_path: str) -> str:
+    return database_path if database_path == ":memory:" else os.path.abspath(database_path)
+
+
+def acquire_lexical_index(database_path: str = None) -> LexicalIndex:
+    database_path = database_path or DEFAULT_LEXICAL_INDEX_PATH
+    with _indexes_lock:
+        index = _indexes.get(_index_key(database_path))
+        if index is None:
+            index = LexicalIndex(database_path)
+            _indexes[_index_key(database_path)] = index
+        index.references += 1
+        return index
+
+
+def release_lexical_index(index: LexicalIndex):
+    with _indexes_lock:
+        index.references -= 1
+        if index.references == 0:
+            _indexes.pop(_index_key(index.database_path), None)
+            index.close()
@@ -5,6 +5,7 @@ Supports Claude and Gemini APIs for various AI tasks.
 
 import os
 import json
+import importlib.util
 import requests
 import re
 from typing import Dict, List, Optional, Any
@@ -22,12 +23,10 @@ try:
 except ImportError:
     OLLAMA_AVAILABLE = False
 
-try:
-    from transformers import AutoTokenizer, AutoModelForCausalLM
-    import torch
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+# transformers and torch take seconds and hundreds of MB to import; they are
+# only imported when the local Transformers model is first called
+TRANSFORMERS_AVAILABLE = (importlib.util.find_spec("transformers") is not None
+                          and importlib.util.find_spec("torch") is not None)
 
 class QueryType(Enum):
     """Types of queries the system can handle"""
@@ -583,6 +582,8 @@ Extract temporal relationships from this document."""
         """
         if not TRANSFORMERS_AVAILABLE:
             raise Exception("Transformers library not available")
+        from transformers import AutoTokenizer, AutoModelForCausalLM
+        import torch
         
         # Initialize model if not already done
         if self.local_model is None:
@@ -9,18 +9,23 @@ import json
 import subprocess
 import os
 import signal
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from datetime import datetime
 from pathlib import Path
 
 from .config_manager import NancyConfiguration, MCPServerConfig
 from schemas.knowledge_packet import NancyKnowledgePacket, KnowledgePacketValidator
-from .search import AnalyticalBrain
-from .knowledge_graph import GraphBrain
-from .nlp import VectorBrain
+from .brain_registry import (
+    get_analytical_brain, get_graph_brain, get_vector_brain, get_packet_dedup_index, get_loaded
+)
+from .concurrency import run_blocking
+from .packet_dedup import chunk_content_hash
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of queued packets written to the brains together
+PACKET_BATCH_SIZE = 100
+
 
 class MCPServerProcess:
     """Manages a single MCP server process."""
@@ -239,19 +244,36 @@ class NancyMCPHost:
         self.mcp_clients: Dict[str, MCPClient] = {}
         self.packet_validator = KnowledgePacketValidator()
         self.packet_queue = asyncio.Queue()
+        self.packet_batch_size = PACKET_BATCH_SIZE
         self.processing_task: Optional[asyncio.Task] = None
         self.is_running = False
         
-        # Brain instances for packet processing
-        self.vector_brain = VectorBrain()
-        self.analytical_brain = AnalyticalBrain()
-        self.graph_brain = GraphBrain()
-        
         # Metrics
         self.packets_processed = 0
         self.packets_failed = 0
+        self.packets_deduplicated = 0
         self.start_time = None
     
+    # Brains for packet processing: the process-wide instances, created by the
+    # first packet that needs them rather than at host startup
+    
+    @property
+    def vector_brain(self):
+        return get_vector_brain()
+    
+    @property
+    def analytical_brain(self):
+        return get_analytical_brain()
+    
+    @property
+    def graph_brain(self):
+        return get_graph_brain()
+    
+    @property
+    def dedup_index(self):
+        """Index of packets and chunks already written, for idempotent ingestion; loaded by the first packet."""
+        return get_packet_dedup_index()
+    
     async def start(self) -> bool:
         """Start the MCP host and all configured servers."""
         logger.info("Starting Nancy MCP Host...")
@@ -428,27 +450,93 @@ class NancyMCPHost:
         return None
     
     async def _process_packet_queue(self):
-        """Process Knowledge Packets from the queue."""
+        """
+        Process Knowledge Packets from the queue.
+        
+        Queue items are single packets or lists of packets (bulk ingestion).
+        Whatever is waiting is drained up to packet_batch_size and written to
+        the brains as one batch. Brain reads and writes run in the blocking
+        threadpool, so the event loop keeps serving requests meanwhile.
+        """
         logger.info("Started Knowledge Packet processing")
         
         while self.is_running:
             try:
                 # Get packet from queue with timeout
-                packet = await asyncio.wait_for(
+                item = await asyncio.wait_for(
                     self.packet_queue.get(),
                     timeout=1.0
                 )
-                
-                await self._process_knowledge_packet(packet)
-                self.packets_processed += 1
-                
             except asyncio.TimeoutError:
                 # Normal timeout, continue processing
                 continue
+            
+            packets = list(item) if isinstance(item, list) else [item]
+            while len(packets) < self.packet_batch_size and not self.packet_queue.empty():
+                item = self.packet_queue.get_nowait()
+                packets.extend(item if isinstance(item, list) else [item])
+            
+            try:
+                if len(packets) == 1:
+                    await self._process_knowledge_packet(packets[0])
+                    self.packets_processed += 1
+                else:
+                    await self._process_knowledge_packet_batch(packets)
             except Exception as e:
                 logger.error(f"Error processing packet: {e}")
                 self.packets_failed += 1
     
+    async def _process_knowledge_packet_batch(self, packets: List[NancyKnowledgePacket]):
+        """
+        Process a batch of Knowledge Packets with one bulk write per brain.
+        
+        If a bulk write fails the batch is replayed packet by packet so that a
+        single bad packet does not fail the others.
+        """
+        valid_packets = []
+        for packet in packets:
+            try:
+                self.packet_validator.validate_packet(packet)
+                valid_packets.append(packet)
+            except Exception as e:
+                logger.error(f"Failed to process Knowledge Packet {packet.packet_id}: {e}")
+                self.packets_failed += 1
+        
+        # Already-ingested packets (and repeats within the batch) are no-ops
+        new_packets = await run_blocking(self._new_packets, valid_packets)
+        duplicates = len(valid_packets) - len(new_packets)
+        self.packets_deduplicated += duplicates
+        self.packets_processed += duplicates
+        valid_packets = new_packets
+        
+        if not valid_packets:
+            return
+        
+        try:
+            await self._route_batch_to_brains(valid_packets)
+            self.packets_processed += len(valid_packets)
+            logger.info(f"Successfully processed batch of {len(valid_packets)} Knowledge Packets")
+        except Exception as e:
+            logger.warning(f"Bulk write failed for batch of {len(valid_packets)} packets, retrying individually: {e}")
+            for packet in valid_packets:
+                try:
+                    await self._route_to_brains(packet)
+                    self.packets_processed += 1
+                except Exception as packet_error:
+                    logger.error(f"Failed to process Knowledge Packet {packet.packet_id}: {packet_error}")
+                    self.packets_failed += 1
+    
+    def _new_packets(self, packets: List[NancyKnowledgePacket]) -> List[NancyKnowledgePacket]:
+        """Packets not yet ingested, without repeats."""
+        new_packets = []
+        batch_packet_ids = set()
+        for packet in packets:
+            if packet.packet_id in batch_packet_ids or self.dedup_index.contains_packet(packet.packet_id):
+                continue
+            batch_packet_ids.add(packet.packet_id)
+            new_packets.append(packet)
+        return new_packets
+    
     async def _process_knowledge_packet(self, packet: NancyKnowledgePacket):
         """
         Process a Knowledge Packet through the Four-Brain architecture.
@@ -462,6 +550,12 @@ class NancyMCPHost:
             # Validate packet
             self.packet_validator.validate_packet(packet)
             
+            # Already-ingested packets are a no-op
+            if await run_blocking(self.dedup_index.contains_packet, packet.packet_id):
+                self.packets_deduplicated += 1
+                logger.info(f"Skipping already ingested Knowledge Packet {packet.packet_id}")
+                return
+            
             # Route to appropriate brains based on content and hints
             await self._route_to_brains(packet)
             
@@ -472,56 +566,163 @@ class NancyMCPHost:
             raise
     
     async def _route_to_brains(self, packet: NancyKnowledgePacket):
-        """Route packet content to appropriate brains for storage."""
+        """Route packet content to appropriate brains for storage, off the event loop."""
+        await run_blocking(self._write_to_brains, packet)
+    
+    def _write_to_brains(self, packet: NancyKnowledgePacket):
+        # Store basic metadata in Analytical Brain first; spreadsheet tables reference it
+        self._store_packet_metadata(packet)
         
         # Store in Vector Brain if vector data present
+        chunks_written = []
         if packet.has_vector_data():
-            await self._store_vector_content(packet)
+            chunks_written = self._store_vector_content(packet)
         
         # Store in Analytical Brain if analytical data present
         if packet.has_analytical_data():
-            await self._store_analytical_content(packet)
+            self._store_analytical_content(packet)
         
         # Store in Graph Brain if graph data present
         if packet.has_graph_data():
-            await self._store_graph_content(packet)
+            self._store_graph_content(packet)
         
-        # Always store basic metadata in Analytical Brain
-        await self._store_packet_metadata(packet)
+        self.dedup_index.record(packet.packet_id, packet.source.get("original_location", ""), chunks_written)
+    
+    async def _route_batch_to_brains(self, packets: List[NancyKnowledgePacket]):
+        """Route a batch of packets to the brains with one bulk write per brain, off the event loop."""
+        await run_blocking(self._write_batch_to_brains, packets)
     
-    async def _store_vector_content(self, packet: NancyKnowledgePacket):
-        """Store vector data in Vector Brain."""
+    def _write_batch_to_brains(self, packets: List[NancyKnowledgePacket]):
+        # Metadata first; spreadsheet tables reference it
+        self.analytical_brain.insert_documents_metadata([
+            {
+                "doc_id": packet.packet_id,
+                "filename": packet.metadata.get("title", "Unknown"),
+                "size": packet.metadata.get("file_size", 0),
+                "file_type": packet.source.get("content_type", "unknown")
+            }
+            for packet in packets
+        ])
+        
+        packet_records = {
+            packet.packet_id: self._new_vector_records(packet) if packet.has_vector_data() else []
+            for packet in packets
+        }
+        vector_records = [record for records in packet_records.values() for record in records]
+        if vector_records:
+            self.vector_brain.add_texts(
+                texts=[record["text"] for record in vector_records],
+                metadatas=[record["metadata"] for record in vector_records],
+                doc_ids=[record["doc_id"] for record in vector_records],
+                upsert=True
+            )
+        
+        for packet in packets:
+            if packet.has_analytical_data():
+                self._store_analytical_content(packet)
+        
+        nodes = []
+        relationships = []
+        for packet in packets:
+            if packet.has_graph_data():
+                records = self._graph_records(packet)
+                nodes.extend(records["nodes"])
+                relationships.extend(records["relationships"])
+        if nodes:
+            self.graph_brain.add_concept_nodes(nodes)
+        if relationships:
+            self.graph_brain.add_relationships(relationships)
+        
+        for packet in packets:
+            self.dedup_index.record(
+                packet.packet_id,
+                packet.source.get("original_location", ""),
+                [(record["chunk_hash"], record["doc_id"]) for record in packet_records[packet.packet_id]]
+            )
+        
+        logger.debug(f"Stored batch of {len(packets)} packets: {len(vector_records)} chunks, "
+                     f"{len(nodes)} entities, {len(relationships)} relationships")
+    
+    def _vector_records(self, packet: NancyKnowledgePacket) -> List[Dict[str, Any]]:
+        """Build the Vector Brain records (text, metadata, doc_id) for a packet's chunks."""
+        records = []
+        for chunk in packet.content.get("vector_data", {}).get("chunks", []):
+            # Add packet metadata to chunk
+            chunk_metadata = {
+                **chunk.get("chunk_metadata", {}),
+                "packet_id": packet.packet_id,
+                "source_file": packet.source.get("original_location"),
+                "author": packet.metadata.get("author"),
+                "title": packet.metadata.get("title")
+            }
+            records.append({
+                "text": chunk.get("text", ""),
+                # Vector store metadata cannot hold None
+                "metadata": {k: v for k, v in chunk_metadata.items() if v is not None},
+                "doc_id": f"{packet.packet_id}_{chunk.get('chunk_id', 'chunk')}",
+                "chunk_hash": chunk_content_hash(chunk.get("text", ""))
+            })
+        return records
+    
+    def _new_vector_records(self, packet: NancyKnowledgePacket) -> List[Dict[str, Any]]:
+        """
+        Vector records for the chunks whose content is not yet stored for the
+        packet's original_location; unchanged chunks of a re-ingested file are reused.
+        """
+        records = {}
+        for record in self._vector_records(packet):
+            records.setdefault(record["chunk_hash"], record)
+        
+        new_hashes = self.dedup_index.new_chunk_hashes(
+            packet.source.get("original_location", ""), list(records.keys())
+        )
+        return [record for chunk_hash, record in records.items() if chunk_hash in new_hashes]
+    
+    def _graph_records(self, packet: NancyKnowledgePacket) -> Dict[str, List]:
+        """Build concept nodes and relationship arguments for a packet's graph data."""
+        graph_data = packet.content.get("graph_data", {})
+        context = f"From {packet.metadata.get('title', 'Unknown')} (packet: {packet.packet_id})"
+        
+        nodes = [(entity.get("name"), entity.get("type")) for entity in graph_data.get("entities", [])]
+        relationships = []
+        for rel in graph_data.get("relationships", []):
+            source = rel.get("source", {})
+            target = rel.get("target", {})
+            relationships.append({
+                "source_node_label": source.get("type"),
+                "source_node_name": source.get("name"),
+                "relationship_type": rel.get("relationship"),
+                "target_node_label": target.get("type"),
+                "target_node_name": target.get("name"),
+                "context": context
+            })
+        return {"nodes": nodes, "relationships": relationships}
+    
+    def _store_vector_content(self, packet: NancyKnowledgePacket) -> List[Tuple[str, str]]:
+        """
+        Store new or changed vector chunks in Vector Brain.
+        Returns the (chunk_hash, vector_id) pairs that were written.
+        """
         try:
-            vector_data = packet.content.get("vector_data", {})
-            chunks = vector_data.get("chunks", [])
-            
-            for chunk in chunks:
-                # Extract chunk data
-                chunk_text = chunk.get("text", "")
-                chunk_metadata = chunk.get("chunk_metadata", {})
-                
-                # Add packet metadata to chunk
-                chunk_metadata.update({
-                    "packet_id": packet.packet_id,
-                    "source_file": packet.source.get("original_location"),
-                    "author": packet.metadata.get("author"),
-                    "title": packet.metadata.get("title")
-                })
-                
-                # Store in vector brain
-                self.vector_brain.add_text(
-                    text=chunk_text,
-                    metadata=chunk_metadata,
-                    doc_id=f"{packet.packet_id}_{chunk.get('chunk_id', 'chunk')}"
+            records = self._new_vector_records(packet)
+            
+            # Upsert so a packet replayed after a partial failure does not hit duplicate IDs
+            if records:
+                self.vector_brain.add_texts(
+                    texts=[record["text"] for record in records],
+                    metadatas=[record["metadata"] for record in records],
+                    doc_ids=[record["doc_id"] for record in records],
+                    upsert=True
                 )
             
-            logger.debug(f"Stored {len(chunks)} chunks in Vector Brain for packet {packet.packet_id}")
+            logger.debug(f"Stored {len(records)} new chunks in Vector Brain for packet {packet.packet_id}")
+            return [(record["chunk_hash"], record["doc_id"]) for record in records]
             
         except Exception as e:
             logger.error(f"Failed to store vector content for packet {packet.packet_id}: {e}")
             raise
     
-    async def _store_analytical_content(self, packet: NancyKnowledgePacket):
+    def _store_analytical_content(self, packet: NancyKnowledgePacket):
         """Store analytical data in Analytical Brain."""
         try:
             analytical_data = packet.content.get("analytical_data", {})
@@ -532,12 +733,15 @@ class NancyMCPHost:
                 # TODO: Implement structured data storage in analytical brain
                 logger.debug(f"Would store structured fields: {list(structured_fields.keys())}")
             
-            # Store table data
+            # Store table data column-wise in DuckDB
             table_data = analytical_data.get("table_data", [])
             for table in table_data:
-                # TODO: Implement table data storage in analytical brain
-                table_name = table.get("table_name")
-                logger.debug(f"Would store table: {table_name}")
+                table_name = self.analytical_brain.store_packet_table(
+                    doc_id=packet.packet_id,
+                    filename=packet.metadata.get("title", "Unknown"),
+                    table=table
+                )
+                logger.debug(f"Stored table {table.get('table_name')} as {table_name}")
             
             logger.debug(f"Stored analytical content in Analytical Brain for packet {packet.packet_id}")
             
@@ -545,55 +749,26 @@ class NancyMCPHost:
             logger.error(f"Failed to store analytical content for packet {packet.packet_id}: {e}")
             raise
     
-    async def _store_graph_content(self, packet: NancyKnowledgePacket):
+    def _store_graph_content(self, packet: NancyKnowledgePacket):
         """Store graph data in Graph Brain."""
         try:
-            graph_data = packet.content.get("graph_data", {})
+            records = self._graph_records(packet)
             
             # Store entities
-            entities = graph_data.get("entities", [])
-            for entity in entities:
-                entity_type = entity.get("type")
-                entity_name = entity.get("name")
-                properties = entity.get("properties", {})
-                
-                # Add packet context to properties
-                properties.update({
-                    "packet_id": packet.packet_id,
-                    "source_file": packet.source.get("original_location")
-                })
-                
-                # Create node in graph brain
+            for entity_name, entity_type in records["nodes"]:
                 self.graph_brain.add_concept_node(entity_name, entity_type)
             
             # Store relationships
-            relationships = graph_data.get("relationships", [])
-            for rel in relationships:
-                source = rel.get("source", {})
-                target = rel.get("target", {})
-                rel_type = rel.get("relationship")
-                rel_props = rel.get("properties", {})
-                
-                # Add packet context
-                context = f"From {packet.metadata.get('title', 'Unknown')} (packet: {packet.packet_id})"
-                
-                # Create relationship in graph brain
-                self.graph_brain.add_relationship(
-                    source_node_label=source.get("type"),
-                    source_node_name=source.get("name"),
-                    relationship_type=rel_type,
-                    target_node_label=target.get("type"),
-                    target_node_name=target.get("name"),
-                    context=context
-                )
+            for rel in records["relationships"]:
+                self.graph_brain.add_relationship(**rel)
             
-            logger.debug(f"Stored {len(entities)} entities and {len(relationships)} relationships in Graph Brain for packet {packet.packet_id}")
+            logger.debug(f"Stored {len(records['nodes'])} entities and {len(records['relationships'])} relationships in Graph Brain for packet {packet.packet_id}")
             
         except Exception as e:
             logger.error(f"Failed to store graph content for packet {packet.packet_id}: {e}")
             raise
     
-    async def _store_packet_metadata(self, packet: NancyKnowledgePacket):
+    def _store_packet_metadata(self, packet: NancyKnowledgePacket):
         """Store packet metadata in Analytical Brain."""
         try:
             # Insert document metadata
@@ -618,6 +793,7 @@ class NancyMCPHost:
                 "uptime_seconds": (datetime.utcnow() - self.start_time).total_seconds() if self.start_time else 0,
                 "packets_processed": self.packets_processed,
                 "packets_failed": self.packets_failed,
+                "packets_deduplicated": self.packets_deduplicated,
                 "queue_size": self.packet_queue.qsize()
             },
             "mcp_servers": {}
@@ -636,6 +812,7 @@ class NancyMCPHost:
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get performance metrics."""
+        dedup_index = get_loaded("packet_dedup_index")
         return {
             "packets_processed": self.packets_processed,
             "packets_failed": self.packets_failed,
@@ -643,5 +820,8 @@ class NancyMCPHost:
             "active_servers": len([s for s in self.server_processes.values() if s.is_healthy]),
             "total_servers": len(self.server_processes),
             "queue_size": self.packet_queue.qsize(),
+            "packets_deduplicated": self.packets_deduplicated,
+            # Metrics must not load the index (and the Analytical Brain) by themselves
+            "dedup_index": dedup_index.get_metrics() if dedup_index else None,
             "uptime_seconds": (datetime.utcnow() - self.start_time).total_seconds() if self.start_time else 0
         }
\ No newline at end of file
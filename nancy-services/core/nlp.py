@@ -1,8 +1,21 @@
-import chromadb
-import os
+import hashlib
+import threading
+from contextlib import contextmanager
 from chromadb import Documents, EmbeddingFunction, Embeddings
 from fastembed import TextEmbedding
 
+from .chunking import TextChunker
+from .lexical_index import acquire_lexical_index, has_exact_terms
+from .vector_backend import create_vector_backend, get_vector_backend_config
+
+# "vector": dense similarity; "lexical": BM25 over the lexical index;
+# "hybrid": both fused by reciprocal rank; "auto": hybrid for queries holding
+# identifiers or quoted phrases, vector otherwise
+RETRIEVAL_MODES = ("vector", "lexical", "hybrid", "auto")
+
+# Reciprocal rank fusion constant (Cormack et al.); ranks past ~60 barely count
+RRF_K = 60
+
 class FastEmbedEmbeddingFunction(EmbeddingFunction):
     """
     A custom embedding function for ChromaDB that uses the fastembed library.
@@ -18,17 +31,18 @@ class FastEmbedEmbeddingFunction(EmbeddingFunction):
         embeddings = self._model.embed(input)
         return [e.tolist() for e in embeddings]
 
-def get_chroma_client():
-    """
-    Returns a ChromaDB client connected to the specified host.
-    """
-    host = os.getenv("CHROMA_HOST", "chromadb")
-    client = chromadb.HttpClient(host=host, port=8000)
-    return client
+    @property
+    def tokenizer(self):
+        """The model's tokenizers.Tokenizer, if this fastembed version exposes it."""
+        return getattr(getattr(self._model, "model", None), "tokenizer", None)
 
 class VectorBrain:
     """
-    Handles interactions with the Vector Brain (ChromaDB).
+    Handles interactions with the Vector Brain.
+    
+    Chunks are stored in the backend selected by brains.vector.backend (see
+    core/vector_backend.py) and mirrored into a BM25 lexical index
+    (core/lexical_index.py) for the lexical and hybrid retrieval modes.
     """
     def __init__(self):
         # Let's see what models are available
@@ -37,53 +51,158 @@ class VectorBrain:
         for model in supported_models:
             print(model)
 
-        self.client = get_chroma_client()
-        
+        embedding_function = FastEmbedEmbeddingFunction(model_name='BAAI/bge-small-en-v1.5')
+        settings = get_vector_backend_config()
+        self.backend = create_vector_backend(embedding_function, settings)
 
-        self.collection = self.client.get_or_create_collection(
-            name="nancy_documents",
-            embedding_function=FastEmbedEmbeddingFunction(model_name='BAAI/bge-small-en-v1.5')
-        )
-        print("VectorBrain initialized with fastembed.")
+        self.default_retrieval_mode = settings["retrieval_mode"]
+        if self.default_retrieval_mode not in RETRIEVAL_MODES:
+            print(f"Unknown retrieval mode {self.default_retrieval_mode}, using vector")
+            self.default_retrieval_mode = "vector"
+        self._retrieval = threading.local()
+        # Sources being replaced by the re-ingest running on this thread, see superseding()
+        self._versions = threading.local()
+        try:
+            self.lexical_index = acquire_lexical_index(settings["connection"].get("lexical_index_path"))
+        except Exception as e:
+            # e.g. the index file is locked by another process
+            print(f"Lexical index unavailable, lexical and hybrid retrieval fall back to vector search: {e}")
+            self.lexical_index = None
+        # Chunks are sized in model tokens from brains.vector.chunk_size/chunk_overlap
+        self.chunker = TextChunker.from_config(tokenizer=embedding_function.tokenizer)
+        print(f"VectorBrain initialized with fastembed on the {self.backend.backend_name} backend "
+              f"(chunks of {self.chunker.chunk_size} tokens, {self.chunker.chunk_overlap} overlap).")
 
+    def _chunk_text(self, text: str, nlp=None):
+        """
+        Splits a long text into overlapping token windows that fit the embedding model.
+        
+        See core/chunking.py: window ends prefer content-defined anchor sentences,
+        so an edit only changes the chunks around it. nlp is no longer needed and
+        kept for existing callers.
+        """
+        return self.chunker.split(text)
 
-    def _chunk_text(self, text: str, nlp, chunk_size: int = 384):
+    @staticmethod
+    def _chunk_ids(chunk_key: str, chunks: list[str]) -> list[str]:
         """
-        Splits a long text into smaller, semantically meaningful chunks using sentences.
+        IDs derived from the chunk content, anchored to the document key and to
+        the occurrence of that content within the document, so an unchanged
+        chunk keeps its ID across versions.
         """
-        doc = nlp(text)
-        sentences = [sent.text for sent in doc.sents]
-        
-        chunks = []
-        current_chunk = ""
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) <= chunk_size:
-                current_chunk += " " + sentence
-            else:
-                chunks.append(current_chunk.strip())
-                current_chunk = sentence
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-            
-        return chunks
+        key_hash = hashlib.sha256(chunk_key.encode('utf-8')).hexdigest()[:16]
+        occurrences = {}
+        chunk_ids = []
+        for chunk in chunks:
+            content_hash = hashlib.sha256(chunk.encode('utf-8')).hexdigest()[:32]
+            occurrence = occurrences.get(content_hash, 0)
+            occurrences[content_hash] = occurrence + 1
+            chunk_ids.append(f"{key_hash}_{content_hash}_{occurrence}")
+        return chunk_ids
+
+    @contextmanager
+    def superseding(self, sources: list):
+        """
+        Let embed_and_store_text calls in this thread reuse and retire the
+        chunks of these sources (the previous version of the file being
+        re-ingested, see DirectoryIngestionService.process_file_state).
+        """
+        previous = getattr(self._versions, "superseded", None)
+        self._versions.superseded = list(sources or [])
+        try:
+            yield
+        finally:
+            self._versions.superseded = previous
 
-    def embed_and_store_text(self, doc_id: str, text: str, nlp):
+    def embed_and_store_text(self, doc_id: str, text: str, nlp, chunk_key: str = None,
+                             superseded: list = None) -> dict:
         """
-        Chunks text and stores it in ChromaDB.
-        Embedding is handled automatically by the collection's embedding function.
+        Chunks text and stores it in the vector backend.
+        Embedding is handled automatically by the backend's embedding function.
+        
+        chunk_key names the document across versions (e.g. its filename). The new
+        chunk set is diffed against the chunks stored under that key by this
+        doc_id or by a superseded source (default: those set by superseding()):
+        unchanged chunks keep their vectors and are only re-tagged with the new
+        doc_id, new chunks are embedded, and chunks no longer in the text are
+        deleted. Chunks of other documents under the same key (two uploads
+        named notes.txt) are never touched; a chunk whose ID one of them already
+        holds gets an ID of its own.
+        Returns chunk counts including the percentage reused.
         """
+        chunk_key = chunk_key or doc_id
+        if superseded is None:
+            superseded = getattr(self._versions, "superseded", None) or []
+        owners = list(dict.fromkeys([doc_id] + list(superseded)))
         chunks = self._chunk_text(text, nlp)
+        chunk_ids = self._chunk_ids(chunk_key, chunks)
+        metadatas = [
+            {"source": doc_id, "chunk_key": chunk_key, "chunk_index": i}
+            for i in range(len(chunks))
+        ]
+        
+        key_ids = set(self.backend.get_ids(where={"chunk_key": chunk_key}))
+        stored_ids = set(self.backend.get_ids(
+            where={"$and": [{"chunk_key": chunk_key}, {"source": {"$in": owners}}]}
+        )) if key_ids else set()
+        foreign_ids = key_ids - stored_ids
+        if foreign_ids:
+            own_ids = self._chunk_ids(f"{chunk_key}@{doc_id}", chunks)
+            chunk_ids = [own_id if chunk_id in foreign_ids else chunk_id
+                         for chunk_id, own_id in zip(chunk_ids, own_ids)]
+        reused = [i for i, chunk_id in enumerate(chunk_ids) if chunk_id in stored_ids]
+        embedded = [i for i, chunk_id in enumerate(chunk_ids) if chunk_id not in stored_ids]
+        removed = list(stored_ids - set(chunk_ids))
+        
+        if reused:
+            # Metadata-only update; the stored embeddings are kept
+            self.backend.update(
+                ids=[chunk_ids[i] for i in reused],
+                metadatas=[metadatas[i] for i in reused]
+            )
+        if embedded:
+            self.backend.add(
+                documents=[chunks[i] for i in embedded],
+                metadatas=[metadatas[i] for i in embedded],
+                ids=[chunk_ids[i] for i in embedded]
+            )
+        if removed:
+            self.backend.delete(ids=removed)
         
-        # Create unique IDs for each chunk
-        chunk_ids = [f"{doc_id}_chunk_{i}" for i in range(len(chunks))]
+        if self.lexical_index is not None:
+            # Reused chunks stored before the lexical index existed are indexed too
+            unindexed = set(self.lexical_index.missing_ids([chunk_ids[i] for i in reused]))
+            indexed = embedded + [i for i in reused if chunk_ids[i] in unindexed]
+            self.lexical_index.add([chunk_ids[i] for i in indexed], [chunks[i] for i in indexed],
+                                   [metadatas[i] for i in indexed])
+            self.lexical_index.update([chunk_ids[i] for i in reused if chunk_ids[i] not in unindexed],
+                                      [metadatas[i] for i in reused if chunk_ids[i] not in unindexed])
+            if removed:
+                self.lexical_index.delete(ids=removed)
+        
+        print(f"Stored {len(chunks)} chunks for document {doc_id} in the vector store: "
+              f"{len(embedded)} embedded, {len(reused)} reused, {len(removed)} removed.")
+        return self.chunk_stats(len(chunks), len(reused), len(removed))
+
+    @staticmethod
+    def chunk_stats(total: int, reused: int, removed: int = 0) -> dict:
+        return {
+            "chunks_total": total,
+            "chunks_reused": reused,
+            "chunks_embedded": total - reused,
+            "chunks_removed": removed,
+            "chunks_reused_percent": round(100 * reused / total, 1) if total else 0.0
+        }
 
-        self.collection.add(
-            documents=chunks,
-            metadatas=[{"source": doc_id} for _ in chunks],
-            ids=chunk_ids
+    @classmethod
+    def combine_chunk_stats(cls, stats_list: list) -> dict:
+        """Sum per-document chunk stats, e.g. over the sheets of a workbook or a processing batch."""
+        stats_list = [stats for stats in stats_list if stats]
+        return cls.chunk_stats(
+            sum(stats["chunks_total"] for stats in stats_list),
+            sum(stats["chunks_reused"] for stats in stats_list),
+            sum(stats["chunks_removed"] for stats in stats_list)
         )
-        print(f"Added {len(chunks)} chunks for document {doc_id} to ChromaDB.")
 
     def add_text(self, text: str, metadata: dict = None, doc_id: str = None):
         """
@@ -99,21 +218,172 @@ class VectorBrain:
         # Prepare metadata
         chunk_metadata = metadata or {}
         
-        # Add to ChromaDB collection
-        self.collection.add(
+        # Add to the vector store
+        self.backend.add(
             documents=[text],
             metadatas=[chunk_metadata],
             ids=[chunk_id]
         )
-        print(f"Added text chunk {chunk_id} to ChromaDB with metadata: {list(chunk_metadata.keys())}")
+        self._index_lexical([chunk_id], [text], [chunk_metadata], replace=False)
+        print(f"Added text chunk {chunk_id} to the vector store with metadata: {list(chunk_metadata.keys())}")
 
-    def query(self, query_texts: list[str], n_results: int = 5):
+    def add_texts(self, texts: list[str], metadatas: list[dict], doc_ids: list[str], batch_size: int = 1000,
+                  upsert: bool = False):
         """
-        Queries the vector database for similar documents.
-        The query text is automatically embedded by the collection's embedding function.
+        Add many text chunks in as few backend add calls as possible.
+        Used when a batch of Knowledge Packets is written at once. With upsert,
+        IDs that already exist are overwritten instead of rejected.
         """
-        results = self.collection.query(
-            query_texts=query_texts,
-            n_results=n_results
-        )
+        write = self.backend.upsert if upsert else self.backend.add
+        records = [
+            (text, metadata or {}, doc_id)
+            for text, metadata, doc_id in zip(texts, metadatas, doc_ids)
+            if text.strip()
+        ]
+        
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            write(
+                documents=[text for text, _, _ in batch],
+                metadatas=[metadata for _, metadata, _ in batch],
+                ids=[doc_id for _, _, doc_id in batch]
+            )
+            self._index_lexical([doc_id for _, _, doc_id in batch], [text for text, _, _ in batch],
+                                [metadata for _, metadata, _ in batch], replace=upsert)
+        print(f"Added {len(records)} text chunks to the vector store in {(len(records) + batch_size - 1) // batch_size} batches.")
+        return len(records)
+
+    def delete_by_sources(self, sources: list[str], batch_size: int = 500) -> int:
+        """
+        Delete every chunk stored for the given sources (the doc_id passed to
+        embed_and_store_text), e.g. the previous version of a re-ingested file.
+        """
+        for start in range(0, len(sources), batch_size):
+            self.backend.delete(where={"source": {"$in": sources[start:start + batch_size]}})
+            if self.lexical_index is not None:
+                self.lexical_index.delete(where={"source": {"$in": sources[start:start + batch_size]}})
+        print(f"Deleted chunks for {len(sources)} sources from the vector store.")
+        return len(sources)
+
+    def _index_lexical(self, ids: list, documents: list, metadatas: list, replace: bool):
+        """Mirror chunks written to the backend into the lexical index; like add, replace=False keeps indexed IDs."""
+        if self.lexical_index is None:
+            return
+        if not replace:
+            missing = set(self.lexical_index.missing_ids(ids))
+            kept = [i for i, chunk_id in enumerate(ids) if chunk_id in missing]
+            ids, documents, metadatas = [ids[i] for i in kept], [documents[i] for i in kept], [metadatas[i] for i in kept]
+        self.lexical_index.add(ids, documents, metadatas)
+
+    def rebuild_lexical_index(self, batch_size: int = 1000) -> int:
+        """Re-index every stored chunk, e.g. once after upgrading an existing deployment."""
+        if self.lexical_index is None:
+            raise RuntimeError("Lexical index unavailable")
+        self.lexical_index.clear()
+        indexed = 0
+        for ids, documents, metadatas in self.backend.scan(batch_size):
+            self.lexical_index.add(ids, documents, metadatas)
+            indexed += len(ids)
+        print(f"Rebuilt the lexical index from {indexed} stored chunks.")
+        return indexed
+
+    @contextmanager
+    def retrieval_mode(self, mode: str = None):
+        """
+        Use mode for every query() in this thread that does not name one, e.g.
+        around an orchestrator call serving a request that asked for hybrid retrieval.
+        """
+        if mode is not None and mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+        previous = getattr(self._retrieval, "mode", None)
+        self._retrieval.mode = mode or previous
+        try:
+            yield
+        finally:
+            self._retrieval.mode = previous
+
+    def query(self, query_texts: list[str], n_results: int = 5, where: dict = None, mode: str = None):
+        """
+        Queries the vector database for similar documents, optionally only
+        among chunks whose metadata matches where (Chroma filter syntax).
+        The query text is automatically embedded by the backend's embedding function.
+        
+        mode is one of RETRIEVAL_MODES, defaulting to the one set by
+        retrieval_mode() and then to brains.vector.retrieval_mode. Results
+        keep Chroma's shape (ids, documents, metadatas, distances, one list
+        per query); lexical and hybrid distances are 1 - the normalized BM25
+        or fused score, so lower is still better.
+        """
+        mode = mode or getattr(self._retrieval, "mode", None) or self.default_retrieval_mode
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+        if mode == "auto":
+            mode = "hybrid" if any(has_exact_terms(text) for text in query_texts) else "vector"
+        if mode != "vector" and self.lexical_index is None:
+            mode = "vector"
+        if mode == "vector":
+            return self.backend.query(
+                query_texts=query_texts,
+                n_results=n_results,
+                where=where
+            )
+
+        if mode == "lexical":
+            ranked = [self._lexical_ranking(text, n_results, where) for text in query_texts]
+        else:
+            # Each list is fetched deeper than n_results so fusion can promote
+            # chunks ranked well by only one of them
+            depth = max(n_results * 4, 20)
+            vector_results = self.backend.query(query_texts=query_texts, n_results=depth, where=where)
+            ranked = [
+                self._fuse([self._vector_ranking(vector_results, i),
+                            self._lexical_ranking(text, depth, where)], n_results)
+                for i, text in enumerate(query_texts)
+            ]
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for hits in ranked:
+            results["ids"].append([hit["id"] for hit in hits])
+            results["documents"].append([hit["document"] for hit in hits])
+            results["metadatas"].append([hit["metadata"] for hit in hits])
+            results["distances"].append([hit["distance"] for hit in hits])
+        results["retrieval_mode"] = mode
         return results
+
+    def _lexical_ranking(self, text: str, n_results: int, where: dict = None) -> list:
+        hits = self.lexical_index.search(text, n_results, where)
+        top = hits[0]["score"] if hits else 0.0
+        for hit in hits:
+            hit["distance"] = 1 - hit["score"] / top if top > 0 else 1.0
+        return hits
+
+    @staticmethod
+    def _vector_ranking(results: dict, i: int) -> list:
+        if not results or not results.get("ids") or not results["ids"][i]:
+            return []
+        return [
+            {"id": chunk_id, "document": results["documents"][i][j], "metadata": results["metadatas"][i][j]}
+            for j, chunk_id in enumerate(results["ids"][i])
+        ]
+
+    @staticmethod
+    def _fuse(rankings: list, n_results: int) -> list:
+        """Reciprocal rank fusion: score = sum of 1 / (RRF_K + rank) over the rankings holding the chunk."""
+        fused = {}
+        for ranking in rankings:
+            for rank, hit in enumerate(ranking, start=1):
+                entry = fused.setdefault(hit["id"], {**hit, "score": 0.0})
+                entry["score"] += 1 / (RRF_K + rank)
+        hits = sorted(fused.values(), key=lambda hit: -hit["score"])[:n_results]
+        # Distance relative to a chunk ranked first by every list
+        best = len(rankings) / (RRF_K + 1)
+        for hit in hits:
+            hit["distance"] = 1 - hit["score"] / best
+        return hits
+
+    def health_check(self) -> dict:
+        health = self.backend.health_check()
+        health["lexical_index"] = (
+            {"chunks": self.lexical_index.count()} if self.lexical_index is not None else {"status": "unavailable"}
+        )
+        health["retrieval_mode"] = self.default_retrieval_mode
+        return health
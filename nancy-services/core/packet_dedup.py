@@ -0,0 +1,149 @@
+"""
+Nancy Knowledge Packet Deduplication Index
+Keeps track of which packets and vector chunks were already written to the
+brains so that repeated ingestion is idempotent.
+
+The index is persisted in DuckDB (packet_index and chunk_index tables) and
+fronted by in-memory Bloom filters: a negative Bloom lookup proves a key is new
+without touching the database, and only possible hits are confirmed in DuckDB.
+"""
+
+import hashlib
+import logging
+import math
+from typing import Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 1_000_000
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+
+
+def chunk_content_hash(text: str) -> str:
+    """SHA256 of a chunk's text, the identity used for chunk-level dedup."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over string keys using double hashing
+    (Kirsch-Mitzenmacher) on a single blake2b digest.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE):
+        self.capacity = max(capacity, 1)
+        self.false_positive_rate = false_positive_rate
+        self.size = max(8, int(-self.capacity * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def is_saturated(self) -> bool:
+        """True once more keys were added than the filter was sized for."""
+        return self.count > self.capacity
+
+
+class PacketDedupIndex:
+    """
+    Dedup index for Knowledge Packets and their vector chunks.
+
+    Packets are keyed by packet_id (the SHA256 of their content). Chunks are
+    keyed by (original_location, content hash), so a new version of a file
+    only writes the chunks whose text actually changed.
+    """
+
+    def __init__(self, analytical_brain, capacity: int = DEFAULT_CAPACITY,
+                 false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE):
+        self.analytical_brain = analytical_brain
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.packet_filter = BloomFilter(capacity, false_positive_rate)
+        self.chunk_filter = BloomFilter(capacity, false_positive_rate)
+
+        # Metrics
+        self.bloom_negatives = 0
+        self.bloom_false_positives = 0
+        self.duplicate_packets = 0
+        self.reused_chunks = 0
+
+        self.load()
+
+    @staticmethod
+    def _chunk_key(original_location: str, chunk_hash: str) -> str:
+        return f"{original_location}\x00{chunk_hash}"
+
+    def load(self):
+        """(Re)build the Bloom filters from the DuckDB tables."""
+        packet_ids = self.analytical_brain.get_indexed_packet_ids()
+        chunk_keys = self.analytical_brain.get_indexed_chunk_keys()
+
+        # Size the filters for what is already stored plus room to grow
+        self.capacity = max(self.capacity, 2 * max(len(packet_ids), len(chunk_keys)))
+        self.packet_filter = BloomFilter(self.capacity, self.false_positive_rate)
+        self.chunk_filter = BloomFilter(self.capacity, self.false_positive_rate)
+
+        for packet_id in packet_ids:
+            self.packet_filter.add(packet_id)
+        for original_location, chunk_hash in chunk_keys:
+            self.chunk_filter.add(self._chunk_key(original_location, chunk_hash))
+
+        logger.info(f"Loaded dedup index: {len(packet_ids)} packets, {len(chunk_keys)} chunks")
+
+    def contains_packet(self, packet_id: str) -> bool:
+        """Check whether a packet was already ingested; new packets never hit DuckDB."""
+        if packet_id not in self.packet_filter:
+            self.bloom_negatives += 1
+            return False
+        if self.analytical_brain.is_packet_indexed(packet_id):
+            self.duplicate_packets += 1
+            return True
+        self.bloom_false_positives += 1
+        return False
+
+    def new_chunk_hashes(self, original_location: str, chunk_hashes: List[str]) -> set:
+        """Return the chunk hashes not yet stored for original_location."""
+        maybe_known = [
+            chunk_hash for chunk_hash in chunk_hashes
+            if self._chunk_key(original_location, chunk_hash) in self.chunk_filter
+        ]
+        known = self.analytical_brain.get_indexed_chunk_hashes(original_location, maybe_known)
+        self.reused_chunks += len(known)
+        return set(chunk_hashes) - known
+
+    def record(self, packet_id: str, original_location: str, chunks: List[Tuple[str, str]]):
+        """
+        Record an ingested packet and the (chunk_hash, vector_id) pairs that
+        were written for it.
+        """
+        self.analytical_brain.record_packet_ingestion(packet_id, original_location, chunks)
+        self.packet_filter.add(packet_id)
+        for chunk_hash, _ in chunks:
+            self.chunk_filter.add(self._chunk_key(original_location, chunk_hash))
+
+        if self.packet_filter.is_saturated or self.chunk_filter.is_saturated:
+            self.capacity *= 2
+            self.load()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "duplicate_packets": self.duplicate_packets,
+            "reused_chunks": self.reused_chunks,
+            "bloom_negatives": self.bloom_negatives,
+            "bloom_false_positives": self.bloom_false_positives,
+            "bloom_capacity": self.capacity
+        }
@@ -0,0 +1,151 @@
+"""
+Compiled include/ignore patterns for directory scans.
+
+Directory configurations store patterns as a comma-separated string
+("*.md,docs/**/*.txt,node_modules/"). PathMatcher compiles the whole set once
+into combined regexes (one for entry names, one for relative paths) instead of
+splitting the string and running fnmatch per pattern for every file and directory.
+
+Patterns follow gitignore conventions:
+- no slash ("*.pyc", ".env*"): matches the file or directory name at any depth
+- a leading or middle slash ("/build", "docs/*.md"): anchored to the scanned root
+- a trailing slash ("node_modules/"): matches directories only
+- "**" matches across directories ("**/tmp", "docs/**/*.md", "logs/**")
+- "*" and "?" never match "/"
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Optional
+
+
+def _translate(pattern: str) -> str:
+    """Translate one glob pattern into a regex matching a relative posix path."""
+    result = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                at_segment_start = i == 0 or pattern[i - 1] == "/"
+                if at_segment_start and pattern.startswith("**/", i):
+                    # "**/" matches zero or more leading directories
+                    result.append("(?:.*/)?")
+                    i += 3
+                    continue
+                if at_segment_start and i + 2 == n:
+                    # trailing "**" matches everything below
+                    result.append(".*")
+                    i += 2
+                    continue
+            result.append("[^/]*")
+            while i < n and pattern[i] == "*":
+                i += 1
+            continue
+        if c == "?":
+            result.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2 if pattern.startswith("[!", i) or pattern.startswith("[^", i) else i + 1)
+            if end == -1:
+                result.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                result.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        else:
+            result.append(re.escape(c))
+        i += 1
+    return "".join(result)
+
+
+class PathMatcher:
+    """
+    A comma-separated pattern set compiled for matching relative paths.
+    Paths are relative to the scanned directory root.
+    """
+
+    def __init__(self, patterns: Optional[str]):
+        self.patterns = [p.strip() for p in (patterns or "").split(",") if p.strip()]
+
+        # Unanchored patterns are matched against the entry name only, anchored
+        # ones against the whole relative path
+        names, paths = [], []
+        directory_names, directory_paths = [], []
+        for pattern in self.patterns:
+            is_directory_pattern = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            if not pattern:
+                continue
+
+            if "/" not in pattern:
+                (directory_names if is_directory_pattern else names).append(_translate(pattern))
+                continue
+
+            pattern = pattern.lstrip("/")
+            (directory_paths if is_directory_pattern else paths).append(_translate(pattern))
+
+            # "logs/*" and "logs/**" cover the whole logs directory
+            for suffix in ("/**", "/*"):
+                if pattern.endswith(suffix) and len(pattern) > len(suffix):
+                    directory_paths.append(_translate(pattern[:-len(suffix)]))
+                    break
+
+        self._name_regex = self._combine(names)
+        self._path_regex = self._combine(paths)
+        self._directory_name_regex = self._combine(directory_names + names)
+        self._directory_path_regex = self._combine(directory_paths + paths)
+
+    @staticmethod
+    def _combine(regexes):
+        if not regexes:
+            return None
+        return re.compile("|".join(f"(?:{regex})" for regex in regexes), re.DOTALL)
+
+    @staticmethod
+    def _match(name_regex, path_regex, relative_path: str) -> bool:
+        path = _to_posix(relative_path)
+        if name_regex is not None and name_regex.fullmatch(path.rpartition("/")[2]) is not None:
+            return True
+        return path_regex is not None and path_regex.fullmatch(path) is not None
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def matches(self, relative_path: str) -> bool:
+        """True if the file at relative_path matches a pattern."""
+        return self._match(self._name_regex, self._path_regex, relative_path)
+
+    def matches_directory(self, relative_path: str) -> bool:
+        """
+        True if the directory itself matches, or a pattern covers everything
+        inside it; a scan can skip the whole subtree.
+        """
+        return self._match(self._directory_name_regex, self._directory_path_regex, relative_path)
+
+    def ignores(self, relative_path: str) -> bool:
+        """
+        True if the file or any of its parent directories matches. Used for
+        single paths that did not come from a pruned walk.
+        """
+        path = _to_posix(relative_path)
+        if self.matches(path):
+            return True
+        parent = path.rpartition("/")[0]
+        while parent:
+            if self.matches_directory(parent):
+                return True
+            parent = parent.rpartition("/")[0]
+        return False
+
+
+def _to_posix(path: str) -> str:
+    return path.replace(os.sep, "/") if os.sep != "/" else path
+
+
+@lru_cache(maxsize=64)
+def compile_patterns(patterns: Optional[str]) -> PathMatcher:
+    """Compiled matcher for a pattern string, cached across scans and watcher events."""
+    return PathMatcher(patterns)
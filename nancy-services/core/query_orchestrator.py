@@ -1,6 +1,4 @@
-from .search import AnalyticalBrain
-from .knowledge_graph import GraphBrain
-from .nlp import VectorBrain
+from .brain_registry import get_analytical_brain, get_graph_brain, get_vector_brain
 
 class QueryOrchestrator:
     """
@@ -9,11 +7,11 @@ class QueryOrchestrator:
     """
     def __init__(self):
         """
-        Initializes the Query Orchestrator and the three brains.
+        Initializes the Query Orchestrator with the process-wide brains.
         """
-        self.analytical_brain = AnalyticalBrain()
-        self.graph_brain = GraphBrain()
-        self.vector_brain = VectorBrain()
+        self.analytical_brain = get_analytical_brain()
+        self.graph_brain = get_graph_brain()
+        self.vector_brain = get_vector_brain()
         print("Query Orchestrator initialized.")
 
     def query_authored_documents(self, author_name: str):
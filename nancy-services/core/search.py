@@ -1,26 +1,41 @@
-import duckdb
 import os
 import pandas as pd
-from datetime import datetime
-from typing import Dict, Any, Optional
+import pyarrow as pa
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Union
 
-def get_duckdb_connection():
-    """
-    Returns a DuckDB connection.
-    The database file is stored in the mounted 'data' volume.
-    """
-    db_path = os.path.join("data", "project_nancy.duckdb")
-    con = duckdb.connect(database=db_path, read_only=False)
-    return con
+from .duckdb_manager import get_duckdb_manager
+from .spreadsheet_streaming import dataframe_to_arrow
+
+# Rows returned per sheet by search_spreadsheet_content
+SPREADSHEET_SEARCH_ROW_LIMIT = 50
 
 class AnalyticalBrain:
     """
     Handles interactions with the Analytical Brain (DuckDB).
+    
+    All instances share the process-wide DuckDBManager of the database file:
+    writes go through self.db.transaction(), reads through self.con, the
+    calling thread's own cursor.
     """
     def __init__(self):
-        self.con = get_duckdb_connection()
-        self.setup_tables()
-
+        self.db = get_duckdb_manager()
+        with self.transaction():
+            self.setup_tables()
+    
+    @property
+    def con(self):
+        """
+        DuckDB connection for the calling thread (see DuckDBManager.connection).
+        """
+        return self.db.connection()
+    
+    def transaction(self):
+        """
+        Group several writes into one explicit commit.
+        """
+        return self.db.transaction()
+    
     def setup_tables(self):
         """
         Creates the necessary tables if they don't exist.
@@ -51,6 +66,32 @@ class AnalyticalBrain:
             )
         """)
         
+        # Cell-value index of every spreadsheet table, fed when a sheet is
+        # registered: one row per non-empty cell (table, rowid, column) pointing
+        # into a dictionary of distinct cell values. Search scans the dictionary
+        # once instead of every column of every sheet table.
+        index_exists = self.con.execute(
+            "SELECT count(*) FROM information_schema.tables WHERE table_name = 'spreadsheet_cells'"
+        ).fetchone()[0] > 0
+        self.con.execute("CREATE SEQUENCE IF NOT EXISTS spreadsheet_cell_value_ids")
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS spreadsheet_cell_values (
+                value_id BIGINT,
+                value VARCHAR,
+                value_lower VARCHAR
+            )
+        """)
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS spreadsheet_cells (
+                table_name VARCHAR,
+                row_id BIGINT,
+                column_name VARCHAR,
+                value_id BIGINT
+            )
+        """)
+        if not index_exists and self.con.execute("SELECT count(*) FROM spreadsheet_registry").fetchone()[0]:
+            self.rebuild_spreadsheet_cell_index()
+        
         # Create table for file state tracking (directory ingestion)
         self.con.execute("""
             CREATE TABLE IF NOT EXISTS file_state (
@@ -69,6 +110,64 @@ class AnalyticalBrain:
             )
         """)
         
+        # Worker leases on file_state rows claimed by background jobs
+        self.con.execute("ALTER TABLE file_state ADD COLUMN IF NOT EXISTS job_id VARCHAR")
+        self.con.execute("ALTER TABLE file_state ADD COLUMN IF NOT EXISTS lease_owner VARCHAR")
+        self.con.execute("ALTER TABLE file_state ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP")
+        
+        # Durable background jobs for directory scans and processing
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS ingestion_jobs (
+                id VARCHAR PRIMARY KEY,
+                job_type VARCHAR NOT NULL,
+                status VARCHAR DEFAULT 'queued',
+                phase VARCHAR,
+                params JSON,
+                result JSON,
+                files_total INTEGER DEFAULT 0,
+                files_done INTEGER DEFAULT 0,
+                files_failed INTEGER DEFAULT 0,
+                error_message VARCHAR,
+                worker_id VARCHAR,
+                lease_expires_at TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                started_at TIMESTAMP,
+                progress_started_at TIMESTAMP,
+                finished_at TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS ingestion_job_errors (
+                job_id VARCHAR NOT NULL,
+                file_path VARCHAR,
+                error_message VARCHAR,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Dedup index of Knowledge Packets already written to the brains
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS packet_index (
+                packet_id VARCHAR PRIMARY KEY,
+                original_location VARCHAR,
+                ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Content hashes of the vector chunks stored for each source location
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS chunk_index (
+                original_location VARCHAR NOT NULL,
+                chunk_hash VARCHAR NOT NULL,
+                vector_id VARCHAR NOT NULL,
+                packet_id VARCHAR,
+                ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (original_location, chunk_hash)
+            )
+        """)
+        
         # Create table for directory configuration
         self.con.execute("""
             CREATE TABLE IF NOT EXISTS directory_config (
@@ -76,7 +175,7 @@ class AnalyticalBrain:
                 directory_path VARCHAR NOT NULL,
                 recursive BOOLEAN DEFAULT TRUE,
                 file_patterns VARCHAR DEFAULT '*.txt,*.md,*.py,*.js,*.html,*.css,*.json,*.csv,*.xlsx,*.xls',
-                ignore_patterns VARCHAR DEFAULT '.git/*,.env*,node_modules/*,__pycache__/*',
+                ignore_patterns VARCHAR DEFAULT '.git/,.env*,node_modules/,__pycache__/',
                 enabled BOOLEAN DEFAULT TRUE,
                 last_scan TIMESTAMP,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -93,22 +192,23 @@ class AnalyticalBrain:
         metadata_json = None if metadata is None else json.dumps(metadata)
         
         try:
-            # First check if document already exists
-            existing = self.con.execute(
-                "SELECT id FROM documents WHERE id = ?", 
-                (doc_id,)
-            ).fetchone()
-            
-            if existing:
-                print(f"Document {filename} (ID: {doc_id[:8]}...) already exists in DuckDB. Skipping insertion.")
-                return
-            
-            # Insert new document
-            self.con.execute(
-                "INSERT INTO documents (id, filename, size, file_type, ingested_at, metadata) VALUES (?, ?, ?, ?, ?, ?)",
-                (doc_id, filename, size, file_type, ingested_at, metadata_json)
-            )
-            print(f"Inserted metadata for {filename} into DuckDB.")
+            with self.transaction():
+                # First check if document already exists
+                existing = self.con.execute(
+                    "SELECT id FROM documents WHERE id = ?", 
+                    (doc_id,)
+                ).fetchone()
+                
+                if existing:
+                    print(f"Document {filename} (ID: {doc_id[:8]}...) already exists in DuckDB. Skipping insertion.")
+                    return
+                
+                # Insert new document
+                self.con.execute(
+                    "INSERT INTO documents (id, filename, size, file_type, ingested_at, metadata) VALUES (?, ?, ?, ?, ?, ?)",
+                    (doc_id, filename, size, file_type, ingested_at, metadata_json)
+                )
+                print(f"Inserted metadata for {filename} into DuckDB.")
             
         except Exception as e:
             print(f"Error inserting document metadata for {filename}: {e}")
@@ -116,6 +216,36 @@ class AnalyticalBrain:
             if "Duplicate key" not in str(e):
                 raise
 
+    def insert_documents_metadata(self, documents: list[dict]) -> int:
+        """
+        Insert metadata for many documents in one statement, skipping IDs that already exist.
+        Each dict has doc_id, filename, size, file_type and optional metadata.
+        Returns the number of rows offered for insertion.
+        """
+        import json
+        ingested_at = datetime.utcnow()
+        rows = [
+            (
+                doc["doc_id"],
+                doc["filename"],
+                doc["size"],
+                doc["file_type"],
+                ingested_at,
+                None if doc.get("metadata") is None else json.dumps(doc["metadata"])
+            )
+            for doc in documents
+        ]
+        if not rows:
+            return 0
+        
+        with self.transaction():
+            self.con.executemany(
+                "INSERT OR IGNORE INTO documents (id, filename, size, file_type, ingested_at, metadata) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        print(f"Inserted metadata for {len(rows)} documents into DuckDB.")
+        return len(rows)
+
     def query(self, sql_query: str):
         """
         Queries the analytical database.
@@ -139,6 +269,53 @@ class AnalyticalBrain:
         columns = [desc[0] for desc in self.con.description]
         return [dict(zip(columns, row)) for row in results]
     
+    def get_document_sheet_names(self, doc_ids: list[str]) -> Dict[str, list]:
+        """
+        Sheet names registered for each document; spreadsheet vectors are stored
+        under "{doc_id}_{sheet_name}".
+        """
+        if not doc_ids:
+            return {}
+        
+        placeholders = ', '.join(['?'] * len(doc_ids))
+        results = self.con.execute(
+            f"SELECT doc_id, sheet_name FROM spreadsheet_registry WHERE doc_id IN ({placeholders})",
+            doc_ids
+        ).fetchall()
+        
+        sheet_names = {}
+        for doc_id, sheet_name in results:
+            sheet_names.setdefault(doc_id, []).append(sheet_name)
+        return sheet_names
+    
+    def delete_documents(self, doc_ids: list[str]) -> Dict[str, int]:
+        """
+        Delete documents with their spreadsheet tables and registry entries.
+        Used when a new version of a file replaces them or the file is removed.
+        """
+        if not doc_ids:
+            return {"documents": 0, "tables": 0}
+        
+        placeholders = ', '.join(['?'] * len(doc_ids))
+        with self.transaction():
+            tables = self.con.execute(
+                f"SELECT table_name FROM spreadsheet_registry WHERE doc_id IN ({placeholders})",
+                doc_ids
+            ).fetchall()
+            for (table_name,) in tables:
+                self.con.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+            self._remove_spreadsheet_cells([table_name for (table_name,) in tables])
+            self.con.execute(f"DELETE FROM spreadsheet_registry WHERE doc_id IN ({placeholders})", doc_ids)
+        
+        # DuckDB checks the registry foreign key against committed rows, so the
+        # documents go in a second transaction
+        with self.transaction():
+            deleted = self.con.execute(
+                f"DELETE FROM documents WHERE id IN ({placeholders}) RETURNING id", doc_ids
+            ).fetchall()
+        
+        return {"documents": len(deleted), "tables": len(tables)}
+    
     def filter_documents(self, filters: dict) -> list[dict]:
         """
         Advanced document filtering based on metadata constraints.
@@ -268,79 +445,253 @@ class AnalyticalBrain:
         Update document metadata with additional information (e.g., spreadsheet details).
         """
         try:
-            # Get existing metadata
-            existing = self.con.execute(
-                "SELECT metadata FROM documents WHERE id = ?", 
-                (doc_id,)
-            ).fetchone()
-            
-            if not existing:
-                print(f"Warning: Document {doc_id} not found for metadata update. Skipping.")
-                return
+            with self.transaction():
+                # Get existing metadata
+                existing = self.con.execute(
+                    "SELECT metadata FROM documents WHERE id = ?", 
+                    (doc_id,)
+                ).fetchone()
                 
-            if existing[0]:
-                # Parse existing metadata and merge with new
-                import json
-                try:
-                    current_metadata = json.loads(existing[0])
-                except Exception as json_error:
-                    print(f"Warning: Could not parse existing metadata as JSON: {json_error}")
-                    print(f"Existing metadata content: {repr(existing[0][:100])}...")
+                if not existing:
+                    print(f"Warning: Document {doc_id} not found for metadata update. Skipping.")
+                    return
+                
+                if existing[0]:
+                    # Parse existing metadata and merge with new
+                    import json
+                    try:
+                        current_metadata = json.loads(existing[0])
+                    except Exception as json_error:
+                        print(f"Warning: Could not parse existing metadata as JSON: {json_error}")
+                        print(f"Existing metadata content: {repr(existing[0][:100])}...")
+                        current_metadata = {}
+                else:
                     current_metadata = {}
-            else:
-                current_metadata = {}
-            
-            # Merge new metadata
-            current_metadata.update(additional_metadata)
-            
-            # Update the document with proper JSON encoding
-            import json
-            self.con.execute(
-                "UPDATE documents SET metadata = ? WHERE id = ?",
-                (json.dumps(current_metadata), doc_id)
-            )
-            
-            print(f"Updated metadata for document {doc_id}")
+                
+                # Merge new metadata
+                current_metadata.update(additional_metadata)
+                
+                # Update the document with proper JSON encoding
+                import json
+                self.con.execute(
+                    "UPDATE documents SET metadata = ? WHERE id = ?",
+                    (json.dumps(current_metadata), doc_id)
+                )
+                
+                print(f"Updated metadata for document {doc_id}")
             
         except Exception as e:
             print(f"Error updating document metadata: {e}")
     
-    def store_spreadsheet_data(self, table_name: str, df: pd.DataFrame, metadata: Dict[str, Any]):
+    @staticmethod
+    def clean_table_name(table_name: str) -> str:
+        """
+        Normalize a table name to a DuckDB-safe identifier.
+        """
+        return ''.join(c if c.isalnum() or c == '_' else '_' for c in table_name)
+    
+    @staticmethod
+    def _to_arrow(data: Union[pd.DataFrame, pa.Table]) -> pa.Table:
+        """
+        Convert spreadsheet data to an Arrow table, keeping column types.
+        Mixed-type object columns are stored as strings.
+        """
+        if isinstance(data, pa.Table):
+            return data
+        return dataframe_to_arrow(data)
+    
+    def store_spreadsheet_data(self, table_name: str, data: Union[pd.DataFrame, pa.Table], metadata: Dict[str, Any]):
         """
         Store spreadsheet data directly in DuckDB for structured querying.
+        
+        Data is loaded column-wise from Arrow with INSERT INTO ... SELECT, so column
+        types come from the Arrow schema. Re-storing an existing table replaces its
+        contents and registry entry instead of being silently ignored.
         """
+        clean_table_name = self.clean_table_name(table_name)
+        arrow_table = self._to_arrow(data)
+        arrow_view = f"__arrow_{clean_table_name}"
+        
         try:
-            # Clean table name for DuckDB compliance
-            clean_table_name = ''.join(c if c.isalnum() or c == '_' else '_' for c in table_name)
-            
-            # Register the DataFrame as a DuckDB table
-            # This allows SQL queries directly on the pandas DataFrame
-            self.con.register(clean_table_name, df)
-            
-            # Create a persistent table from the DataFrame
-            create_table_sql = f"CREATE TABLE IF NOT EXISTS {clean_table_name} AS SELECT * FROM {clean_table_name}"
-            self.con.execute(create_table_sql)
-            
-            # Register in spreadsheet registry
-            self.con.execute("""
-                INSERT INTO spreadsheet_registry 
-                (doc_id, filename, sheet_name, table_name, row_count, column_count, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                metadata['doc_id'],
-                metadata['filename'], 
-                metadata['sheet_name'],
-                clean_table_name,
-                len(df),
-                len(df.columns),
-                datetime.utcnow()
-            ))
-            
-            print(f"Stored spreadsheet data in table {clean_table_name}")
+            with self.transaction():
+                self.con.register(arrow_view, arrow_table)
+                try:
+                    # Typed, empty target table from the Arrow schema, then a columnar bulk insert
+                    self.con.execute(f'CREATE OR REPLACE TABLE "{clean_table_name}" AS SELECT * FROM "{arrow_view}" LIMIT 0')
+                    self.con.execute(f'INSERT INTO "{clean_table_name}" SELECT * FROM "{arrow_view}"')
+                    
+                    self._register_spreadsheet_table(clean_table_name, metadata, arrow_table.num_rows, arrow_table.num_columns)
+                finally:
+                    self.con.unregister(arrow_view)
+            print(f"Stored spreadsheet data in table {clean_table_name} ({arrow_table.num_rows} rows)")
             
         except Exception as e:
             print(f"Error storing spreadsheet data: {e}")
             raise e
+        
+        # Cells are keyed by rowid, which is only final once the rows are committed
+        self.index_spreadsheet_cells(clean_table_name)
+    
+    def register_spreadsheet_table(self, table_name: str, metadata: Dict[str, Any], row_count: int, column_count: int):
+        """
+        Record a stored sheet in the spreadsheet registry and the cell-value
+        index, replacing any previous entry for the table.
+        """
+        with self.transaction():
+            self._register_spreadsheet_table(table_name, metadata, row_count, column_count)
+            self._index_spreadsheet_cells(table_name)
+    
+    def _register_spreadsheet_table(self, table_name: str, metadata: Dict[str, Any], row_count: int, column_count: int):
+        self.con.execute("DELETE FROM spreadsheet_registry WHERE table_name = ?", (table_name,))
+        self.con.execute("""
+            INSERT INTO spreadsheet_registry 
+            (doc_id, filename, sheet_name, table_name, row_count, column_count, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (
+            metadata['doc_id'],
+            metadata['filename'], 
+            metadata['sheet_name'],
+            table_name,
+            row_count,
+            column_count,
+            datetime.utcnow()
+        ))
+    
+    def index_spreadsheet_cells(self, table_name: str):
+        """
+        (Re)index the cells of a committed sheet table in the cell-value index.
+        """
+        with self.transaction():
+            self._index_spreadsheet_cells(table_name)
+    
+    def _index_spreadsheet_cells(self, table_name: str):
+        """
+        (Re)index the non-empty cells of a sheet table, cast to text. New
+        distinct values get a dictionary entry; cells are keyed by rowid, so
+        the table's rows must already be committed.
+        """
+        staged = f"__cells_{table_name}"
+        self._remove_spreadsheet_cells([table_name])
+        self.con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE "{staged}" AS
+            SELECT __row_id AS row_id, column_name, value FROM (
+                UNPIVOT (SELECT rowid AS __row_id, COLUMNS(*)::VARCHAR FROM "{table_name}")
+                ON COLUMNS(* EXCLUDE (__row_id)) INTO NAME column_name VALUE value
+            )
+            WHERE trim(value) <> ''
+        """)
+        self.con.execute(f"""
+            INSERT INTO spreadsheet_cell_values
+            SELECT nextval('spreadsheet_cell_value_ids'), value, lower(value)
+            FROM (SELECT DISTINCT value FROM "{staged}") s
+            WHERE NOT EXISTS (SELECT 1 FROM spreadsheet_cell_values v WHERE v.value = s.value)
+        """)
+        self.con.execute(f"""
+            INSERT INTO spreadsheet_cells
+            SELECT ?, s.row_id, s.column_name, v.value_id
+            FROM "{staged}" s JOIN spreadsheet_cell_values v ON v.value = s.value
+        """, [table_name])
+        self.con.execute(f'DROP TABLE "{staged}"')
+    
+    def _remove_spreadsheet_cells(self, table_names: list[str]):
+        """
+        Drop the indexed cells of the given tables, and the dictionary values no other table uses.
+        """
+        if not table_names:
+            return
+        self.con.execute("""
+            CREATE OR REPLACE TEMP TABLE __freed_cell_values AS
+            SELECT DISTINCT value_id FROM spreadsheet_cells WHERE table_name IN (SELECT unnest(?::VARCHAR[]))
+        """, [table_names])
+        self.con.execute("DELETE FROM spreadsheet_cells WHERE table_name IN (SELECT unnest(?::VARCHAR[]))",
+                         [table_names])
+        self.con.execute("""
+            DELETE FROM spreadsheet_cell_values
+            WHERE value_id IN (SELECT value_id FROM __freed_cell_values)
+              AND value_id NOT IN (
+                  SELECT value_id FROM spreadsheet_cells
+                  WHERE value_id IN (SELECT value_id FROM __freed_cell_values)
+              )
+        """)
+        self.con.execute("DROP TABLE __freed_cell_values")
+    
+    def rebuild_spreadsheet_cell_index(self) -> Dict[str, int]:
+        """
+        Rebuild the cell-value index from every registered spreadsheet table,
+        e.g. for tables stored before the index existed.
+        """
+        with self.transaction():
+            tables = [row[0] for row in self.con.execute("""
+                SELECT DISTINCT r.table_name FROM spreadsheet_registry r
+                JOIN information_schema.tables t ON t.table_name = r.table_name
+            """).fetchall()]
+            self.con.execute("DELETE FROM spreadsheet_cells")
+            self.con.execute("DELETE FROM spreadsheet_cell_values")
+            for table_name in tables:
+                self._index_spreadsheet_cells(table_name)
+            cells = self.con.execute("SELECT count(*) FROM spreadsheet_cells").fetchone()[0]
+        
+        print(f"Indexed {cells} spreadsheet cells from {len(tables)} tables")
+        return {"tables": len(tables), "cells": cells}
+    
+    def append_spreadsheet_data(self, table_name: str, data: Union[pd.DataFrame, pa.Table], create: bool = False) -> int:
+        """
+        Append one chunk of a streamed spreadsheet to its DuckDB table.
+        
+        With create=True the table is (re)created from the chunk's schema first.
+        Columns that arrive as text in a later chunk are widened to VARCHAR so a
+        mixed-type column does not abort the load. Returns the rows appended.
+        """
+        clean_table_name = self.clean_table_name(table_name)
+        arrow_table = self._to_arrow(data)
+        arrow_view = f"__arrow_{clean_table_name}"
+        
+        with self.transaction():
+            self.con.register(arrow_view, arrow_table)
+            try:
+                if create:
+                    self.con.execute(f'CREATE OR REPLACE TABLE "{clean_table_name}" AS SELECT * FROM "{arrow_view}" LIMIT 0')
+                else:
+                    existing_types = {
+                        row[1]: row[2] for row in self.con.execute(f"PRAGMA table_info('{clean_table_name}')").fetchall()
+                    }
+                    for field in arrow_table.schema:
+                        if pa.types.is_string(field.type) and existing_types.get(field.name, 'VARCHAR') != 'VARCHAR':
+                            self.con.execute(f'ALTER TABLE "{clean_table_name}" ALTER COLUMN "{field.name}" TYPE VARCHAR')
+                
+                self.con.execute(f'INSERT INTO "{clean_table_name}" BY NAME SELECT * FROM "{arrow_view}"')
+                return arrow_table.num_rows
+                
+            finally:
+                self.con.unregister(arrow_view)
+    
+    def drop_spreadsheet_table(self, table_name: str):
+        """Drop an unregistered sheet table, e.g. one left half-appended by a failed stream."""
+        with self.transaction():
+            self.con.execute(f'DROP TABLE IF EXISTS "{self.clean_table_name(table_name)}"')
+    
+    def store_packet_table(self, doc_id: str, filename: str, table: Dict[str, Any]) -> str:
+        """
+        Store a Knowledge Packet table_data entry. Prefers the Arrow IPC attachment
+        and falls back to the JSON row lists. Returns the DuckDB table name.
+        """
+        if table.get("arrow_ipc"):
+            import base64
+            reader = pa.ipc.open_stream(base64.b64decode(table["arrow_ipc"]))
+            arrow_table = reader.read_all()
+        else:
+            columns = [str(col) for col in table["columns"]]
+            rows = table.get("rows", [])
+            arrow_table = pa.Table.from_pylist([dict(zip(columns, row)) for row in rows]) if rows else \
+                pa.table({col: pa.array([], type=pa.string()) for col in columns})
+        
+        table_name = self.clean_table_name(f"packet_{doc_id[:8]}_{table['table_name']}")
+        self.store_spreadsheet_data(table_name, arrow_table, {
+            "doc_id": doc_id,
+            "filename": filename,
+            "sheet_name": table["table_name"]
+        })
+        return table_name
     
     def query_spreadsheet_data(self, doc_id: str, sheet_name: Optional[str] = None, sql_filter: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
         """
@@ -442,52 +793,62 @@ class AnalyticalBrain:
     def search_spreadsheet_content(self, search_term: str, doc_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Search across all spreadsheet data for content matching the search term.
+        
+        One query over the cell-value index finds the cells containing the term
+        (case-insensitive, any column type); up to SPREADSHEET_SEARCH_ROW_LIMIT
+        matching rows per sheet are then read back by rowid. Each result lists
+        the matched rows with, in the same order, their provenance: rowid and
+        the columns that matched.
         """
         try:
-            # Get all spreadsheet tables
-            registry_query = "SELECT doc_id, filename, sheet_name, table_name FROM spreadsheet_registry"
-            params = []
+            doc_filter = "WHERE r.doc_id = ?" if doc_id else ""
+            params = [search_term.lower()] + ([doc_id] if doc_id else []) + [SPREADSHEET_SEARCH_ROW_LIMIT]
+            hits = self.con.execute(f"""
+                WITH matched AS (
+                    SELECT value_id FROM spreadsheet_cell_values WHERE contains(value_lower, ?)
+                )
+                SELECT r.doc_id, r.filename, r.sheet_name, c.table_name, c.row_id, c.column_name
+                FROM spreadsheet_cells c
+                JOIN matched m USING (value_id)
+                JOIN spreadsheet_registry r USING (table_name)
+                {doc_filter}
+                QUALIFY dense_rank() OVER (PARTITION BY c.table_name ORDER BY c.row_id) <= ?
+                ORDER BY r.filename, r.sheet_name, c.row_id, c.column_name
+            """, params).fetchall()
             
-            if doc_id:
-                registry_query += " WHERE doc_id = ?"
-                params.append(doc_id)
-            
-            tables = self.con.execute(registry_query, params).fetchall()
+            sheets = {}
+            for table_doc_id, filename, sheet_name, table_name, row_id, column_name in hits:
+                sheet = sheets.setdefault(table_name, {
+                    "doc_id": table_doc_id,
+                    "filename": filename,
+                    "sheet_name": sheet_name,
+                    "rows": {}
+                })
+                sheet["rows"].setdefault(row_id, []).append(column_name)
             
             results = []
-            
-            for table_info in tables:
-                table_doc_id, filename, sheet_name, table_name = table_info
-                
+            for table_name, sheet in sheets.items():
                 try:
-                    # Get table columns to search text columns
-                    columns_info = self.con.execute(f"PRAGMA table_info({table_name})").fetchall()
-                    text_columns = [col[1] for col in columns_info if 'VARCHAR' in col[2] or 'TEXT' in col[2]]
-                    
-                    if text_columns:
-                        # Build search query for text columns
-                        search_conditions = [f"{col} LIKE ?" for col in text_columns]
-                        search_query = f"""
-                            SELECT * FROM {table_name} 
-                            WHERE {' OR '.join(search_conditions)}
-                            LIMIT 50
-                        """
-                        
-                        search_params = [f"%{search_term}%" for _ in text_columns]
-                        matches = self.con.execute(search_query, search_params).fetchall()
-                        
-                        if matches:
-                            columns = [desc[0] for desc in self.con.description]
-                            results.append({
-                                "doc_id": table_doc_id,
-                                "filename": filename,
-                                "sheet_name": sheet_name,
-                                "matches": [dict(zip(columns, row)) for row in matches]
-                            })
-                
+                    rows = self.con.execute(
+                        f'SELECT rowid AS __row_id, * FROM "{table_name}" '
+                        f'WHERE list_contains(?::BIGINT[], rowid) ORDER BY rowid',
+                        [list(sheet["rows"])]
+                    ).fetchall()
+                    columns = [desc[0] for desc in self.con.description][1:]
                 except Exception as e:
                     print(f"Error searching table {table_name}: {e}")
                     continue
+                
+                results.append({
+                    "doc_id": sheet["doc_id"],
+                    "filename": sheet["filename"],
+                    "sheet_name": sheet["sheet_name"],
+                    "table_name": table_name,
+                    "matches": [dict(zip(columns, row[1:])) for row in rows],
+                    "provenance": [
+                        {"row_id": row[0], "matched_columns": sheet["rows"][row[0]]} for row in rows
+                    ]
+                })
             
             return {
                 "search_term": search_term,
@@ -499,6 +860,48 @@ class AnalyticalBrain:
             print(f"Error searching spreadsheet content: {e}")
             return {"error": str(e)}
     
+    # Packet deduplication index methods
+    
+    def get_indexed_packet_ids(self) -> list[str]:
+        """All packet IDs recorded in the dedup index."""
+        return [row[0] for row in self.con.execute("SELECT packet_id FROM packet_index").fetchall()]
+    
+    def get_indexed_chunk_keys(self) -> list[tuple]:
+        """All (original_location, chunk_hash) pairs recorded in the dedup index."""
+        return self.con.execute("SELECT original_location, chunk_hash FROM chunk_index").fetchall()
+    
+    def is_packet_indexed(self, packet_id: str) -> bool:
+        """Check whether a packet ID was already written to the brains."""
+        return self.con.execute(
+            "SELECT 1 FROM packet_index WHERE packet_id = ?", (packet_id,)
+        ).fetchone() is not None
+    
+    def get_indexed_chunk_hashes(self, original_location: str, chunk_hashes: list[str]) -> set:
+        """Return the subset of chunk_hashes already stored for original_location."""
+        if not chunk_hashes:
+            return set()
+        rows = self.con.execute(
+            "SELECT chunk_hash FROM chunk_index WHERE original_location = ? AND list_contains(?, chunk_hash)",
+            (original_location, chunk_hashes)
+        ).fetchall()
+        return {row[0] for row in rows}
+    
+    def record_packet_ingestion(self, packet_id: str, original_location: str, chunks: list[tuple]):
+        """
+        Record an ingested packet and its new chunks in the dedup index.
+        chunks holds (chunk_hash, vector_id) pairs.
+        """
+        with self.transaction():
+            self.con.execute(
+                "INSERT OR IGNORE INTO packet_index (packet_id, original_location) VALUES (?, ?)",
+                (packet_id, original_location)
+            )
+            if chunks:
+                self.con.executemany(
+                    "INSERT OR IGNORE INTO chunk_index (original_location, chunk_hash, vector_id, packet_id) VALUES (?, ?, ?, ?)",
+                    [(original_location, chunk_hash, vector_id, packet_id) for chunk_hash, vector_id in chunks]
+                )
+    
     # Directory-based ingestion methods
     
     def upsert_file_state(self, file_path: str, content_hash: str, last_modified: datetime, 
@@ -508,40 +911,41 @@ class AnalyticalBrain:
         Returns True if the file is new or changed, False if unchanged.
         """
         try:
-            # Check if file exists and has changed
-            existing = self.con.execute(
-                "SELECT content_hash, processing_status FROM file_state WHERE file_path = ?",
-                (file_path,)
-            ).fetchone()
-            
-            if existing:
-                existing_hash, status = existing
-                if existing_hash == content_hash and status == 'completed':
-                    # File hasn't changed and was successfully processed
-                    return False
+            with self.transaction():
+                # Check if file exists and has changed
+                existing = self.con.execute(
+                    "SELECT content_hash, processing_status FROM file_state WHERE file_path = ?",
+                    (file_path,)
+                ).fetchone()
+                
+                if existing:
+                    existing_hash, status = existing
+                    if existing_hash == content_hash and status == 'completed':
+                        # File hasn't changed and was successfully processed
+                        return False
+                    else:
+                        # File has changed or previous processing failed
+                        self.con.execute("""
+                            UPDATE file_state SET 
+                                content_hash = ?, 
+                                last_modified = ?, 
+                                file_size = ?,
+                                processing_status = 'pending',
+                                error_message = NULL,
+                                updated_at = CURRENT_TIMESTAMP
+                            WHERE file_path = ?
+                        """, (content_hash, last_modified, file_size, file_path))
+                        print(f"File state updated for changed file: {file_path}")
+                        return True
                 else:
-                    # File has changed or previous processing failed
+                    # New file
                     self.con.execute("""
-                        UPDATE file_state SET 
-                            content_hash = ?, 
-                            last_modified = ?, 
-                            file_size = ?,
-                            processing_status = 'pending',
-                            error_message = NULL,
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE file_path = ?
-                    """, (content_hash, last_modified, file_size, file_path))
-                    print(f"File state updated for changed file: {file_path}")
+                        INSERT INTO file_state 
+                        (file_path, content_hash, last_modified, file_size, directory_root, relative_path)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    """, (file_path, content_hash, last_modified, file_size, directory_root, relative_path))
+                    print(f"File state created for new file: {file_path}")
                     return True
-            else:
-                # New file
-                self.con.execute("""
-                    INSERT INTO file_state 
-                    (file_path, content_hash, last_modified, file_size, directory_root, relative_path)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (file_path, content_hash, last_modified, file_size, directory_root, relative_path))
-                print(f"File state created for new file: {file_path}")
-                return True
                 
         except Exception as e:
             print(f"Error upserting file state for {file_path}: {e}")
@@ -552,16 +956,20 @@ class AnalyticalBrain:
         """
         Update the processing status of a file after ingestion attempt.
         """
+        now = datetime.utcnow()
         try:
-            self.con.execute("""
-                UPDATE file_state SET 
-                    processing_status = ?,
-                    doc_id = COALESCE(?, doc_id),
-                    error_message = ?,
-                    last_processed = CURRENT_TIMESTAMP,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE file_path = ?
-            """, (status, doc_id, error_message, file_path))
+            with self.transaction():
+                self.con.execute("""
+                    UPDATE file_state SET 
+                        processing_status = ?,
+                        doc_id = COALESCE(?, doc_id),
+                        error_message = ?,
+                        lease_owner = NULL,
+                        lease_expires_at = NULL,
+                        last_processed = ?,
+                        updated_at = ?
+                    WHERE file_path = ?
+                """, (status, doc_id, error_message, now, now, file_path))
             print(f"Updated processing status for {file_path}: {status}")
             
         except Exception as e:
@@ -573,20 +981,72 @@ class AnalyticalBrain:
         """
         try:
             results = self.con.execute("""
-                SELECT file_path, content_hash, last_modified, file_size, directory_root, relative_path
+                SELECT file_path, content_hash, last_modified, file_size, directory_root, relative_path, doc_id
                 FROM file_state 
                 WHERE processing_status = 'pending'
                 ORDER BY last_modified DESC
                 LIMIT ?
             """, (limit,)).fetchall()
             
-            columns = ['file_path', 'content_hash', 'last_modified', 'file_size', 'directory_root', 'relative_path']
+            columns = ['file_path', 'content_hash', 'last_modified', 'file_size', 'directory_root', 'relative_path', 'doc_id']
             return [dict(zip(columns, row)) for row in results]
             
         except Exception as e:
             print(f"Error getting files to process: {e}")
             return []
     
+    def count_claimable_files(self, directory_root: Optional[str] = None) -> int:
+        """
+        Count files a background job could claim: pending rows plus rows whose
+        worker lease expired (the worker crashed mid-file).
+        """
+        query = """
+            SELECT COUNT(*) FROM file_state
+            WHERE (processing_status = 'pending'
+                   OR (processing_status = 'processing' AND lease_expires_at < ?))
+        """
+        params = [datetime.utcnow()]
+        if directory_root:
+            query += " AND directory_root = ?"
+            params.append(directory_root)
+        return self.con.execute(query, params).fetchone()[0]
+    
+    def claim_pending_files(self, job_id: str, worker_id: str, limit: int,
+                            lease_seconds: int, directory_root: Optional[str] = None) -> list[dict]:
+        """
+        Atomically lease up to `limit` claimable files to a job worker.
+        Leased rows move to 'processing' until update_file_processing_status
+        commits them or the lease expires and another worker reclaims them.
+        """
+        now = datetime.utcnow()
+        scope = "AND directory_root = ?" if directory_root else ""
+        params = [job_id, worker_id, now + timedelta(seconds=lease_seconds), now, now]
+        if directory_root:
+            params.append(directory_root)
+        params.append(limit)
+        
+        with self.transaction():
+            results = self.con.execute(f"""
+                UPDATE file_state SET
+                    processing_status = 'processing',
+                    job_id = ?,
+                    lease_owner = ?,
+                    lease_expires_at = ?,
+                    updated_at = ?
+                WHERE file_path IN (
+                    SELECT file_path FROM file_state
+                    WHERE (processing_status = 'pending'
+                           OR (processing_status = 'processing' AND lease_expires_at < ?))
+                    {scope}
+                    ORDER BY last_modified DESC
+                    LIMIT ?
+                )
+                RETURNING file_path, content_hash, last_modified, file_size, directory_root, relative_path, doc_id
+            """, params).fetchall()
+        
+        columns = ['file_path', 'content_hash', 'last_modified', 'file_size', 'directory_root', 'relative_path', 'doc_id']
+        return [dict(zip(columns, row)) for row in results]
+    
     def get_file_state_statistics(self) -> dict:
         """
         Get statistics about directory ingestion file states.
@@ -645,27 +1105,232 @@ class AnalyticalBrain:
             print(f"Error getting file state statistics: {e}")
             return {"error": str(e)}
     
+    # Background ingestion job methods
+    
+    def create_ingestion_job(self, job_id: str, job_type: str, params: Dict[str, Any]):
+        """Insert a queued background job."""
+        import json
+        now = datetime.utcnow()
+        with self.transaction():
+            self.con.execute(
+                "INSERT INTO ingestion_jobs (id, job_type, params, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, job_type, json.dumps(params), now, now)
+            )
+    
+    def claim_ingestion_job(self, worker_id: str, lease_seconds: int) -> Optional[dict]:
+        """
+        Lease the oldest queued job, or a running job whose worker lease expired
+        (the process crashed), to worker_id. Returns the job row or None.
+        """
+        now = datetime.utcnow()
+        with self.transaction():
+            row = self.con.execute("""
+                UPDATE ingestion_jobs SET
+                    status = 'running',
+                    worker_id = ?,
+                    lease_expires_at = ?,
+                    started_at = COALESCE(started_at, ?),
+                    updated_at = ?
+                WHERE id = (
+                    SELECT id FROM ingestion_jobs
+                    WHERE status = 'queued' OR (status = 'running' AND lease_expires_at < ?)
+                    ORDER BY created_at
+                    LIMIT 1
+                )
+                RETURNING id, job_type, phase, params, files_total
+            """, (worker_id, now + timedelta(seconds=lease_seconds), now, now, now)).fetchone()
+        
+        if row is None:
+            return None
+        import json
+        return {
+            "id": row[0],
+            "job_type": row[1],
+            "phase": row[2],
+            "params": json.loads(row[3]) if row[3] else {},
+            "files_total": row[4]
+        }
+    
+    def renew_ingestion_job_lease(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        """
+        Extend a running job's lease and the leases of the files it holds and
+        has not committed yet; called from the worker's heartbeat. Returns
+        False if the job is no longer leased to worker_id.
+        """
+        now = datetime.utcnow()
+        lease_expires_at = now + timedelta(seconds=lease_seconds)
+        with self.transaction():
+            held = self.con.execute("""
+                UPDATE ingestion_jobs SET lease_expires_at = ?, updated_at = ?
+                WHERE id = ? AND worker_id = ? AND status = 'running'
+                RETURNING id
+            """, (lease_expires_at, now, job_id, worker_id)).fetchone() is not None
+            if held:
+                self.con.execute("""
+                    UPDATE file_state SET lease_expires_at = ?, updated_at = ?
+                    WHERE job_id = ? AND lease_owner = ? AND processing_status = 'processing'
+                """, (lease_expires_at, now, job_id, worker_id))
+        return held
+    
+    def start_ingestion_job_phase(self, job_id: str, phase: str, files_total: Optional[int] = None,
+                                  result: Optional[Dict[str, Any]] = None):
+        """Record that a job entered a new phase, with its file total and partial result."""
+        import json
+        now = datetime.utcnow()
+        with self.transaction():
+            self.con.execute("""
+                UPDATE ingestion_jobs SET
+                    phase = ?,
+                    files_total = COALESCE(?, files_total),
+                    result = COALESCE(?, result),
+                    progress_started_at = CASE WHEN ? = 'process' THEN ? ELSE progress_started_at END,
+                    updated_at = ?
+                WHERE id = ?
+            """, (phase, files_total, None if result is None else json.dumps(result), phase, now, now, job_id))
+    
+    def record_ingestion_job_file(self, job_id: str, file_path: str, error_message: Optional[str] = None):
+        """Count one committed file against a job, logging its error if it failed."""
+        now = datetime.utcnow()
+        with self.transaction():
+            if error_message is None:
+                self.con.execute(
+                    "UPDATE ingestion_jobs SET files_done = files_done + 1, updated_at = ? WHERE id = ?",
+                    (now, job_id)
+                )
+            else:
+                self.con.execute(
+                    "UPDATE ingestion_jobs SET files_failed = files_failed + 1, updated_at = ? WHERE id = ?",
+                    (now, job_id)
+                )
+                self.con.execute(
+                    "INSERT INTO ingestion_job_errors (job_id, file_path, error_message, created_at) VALUES (?, ?, ?, ?)",
+                    (job_id, file_path, error_message, now)
+                )
+    
+    def finish_ingestion_job(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None,
+                             error_message: Optional[str] = None):
+        """Mark a job completed or failed and release its lease."""
+        import json
+        now = datetime.utcnow()
+        with self.transaction():
+            self.con.execute("""
+                UPDATE ingestion_jobs SET
+                    status = ?,
+                    result = COALESCE(?, result),
+                    error_message = ?,
+                    lease_expires_at = NULL,
+                    finished_at = ?,
+                    updated_at = ?
+                WHERE id = ?
+            """, (status, None if result is None else json.dumps(result), error_message, now, now, job_id))
+    
+    def release_ingestion_job(self, job_id: str, worker_id: str):
+        """
+        Requeue a job interrupted by shutdown and return the files it had leased
+        to 'pending', so a restarted worker resumes immediately instead of
+        waiting for the leases to expire.
+        """
+        now = datetime.utcnow()
+        with self.transaction():
+            self.con.execute("""
+                UPDATE file_state SET
+                    processing_status = 'pending',
+                    lease_owner = NULL,
+                    lease_expires_at = NULL,
+                    updated_at = ?
+                WHERE job_id = ? AND lease_owner = ? AND processing_status = 'processing'
+            """, (now, job_id, worker_id))
+            self.con.execute("""
+                UPDATE ingestion_jobs SET
+                    status = 'queued',
+                    worker_id = NULL,
+                    lease_expires_at = NULL,
+                    updated_at = ?
+                WHERE id = ? AND worker_id = ? AND status = 'running'
+            """, (now, job_id, worker_id))
+    
+    def get_ingestion_job(self, job_id: str, error_limit: int = 50) -> Optional[dict]:
+        """Fetch a job row with its most recent file errors."""
+        import json
+        row = self.con.execute("SELECT * FROM ingestion_jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        columns = [desc[0] for desc in self.con.description]
+        job = dict(zip(columns, row))
+        for field in ('params', 'result'):
+            job[field] = json.loads(job[field]) if job[field] else None
+        
+        errors = self.con.execute("""
+            SELECT file_path, error_message, created_at FROM ingestion_job_errors
+            WHERE job_id = ? ORDER BY created_at DESC LIMIT ?
+        """, (job_id, error_limit)).fetchall()
+        job['errors'] = [
+            {"file_path": file_path, "error": error, "timestamp": created_at}
+            for file_path, error, created_at in errors
+        ]
+        return job
+    
+    def list_ingestion_jobs(self, limit: int = 50) -> list[dict]:
+        """Most recent jobs, newest first, without params or results."""
+        results = self.con.execute("""
+            SELECT id, job_type, status, phase, files_total, files_done, files_failed, created_at, finished_at
+            FROM ingestion_jobs ORDER BY created_at DESC LIMIT ?
+        """, (limit,)).fetchall()
+        columns = ['id', 'job_type', 'status', 'phase', 'files_total', 'files_done', 'files_failed', 'created_at', 'finished_at']
+        return [dict(zip(columns, row)) for row in results]
+    
+    def has_queued_process_job(self, directory_root: str) -> bool:
+        """Whether a process job for directory_root is queued and not yet claimed."""
+        return self.con.execute("""
+            SELECT count(*) FROM ingestion_jobs
+            WHERE status = 'queued' AND job_type = 'process'
+            AND json_extract_string(params, '$.directory_path') = ?
+        """, (directory_root,)).fetchone()[0] > 0
+    
+    def mark_paths_deleted(self, path: str) -> int:
+        """
+        Mark a removed file, or every tracked file under a removed directory, as deleted.
+        """
+        try:
+            prefix = path.rstrip(os.sep) + os.sep
+            with self.transaction():
+                deleted = self.con.execute("""
+                    UPDATE file_state SET 
+                        processing_status = 'deleted',
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE (file_path = ? OR starts_with(file_path, ?))
+                    AND processing_status != 'deleted'
+                    RETURNING file_path
+                """, (path, prefix)).fetchall()
+            return len(deleted)
+            
+        except Exception as e:
+            print(f"Error marking deleted path {path}: {e}")
+            return 0
+    
     def mark_deleted_files(self, existing_file_paths: set, directory_root: str):
         """
         Mark files as deleted if they no longer exist in the filesystem.
+        Their doc_id is kept until the brains are purged (see get_deleted_files_to_purge).
         """
         try:
-            # Get all files tracked for this directory
-            tracked_files = self.con.execute("""
-                SELECT file_path FROM file_state WHERE directory_root = ?
-            """, (directory_root,)).fetchall()
-            
-            deleted_count = 0
-            for (file_path,) in tracked_files:
-                if file_path not in existing_file_paths:
-                    # File no longer exists, mark as deleted
+            with self.transaction():
+                # Get all files still tracked as present for this directory
+                tracked_files = self.con.execute("""
+                    SELECT file_path FROM file_state
+                    WHERE directory_root = ? AND processing_status != 'deleted'
+                """, (directory_root,)).fetchall()
+                
+                # Files that no longer exist are marked deleted in one statement
+                missing = [file_path for (file_path,) in tracked_files if file_path not in existing_file_paths]
+                if missing:
                     self.con.execute("""
                         UPDATE file_state SET 
                             processing_status = 'deleted',
                             updated_at = CURRENT_TIMESTAMP
-                        WHERE file_path = ?
-                    """, (file_path,))
-                    deleted_count += 1
+                        WHERE file_path IN (SELECT unnest(?::VARCHAR[]))
+                    """, (missing,))
+            deleted_count = len(missing)
             
             if deleted_count > 0:
                 print(f"Marked {deleted_count} files as deleted in directory {directory_root}")
@@ -676,6 +1341,30 @@ class AnalyticalBrain:
             print(f"Error marking deleted files: {e}")
             return 0
     
+    def get_deleted_files_to_purge(self, limit: int = 500) -> list[dict]:
+        """
+        Deleted files whose last ingested version is still stored in the brains.
+        """
+        results = self.con.execute("""
+            SELECT file_path, doc_id FROM file_state
+            WHERE processing_status = 'deleted' AND doc_id IS NOT NULL
+            LIMIT ?
+        """, (limit,)).fetchall()
+        return [{"file_path": file_path, "doc_id": doc_id} for file_path, doc_id in results]
+    
+    def clear_file_doc_ids(self, file_paths: list[str]):
+        """
+        Forget the stored version of deleted files once it has been purged.
+        """
+        if not file_paths:
+            return
+        placeholders = ', '.join(['?'] * len(file_paths))
+        with self.transaction():
+            self.con.execute(f"""
+                UPDATE file_state SET doc_id = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE file_path IN ({placeholders}) AND processing_status = 'deleted'
+            """, file_paths)
+    
     def add_directory_config(self, directory_path: str, recursive: bool = True, 
                            file_patterns: str = None, ignore_patterns: str = None) -> str:
         """
@@ -689,13 +1378,14 @@ class AnalyticalBrain:
             if file_patterns is None:
                 file_patterns = "*.txt,*.md,*.py,*.js,*.html,*.css,*.json,*.csv,*.xlsx,*.xls"
             if ignore_patterns is None:
-                ignore_patterns = ".git/*,.env*,node_modules/*,__pycache__/*"
+                ignore_patterns = ".git/,.env*,node_modules/,__pycache__/"
             
-            self.con.execute("""
-                INSERT INTO directory_config 
-                (id, directory_path, recursive, file_patterns, ignore_patterns)
-                VALUES (?, ?, ?, ?, ?)
-            """, (config_id, directory_path, recursive, file_patterns, ignore_patterns))
+            with self.transaction():
+                self.con.execute("""
+                    INSERT INTO directory_config 
+                    (id, directory_path, recursive, file_patterns, ignore_patterns)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (config_id, directory_path, recursive, file_patterns, ignore_patterns))
             
             print(f"Added directory config for: {directory_path}")
             return config_id
@@ -730,12 +1420,13 @@ class AnalyticalBrain:
         Update the last scan timestamp for a directory configuration.
         """
         try:
-            self.con.execute("""
-                UPDATE directory_config SET 
-                    last_scan = CURRENT_TIMESTAMP,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (config_id,))
+            with self.transaction():
+                self.con.execute("""
+                    UPDATE directory_config SET 
+                        last_scan = CURRENT_TIMESTAMP,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """, (config_id,))
             
         except Exception as e:
             print(f"Error updating directory last scan: {e}")
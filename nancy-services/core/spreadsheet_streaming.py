@@ -0,0 +1,415 @@
+"""
+Streaming spreadsheet readers and one-pass column statistics.
+
+Large CSV/XLSX files are read in bounded chunks (pyarrow's incremental CSV
+reader, openpyxl read-only row iterators) so that peak memory depends on the
+chunk size rather than the file size. Column statistics are accumulated online
+while the chunks stream past, and a fixed-size row reservoir is kept for the
+relationship and summary code that needs example rows.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.compute as pc
+from typing import Dict, List, Any, Optional, Iterator, Iterable, Tuple
+
+# Rows per XLSX chunk and bytes per CSV block
+DEFAULT_CHUNK_ROWS = 50_000
+DEFAULT_CSV_BLOCK_SIZE = 16 * 1024 * 1024
+
+# Files above this size go through the streaming path
+STREAMING_THRESHOLD_BYTES = 64 * 1024 * 1024
+
+STREAMABLE_EXTENSIONS = ['.csv', '.xlsx']
+
+
+def header_to_column_names(header: Iterable[Any]) -> List[str]:
+    """
+    Normalize a header row the way pandas does: blank cells become
+    'Unnamed: i' and repeated names get '.1', '.2', ... suffixes. Names are
+    compared case-insensitively, since DuckDB column names are.
+    """
+    column_names = []
+    used = set()
+    for i, name in enumerate(header):
+        name = str(name).strip() if name is not None else ""
+        name = name or f"Unnamed: {i}"
+        unique, suffix = name, 0
+        while unique.lower() in used:
+            suffix += 1
+            unique = f"{name}.{suffix}"
+        used.add(unique.lower())
+        column_names.append(unique)
+    return column_names
+
+
+def rows_to_arrow(column_names: List[str], rows: List[tuple], schema: Optional[pa.Schema] = None) -> pa.Table:
+    """
+    Build an Arrow table from row tuples. When a schema from an earlier chunk is
+    given, columns keep that type where the values allow it; columns with mixed
+    cell types are stored as strings.
+    """
+    columns = [[] for _ in column_names]
+    for row in rows:
+        for i in range(len(column_names)):
+            columns[i].append(row[i] if i < len(row) else None)
+
+    arrays = []
+    for i, values in enumerate(columns):
+        array = None
+        if schema is not None and not pa.types.is_null(schema.field(i).type):
+            try:
+                array = pa.array(values, type=schema.field(i).type)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                array = None
+        if array is None:
+            try:
+                array = pa.array(values)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                array = pa.array([None if v is None else str(v) for v in values], type=pa.string())
+        arrays.append(array)
+
+    return pa.Table.from_arrays(arrays, names=column_names)
+
+
+def dataframe_to_arrow(df: pd.DataFrame) -> pa.Table:
+    """
+    Build an Arrow table from a DataFrame, keeping column types. Object columns
+    pyarrow cannot convert as a whole (numbers and text in one column) are
+    stored as strings.
+    """
+    arrays = []
+    for name in df.columns:
+        series = df[name]
+        try:
+            array = pa.array(series, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            array = pa.array([None if _is_missing(v) else str(v) for v in series], type=pa.string())
+        arrays.append(array)
+    return pa.Table.from_arrays(arrays, names=[str(name) for name in df.columns])
+
+
+def _is_missing(value: Any) -> bool:
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def iter_row_chunks(rows: Iterable[tuple], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pa.Table]:
+    """
+    Turn a row iterator (first row is the header) into Arrow tables of at most
+    chunk_rows rows. Empty rows are skipped.
+    """
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return
+
+    column_names = header_to_column_names(header)
+    schema = None
+    buffer = []
+
+    for row in rows:
+        if row is None or all(value is None for value in row):
+            continue
+        buffer.append(row)
+        if len(buffer) >= chunk_rows:
+            table = rows_to_arrow(column_names, buffer, schema)
+            schema = schema or table.schema
+            buffer = []
+            yield table
+
+    if buffer or schema is None:
+        yield rows_to_arrow(column_names, buffer, schema)
+
+
+def _open_csv(file_path: str, block_size: int, column_types: Dict[str, pa.DataType],
+              column_names: Optional[List[str]] = None):
+    # Given column names replace the file's header row
+    header_options = {"column_names": column_names, "skip_rows": 1} if column_names else {}
+    convert_options = pa_csv.ConvertOptions(column_types=column_types)
+    try:
+        return pa_csv.open_csv(file_path, read_options=pa_csv.ReadOptions(block_size=block_size, **header_options),
+                               convert_options=convert_options)
+    except (pa.ArrowInvalid, UnicodeDecodeError):
+        return pa_csv.open_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(block_size=block_size, encoding='latin-1', **header_options),
+            convert_options=convert_options
+        )
+
+
+def iter_csv_chunks(file_path: str, block_size: int = DEFAULT_CSV_BLOCK_SIZE) -> Iterator[pa.Table]:
+    """
+    Read a CSV file incrementally, one Arrow table per block. Column types are
+    inferred from the first block. Falls back to latin-1 if the first block is
+    not valid UTF-8. Header names go through header_to_column_names, so
+    repeated and blank headers are named as in the XLSX path.
+    
+    A column holding a value its inferred type cannot parse in a later block
+    (an int64 column reaching 'pending') is read as string from there on: the
+    file is reopened with that column forced to string and the rows already
+    yielded are skipped, so consumers see the type change as a string chunk.
+    """
+    column_types = {}
+    column_names = None
+    rows_yielded = 0
+    while True:
+        reader = _open_csv(file_path, block_size, column_types, column_names)
+        if column_names is None:
+            column_names = header_to_column_names(reader.schema.names)
+            if column_names != reader.schema.names:
+                reader = _open_csv(file_path, block_size, column_types, column_names)
+        to_skip = rows_yielded
+        try:
+            for batch in reader:
+                if to_skip >= batch.num_rows:
+                    to_skip -= batch.num_rows
+                    continue
+                table = pa.Table.from_batches([batch.slice(to_skip)])
+                to_skip = 0
+                rows_yielded += table.num_rows
+                yield table
+            return
+        except pa.ArrowInvalid as e:
+            match = re.search(r"CSV column #(\d+)", str(e))
+            failing = [column_names[int(match.group(1))]] if match and int(match.group(1)) < len(column_names) \
+                else [name for name in column_names if name not in column_types]
+            failing = [name for name in failing if name not in column_types]
+            if not failing:
+                raise
+            column_types.update({name: pa.string() for name in failing})
+
+
+def iter_xlsx_sheets(file_path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[Tuple[str, Iterator[pa.Table]]]:
+    """
+    Yield (sheet_name, chunk iterator) for each worksheet using openpyxl's
+    read-only mode, which streams rows from the XML instead of loading the sheet.
+    Each chunk iterator must be consumed before advancing to the next sheet.
+    """
+    import openpyxl
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for sheet_name in workbook.sheetnames:
+            yield sheet_name, iter_row_chunks(workbook[sheet_name].iter_rows(values_only=True), chunk_rows)
+    finally:
+        workbook.close()
+
+
+def iter_spreadsheet_chunks(file_path: str, file_type: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[Tuple[str, Iterator[pa.Table]]]:
+    """Yield (sheet_name, chunk iterator) for a streamable spreadsheet file."""
+    if file_type == '.csv':
+        yield "Sheet1", iter_csv_chunks(file_path)
+    elif file_type == '.xlsx':
+        yield from iter_xlsx_sheets(file_path, chunk_rows)
+    else:
+        raise ValueError(f"Streaming is not supported for {file_type} files")
+
+
+def unify_types(types: Iterable[pa.DataType]) -> pa.DataType:
+    """
+    Smallest common type for the chunk types seen in one column: the type itself
+    if all agree, float64 for mixed numbers, otherwise string.
+    """
+    distinct = {t for t in types if not pa.types.is_null(t)}
+    if not distinct:
+        return pa.null()
+    if len(distinct) == 1:
+        return distinct.pop()
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in distinct):
+        return pa.float64()
+    return pa.string()
+
+
+def _json_value(value: Any) -> Any:
+    """Keep JSON primitives as they are and stringify dates, decimals and the like."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def _reservoir_hits(seen: int, count: int, capacity: int, filled: int, rng: np.random.Generator) -> List[Tuple[int, int]]:
+    """
+    Vectorized Algorithm R over a batch of `count` new items after `seen`
+    earlier ones. Returns (batch_index, slot) pairs; slots >= filled are appends.
+    """
+    fill = min(max(capacity - filled, 0), count)
+    hits = [(i, filled + i) for i in range(fill)]
+    if count > fill:
+        positions = np.arange(seen + fill, seen + count)
+        slots = (rng.random(len(positions)) * (positions + 1)).astype(np.int64)
+        for offset in np.nonzero(slots < capacity)[0]:
+            hits.append((fill + int(offset), int(slots[offset])))
+    return hits
+
+
+class ColumnStatistics:
+    """
+    One-pass accumulator for a single column: counts, min/max, mean and
+    standard deviation (Chan's parallel update), bounded distinct counting and a
+    reservoir sample of values.
+    """
+
+    def __init__(self, name: str, sample_size: int = 10, distinct_limit: int = 10_000, seed: int = 0):
+        self.name = name
+        self.count = 0
+        self.null_count = 0
+        self.min_value = None
+        self.max_value = None
+        self.numeric_count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.is_numeric = True
+        self._distinct = set()
+        self._distinct_limit = distinct_limit
+        self.distinct_overflow = False
+        self.sample_size = sample_size
+        self.sample: List[Any] = []
+        self._sampled_seen = 0
+        self._rng = np.random.default_rng(seed)
+
+    @staticmethod
+    def _pick(current, candidate, keep_smaller: bool):
+        if current is None:
+            return candidate
+        try:
+            smaller = candidate < current
+        except TypeError:
+            # Mixed types across chunks; compare as text
+            smaller = str(candidate) < str(current)
+        return candidate if smaller == keep_smaller else current
+
+    def update(self, array) -> None:
+        """Fold one chunk of this column into the running statistics."""
+        self.count += len(array)
+        self.null_count += array.null_count
+        valid = pc.drop_null(array)
+        n = len(valid)
+        if n == 0:
+            return
+
+        value_type = valid.type
+        is_numeric = pa.types.is_integer(value_type) or pa.types.is_floating(value_type)
+        self.is_numeric = self.is_numeric and is_numeric
+
+        if not pa.types.is_boolean(value_type) and not pa.types.is_null(value_type):
+            try:
+                extremes = pc.min_max(valid).as_py()
+                self.min_value = self._pick(self.min_value, extremes['min'], keep_smaller=True)
+                self.max_value = self._pick(self.max_value, extremes['max'], keep_smaller=False)
+            except (pa.ArrowNotImplementedError, pa.ArrowInvalid):
+                pass
+
+        if is_numeric:
+            as_float = pc.cast(valid, pa.float64())
+            batch_mean = pc.mean(as_float).as_py()
+            batch_m2 = pc.sum(pc.power(pc.subtract(as_float, batch_mean), 2)).as_py()
+            total = self.numeric_count + n
+            delta = batch_mean - self.mean
+            self.mean += delta * n / total
+            self._m2 += batch_m2 + delta * delta * self.numeric_count * n / total
+            self.numeric_count = total
+
+        if not self.distinct_overflow:
+            self._distinct.update(pc.unique(valid).to_pylist())
+            if len(self._distinct) > self._distinct_limit:
+                self.distinct_overflow = True
+                self._distinct.clear()
+
+        hits = _reservoir_hits(self._sampled_seen, n, self.sample_size, len(self.sample), self._rng)
+        if hits:
+            values = valid.take(pa.array([i for i, _ in hits])).to_pylist()
+            for value, (_, slot) in zip(values, hits):
+                if slot < len(self.sample):
+                    self.sample[slot] = value
+                else:
+                    self.sample.append(value)
+        self._sampled_seen += n
+
+    @property
+    def non_null_count(self) -> int:
+        return self.count - self.null_count
+
+    @property
+    def nunique(self) -> Optional[int]:
+        """Exact distinct count, or None once it exceeded distinct_limit."""
+        return None if self.distinct_overflow else len(self._distinct)
+
+    @property
+    def std(self) -> Optional[float]:
+        if self.numeric_count < 2:
+            return None
+        return (self._m2 / (self.numeric_count - 1)) ** 0.5
+
+    def to_dict(self) -> Dict[str, Any]:
+        numeric = self.is_numeric and self.numeric_count > 0
+        return {
+            "column": self.name,
+            "count": self.non_null_count,
+            "null_count": self.null_count,
+            "min": _json_value(self.min_value),
+            "max": _json_value(self.max_value),
+            "mean": self.mean if numeric else None,
+            "std": self.std if numeric else None,
+            "nunique": self.nunique,
+            "nunique_exact": not self.distinct_overflow,
+            "sample": [_json_value(value) for value in self.sample]
+        }
+
+
+class SheetStatistics:
+    """
+    Online statistics for a whole sheet: one ColumnStatistics per column plus a
+    bounded reservoir of complete rows for downstream analysis.
+    """
+
+    def __init__(self, row_sample_size: int = 1000, seed: int = 0):
+        self.row_count = 0
+        self.columns: Dict[str, ColumnStatistics] = {}
+        self.column_types: Dict[str, set] = {}
+        self.row_sample_size = row_sample_size
+        self._sample_rows: List[Dict[str, Any]] = []
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns.keys())
+
+    def update(self, table: pa.Table) -> None:
+        """Fold one Arrow chunk into the sheet statistics."""
+        for name in table.column_names:
+            if name not in self.columns:
+                self.columns[name] = ColumnStatistics(name)
+                self.column_types[name] = set()
+            self.columns[name].update(table.column(name))
+            self.column_types[name].add(table.schema.field(name).type)
+
+        hits = _reservoir_hits(self.row_count, table.num_rows, self.row_sample_size, len(self._sample_rows), self._rng)
+        if hits:
+            rows = table.take(pa.array([i for i, _ in hits])).to_pylist()
+            for row, (_, slot) in zip(rows, hits):
+                if slot < len(self._sample_rows):
+                    self._sample_rows[slot] = row
+                else:
+                    self._sample_rows.append(row)
+        self.row_count += table.num_rows
+
+    def unified_schema(self) -> pa.Schema:
+        """Schema every chunk of the sheet can be cast to."""
+        return pa.schema([(name, unify_types(types)) for name, types in self.column_types.items()])
+
+    def sample_frame(self) -> pd.DataFrame:
+        """Row sample as a DataFrame, for code that analyses example rows."""
+        return pd.DataFrame(self._sample_rows, columns=self.column_names)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "row_count": self.row_count,
+            "column_count": len(self.columns),
+            "columns": {name: stats.to_dict() for name, stats in self.columns.items()}
+        }
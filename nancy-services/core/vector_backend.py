@@ -0,0 +1,250 @@
+"""
+Vector Brain backend interface.
+
+VectorBackend is the storage surface VectorBrain (core/nlp.py) writes chunks
+to and queries: add/upsert/update/delete by ID, ID lookup and deletion by
+metadata filter, and filtered similarity queries returning Chroma-shaped
+results. Documents are embedded by the backend's embedding function.
+
+create_vector_backend() returns the one selected by brains.vector.backend,
+which NANCY_VECTOR_BACKEND overrides:
+- "chromadb": a Chroma server over HTTP (CHROMA_HOST), one round-trip per call
+- "embedded": an in-process Chroma PersistentClient storing its HNSW index and
+  metadata under brains.vector.connection.persist_directory, for single-node
+  deployments and CI (no Chroma container needed)
+- "exact": in-process brute-force search over a memory-mapped embeddings
+  matrix in persist_directory (core/exact_vectors.py); perfect recall, for
+  collections up to about 100k chunks
+
+HNSW parameters (hnsw_space, hnsw_m, hnsw_construction_ef, hnsw_search_ef)
+are read from brains.vector.connection; they apply when the collection is
+created, except hnsw_search_ef, which is also updated on existing collections.
+"""
+
+import os
+from abc import ABC, abstractmethod
+
+import chromadb
+
+COLLECTION_NAME = "nancy_documents"
+DEFAULT_PERSIST_DIRECTORY = "./data/nancy_vectors"
+
+# brains.vector.connection keys -> Chroma collection metadata
+HNSW_SETTINGS = {
+    "hnsw_space": "hnsw:space",
+    "hnsw_m": "hnsw:M",
+    "hnsw_construction_ef": "hnsw:construction_ef",
+    "hnsw_search_ef": "hnsw:search_ef",
+}
+
+
+def get_chroma_client():
+    """
+    Returns a ChromaDB client connected to the specified host.
+    """
+    host = os.getenv("CHROMA_HOST", "chromadb")
+    client = chromadb.HttpClient(host=host, port=8000)
+    return client
+
+
+def get_vector_backend_config() -> dict:
+    """
+    Backend name, connection settings and default retrieval mode of the
+    Vector Brain, from brains.vector in the Nancy configuration.
+    NANCY_VECTOR_BACKEND, NANCY_VECTOR_PERSIST_DIRECTORY,
+    NANCY_LEXICAL_INDEX_PATH and NANCY_RETRIEVAL_MODE override the configuration.
+    """
+    backend, connection, retrieval_mode = "chromadb", {}, "vector"
+    try:
+        from .config_manager import get_config_manager
+        manager = get_config_manager()
+        config = manager.config or manager.load_config()
+        backend = config.brains.vector.backend.value
+        connection = dict(config.brains.vector.connection)
+        retrieval_mode = config.brains.vector.retrieval_mode
+    except Exception as e:
+        print(f"Vector configuration not loaded, using defaults: {e}")
+    backend = os.getenv("NANCY_VECTOR_BACKEND", backend).lower()
+    if os.getenv("NANCY_VECTOR_PERSIST_DIRECTORY"):
+        connection["persist_directory"] = os.getenv("NANCY_VECTOR_PERSIST_DIRECTORY")
+    if os.getenv("NANCY_LEXICAL_INDEX_PATH"):
+        connection["lexical_index_path"] = os.getenv("NANCY_LEXICAL_INDEX_PATH")
+    retrieval_mode = os.getenv("NANCY_RETRIEVAL_MODE", retrieval_mode).lower()
+    return {"backend": backend, "connection": connection, "retrieval_mode": retrieval_mode}
+
+
+def create_vector_backend(embedding_function, settings: dict = None) -> "VectorBackend":
+    """
+    Vector store for the configured backend (or the given
+    get_vector_backend_config() settings), embedding with embedding_function.
+    """
+    settings = settings or get_vector_backend_config()
+    connection = settings["connection"]
+    hnsw = {metadata_key: connection[key] for key, metadata_key in HNSW_SETTINGS.items()
+            if connection.get(key) is not None}
+    if settings["backend"] == "exact":
+        from .exact_vectors import ExactVectorBackend
+        return ExactVectorBackend(embedding_function, connection.get("persist_directory"),
+                                  space=connection.get("hnsw_space") or "l2")
+    if settings["backend"] == "embedded":
+        persist_directory = connection.get("persist_directory") or DEFAULT_PERSIST_DIRECTORY
+        os.makedirs(persist_directory, exist_ok=True)
+        client = chromadb.PersistentClient(path=persist_directory)
+        return ChromaVectorBackend(client, embedding_function, backend_name="embedded", hnsw=hnsw)
+    if settings["backend"] != "chromadb":
+        raise ValueError(f"Unsupported vector backend: {settings['backend']}")
+    return ChromaVectorBackend(get_chroma_client(), embedding_function, backend_name="chromadb", hnsw=hnsw)
+
+
+def _compare(value, operator, operand) -> bool:
+    if operator == "$eq":
+        return value == operand
+    if operator == "$ne":
+        return value != operand
+    if operator == "$in":
+        return value in operand
+    if operator == "$nin":
+        return value not in operand
+    if value is None:
+        return False
+    if operator == "$gt":
+        return value > operand
+    if operator == "$gte":
+        return value >= operand
+    if operator == "$lt":
+        return value < operand
+    if operator == "$lte":
+        return value <= operand
+    raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+def matches_where(metadata: dict, where: dict) -> bool:
+    """Evaluate a Chroma metadata filter against one chunk's metadata."""
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            if not all(_compare(value, operator, operand) for operator, operand in condition.items()):
+                return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+class VectorBackend(ABC):
+    """
+    Chunk store of the Vector Brain.
+
+    Filters use Chroma's `where` syntax: {"field": value},
+    {"field": {"$in": [...]}} and {"$and": [...]} / {"$or": [...]}.
+    """
+
+    backend_name = None
+
+    def __init__(self, embedding_function):
+        self.embedding_function = embedding_function
+
+    @abstractmethod
+    def add(self, ids: list[str], documents: list[str], metadatas: list[dict]):
+        """Embed and store new chunks; IDs already stored are left unchanged."""
+
+    @abstractmethod
+    def upsert(self, ids: list[str], documents: list[str], metadatas: list[dict]):
+        """Embed and store chunks, overwriting existing IDs."""
+
+    @abstractmethod
+    def update(self, ids: list[str], metadatas: list[dict]):
+        """Replace the metadata of stored chunks, keeping their embeddings."""
+
+    @abstractmethod
+    def get_ids(self, where: dict) -> list[str]:
+        """IDs of the chunks whose metadata matches where."""
+
+    @abstractmethod
+    def delete(self, ids: list[str] = None, where: dict = None):
+        """Delete chunks by ID or metadata filter."""
+
+    @abstractmethod
+    def query(self, query_texts: list[str], n_results: int = 5, where: dict = None) -> dict:
+        """
+        Nearest chunks per query text, as Chroma returns them: ids, documents,
+        metadatas and distances, each a list with one list per query.
+        """
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored chunks."""
+
+    @abstractmethod
+    def scan(self, batch_size: int = 1000):
+        """Every stored chunk, as (ids, documents, metadatas) batches."""
+
+    def health_check(self) -> dict:
+        try:
+            return {
+                "status": "healthy",
+                "backend": self.backend_name,
+                "chunks": self.count()
+            }
+        except Exception as e:
+            return {"status": "unhealthy", "backend": self.backend_name, "error": str(e)}
+
+    def close(self):
+        pass
+
+
+class ChromaVectorBackend(VectorBackend):
+    """
+    A Chroma collection, over HTTP or in-process depending on the client.
+    """
+
+    def __init__(self, client, embedding_function, backend_name: str = "chromadb",
+                 collection_name: str = COLLECTION_NAME, hnsw: dict = None):
+        super().__init__(embedding_function)
+        self.backend_name = backend_name
+        self.client = client
+        self.collection = client.get_or_create_collection(
+            name=collection_name,
+            embedding_function=embedding_function,
+            metadata=hnsw or None
+        )
+        # search_ef is the one HNSW parameter that can change after creation
+        # (Chroma rejects any hnsw:space in modify, even an unchanged one)
+        metadata = dict(self.collection.metadata or {})
+        if hnsw and "hnsw:search_ef" in hnsw and metadata.get("hnsw:search_ef") != hnsw["hnsw:search_ef"]:
+            metadata.pop("hnsw:space", None)
+            metadata["hnsw:search_ef"] = hnsw["hnsw:search_ef"]
+            self.collection.modify(metadata=metadata)
+
+    def add(self, ids, documents, metadatas):
+        self.collection.add(ids=ids, documents=documents, metadatas=metadatas)
+
+    def upsert(self, ids, documents, metadatas):
+        self.collection.upsert(ids=ids, documents=documents, metadatas=metadatas)
+
+    def update(self, ids, metadatas):
+        self.collection.update(ids=ids, metadatas=metadatas)
+
+    def get_ids(self, where):
+        return self.collection.get(where=where, include=[])["ids"]
+
+    def delete(self, ids=None, where=None):
+        self.collection.delete(ids=ids, where=where)
+
+    def query(self, query_texts, n_results=5, where=None):
+        return self.collection.query(query_texts=query_texts, n_results=n_results, where=where)
+
+    def count(self):
+        return self.collection.count()
+
+    def scan(self, batch_size=1000):
+        for offset in range(0, self.collection.count(), batch_size):
+            page = self.collection.get(include=["documents", "metadatas"], limit=batch_size, offset=offset)
+            if not page["ids"]:
+                break
+            yield page["ids"], page["documents"], page["metadatas"]
@@ -10,6 +10,13 @@ from datetime import datetime
 import hashlib
 
 
+# Node labels a packet's graph_data entities may carry
+GRAPH_ENTITY_TYPES = [
+    "Person", "Document", "TechnicalConcept", "System", "Component", "Decision", "Meeting",
+    "Project", "Team", "Role", "Process", "Constraint", "Risk", "Action"
+]
+
+
 KNOWLEDGE_PACKET_SCHEMA = {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "$id": "https://schemas.nancy.ai/knowledge-packet/v1.0",
@@ -142,6 +149,16 @@ KNOWLEDGE_PACKET_SCHEMA = {
                                             "type": "string",
                                             "enum": ["string", "integer", "float", "boolean", "date", "datetime"]
                                         }
+                                    },
+                                    "row_count": {"type": "integer", "minimum": 0},
+                                    "arrow_ipc": {
+                                        "type": "string",
+                                        "contentEncoding": "base64",
+                                        "description": "Base64 Arrow IPC stream carrying the rows column-wise; when present, rows may be empty"
+                                    },
+                                    "column_statistics": {
+                                        "type": "object",
+                                        "description": "Per-column count, null_count, min, max, mean, std, nunique and sample values"
                                     }
                                 }
                             }
@@ -173,7 +190,7 @@ KNOWLEDGE_PACKET_SCHEMA = {
                                 "properties": {
                                     "type": {
                                         "type": "string",
-                                        "enum": ["Person", "Document", "TechnicalConcept", "System", "Component", "Decision", "Meeting", "Project", "Team", "Role", "Process", "Constraint", "Risk", "Action"]
+                                        "enum": GRAPH_ENTITY_TYPES
                                     },
                                     "name": {"type": "string"},
                                     "properties": {"type": "object"},
@@ -291,22 +308,68 @@ KNOWLEDGE_PACKET_SCHEMA = {
 }
 
 
+# Validators are built once at import; jsonschema.validate() re-checks the schema
+# and rebuilds a validator on every call.
+_SCHEMA_VALIDATOR = jsonschema.validators.validator_for(KNOWLEDGE_PACKET_SCHEMA)(KNOWLEDGE_PACKET_SCHEMA)
+_SCHEMA_VALIDATOR.check_schema(KNOWLEDGE_PACKET_SCHEMA)
+
+try:
+    import fastjsonschema
+    _FAST_VALIDATE = fastjsonschema.compile(KNOWLEDGE_PACKET_SCHEMA, use_default=False)
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    _FAST_VALIDATE = None
+    FASTJSONSCHEMA_AVAILABLE = False
+
+
+def validate_packet_data(packet_data: Dict[str, Any]):
+    """
+    Validate packet data against KNOWLEDGE_PACKET_SCHEMA with the precompiled validators.
+    
+    The generated fastjsonschema validator is the fast path when installed; any
+    packet it rejects is re-checked with jsonschema, which stays the authority for
+    acceptance and for the error reported.
+    
+    Raises:
+        jsonschema.ValidationError: If the packet is invalid
+    """
+    if _FAST_VALIDATE is not None:
+        try:
+            _FAST_VALIDATE(packet_data)
+            return
+        except fastjsonschema.JsonSchemaException:
+            pass
+    
+    error = jsonschema.exceptions.best_match(_SCHEMA_VALIDATOR.iter_errors(packet_data))
+    if error is not None:
+        raise error
+
+
 class NancyKnowledgePacket:
     """
     Represents a validated Nancy Knowledge Packet with helper methods.
     """
     
-    def __init__(self, packet_data: Dict[str, Any]):
-        """Initialize with validated packet data."""
+    def __init__(self, packet_data: Dict[str, Any], validated: bool = False):
+        """
+        Initialize with packet data, validating it unless the caller already did.
+        
+        Args:
+            packet_data: Dictionary containing packet data
+            validated: True if packet_data already passed schema validation
+        """
         self.data = packet_data
-        self._validate()
+        self.validated = validated
+        if not self.validated:
+            self._validate()
     
     def _validate(self):
         """Validate packet against schema."""
         try:
-            jsonschema.validate(self.data, KNOWLEDGE_PACKET_SCHEMA)
+            validate_packet_data(self.data)
         except jsonschema.ValidationError as e:
             raise ValueError(f"Invalid Knowledge Packet: {e.message}")
+        self.validated = True
     
     @classmethod
     def create(cls, 
@@ -441,14 +504,18 @@ class KnowledgePacketValidator:
             ValueError: If packet is invalid
         """
         try:
-            jsonschema.validate(packet_data, self.schema)
+            validate_packet_data(packet_data)
             return True
         except jsonschema.ValidationError as e:
             raise ValueError(f"Knowledge Packet validation failed: {e.message}")
     
     def validate_packet(self, packet: NancyKnowledgePacket) -> bool:
-        """Validate a NancyKnowledgePacket instance."""
-        return self.validate(packet.to_dict())
+        """Validate a NancyKnowledgePacket instance, skipping packets already validated."""
+        if packet.validated:
+            return True
+        self.validate(packet.to_dict())
+        packet.validated = True
+        return True
     
     def get_validation_errors(self, packet_data: Dict[str, Any]) -> List[str]:
         """
@@ -461,9 +528,8 @@ class KnowledgePacketValidator:
             List of validation error messages
         """
         errors = []
-        validator = jsonschema.Draft7Validator(self.schema)
         
-        for error in validator.iter_errors(packet_data):
+        for error in _SCHEMA_VALIDATOR.iter_errors(packet_data):
             errors.append(f"{error.json_path}: {error.message}")
         
         return errors
\ No newline at end of file
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Exact vector store concurrency and failed writes
+Checks the brute-force Vector Brain store of nancy-services/core/exact_vectors.py:
+concurrent searches score the matrix at the same time instead of one after
+another, and a write whose DuckDB commit fails leaves the in-memory records,
+free rows and matrix as the committed state describes.
+"""
+
+import os
+import sys
+import threading
+
+import numpy as np
+
+# Add path for Nancy core modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'nancy-services'))
+
+from core.exact_vectors import ExactVectorBackend
+
+DIMENSION = 8
+
+
+def embed(texts: list) -> np.ndarray:
+    """Deterministic embeddings: one pseudo-random vector per text."""
+    return np.stack([np.random.default_rng(sum(map(ord, text))).standard_normal(DIMENSION) for text in texts])
+
+
+def nearest(backend: ExactVectorBackend, text: str) -> str:
+    return backend.query([text], n_results=1)["ids"][0][0]
+
+
+def test_concurrent_searches() -> bool:
+    """Two searches are inside the matrix product at the same time."""
+    print("\n1. Concurrent searches")
+    backend = ExactVectorBackend(embed, persist_directory=":memory:")
+    backend.add([f"c{i}" for i in range(100)], [f"chunk {i}" for i in range(100)], [{"n": i} for i in range(100)])
+    store = backend._store
+    both_scoring = threading.Barrier(2, timeout=5)
+    score = store.index.search
+
+    def scoring_together(*args, **kwargs):
+        both_scoring.wait()
+        return score(*args, **kwargs)
+    store.index.search = scoring_together
+
+    results, errors = [], []
+
+    def search(text):
+        try:
+            results.append(nearest(backend, text))
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=search, args=(f"chunk {i}",)) for i in (3, 7)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    store.index.search = score
+    print(f"   results {sorted(results)}, errors {[type(e).__name__ for e in errors]}")
+    backend.close()
+    return sorted(results) == ["c3", "c7"] and not errors
+
+
+def test_failed_commit_keeps_state() -> bool:
+    """A failed commit changes neither the records nor the matrix; a retry then succeeds."""
+    print("\n2. Failed commit")
+    backend = ExactVectorBackend(embed, persist_directory=":memory:")
+    backend.add(["a", "b", "c"], ["alpha", "beta", "gamma"], [{}, {}, {}])
+    backend.delete(ids=["b"])
+    store = backend._store
+    before = (dict(store.row_of), dict(store.records), list(store.free_rows), store.index.size)
+    save_records = store._save_records
+
+    def failing_save(records):
+        raise RuntimeError("disk full")
+    store._save_records = failing_save
+    try:
+        backend.upsert(["a", "d", "e"], ["delta", "epsilon", "zeta"], [{}, {}, {}])
+    except RuntimeError as e:
+        print(f"   upsert failed: {e}")
+    store._save_records = save_records
+    after = (dict(store.row_of), dict(store.records), list(store.free_rows), store.index.size)
+    unchanged = before == after
+    # "a" still answers with its committed vector, and no uncommitted row is live
+    a_kept, live = nearest(backend, "alpha"), int(store.index.active[:store.index.size].sum())
+    print(f"   state unchanged {unchanged}, 'alpha' -> {a_kept}, live rows {live}")
+
+    backend.upsert(["a", "d", "e"], ["delta", "epsilon", "zeta"], [{}, {}, {}])
+    retried = {text: nearest(backend, text) for text in ("delta", "epsilon", "zeta", "gamma")}
+    count = backend.count()
+    print(f"   after retry {retried}, count {count}, free rows {store.free_rows}")
+    backend.close()
+    return (unchanged and a_kept == "a" and live == 2 and count == 4
+            and retried == {"delta": "a", "epsilon": "d", "zeta": "e", "gamma": "c"})
+
+
+def main():
+    """Run the exact vector store tests"""
+    print("Testing exact vector store")
+    print("=" * 60)
+    results = [
+        test_concurrent_searches(),
+        test_failed_commit_keeps_state(),
+    ]
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Graph Brain entity lookup
+Checks resolve_entities on the embedded Graph Brain: packet entity types and
+ingestion labels are indexed, numbered terms such as "S-400" and "ISO 9001"
+are found, and nodes outside the indexed labels are still found by their
+exact name.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+# Add path for Nancy core modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'nancy-services'))
+
+from core.embedded_graph import EmbeddedGraphBrain
+from core.graph_backend import ENTITY_LABELS
+
+
+def names(entities: list) -> list:
+    return sorted(entity["name"] for entity in entities)
+
+
+def test_labels_cover_packet_and_ingestion_types() -> bool:
+    """Packet entity types and ingestion labels are in the entity index."""
+    print("\n1. Indexed labels")
+    expected = ["System", "Project", "Process", "Risk", "Action", "Spreadsheet", "Column", "CodeFile", "Module"]
+    missing = [label for label in expected if label not in ENTITY_LABELS]
+    print(f"   {len(ENTITY_LABELS)} labels, missing: {missing or 'none'}")
+    return not missing and len(ENTITY_LABELS) == len(set(ENTITY_LABELS))
+
+
+def test_packet_entity_types(graph: EmbeddedGraphBrain) -> bool:
+    """Entities of packet-only types are resolved by topic words."""
+    print("\n2. Risk and System entities")
+    graph.add_concept_node("Thermal runaway risk", "Risk")
+    graph.add_concept_node("Power distribution system", "System")
+    risks, systems = graph.resolve_entities("thermal runaway"), graph.resolve_entities("power system")
+    print(f"   'thermal runaway' -> {names(risks)}, 'power system' -> {names(systems)}")
+    return names(risks) == ["Thermal runaway risk"] and names(systems) == ["Power distribution system"]
+
+
+def test_numbered_terms(graph: EmbeddedGraphBrain) -> bool:
+    """Digits are part of the index, so numbered names are told apart."""
+    print("\n3. Numbered terms")
+    for name in ("S-400 radar", "S-300 radar", "ISO 9001 audit", "Harness rev2"):
+        graph.add_concept_node(name, "Component")
+    s400, iso, rev = graph.resolve_entities("S-400"), graph.resolve_entities("ISO 9001"), graph.resolve_entities("rev2")
+    print(f"   'S-400' -> {names(s400)}, 'ISO 9001' -> {names(iso)}, 'rev2' -> {names(rev)}")
+    return names(s400) == ["S-400 radar"] and names(iso) == ["ISO 9001 audit"] and names(rev) == ["Harness rev2"]
+
+
+def test_exact_name_fallback(graph: EmbeddedGraphBrain) -> bool:
+    """A node outside the indexed labels is found by its exact name, and only then."""
+    print("\n4. Exact-name fallback")
+    graph.add_concept_node("calibrate_sensor", "Function")
+    graph.add_concept_node("calibrate sensor drift", "Concept")
+    exact = graph.resolve_entities("calibrate_sensor", labels=["Function"])
+    indexed = graph.resolve_entities("calibrate_sensor")
+    unknown = graph.resolve_entities("no such entity")
+    print(f"   Function lookup -> {names(exact)}, unfiltered -> {names(indexed)}, unknown -> {names(unknown)}")
+    return (names(exact) == ["calibrate_sensor"] and names(indexed) == ["calibrate sensor drift"]
+            and unknown == [])
+
+
+def main():
+    """Run the entity lookup tests"""
+    print("Testing Graph Brain entity lookup")
+    print("=" * 60)
+    directory = tempfile.mkdtemp(prefix="nancy-graph-")
+    try:
+        graph = EmbeddedGraphBrain(os.path.join(directory, "graph.duckdb"))
+        results = [
+            test_labels_cover_packet_and_ingestion_types(),
+            test_packet_entity_types(graph),
+            test_numbered_terms(graph),
+            test_exact_name_fallback(graph),
+        ]
+        graph.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Graph Brain document provenance
+Checks remove_document_provenance on the embedded Graph Brain: relationships
+are retired through the per-document index rather than a scan of the graph,
+edges asserted by several documents survive until the last one is removed,
+the index is rebuilt when the graph is reopened, and code nodes are removed
+through their CodeFile.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+# Add path for Nancy core modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'nancy-services'))
+
+from core.embedded_graph import EmbeddedGraphBrain
+
+
+def add_edges(graph: EmbeddedGraphBrain, doc_id: str, edges: list):
+    with graph.provenance(doc_id):
+        for source, target in edges:
+            graph.add_relationship("Concept", source, "RELATES_TO", "Concept", target)
+
+
+def edge_names(graph: EmbeddedGraphBrain) -> set:
+    store = graph._store
+    return {(store.props(r["source"])["name"], store.props(r["target"])["name"])
+            for r in store.relationships.values() if r["type"] == "RELATES_TO"}
+
+
+def test_indexed_retirement(graph: EmbeddedGraphBrain) -> bool:
+    """Only the relationships a document asserted are visited and retired."""
+    print("\n1. Retirement through the provenance index")
+    add_edges(graph, "doc-a", [("power", "thermal"), ("power", "harness")])
+    add_edges(graph, "doc-b", [("power", "thermal")])
+    # Untagged edges the retirement must not visit
+    for i in range(500):
+        graph.add_relationship("Concept", f"other {i}", "RELATES_TO", "Concept", "noise")
+    indexed = {doc_id: len(graph._store.with_source_doc(doc_id)) for doc_id in ("doc-a", "doc-b")}
+    result = graph.remove_document_provenance(["doc-a"])
+    edges = edge_names(graph)
+    print(f"   indexed {indexed}, result {result}")
+    return (indexed == {"doc-a": 2, "doc-b": 1} and result["relationships_updated"] == 2
+            and result["relationships_deleted"] == 1 and ("power", "thermal") in edges
+            and ("power", "harness") not in edges and graph._store.with_source_doc("doc-a") == [])
+
+
+def test_index_survives_reload(directory: str) -> bool:
+    """A reopened graph rebuilds the index from the stored source_doc_ids."""
+    print("\n2. Reload")
+    graph = EmbeddedGraphBrain(os.path.join(directory, "reload.duckdb"))
+    add_edges(graph, "doc-c", [("radar", "antenna"), ("radar", "power")])
+    graph.close()
+    graph = EmbeddedGraphBrain(os.path.join(directory, "reload.duckdb"))
+    indexed = len(graph._store.with_source_doc("doc-c"))
+    result = graph.remove_document_provenance(["doc-c"])
+    graph.close()
+    print(f"   indexed after reload {indexed}, deleted {result['relationships_deleted']}")
+    return indexed == 2 and result["relationships_deleted"] == 2
+
+
+def test_code_nodes(graph: EmbeddedGraphBrain) -> bool:
+    """Function and Class nodes of a code file are removed through its CodeFile."""
+    print("\n3. Code nodes")
+    graph.add_code_file_node("src/a.py", "python")
+    graph.add_function_node("run", "src/a.py", "python")
+    graph.add_class_node("Runner", "src/a.py", "python")
+    graph.add_function_node("run", "src/b.py", "python")
+    graph.add_import_relationship("src/a.py", "os")
+    result = graph.remove_document_provenance(["doc-code"], ["src/a.py"])
+    store = graph._store
+    functions = sorted(store.props(n)["file_path"] for n in store.with_label("Function"))
+    imports = [r for r in store.relationships.values() if r["type"] == "IMPORTS"]
+    print(f"   deleted {result['code_nodes_deleted']}, functions left in {functions}, imports left {len(imports)}")
+    return (result["code_nodes_deleted"] == 2 and functions == ["src/b.py"]
+            and store.with_label("Class") == [] and imports == [])
+
+
+def main():
+    """Run the provenance tests"""
+    print("Testing Graph Brain document provenance")
+    print("=" * 60)
+    directory = tempfile.mkdtemp(prefix="nancy-provenance-")
+    try:
+        graph = EmbeddedGraphBrain(os.path.join(directory, "graph.duckdb"))
+        results = [
+            test_indexed_retirement(graph),
+            test_index_survives_reload(directory),
+            test_code_nodes(graph),
+        ]
+        graph.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
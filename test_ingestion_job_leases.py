@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Ingestion job leases
+Runs two job managers (two "processes") against one temporary Analytical
+Brain with a lease far shorter than a batch of slow files. The running
+worker's heartbeat must keep its job and its leased files, so no file is
+ingested twice and no job is taken over while it is still running.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+# Add path for Nancy core modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'nancy-services'))
+
+from core.brain_registry import get_analytical_brain
+from core.ingestion_jobs import FILE_CLAIM_BATCH, IngestionJobManager
+
+LEASE_SECONDS = 1
+FILES = 2 * FILE_CLAIM_BATCH
+SLOW_FILE_SECONDS = 2.5
+FILE_SECONDS = 0.3
+
+
+class SlowDirectoryService:
+    """Stands in for DirectoryIngestionService: counts and slowly commits each file."""
+
+    def __init__(self, analytical_brain):
+        self.analytical_brain = analytical_brain
+        self.processed = Counter()
+        self.lock = threading.Lock()
+
+    def process_file_state(self, file_info: dict, author: str) -> dict:
+        file_path = file_info["file_path"]
+        with self.lock:
+            self.processed[file_path] += 1
+        # The first file alone outlasts the lease; a batch outlasts it many times over
+        time.sleep(SLOW_FILE_SECONDS if file_path.endswith("file_00.txt") else FILE_SECONDS)
+        self.analytical_brain.update_file_processing_status(file_path, "completed")
+        return {"file_path": file_path, "status": "completed"}
+
+
+def add_pending_files(brain):
+    with brain.transaction() as writer:
+        for i in range(FILES):
+            writer.execute("""
+                INSERT INTO file_state (file_path, content_hash, last_modified, file_size, directory_root, relative_path, processing_status)
+                VALUES (?, 'hash', ?, 1, '/data', ?, 'pending')
+            """, (f"/data/file_{i:02d}.txt", datetime(2026, 1, 1, 0, FILES - i), f"file_{i:02d}.txt"))
+
+
+def wait_for_jobs(managers: list, job_ids: list, timeout: float = 60.0) -> list:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        jobs = [managers[0].get_job(job_id) for job_id in job_ids]
+        if all(job["status"] in ("completed", "failed") for job in jobs):
+            return jobs
+        time.sleep(0.2)
+    return [managers[0].get_job(job_id) for job_id in job_ids]
+
+
+def test_slow_batch_keeps_leases(service: SlowDirectoryService, first: IngestionJobManager,
+                                 second: IngestionJobManager) -> bool:
+    """Files and jobs leased by a busy worker are not reclaimed by the other manager."""
+    print(f"\n1. {FILES} files, lease {LEASE_SECONDS} s, one file {SLOW_FILE_SECONDS} s, "
+          f"a batch about {SLOW_FILE_SECONDS + (FILE_CLAIM_BATCH - 1) * FILE_SECONDS:.1f} s")
+    first_job = first.submit("process", {"directory_path": "/data"})
+    # Let the first manager lease its job and a batch before the second one starts
+    time.sleep(0.5)
+    second_job = second.submit("process", {"directory_path": "/data"})
+    jobs = wait_for_jobs([first, second], [first_job, second_job])
+
+    duplicates = {path: count for path, count in service.processed.items() if count > 1}
+    owners = [job["worker_id"] for job in jobs]
+    print(f"   job status {[job['status'] for job in jobs]}, workers {owners}")
+    print(f"   files ingested {len(service.processed)}/{FILES}, more than once: {duplicates or 'none'}")
+    return (all(job["status"] == "completed" for job in jobs) and len(service.processed) == FILES
+            and not duplicates and owners[0].startswith(first.worker_prefix)
+            and owners[1].startswith(second.worker_prefix)
+            and sum(job["files_done"] for job in jobs) == FILES)
+
+
+def main():
+    """Run the job lease tests"""
+    print("Testing ingestion job leases")
+    print("=" * 60)
+    directory = tempfile.mkdtemp(prefix="nancy-job-leases-")
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        brain = get_analytical_brain()
+        add_pending_files(brain)
+        service = SlowDirectoryService(brain)
+        first = IngestionJobManager(service, workers=1, lease_seconds=LEASE_SECONDS)
+        second = IngestionJobManager(service, workers=2, lease_seconds=LEASE_SECONDS)
+        # Two managers in one process stand in for two hosts
+        second.worker_prefix = "other-host:1"
+        try:
+            results = [test_slow_batch_keeps_leases(service, first, second)]
+        finally:
+            first.stop()
+            second.stop()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
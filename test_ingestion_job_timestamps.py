@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Ingestion job timestamps
+Checks that every timestamp of a background ingestion job (creation, lease,
+progress start, finish, file errors, file leases) is written from one UTC
+clock, so durations and lease expiry agree even when the DuckDB session time
+zone is not UTC.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Add path for Nancy core modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'nancy-services'))
+
+from core.search import AnalyticalBrain
+
+# Far from UTC, so a timestamp taken from the session clock stands out
+SESSION_TIME_ZONE = "Pacific/Kiritimati"
+
+
+def run_job(brain: AnalyticalBrain) -> dict:
+    """Take one job through its whole life cycle and return its row."""
+    brain.create_ingestion_job("job-1", "process", {"directory_path": "/data"})
+    brain.claim_ingestion_job("worker-1", lease_seconds=300)
+    brain.start_ingestion_job_phase("job-1", "process", files_total=2)
+    brain.renew_ingestion_job_lease("job-1", "worker-1", lease_seconds=300)
+    brain.record_ingestion_job_file("job-1", "/data/a.txt")
+    brain.record_ingestion_job_file("job-1", "/data/b.txt", error_message="unreadable")
+    brain.finish_ingestion_job("job-1", "completed", {"files": 2})
+    return brain.get_ingestion_job("job-1")
+
+
+def test_job_timestamps_share_utc_clock(brain: AnalyticalBrain) -> bool:
+    """All job timestamps lie within a minute of UTC now."""
+    print("\n1. Job life cycle under a non-UTC session time zone")
+    started = datetime.utcnow()
+    job = run_job(brain)
+    window = (started - timedelta(minutes=1), datetime.utcnow() + timedelta(minutes=1))
+    stamps = {
+        "created_at": job["created_at"], "started_at": job["started_at"],
+        "progress_started_at": job["progress_started_at"], "finished_at": job["finished_at"],
+        "updated_at": job["updated_at"], "error created_at": job["errors"][0]["timestamp"]
+    }
+    outside = {name: str(value) for name, value in stamps.items() if not window[0] <= value <= window[1]}
+    print(f"   outside the UTC window: {outside or 'none'}")
+    duration = (job["finished_at"] - job["progress_started_at"]).total_seconds()
+    print(f"   progress duration: {duration:.3f} s")
+    return not outside and 0 <= duration < 60
+
+
+def test_file_leases_share_utc_clock(brain: AnalyticalBrain) -> bool:
+    """Leased and committed file rows are stamped from the same clock as their lease."""
+    print("\n2. File lease and commit")
+    with brain.transaction() as writer:
+        writer.execute("""
+            INSERT INTO file_state (file_path, content_hash, last_modified, file_size, directory_root, relative_path, processing_status)
+            VALUES ('/data/c.txt', 'hash', ?, 1, '/data', 'c.txt', 'pending')
+        """, (datetime.utcnow(),))
+    before = datetime.utcnow() - timedelta(minutes=1)
+    brain.claim_pending_files("job-2", "worker-1", limit=10, lease_seconds=300)
+    leased_at, lease_expires_at = brain.con.execute(
+        "SELECT updated_at, lease_expires_at FROM file_state WHERE file_path = '/data/c.txt'"
+    ).fetchone()
+    brain.update_file_processing_status("/data/c.txt", "completed", doc_id=None)
+    processed_at = brain.con.execute(
+        "SELECT last_processed FROM file_state WHERE file_path = '/data/c.txt'"
+    ).fetchone()[0]
+    print(f"   lease length {(lease_expires_at - leased_at).total_seconds():.0f} s, "
+          f"committed {(processed_at - leased_at).total_seconds():.3f} s after leasing")
+    return (before <= leased_at and 299 <= (lease_expires_at - leased_at).total_seconds() <= 301
+            and 0 <= (processed_at - leased_at).total_seconds() < 60)
+
+
+def main():
+    """Run the job timestamp tests"""
+    print("Testing ingestion job timestamps")
+    print("=" * 60)
+    directory = tempfile.mkdtemp(prefix="nancy-job-clock-")
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        brain = AnalyticalBrain()
+        # Writes go through the shared writer connection
+        with brain.transaction() as writer:
+            writer.execute(f"SET TimeZone = '{SESSION_TIME_ZONE}'")
+        results = [
+            test_job_timestamps_share_utc_clock(brain),
+            test_file_leases_share_utc_clock(brain),
+        ]
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
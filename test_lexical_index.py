@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Vector Brain lexical index
+Checks the BM25 index of nancy-services/core/lexical_index.py: identifier
+tokens, BM25 ranking, metadata filters (including matches that rank far below
+other sources), replacement under the same ID, and deletion by filter.
+"""
+
+import os
+import sys
+
+# Add path for Nancy core modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'nancy-services'))
+
+from core.lexical_index import FILTER_OVERFETCH, LexicalIndex, has_exact_terms, tokenize
+
+
+def ids(results: list) -> list:
+    return [result["id"] for result in results]
+
+
+def build_index() -> LexicalIndex:
+    index = LexicalIndex(":memory:")
+    index.add(
+        ["req_0", "req_1", "req_2", "note_0"],
+        ["REQ-042 the bus voltage shall stay at 3.3V under load.",
+         "REQ-043 the harness connector shall be keyed.",
+         "Voltage voltage voltage margins for the power bus.",
+         "Meeting notes: REQ-042 was reviewed and approved."],
+        [{"source": "requirements.md", "type": "requirement"},
+         {"source": "requirements.md", "type": "requirement"},
+         {"source": "power.md", "type": "analysis"},
+         {"source": "notes.md", "type": "minutes"}]
+    )
+    return index
+
+
+def test_tokens() -> bool:
+    """Compound identifiers are indexed whole and as parts; stop words are dropped."""
+    print("\n1. Tokenizer")
+    tokens = tokenize("The REQ-042 limit is 3.3V in tps54331.c")
+    print(f"   tokens: {tokens}")
+    return (tokens == ["req-042", "req", "042", "limit", "3.3v", "3", "3v", "tps54331.c", "tps54331", "c"]
+            and has_exact_terms("what does REQ-042 say") and not has_exact_terms("power margins"))
+
+
+def test_bm25_ranking() -> bool:
+    """Exact identifiers rank their chunks first; term frequency and rarity order the results."""
+    print("\n2. BM25 ranking")
+    index = build_index()
+    identifier = index.search("REQ-042", n_results=5)
+    voltage = index.search("voltage", n_results=5)
+    part = index.search("043", n_results=5)
+    print(f"   'REQ-042' -> {ids(identifier)}, 'voltage' -> {ids(voltage)}, '043' -> {ids(part)}")
+    scores = [result["score"] for result in identifier]
+    index.close()
+    return (set(ids(identifier)[:2]) == {"req_0", "note_0"} and ids(identifier)[2:] == ["req_1"]
+            and ids(voltage) == ["req_2", "req_0"]
+            and ids(part) == ["req_1"] and scores == sorted(scores, reverse=True))
+
+
+def test_filters() -> bool:
+    """Source, $in and other metadata filters restrict the results."""
+    print("\n3. Metadata filters")
+    index = build_index()
+    by_source = index.search("REQ-042 voltage", n_results=5, where={"source": "notes.md"})
+    by_sources = index.search("voltage", n_results=5, where={"source": {"$in": ["power.md", "notes.md"]}})
+    by_type = index.search("REQ-042", n_results=5, where={"type": "requirement"})
+    print(f"   source -> {ids(by_source)}, $in -> {ids(by_sources)}, type -> {ids(by_type)}")
+    index.close()
+    return ids(by_source) == ["note_0"] and ids(by_sources) == ["req_2"] and ids(by_type)[:1] == ["req_0"]
+
+
+def test_filter_beyond_overfetch() -> bool:
+    """A filtered match is found even when many better matches from other sources come first."""
+    print("\n4. Filtered matches ranked below the overfetch window")
+    index = LexicalIndex(":memory:")
+    crowd = 5 * FILTER_OVERFETCH + 10
+    index.add([f"crowd_{i}" for i in range(crowd)],
+              [f"Telemetry telemetry frame {i}." for i in range(crowd)],
+              [{"source": "telemetry.md", "type": "log"} for _ in range(crowd)])
+    index.add(["rare_0"], ["A long design note that mentions telemetry once among many other words "
+                           "about thermal margins harness routing and connector keying."],
+              [{"source": "design.md", "type": "design"}])
+    by_source = index.search("telemetry", n_results=1, where={"source": "design.md"})
+    by_type = index.search("telemetry", n_results=1, where={"type": "design"})
+    print(f"   {crowd} better matches, source filter -> {ids(by_source)}, type filter -> {ids(by_type)}")
+    index.close()
+    return ids(by_source) == ["rare_0"] and ids(by_type) == ["rare_0"]
+
+
+def test_replace_and_delete() -> bool:
+    """Re-adding an ID replaces its postings; deletion by source removes only that source."""
+    print("\n5. Replace and delete")
+    index = build_index()
+    index.add(["req_1"], ["REQ-043 superseded by REQ-044."], [{"source": "requirements.md"}])
+    old, new = index.search("keyed", n_results=5), index.search("REQ-044", n_results=5)
+    index.delete(where={"source": "requirements.md"})
+    remaining = index.count()
+    index.delete(ids=["note_0"])
+    print(f"   old text -> {ids(old)}, new text -> {ids(new)}, after deleting requirements.md {remaining}, "
+          f"after deleting note_0 {index.count()}")
+    gone = index.search("REQ-042", n_results=5)
+    index.close()
+    return old == [] and ids(new)[:1] == ["req_1"] and remaining == 2 and gone == []
+
+
+def main():
+    """Run the lexical index tests"""
+    print("Testing Vector Brain lexical index")
+    print("=" * 60)
+    results = [
+        test_tokens(),
+        test_bm25_ranking(),
+        test_filters(),
+        test_filter_beyond_overfetch(),
+        test_replace_and_delete(),
+    ]
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
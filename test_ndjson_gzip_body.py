@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Bulk Knowledge Packet body decoding
+Checks the NDJSON body reader of /api/ingest/knowledge-packets: plain and
+gzip bodies, gzip bodies made of several members (concatenated files, pigz
+output) split at arbitrary points, truncated members, and the cap on the
+decompressed size.
+"""
+
+import asyncio
+import gzip
+import os
+import sys
+import zlib
+
+# Add path for Nancy core modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'nancy-services'))
+
+from fastapi import HTTPException
+
+from api.endpoints import ingest
+
+
+class StreamedRequest:
+    """The parts of a Starlette request the body reader uses."""
+
+    def __init__(self, body: bytes, block_size: int, gzipped: bool):
+        self.headers = {"content-type": "application/x-ndjson"}
+        if gzipped:
+            self.headers["content-encoding"] = "gzip"
+        self.body = body
+        self.block_size = block_size
+
+    async def stream(self):
+        for start in range(0, len(self.body), self.block_size):
+            yield self.body[start:start + self.block_size]
+
+
+def read_lines(body: bytes, block_size: int = 7, gzipped: bool = True,
+               max_bytes: int = ingest.MAX_DECOMPRESSED_BODY_BYTES) -> list:
+    async def collect():
+        request = StreamedRequest(body, block_size, gzipped)
+        return [line async for line in ingest._iter_ndjson_lines(request, max_bytes)]
+    return [line for line in asyncio.run(collect()) if line.strip()]
+
+
+def ndjson(first: int, count: int) -> bytes:
+    return b"".join(b'{"line": %d}\n' % i for i in range(first, first + count))
+
+
+def test_plain_and_single_member() -> bool:
+    """Uncompressed and single-member gzip bodies yield every line."""
+    print("\n1. Plain and single-member gzip")
+    plain = read_lines(ndjson(0, 50), gzipped=False)
+    single = read_lines(gzip.compress(ndjson(0, 50)))
+    print(f"   plain: {len(plain)} lines, gzip: {len(single)} lines")
+    return len(plain) == 50 and single == plain
+
+
+def test_multi_member() -> bool:
+    """Lines of every gzip member arrive, whatever the block boundaries."""
+    print("\n2. Three gzip members")
+    body = gzip.compress(ndjson(0, 40)) + gzip.compress(ndjson(40, 40)) + gzip.compress(ndjson(80, 40))
+    results = {block_size: read_lines(body, block_size) for block_size in (1, 7, 64, len(body))}
+    counts = {block_size: len(lines) for block_size, lines in results.items()}
+    print(f"   lines per block size: {counts}")
+    return all(lines == read_lines(ndjson(0, 120), gzipped=False) for lines in results.values())
+
+
+def test_truncated_member_rejected() -> bool:
+    """A body cut off inside a member is an error, not a silently short result."""
+    print("\n3. Truncated gzip member")
+    body = gzip.compress(ndjson(0, 40)) + gzip.compress(ndjson(40, 40))[:-12]
+    try:
+        read_lines(body)
+    except zlib.error as e:
+        print(f"   rejected: {e}")
+        return True
+    print("   accepted")
+    return False
+
+
+def test_decompressed_size_cap() -> bool:
+    """A body that expands past the cap is refused with 413."""
+    print("\n4. Decompressed size cap")
+    body = gzip.compress(b"\n" * (1024 * 1024))
+    within = read_lines(gzip.compress(ndjson(0, 10)), max_bytes=64 * 1024)
+    try:
+        read_lines(body, block_size=len(body), max_bytes=64 * 1024)
+    except HTTPException as e:
+        print(f"   {len(body)} compressed bytes refused: {e.status_code} {e.detail}")
+        return e.status_code == 413 and len(within) == 10
+    print("   accepted")
+    return False
+
+
+def main():
+    """Run the body decoding tests"""
+    print("Testing bulk Knowledge Packet body decoding")
+    print("=" * 60)
+    results = [
+        test_plain_and_single_member(),
+        test_multi_member(),
+        test_truncated_member_rejected(),
+        test_decompressed_size_cap(),
+    ]
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
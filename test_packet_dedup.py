@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Knowledge Packet dedup index
+Checks the Bloom-filter fronted dedup index of nancy-services/core/packet_dedup.py
+against a temporary Analytical Brain: packets and chunks are recognised after
+recording, the filters grow when they saturate without forgetting keys, and a
+new index reloads everything from DuckDB.
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+
+# Add path for Nancy core modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'nancy-services'))
+
+from core.packet_dedup import BloomFilter, PacketDedupIndex, chunk_content_hash
+from core.search import AnalyticalBrain
+
+
+def packet_id(i: int) -> str:
+    return hashlib.sha256(f"packet-{i}".encode()).hexdigest()
+
+
+def record_packets(index: PacketDedupIndex, first: int, count: int):
+    for i in range(first, first + count):
+        chunk_hash = chunk_content_hash(f"chunk text {i}")
+        index.record(packet_id(i), f"/docs/file_{i}.txt", [(chunk_hash, f"{packet_id(i)}_chunk_0")])
+
+
+def test_bloom_filter_basics() -> bool:
+    """Added keys are always found; the false positive rate stays near its target."""
+    print("\n1. Bloom filter")
+    bloom = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"key-{i}")
+    missing = sum(1 for i in range(1000) if f"key-{i}" not in bloom)
+    false_positives = sum(1 for i in range(10000) if f"other-{i}" in bloom)
+    at_capacity = bloom.is_saturated
+    bloom.add("one-more")
+    print(f"   missing {missing}, false positive rate {false_positives / 10000:.4f}, "
+          f"saturated at capacity {at_capacity}, past capacity {bloom.is_saturated}")
+    return missing == 0 and false_positives / 10000 < 0.03 and not at_capacity and bloom.is_saturated
+
+
+def test_record_and_lookup(brain: AnalyticalBrain) -> bool:
+    """Recorded packets and chunks are known; unseen ones are answered by the filter."""
+    print("\n2. Record and look up")
+    index = PacketDedupIndex(brain, capacity=64)
+    record_packets(index, 0, 10)
+    known = all(index.contains_packet(packet_id(i)) for i in range(10))
+    negatives_before = index.bloom_negatives
+    unseen = [index.contains_packet(packet_id(i)) for i in range(1000, 1020)]
+    new_hashes = index.new_chunk_hashes("/docs/file_3.txt", [chunk_content_hash("chunk text 3"),
+                                                              chunk_content_hash("edited text")])
+    print(f"   known {known}, unseen reported new {not any(unseen)}, "
+          f"Bloom negatives {index.bloom_negatives - negatives_before}/20, new chunks {len(new_hashes)}")
+    return (known and not any(unseen) and index.bloom_negatives - negatives_before >= 15
+            and new_hashes == {chunk_content_hash("edited text")})
+
+
+def test_resize_keeps_keys(brain: AnalyticalBrain) -> bool:
+    """Recording past the capacity doubles the filters and keeps every key."""
+    print("\n3. Resize on saturation")
+    index = PacketDedupIndex(brain, capacity=64)
+    capacity_before = index.capacity
+    record_packets(index, 10, 200)
+    all_known = all(index.contains_packet(packet_id(i)) for i in range(210))
+    chunks_known = all(
+        not index.new_chunk_hashes(f"/docs/file_{i}.txt", [chunk_content_hash(f"chunk text {i}")])
+        for i in range(210)
+    )
+    print(f"   capacity {capacity_before} -> {index.capacity}, saturated {index.packet_filter.is_saturated}, "
+          f"all packets known {all_known}, all chunks known {chunks_known}")
+    return (index.capacity > capacity_before and not index.packet_filter.is_saturated
+            and all_known and chunks_known)
+
+
+def test_reload_from_duckdb(brain: AnalyticalBrain) -> bool:
+    """A fresh index (a restarted host) is sized for and knows everything stored."""
+    print("\n4. Reload")
+    index = PacketDedupIndex(brain, capacity=16)
+    all_known = all(index.contains_packet(packet_id(i)) for i in range(210))
+    print(f"   capacity {index.capacity}, all packets known {all_known}, "
+          f"false positives {index.bloom_false_positives}")
+    return index.capacity >= 2 * 210 and all_known and not index.packet_filter.is_saturated
+
+
+def main():
+    """Run the dedup index tests"""
+    print("Testing Knowledge Packet dedup index")
+    print("=" * 60)
+    directory = tempfile.mkdtemp(prefix="nancy-dedup-")
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        brain = AnalyticalBrain()
+        results = [
+            test_bloom_filter_basics(),
+            test_record_and_lookup(brain),
+            test_resize_keeps_keys(brain),
+            test_reload_from_duckdb(brain),
+        ]
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Directory scan include/ignore patterns
+Checks the gitignore-style matcher of nancy-services/core/path_patterns.py:
+unanchored name patterns, anchoring by a leading or middle slash, directory-only
+patterns, "**" across directories, and whole-subtree pruning.
+"""
+
+import os
+import sys
+
+# Add path for Nancy core modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'nancy-services'))
+
+from core.path_patterns import PathMatcher, compile_patterns
+
+
+def check(label: str, actual: dict, expected: dict) -> bool:
+    wrong = {path: actual[path] for path in expected if actual[path] != expected[path]}
+    print(f"   {label}: {'ok' if not wrong else f'wrong for {wrong}'}")
+    return not wrong
+
+
+def test_unanchored_names() -> bool:
+    """Patterns without a slash match the entry name at any depth; '*' stays within one name."""
+    print("\n1. Unanchored name patterns")
+    matcher = PathMatcher("*.pyc, .env*")
+    expected = {
+        "module.pyc": True, "pkg/sub/module.pyc": True, ".env.local": True, "config/.env": True,
+        "module.py": False, "pyc/readme.md": False, "src.pyc.d/file.txt": False
+    }
+    return check("names", {path: matcher.matches(path) for path in expected}, expected)
+
+
+def test_anchoring() -> bool:
+    """A leading or middle slash anchors the pattern to the scanned root."""
+    print("\n2. Anchored patterns")
+    matcher = PathMatcher("/build,docs/*.md")
+    files = {"docs/guide.md": True, "docs/api/guide.md": False, "src/docs/guide.md": False,
+             "build": True, "src/build": False}
+    directories = {"build": True, "src/build": False, "docs": False}
+    return (check("files", {path: matcher.matches(path) for path in files}, files)
+            and check("directories", {path: matcher.matches_directory(path) for path in directories}, directories))
+
+
+def test_double_star() -> bool:
+    """'**' matches zero or more directories, at the start, middle or end."""
+    print("\n3. '**' patterns")
+    matcher = PathMatcher("**/tmp,docs/**/*.md,logs/**")
+    files = {
+        "docs/a.md": True, "docs/x/y/a.md": True, "other/docs/a.md": False, "docs/a.txt": False,
+        "logs/app.log": True, "logs/2024/01/app.log": True, "src/logs/app.log": False,
+        "tmp": True, "a/b/tmp": True, "a/tmpx": False
+    }
+    directories = {"logs": True, "tmp": True, "cache/tmp": True, "docs": False}
+    return (check("files", {path: matcher.matches(path) for path in files}, files)
+            and check("directories", {path: matcher.matches_directory(path) for path in directories}, directories))
+
+
+def test_directory_only_and_ignores() -> bool:
+    """Trailing-slash patterns match directories only; ignores() checks every parent."""
+    print("\n4. Directory patterns and parent pruning")
+    matcher = compile_patterns("node_modules/,.git/")
+    expected = {
+        "node_modules/pkg/index.js": True, "web/node_modules/lib.js": True, ".git/config": True,
+        "src/node_modules.txt": False, "src/app.js": False
+    }
+    file_only = {"node_modules": matcher.matches("node_modules")}
+    print(f"   a file named node_modules matches: {file_only['node_modules']}")
+    return (check("ignores", {path: matcher.ignores(path) for path in expected}, expected)
+            and not file_only["node_modules"] and matcher.matches_directory("node_modules")
+            and compile_patterns("node_modules/,.git/") is matcher)
+
+
+def test_empty_patterns() -> bool:
+    """Empty pattern strings match nothing."""
+    print("\n5. Empty patterns")
+    matchers = [PathMatcher(None), PathMatcher(""), PathMatcher(" , ,")]
+    matched = [m.matches("a.txt") or m.ignores("a/b.txt") for m in matchers]
+    print(f"   falsy {[not m for m in matchers]}, matched {matched}")
+    return all(not m for m in matchers) and not any(matched)
+
+
+def main():
+    """Run the path pattern tests"""
+    print("Testing directory scan path patterns")
+    print("=" * 60)
+    results = [
+        test_unanchored_names(),
+        test_anchoring(),
+        test_double_star(),
+        test_directory_only_and_ignores(),
+        test_empty_patterns(),
+    ]
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Streaming spreadsheet reader edge cases
+Checks the incremental CSV reader of nancy-services/core/spreadsheet_streaming.py,
+shared with the spreadsheet MCP server, against files whose column types
+change after the first block, so every row still arrives, and the DataFrame
+conversion used for .xls sheets and MCP table attachments against columns
+mixing numbers and text.
+"""
+
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+
+# Add path for Nancy core modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'nancy-services'))
+
+from core import spreadsheet_streaming
+
+
+def load_mcp_processor():
+    """The spreadsheet MCP server's processor module."""
+    path = os.path.join(os.path.dirname(__file__), 'mcp-servers', 'spreadsheet', 'processor.py')
+    spec = importlib.util.spec_from_file_location("mcp_spreadsheet_processor", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_type_change_csv(path: str, rows: int = 5000, change_at: int = 4000):
+    """Status column numeric for change_at rows, then 'pending'; Value stays numeric."""
+    with open(path, 'w') as f:
+        f.write("Test,Status,Value\n")
+        for i in range(rows):
+            status = i if i < change_at else ("pending" if i % 2 else i)
+            f.write(f"T{i},{status},{i * 0.5}\n")
+
+
+def test_type_change_after_first_block(directory: str) -> bool:
+    """A column that turns to text after the first block is read as string from there on."""
+    path = os.path.join(directory, "type_change.csv")
+    write_type_change_csv(path)
+    chunks = list(spreadsheet_streaming.iter_csv_chunks(path, block_size=16 * 1024))
+    stats = spreadsheet_streaming.SheetStatistics()
+    for chunk in chunks:
+        stats.update(chunk)
+    unified = stats.unified_schema()
+    table = pa.concat_tables([chunk.cast(unified) for chunk in chunks])
+    status_types = {str(chunk.schema.field("Status").type) for chunk in chunks}
+    print(f"   {len(chunks)} chunks, {table.num_rows} rows, Status types {sorted(status_types)}, "
+          f"unified {unified.field('Status').type}")
+    return (table.num_rows == 5000 and "string" in status_types
+            and pa.types.is_string(unified.field("Status").type)
+            and pa.types.is_floating(unified.field("Value").type)
+            and table.column("Test").to_pylist() == [f"T{i}" for i in range(5000)]
+            and table.column("Status").to_pylist()[4001] == "pending"
+            and table.column("Status").to_pylist()[10] == "10")
+
+
+def test_single_block_unchanged(directory: str) -> bool:
+    """Files that fit the first block keep their inferred types."""
+    path = os.path.join(directory, "small.csv")
+    with open(path, 'w') as f:
+        f.write("Name,Count\nalpha,1\nbeta,2\n")
+    chunks = list(spreadsheet_streaming.iter_csv_chunks(path))
+    print(f"   {len(chunks)} chunk, Count type {chunks[0].schema.field('Count').type}")
+    return len(chunks) == 1 and pa.types.is_integer(chunks[0].schema.field("Count").type)
+
+
+def test_mixed_type_dataframe() -> bool:
+    """Object columns mixing numbers and text become strings; other columns keep their types."""
+    df = pd.DataFrame({
+        "Test": ["T1", "T2", "T3"],
+        "Result": [1, "n/a", 2.5],
+        "Value": [1.0, None, 3.0],
+    })
+    table = spreadsheet_streaming.dataframe_to_arrow(df)
+    print(f"   schema {[(f.name, str(f.type)) for f in table.schema]}")
+    return (pa.types.is_string(table.schema.field("Result").type)
+            and table.column("Result").to_pylist() == ["1", "n/a", "2.5"]
+            and pa.types.is_floating(table.schema.field("Value").type)
+            and table.column("Value").to_pylist()[1] is None)
+
+
+def test_duplicate_headers(directory: str) -> bool:
+    """Repeated and blank CSV headers are renamed pandas-style, keeping the forced-string restart working."""
+    path = os.path.join(directory, "duplicates.csv")
+    with open(path, 'w') as f:
+        f.write("Test,Value,Value,value,\n")
+        for i in range(3000):
+            f.write(f"T{i},{i},{i if i < 2500 else 'x'},{i},{i}\n")
+    chunks = list(spreadsheet_streaming.iter_csv_chunks(path, block_size=16 * 1024))
+    names = chunks[0].column_names
+    header = spreadsheet_streaming.header_to_column_names(["A", "A", "A.1", None, " "])
+    print(f"   CSV columns {names}; header {header}")
+    return (names == ["Test", "Value", "Value.1", "value.2", "Unnamed: 4"]
+            and all(chunk.column_names == names for chunk in chunks)
+            and sum(chunk.num_rows for chunk in chunks) == 3000
+            and header == ["A", "A.1", "A.1.1", "Unnamed: 3", "Unnamed: 4"])
+
+
+def test_mcp_server_shares_reader() -> bool:
+    """The spreadsheet MCP server imports the streaming reader of Nancy Core."""
+    processor = load_mcp_processor()
+    shared = (processor.iter_spreadsheet_chunks is spreadsheet_streaming.iter_spreadsheet_chunks
+              and processor.dataframe_to_arrow is spreadsheet_streaming.dataframe_to_arrow)
+    print(f"   processor reader from {processor.iter_spreadsheet_chunks.__module__}")
+    return shared
+
+
+def test_duplicate_headers_store(directory: str) -> bool:
+    """A CSV with repeated headers streams into DuckDB."""
+    from core.search import AnalyticalBrain
+    path = os.path.join(directory, "duplicates.csv")
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        brain = AnalyticalBrain()
+        for i, chunk in enumerate(spreadsheet_streaming.iter_csv_chunks(path, block_size=16 * 1024)):
+            brain.append_spreadsheet_data("duplicate_headers", chunk, create=i == 0)
+        rows = brain.con.execute('SELECT count(*), count("Value.1") FROM duplicate_headers').fetchone()
+    finally:
+        os.chdir(cwd)
+    print(f"   stored {rows[0]} rows")
+    return rows[0] == 3000
+
+
+def main():
+    """Run the streaming reader tests"""
+    print("Testing streaming spreadsheet readers")
+    print("=" * 60)
+    directory = tempfile.mkdtemp(prefix="nancy-streaming-")
+    results = []
+    try:
+        print("\n1. Column type change after the first block")
+        results.append(test_type_change_after_first_block(directory))
+        print("\n2. Single block")
+        results.append(test_single_block_unchanged(directory))
+        print("\n3. Mixed-type DataFrame columns")
+        results.append(test_mixed_type_dataframe())
+        print("\n4. Repeated CSV headers")
+        results.append(test_duplicate_headers(directory))
+        print("\n5. Spreadsheet MCP server uses the core reader")
+        results.append(test_mcp_server_shares_reader())
+        print("\n6. Repeated CSV headers stored in DuckDB")
+        results.append(test_duplicate_headers_store(directory))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Vector Brain text chunking
+Checks the token-aware chunker of nancy-services/core/chunking.py: chunks stay
+within the token window, consecutive chunks overlap, boundaries fall on
+sentence starts, and an edit in the middle of a document leaves the chunks
+away from it unchanged.
+"""
+
+import os
+import random
+import sys
+
+# Add path for Nancy core modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'nancy-services'))
+
+from core.chunking import TextChunker
+
+WORDS = ("sensor calibration drift thermal margin harness connector power bus "
+         "telemetry frame review approved rejected baseline interface latency").split()
+
+
+def document(sentences: int, seed: int = 7) -> list:
+    """Sentences of 6-14 words with a unique number each."""
+    rng = random.Random(seed)
+    return [f"Item {i} " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))) + "."
+            for i in range(sentences)]
+
+
+def test_window_and_coverage() -> bool:
+    """Every chunk fits the window, spans match the text and the chunks cover the document."""
+    print("\n1. Window limits and coverage")
+    chunker = TextChunker(chunk_size=64, chunk_overlap=12)
+    text = " ".join(document(200))
+    chunks = chunker.chunk(text)
+    fits = all(chunk["token_count"] <= chunker.chunk_size for chunk in chunks)
+    counted = all(chunker.count_tokens(chunk["text"]) == chunk["token_count"] for chunk in chunks)
+    sliced = all(text[chunk["start_char"]:chunk["end_char"]] == chunk["text"] for chunk in chunks)
+    covered = chunks[0]["start_char"] == 0 and chunks[-1]["end_char"] == len(text)
+    tail = chunks[-1]["token_count"] >= chunker.chunk_size // 4
+    print(f"   {len(chunks)} chunks, largest {max(c['token_count'] for c in chunks)} tokens, "
+          f"smallest {min(c['token_count'] for c in chunks)}, fits {fits}, counts {counted}, "
+          f"spans {sliced}, covered {covered}")
+    return fits and counted and sliced and covered and tail
+
+
+def test_overlap() -> bool:
+    """Each chunk starts before the previous one ends, by no more than the overlap."""
+    print("\n2. Overlap between consecutive chunks")
+    chunker = TextChunker(chunk_size=64, chunk_overlap=12)
+    text = " ".join(document(200))
+    chunks = chunker.chunk(text)
+    overlaps = [chunker.count_tokens(text[b["start_char"]:a["end_char"]])
+                for a, b in zip(chunks, chunks[1:])]
+    advancing = all(b["start_char"] > a["start_char"] for a, b in zip(chunks, chunks[1:]))
+    print(f"   overlap tokens: min {min(overlaps)}, max {max(overlaps)}, advancing {advancing}")
+    return advancing and all(0 < overlap <= chunker.chunk_overlap for overlap in overlaps)
+
+
+def test_sentence_boundaries() -> bool:
+    """Chunks end at sentence ends when a sentence start lies in the window's second half."""
+    print("\n3. Sentence boundaries")
+    chunker = TextChunker(chunk_size=64, chunk_overlap=0)
+    sentences = document(200)
+    chunks = chunker.chunk(" ".join(sentences))
+    on_sentence = sum(1 for chunk in chunks if chunk["text"].endswith("."))
+    print(f"   {on_sentence}/{len(chunks)} chunks end on a sentence")
+    return on_sentence == len(chunks)
+
+
+def test_boundary_stability() -> bool:
+    """An edit in the middle changes only the chunks around it."""
+    print("\n4. Boundary stability after an edit")
+    chunker = TextChunker(chunk_size=64, chunk_overlap=12)
+    sentences = document(300)
+    original = chunker.split(" ".join(sentences))
+    edited_sentences = list(sentences)
+    edited_sentences[150] = "Item 150 was rewritten with a much longer sentence that adds words to the window."
+    edited = chunker.split(" ".join(edited_sentences))
+    changed = len(set(edited) - set(original))
+    print(f"   {len(original)} chunks, {changed} changed by the edit")
+    return 0 < changed <= 4 and original[:10] == edited[:10] and original[-10:] == edited[-10:]
+
+
+def test_limits() -> bool:
+    """Window and overlap settings are clamped; empty text gives no chunks."""
+    print("\n5. Settings and edge cases")
+    tiny, huge = TextChunker(chunk_size=1, chunk_overlap=100), TextChunker(chunk_size=5000, chunk_overlap=5000)
+    long_word = TextChunker(chunk_size=16, chunk_overlap=4).chunk("x" * 600)
+    print(f"   tiny {tiny.chunk_size}/{tiny.chunk_overlap}, huge {huge.chunk_size}/{huge.chunk_overlap}, "
+          f"unbroken word -> {len(long_word)} chunks")
+    return (tiny.chunk_size == 16 and tiny.chunk_overlap == 4 and huge.chunk_size == 510
+            and huge.chunk_overlap == 127 and TextChunker().chunk("  \n ") == []
+            and all(chunk["token_count"] <= 16 for chunk in long_word))
+
+
+def main():
+    """Run the chunking tests"""
+    print("Testing Vector Brain text chunking")
+    print("=" * 60)
+    results = [
+        test_window_and_coverage(),
+        test_overlap(),
+        test_sentence_boundaries(),
+        test_boundary_stability(),
+        test_limits(),
+    ]
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Vector Brain chunk reuse across document versions
+Checks that embed_and_store_text only reuses and deletes chunks of the
+document itself and of the versions it supersedes: two live documents stored
+under the same chunk key (two uploads named README.md) keep each other's
+chunks. Runs on the exact backend with a deterministic test embedding, so no
+model download or Chroma server is needed.
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+import numpy as np
+
+# Add path for Nancy core modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'nancy-services'))
+
+from core.chunking import TextChunker
+from core.exact_vectors import ExactVectorBackend
+from core.lexical_index import LexicalIndex
+from core.nlp import VectorBrain
+
+
+def hash_embedding(texts):
+    """Deterministic 32-dimensional embedding of each text."""
+    return [np.frombuffer(hashlib.sha256(text.encode()).digest(), dtype=np.uint8).astype(np.float32)
+            for text in texts]
+
+
+def create_vector_brain(directory: str) -> VectorBrain:
+    """A VectorBrain on the exact backend, without loading fastembed."""
+    brain = VectorBrain.__new__(VectorBrain)
+    brain.backend = ExactVectorBackend(hash_embedding, directory)
+    brain.lexical_index = LexicalIndex(":memory:")
+    brain.chunker = TextChunker(chunk_size=64, chunk_overlap=8)
+    brain.default_retrieval_mode = "vector"
+    brain._retrieval = threading.local()
+    brain._versions = threading.local()
+    return brain
+
+
+def document(topic: str, paragraphs: int = 12) -> str:
+    return "\n".join(
+        f"Section {i} of the {topic} notes. The {topic} design review covers item {i} in detail."
+        for i in range(paragraphs)
+    )
+
+
+def chunk_count(brain: VectorBrain, source: str) -> int:
+    return len(brain.backend.get_ids(where={"source": source}))
+
+
+def test_same_key_documents_are_independent(brain: VectorBrain) -> bool:
+    """Two live documents under one chunk key do not delete each other's chunks."""
+    print("\n1. Two documents named README.md")
+    stats_a = brain.embed_and_store_text("docA", document("thermal"), None, chunk_key="README.md")
+    stats_b = brain.embed_and_store_text("docB", document("power"), None, chunk_key="README.md")
+    chunks_a, chunks_b = chunk_count(brain, "docA"), chunk_count(brain, "docB")
+    print(f"   docA: {chunks_a} chunks, docB: {chunks_b} chunks, removed by docB: {stats_b['chunks_removed']}")
+    return (chunks_a == stats_a["chunks_total"] and chunks_b == stats_b["chunks_total"]
+            and stats_b["chunks_removed"] == 0)
+
+
+def test_identical_content_gets_own_chunks(brain: VectorBrain) -> bool:
+    """A chunk whose content another live document already holds is stored again for the new one."""
+    print("\n2. Third README.md sharing docA's content")
+    text = document("thermal")
+    stats_c = brain.embed_and_store_text("docC", text + "\nAppendix.", None, chunk_key="README.md")
+    chunks_a, chunks_c = chunk_count(brain, "docA"), chunk_count(brain, "docC")
+    print(f"   docA: {chunks_a} chunks, docC: {chunks_c} chunks, reused: {stats_c['chunks_reused']}")
+    return chunks_a > 0 and chunks_c == stats_c["chunks_total"] and stats_c["chunks_reused"] == 0
+
+
+def test_new_version_reuses_only_superseded(brain: VectorBrain) -> bool:
+    """A new version reuses and retires the chunks of the version it supersedes only."""
+    print("\n3. New version of docB superseding it")
+    before_a, before_c = chunk_count(brain, "docA"), chunk_count(brain, "docC")
+    edited = document("power").replace("item 11", "item eleven")
+    with brain.superseding(["docB"]):
+        stats = brain.embed_and_store_text("docB2", edited, None, chunk_key="README.md")
+    print(f"   reused {stats['chunks_reused']}/{stats['chunks_total']}, removed {stats['chunks_removed']}; "
+          f"docB left: {chunk_count(brain, 'docB')}")
+    return (stats["chunks_reused"] > 0 and chunk_count(brain, "docB") == 0
+            and chunk_count(brain, "docB2") == stats["chunks_total"]
+            and chunk_count(brain, "docA") == before_a and chunk_count(brain, "docC") == before_c)
+
+
+def test_lexical_index_follows(brain: VectorBrain) -> bool:
+    """The lexical index holds exactly the stored chunks."""
+    print("\n4. Lexical index matches the vector store")
+    stored = brain.backend.count()
+    indexed = brain.lexical_index.count()
+    print(f"   stored {stored}, indexed {indexed}")
+    return stored == indexed
+
+
+def main():
+    """Run the chunk reuse tests"""
+    print("Testing Vector Brain chunk reuse")
+    print("=" * 60)
+    directory = tempfile.mkdtemp(prefix="nancy-vectors-")
+    try:
+        brain = create_vector_brain(directory)
+        results = [
+            test_same_key_documents_are_independent(brain),
+            test_identical_content_gets_own_chunks(brain),
+            test_new_version_reuses_only_superseded(brain),
+            test_lexical_index_follows(brain),
+        ]
+        brain.backend.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
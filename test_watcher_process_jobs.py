@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Directory watcher process jobs
+Checks that the watcher callback of the brain registry queues one process job
+per watched directory and does not queue another while one is still waiting.
+Runs against a temporary Analytical Brain with the job workers not started,
+so queued jobs stay queued.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+# Add path for Nancy core modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'nancy-services'))
+
+from core import brain_registry
+from core.ingestion_jobs import IngestionJobManager
+
+
+def queued_process_jobs(job_manager: IngestionJobManager, directory_root: str) -> int:
+    return sum(
+        1 for job in job_manager.list_jobs()
+        if job["status"] == "queued" and job["job_type"] == "process"
+        and job_manager.get_job(job["id"])["params"].get("directory_path") == directory_root
+    )
+
+
+def test_one_job_per_directory(job_manager: IngestionJobManager) -> bool:
+    """Repeated change notifications for one directory queue a single job."""
+    print("\n1. Three change notifications for /data/docs")
+    for queued in (1, 3, 5):
+        brain_registry._process_watched_changes("/data/docs", queued)
+    jobs = queued_process_jobs(job_manager, "/data/docs")
+    print(f"   queued process jobs: {jobs}")
+    return jobs == 1
+
+
+def test_other_directory_gets_own_job(job_manager: IngestionJobManager) -> bool:
+    """A second watched directory gets its own job."""
+    print("\n2. Change notification for /data/reports")
+    brain_registry._process_watched_changes("/data/reports", 2)
+    docs, reports = queued_process_jobs(job_manager, "/data/docs"), queued_process_jobs(job_manager, "/data/reports")
+    print(f"   /data/docs: {docs}, /data/reports: {reports}")
+    return docs == 1 and reports == 1
+
+
+def main():
+    """Run the watcher job tests"""
+    print("Testing directory watcher process jobs")
+    print("=" * 60)
+    directory = tempfile.mkdtemp(prefix="nancy-watch-jobs-")
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        job_manager = IngestionJobManager(directory_service=None)
+        # Leave submitted jobs queued instead of running them
+        job_manager.start = lambda: None
+        brain_registry._resources["job_manager"] = job_manager
+        results = [
+            test_one_job_per_directory(job_manager),
+            test_other_directory_gets_own_job(job_manager),
+        ]
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    exit(main())